@@ -0,0 +1,69 @@
+"""
+Benchmark the batch validation executor backends against a generated corpus.
+
+Usage: python benchmarks/batch_backends.py [--plugins 500] [--states 200] [--workers 4]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from tpc_plugin_validator.batch.backends import Backend, available_backends
+from tpc_plugin_validator.batch.batch_validator import BatchValidator
+
+
+def generate_corpus(root: str, plugins: int, states: int) -> None:
+    """
+    Write a corpus of synthetic plugins to disk.
+
+    :param root: Directory to write the corpus to.
+    :param plugins: Number of plugins to generate.
+    :param states: Number of chained states in each plugin.
+    """
+    for plugin in range(plugins):
+        state_names = [f"State{index}" for index in range(states)]
+        process_lines = ["[states]", "Init", *(f"{name}=echo {plugin}" for name in state_names)]
+        process_lines += ["SomeFailure=FAIL(We failed for some reason., 1234)", "END", "", "[transitions]"]
+        previous = "Init"
+        for name in state_names:
+            process_lines += [f"{previous},Ready,{name}", f"{previous},Failure,SomeFailure"]
+            previous = name
+        process_lines += [f"{previous},Ready,END", "", "[CPM Parameters Validation]", "", "[parameters]"]
+        process_lines += ["PromptTimeout=60", "", "[Debug Information]", "ExpectLog=no"]
+        prompts_lines = ["[conditions]", "Ready=.*\\$", "Failure=(denied|failure)"]
+
+        directory = os.path.join(root, f"plugin{plugin:05d}")
+        os.mkdir(directory)
+        with open(os.path.join(directory, "process.ini"), "w", encoding="utf-8") as process_file:
+            process_file.write("\n".join(process_lines))
+        with open(os.path.join(directory, "prompts.ini"), "w", encoding="utf-8") as prompts_file:
+            prompts_file.write("\n".join(prompts_lines))
+
+
+def main() -> None:
+    """Generate a corpus and time each backend available with the running Python."""
+    arg_parse = argparse.ArgumentParser(description="Benchmark the batch validation executor backends.")
+    arg_parse.add_argument("--plugins", type=int, default=500, help="Number of plugins to generate")
+    arg_parse.add_argument("--states", type=int, default=200, help="Number of states in each plugin")
+    arg_parse.add_argument("--workers", type=int, default=None, help="Maximum number of parallel workers")
+    args = arg_parse.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        generate_corpus(root=root, plugins=args.plugins, states=args.states)
+        for backend in Backend:
+            if backend not in available_backends():
+                print(f"{backend.value:>12}: unavailable with this Python")
+                continue
+            batch_validator = BatchValidator.with_directory(root=root, backend=backend, max_workers=args.workers)
+            started = time.perf_counter()
+            violations = sum(len(result.violations) for result in batch_validator.run())
+            elapsed = time.perf_counter() - started
+            print(
+                f"{backend.value:>12}: {elapsed:.2f}s for {len(batch_validator.pairs)} plugins "
+                f"({len(batch_validator.pairs) / elapsed:.1f} plugins/s, {violations} violations)"
+            )
+
+
+if __name__ == "__main__":
+    main()
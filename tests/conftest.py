@@ -0,0 +1,86 @@
+"""Fixtures shared by the tests."""
+
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+CorpusBuilder = Callable[..., Path]
+
+
+class BrokenExecutor(ThreadPoolExecutor):
+    """Executor behaving as a process pool whose worker died running the first task submitted."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Standard init for the BrokenExecutor class.
+
+        :param args: Positional arguments for ThreadPoolExecutor.
+        :param kwargs: Keyword arguments for ThreadPoolExecutor.
+        """
+        super().__init__(*args, **kwargs)
+        self.submitted: int = 0
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        """
+        Fail the first task submitted and refuse any more, as a broken process pool does.
+
+        :param fn: The function to call.
+        :param args: Positional arguments for the function.
+        :param kwargs: Keyword arguments for the function.
+
+        :raises BrokenProcessPool: If a task has already been submitted.
+
+        :return: A future holding the error.
+        """
+        self.submitted += 1
+        if self.submitted > 1:
+            raise BrokenProcessPool("A child process terminated abruptly, the process pool is not usable anymore.")
+        future: Future = Future()
+        future.set_exception(BrokenProcessPool("A process in the process pool was terminated abruptly."))
+        return future
+
+
+@pytest.fixture
+def build_corpus(tmp_path: Path) -> CorpusBuilder:
+    """
+    Provide a function creating plugins within a corpus on disk, each in its own directory.
+
+    :param tmp_path: Temporary directory provided by pytest.
+
+    :return: The function, which may be called more than once to add plugins to the same corpus.
+    """
+    root = tmp_path / "corpus"
+
+    def build(
+        names: Iterable[str],
+        process_file: str = "tests/data/transitions-invalid-process.ini",
+        prompts_file: str = "tests/data/transitions-invalid-prompts.ini",
+        padding: int = 0,
+        file_prefix: str = "",
+    ) -> Path:
+        """
+        Create a plugin for each of the names given.
+
+        :param names: The names of the directories holding each plugin.
+        :param process_file: Path to the process file to copy.
+        :param prompts_file: Path to the prompts file to copy.
+        :param padding: The number of comment lines appended to each process file.
+        :param file_prefix: The prefix in front of Process.ini and Prompts.ini, the files are named process.ini and
+            prompts.ini if empty.
+
+        :return: Path to the root of the corpus.
+        """
+        process: bytes = Path(process_file).read_bytes() + b"# Padding.\n" * padding
+        prompts: bytes = Path(prompts_file).read_bytes()
+        for name in names:
+            directory = root / name
+            directory.mkdir(parents=True)
+            (directory / f"{file_prefix}{'Process' if file_prefix else 'process'}.ini").write_bytes(process)
+            (directory / f"{file_prefix}{'Prompts' if file_prefix else 'prompts'}.ini").write_bytes(prompts)
+        return root
+
+    return build
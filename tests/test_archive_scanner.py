@@ -0,0 +1,312 @@
+"""Tests for streaming plugin pairs out of bulk archives."""
+
+import io
+import tarfile
+import zipfile
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+from tpc_plugin_validator.batch import batch_validator as batch_validator_module
+from tpc_plugin_validator.batch.archive_scanner import is_archive, scan_archive
+from tpc_plugin_validator.batch.backends import Backend
+from tpc_plugin_validator.batch.batch_validator import BatchValidator
+from tpc_plugin_validator.batch.plugin_pair import PluginPair
+from tpc_plugin_validator.validator import Validator
+
+
+def _read(path: str) -> bytes:
+    """
+    Read a test data file.
+
+    :param path: Path to the file.
+
+    :return: The raw file content.
+    """
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def _zip(members: dict[str, bytes]) -> bytes:
+    """
+    Create a zip archive in memory.
+
+    :param members: Mapping of member names to content.
+
+    :return: The raw archive.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def _tar(path: Path, members: dict[str, bytes]) -> None:
+    """
+    Create a gzipped tar archive on disk.
+
+    :param path: Path to write the archive to.
+    :param members: Mapping of member names to content.
+    """
+    with tarfile.open(path, "w:gz") as archive:
+        for name, content in members.items():
+            info = tarfile.TarInfo(name=name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+
+
+@pytest.fixture
+def export(tmp_path: Path) -> Path:
+    """
+    Create a platform export holding plain, nested and sniffed plugins.
+
+    :param tmp_path: Temporary directory provided by pytest.
+
+    :return: Path to the export archive.
+    """
+    valid_process = _read("tests/data/valid-process.ini")
+    valid_prompts = _read("tests/data/valid-prompts.ini")
+    invalid_process = _read("tests/data/transitions-invalid-process.ini")
+    invalid_prompts = _read("tests/data/transitions-invalid-prompts.ini")
+    nested_tar = io.BytesIO()
+    with tarfile.open(fileobj=nested_tar, mode="w") as archive:
+        for name, content in {"Deep/Process.ini": valid_process, "Deep/Prompts.ini": valid_prompts}.items():
+            info = tarfile.TarInfo(name=name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+
+    export_path = tmp_path / "export.tar.gz"
+    _tar(
+        path=export_path,
+        members={
+            "Platforms/Unix/UnixProcess.ini": valid_process,
+            "Platforms/Readme.txt": b"Not a plugin.",
+            "Platforms/Windows.zip": _zip(
+                {
+                    "Windows/WindowsProcess.ini": invalid_process,
+                    "Windows/Policy-Windows.ini": b"[ExtraInfo]\nPolicyID=Windows",
+                    "Windows/WindowsPrompts.ini": invalid_prompts,
+                    "Nested.zip": _zip({"first.ini": valid_process, "second.ini": valid_prompts}),
+                    "Deep.tar": nested_tar.getvalue(),
+                }
+            ),
+            "Platforms/Unix/UnixPrompts.ini": valid_prompts,
+            "Platforms/Orphan/OrphanPrompts.ini": valid_prompts,
+        },
+    )
+    return export_path
+
+
+class TestArchiveScanner(object):
+    """Tests for streaming plugin pairs out of bulk archives."""
+
+    def test_scan_archive(self, export: Path) -> None:
+        """
+        Test to ensure that every pair is found, including in nested archives, and attributed to its member path.
+
+        :param export: Path to the export archive.
+        """
+        pairs = [pair for pair, _, _, _ in scan_archive(archive_path=str(export))]
+
+        assert pairs == [
+            PluginPair(
+                name="export.tar.gz!Platforms/Windows.zip!Windows/Windows",
+                process_file="export.tar.gz!Platforms/Windows.zip!Windows/WindowsProcess.ini",
+                prompts_file="export.tar.gz!Platforms/Windows.zip!Windows/WindowsPrompts.ini",
+            ),
+            PluginPair(
+                name="export.tar.gz!Platforms/Windows.zip!Nested.zip",
+                process_file="export.tar.gz!Platforms/Windows.zip!Nested.zip!first.ini",
+                prompts_file="export.tar.gz!Platforms/Windows.zip!Nested.zip!second.ini",
+            ),
+            PluginPair(
+                name="export.tar.gz!Platforms/Windows.zip!Deep.tar!Deep",
+                process_file="export.tar.gz!Platforms/Windows.zip!Deep.tar!Deep/Process.ini",
+                prompts_file="export.tar.gz!Platforms/Windows.zip!Deep.tar!Deep/Prompts.ini",
+            ),
+            PluginPair(
+                name="export.tar.gz!Platforms/Unix/Unix",
+                process_file="export.tar.gz!Platforms/Unix/UnixProcess.ini",
+                prompts_file="export.tar.gz!Platforms/Unix/UnixPrompts.ini",
+            ),
+            PluginPair(
+                name="export.tar.gz!Platforms/Orphan/Orphan",
+                prompts_file="export.tar.gz!Platforms/Orphan/OrphanPrompts.ini",
+            ),
+        ]
+
+    def test_batch_validator_with_archive(self, export: Path) -> None:
+        """
+        Test to ensure that pairs streamed from an archive validate the same as the files on disk.
+
+        :param export: Path to the export archive.
+        """
+        batch_validator = BatchValidator.with_archive(archive_path=str(export), backend=Backend.thread, max_workers=1)
+        results = {result.pair.name: result for result in batch_validator.run()}
+
+        expected = Validator.with_file(
+            process_file_path="tests/data/transitions-invalid-process.ini",
+            prompts_file_path="tests/data/transitions-invalid-prompts.ini",
+        )
+        expected.validate()
+
+        assert len(results) == 5
+        assert results["export.tar.gz!Platforms/Windows.zip!Windows/Windows"].violations == expected.violations
+        assert results["export.tar.gz!Platforms/Unix/Unix"].passed
+        assert results["export.tar.gz!Platforms/Windows.zip!Deep.tar!Deep"].passed
+
+    @pytest.mark.parametrize(
+        "file_name,content,exception_type,expected_message",
+        [
+            ("missing.zip", None, FileNotFoundError, "The archive was not found: {path}"),
+            ("export.rar", b"", ValueError, "The archive type is not supported: {path}"),
+            (
+                "export.zip",
+                b"not a zip",
+                ValueError,
+                "The archive export.zip could not be read: File is not a zip file",
+            ),
+        ],
+    )
+    def test_scan_archive_exception(
+        self, tmp_path: Path, file_name: str, content: bytes | None, exception_type, expected_message: str
+    ) -> None:
+        """
+        Test to ensure that archives that cannot be scanned are reported.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        :param file_name: Name of the archive.
+        :param content: Content to write to the archive, None to not create it.
+        :param exception_type: The expected exception type.
+        :param expected_message: The expected message from the thrown exception.
+        """
+        path = tmp_path / file_name
+        if content is not None:
+            path.write_bytes(content)
+
+        with pytest.raises(exception_type) as exc_info:
+            list(scan_archive(archive_path=str(path)))
+
+        assert exc_info.value.args[0] == expected_message.format(path=path)
+
+    @pytest.mark.parametrize(
+        "max_depth,max_bytes,expected_message",
+        [
+            (2, 1_000_000, "The archive export.zip!1.zip!2.zip!3.zip exceeds the maximum nesting depth of 2."),
+            (10, 1_000_000, ""),
+            (10, 2000, "The archive export.zip!1.zip!2.zip!3.zip exceeds the maximum uncompressed size of 2000 bytes."),
+        ],
+    )
+    def test_scan_archive_limits(self, tmp_path: Path, max_depth: int, max_bytes: int, expected_message: str) -> None:
+        """
+        Test to ensure that archives nested too deeply or holding too much uncompressed content are reported.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        :param max_depth: The deepest an archive may be nested.
+        :param max_bytes: The most uncompressed bytes the scan may read.
+        :param expected_message: The expected message from the thrown exception, empty if none is thrown.
+        """
+        content = _zip({"Deep/Process.ini": b"[transitions]\n" * 20, "Deep/Prompts.ini": b"[conditions]\n"})
+        for depth in range(3, 0, -1):
+            content = _zip({f"{depth}.zip": content})
+        path = tmp_path / "export.zip"
+        path.write_bytes(content)
+
+        if not expected_message:
+            assert [pair.name for pair, _, _, _ in scan_archive(archive_path=str(path), max_depth=max_depth)] == [
+                "export.zip!1.zip!2.zip!3.zip!Deep"
+            ]
+            return
+        with pytest.raises(ValueError) as exc_info:
+            list(scan_archive(archive_path=str(path), max_depth=max_depth, max_bytes=max_bytes))
+
+        assert exc_info.value.args[0] == expected_message
+
+    @pytest.mark.parametrize(
+        "max_file_bytes,max_zip_bytes,expected",
+        [
+            (1000, 1_000_000, [("export.zip!Nested.zip!Deep", "")]),
+            (
+                20,
+                1_000_000,
+                [
+                    (
+                        "export.zip!Nested.zip!Deep/Process.ini",
+                        "The archive member export.zip!Nested.zip!Deep/Process.ini exceeds the maximum size of 20 "
+                        "bytes.",
+                    ),
+                    ("export.zip!Nested.zip!Deep", ""),
+                ],
+            ),
+            (
+                1000,
+                100,
+                [
+                    (
+                        "export.zip!Nested.zip",
+                        "The archive member export.zip!Nested.zip exceeds the maximum size of 100 bytes.",
+                    )
+                ],
+            ),
+        ],
+    )
+    def test_scan_archive_member_limits(
+        self, tmp_path: Path, max_file_bytes: int, max_zip_bytes: int, expected: list[tuple[str, str]]
+    ) -> None:
+        """
+        Test to ensure that members larger than their cap are reported as a pair with an error rather than read.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        :param max_file_bytes: The most bytes a plugin file may hold.
+        :param max_zip_bytes: The most bytes a nested zip may hold.
+        :param expected: The expected name and error of each pair.
+        """
+        content = _zip({"Deep/Process.ini": b"[transitions]\n" * 20, "Deep/Prompts.ini": b"[conditions]\n"})
+        path = tmp_path / "export.zip"
+        path.write_bytes(_zip({"Nested.zip": content}))
+
+        pairs = scan_archive(archive_path=str(path), max_file_bytes=max_file_bytes, max_zip_bytes=max_zip_bytes)
+
+        assert [(pair.name, error) for pair, _, _, error in pairs] == expected
+
+    def test_batch_validator_with_oversized_member(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test to ensure that a member too large to read is reported as an error for its pair without ending the batch.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        :param monkeypatch: Pytest monkeypatch fixture.
+        """
+        monkeypatch.setattr(batch_validator_module, "scan_archive", partial(scan_archive, max_file_bytes=20))
+        path = tmp_path / "export.zip"
+        path.write_bytes(_zip({"Deep/Process.ini": b"[transitions]\n" * 20, "Deep/Prompts.ini": b"[conditions]\n"}))
+
+        results = {
+            result.pair.name: result
+            for result in BatchValidator.with_archive(archive_path=str(path), backend=Backend.thread).run()
+        }
+
+        assert results["export.zip!Deep/Process.ini"].error == (
+            "The archive member export.zip!Deep/Process.ini exceeds the maximum size of 20 bytes."
+        )
+        assert "export.zip!Deep" in results
+
+    @pytest.mark.parametrize(
+        "path,expected",
+        [
+            ("export.zip", True),
+            ("export.TAR.GZ", True),
+            ("export.tgz", True),
+            ("export.tar.xz", True),
+            ("UnixProcess.ini", False),
+        ],
+    )
+    def test_is_archive(self, path: str, expected: bool) -> None:
+        """
+        Test to ensure that supported archives are recognised by name.
+
+        :param path: The path to check.
+        :param expected: The expected result.
+        """
+        assert is_archive(path=path) == expected
@@ -0,0 +1,147 @@
+"""Tests for the asynchronous validation entry points."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tpc_plugin_validator import async_validator
+from tpc_plugin_validator.async_validator import avalidate_file, avalidate_many
+from tpc_plugin_validator.batch.plugin_pair import PluginPair
+from tpc_plugin_validator.batch.worker import WorkerResult, validate_pair
+from tpc_plugin_validator.validator import Validator
+
+
+class TestAsyncValidator(object):
+    """Tests for the asynchronous validation entry points."""
+
+    @pytest.mark.parametrize(
+        "process_file,prompts_file",
+        [
+            ("tests/data/valid-process.ini", "tests/data/valid-prompts.ini"),
+            ("tests/data/transitions-invalid-process.ini", "tests/data/transitions-invalid-prompts.ini"),
+        ],
+    )
+    def test_avalidate_file(self, process_file: str, prompts_file: str) -> None:
+        """
+        Test to ensure that validating asynchronously matches validating synchronously.
+
+        :param process_file: Path to the process file to test.
+        :param prompts_file: Path to the prompts file to test.
+        """
+        validator = Validator.with_file(process_file_path=process_file, prompts_file_path=prompts_file)
+        validator.validate()
+
+        assert asyncio.run(avalidate_file(process_file, prompts_file)) == validator.violations
+
+    def test_avalidate_file_missing(self) -> None:
+        """Test to ensure that errors reading the files are raised to the caller."""
+        with pytest.raises(FileNotFoundError) as exc_info:
+            asyncio.run(avalidate_file("tests/data/doesnt_exist/process.ini", "tests/data/valid-prompts.ini"))
+
+        assert exc_info.value.args[0] == "The process file was not found: tests/data/doesnt_exist/process.ini"
+
+    def test_avalidate_many_completion_order(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test to ensure that a slow plugin does not hold back the results of the others.
+
+        :param monkeypatch: Pytest monkeypatch fixture.
+        """
+        release_slow = threading.Event()
+
+        def fake_validate_pair(process_file_path: str, prompts_file_path: str) -> WorkerResult:
+            if process_file_path == "slow":
+                release_slow.wait(timeout=5)
+                return (), ""
+            return validate_pair(process_file_path=process_file_path, prompts_file_path=prompts_file_path)
+
+        monkeypatch.setattr(async_validator, "validate_pair", fake_validate_pair)
+        pairs = [
+            PluginPair(name="slow", process_file="slow"),
+            PluginPair(
+                name="valid",
+                process_file="tests/data/valid-process.ini",
+                prompts_file="tests/data/valid-prompts.ini",
+            ),
+            PluginPair(name="missing", process_file="tests/data/doesnt_exist/process.ini"),
+        ]
+
+        async def collect() -> list[str]:
+            names: list[str] = []
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                async for result in avalidate_many(pairs=pairs, executor=executor, concurrency=3):
+                    names.append(result.pair.name)
+                    if len(names) == 2:
+                        release_slow.set()
+            return names
+
+        names = asyncio.run(collect())
+
+        assert names[-1] == "slow"
+        assert sorted(names) == ["missing", "slow", "valid"]
+
+    def test_avalidate_many_bounded(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test to ensure that no more than the requested number of validations are in flight.
+
+        :param monkeypatch: Pytest monkeypatch fixture.
+        """
+        lock = threading.Lock()
+        in_flight: list[int] = [0, 0]
+
+        def fake_validate_pair(process_file_path: str, prompts_file_path: str) -> WorkerResult:
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            threading.Event().wait(timeout=0.01)
+            with lock:
+                in_flight[0] -= 1
+            return (), ""
+
+        monkeypatch.setattr(async_validator, "validate_pair", fake_validate_pair)
+        pairs = (PluginPair(name=str(index), process_file=str(index)) for index in range(20))
+
+        async def collect() -> int:
+            with ThreadPoolExecutor(max_workers=10) as executor:
+                return len([result async for result in avalidate_many(pairs=pairs, executor=executor, concurrency=2)])
+
+        assert asyncio.run(collect()) == 20
+        assert in_flight[1] == 2
+
+    def test_avalidate_many_cancel(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test to ensure that closing the iterator cancels validations that have not started.
+
+        :param monkeypatch: Pytest monkeypatch fixture.
+        """
+        started: list[str] = []
+
+        def fake_validate_pair(process_file_path: str, prompts_file_path: str) -> WorkerResult:
+            started.append(process_file_path)
+            return (), ""
+
+        monkeypatch.setattr(async_validator, "validate_pair", fake_validate_pair)
+        pairs = [PluginPair(name=str(index), process_file=str(index)) for index in range(10)]
+
+        async def first_only() -> str:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                results = avalidate_many(pairs=pairs, executor=executor, concurrency=2)
+                first = await anext(results)
+                await results.aclose()
+                return first.pair.name
+
+        assert asyncio.run(first_only()) in ("0", "1")
+        assert len(started) <= 3
+
+    def test_avalidate_many_invalid_concurrency(self) -> None:
+        """Test to ensure that an invalid concurrency is rejected."""
+
+        async def collect() -> None:
+            async for _ in avalidate_many(pairs=[], concurrency=0):
+                pass
+
+        with pytest.raises(ValueError) as exc_info:
+            asyncio.run(collect())
+
+        assert exc_info.value.args[0] == "The concurrency must be at least 1, 0 was given."
@@ -0,0 +1,207 @@
+"""Tests for the batch validator."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from tests.conftest import BrokenExecutor, CorpusBuilder
+from tpc_plugin_validator.batch import batch_validator as batch_validator_module
+from tpc_plugin_validator.batch import worker
+from tpc_plugin_validator.batch.backends import Backend, available_backends, create_executor
+from tpc_plugin_validator.batch.batch_validator import BatchValidator
+from tpc_plugin_validator.batch.plugin_pair import PluginPair, discover_pairs
+from tpc_plugin_validator.validator import Validator
+
+
+@pytest.fixture
+def corpus(build_corpus: CorpusBuilder) -> Path:
+    """
+    Create a small corpus of plugins on disk.
+
+    :param build_corpus: Function creating plugins within a corpus on disk.
+
+    :return: Path to the root of the corpus.
+    """
+    build_corpus(names=["windows"])
+    root = build_corpus(
+        names=["unix"],
+        process_file="tests/data/valid-process.ini",
+        prompts_file="tests/data/valid-prompts.ini",
+        file_prefix="Unix",
+    )
+    shutil.copy("tests/data/valid-process-alt.ini", root / "OrphanProcess.ini")
+    return root
+
+
+class TestBatchValidator(object):
+    """Tests for the batch validator."""
+
+    def test_discover_pairs(self, corpus: Path) -> None:
+        """
+        Test to ensure that process and prompts files are paired correctly.
+
+        :param corpus: Path to the root of the corpus.
+        """
+        assert discover_pairs(root=str(corpus)) == [
+            PluginPair(name="Orphan", process_file=str(corpus / "OrphanProcess.ini")),
+            PluginPair(
+                name="unix/Unix",
+                process_file=str(corpus / "unix" / "UnixProcess.ini"),
+                prompts_file=str(corpus / "unix" / "UnixPrompts.ini"),
+            ),
+            PluginPair(
+                name="windows",
+                process_file=str(corpus / "windows" / "process.ini"),
+                prompts_file=str(corpus / "windows" / "prompts.ini"),
+            ),
+        ]
+
+    def test_discover_pairs_missing_directory(self) -> None:
+        """Test to ensure that a missing directory is reported."""
+        with pytest.raises(FileNotFoundError) as exc_info:
+            discover_pairs(root="tests/data/doesnt_exist")
+
+        assert exc_info.value.args[0] == "The directory was not found: tests/data/doesnt_exist"
+
+    @pytest.mark.parametrize("backend", available_backends())
+    def test_batch_validator(self, corpus: Path, backend: Backend) -> None:
+        """
+        Test to ensure that each backend produces the same results as validating each pair alone.
+
+        :param corpus: Path to the root of the corpus.
+        :param backend: The backend to test.
+        """
+        batch_validator = BatchValidator.with_directory(root=str(corpus), backend=backend, max_workers=2)
+        results = {result.pair.name: result for result in batch_validator.run()}
+
+        assert sorted(results) == [pair.name for pair in batch_validator.pairs]
+        for pair in batch_validator.pairs:
+            validator = Validator.with_file(process_file_path=pair.process_file, prompts_file_path=pair.prompts_file)
+            validator.validate()
+            assert results[pair.name].violations == validator.violations
+            assert results[pair.name].error == ""
+
+        assert results["unix/Unix"].passed
+        assert not results["windows"].passed
+
+    @pytest.mark.parametrize("deduplicate", [False, True])
+    def test_batch_validator_config(self, corpus: Path, deduplicate: bool) -> None:
+        """
+        Test to ensure that the rule set configuration reaches the workers.
+
+        :param corpus: Path to the root of the corpus.
+        :param deduplicate: Whether to validate duplicate pairs once.
+        """
+        batch_validator = BatchValidator.with_directory(
+            root=str(corpus),
+            backend=Backend.process,
+            max_workers=2,
+            deduplicate=deduplicate,
+            config={"transitions": {"runtime_budget": 30}},
+        )
+        results = {result.pair.name: result for result in batch_validator.run()}
+
+        assert [
+            violation.rule for violation in results["windows"].violations if violation.rule == "RuntimeBudgetViolation"
+        ] == ["RuntimeBudgetViolation"]
+
+    def test_batch_validator_error(self, tmp_path: Path) -> None:
+        """
+        Test to ensure that a pair that cannot be read is reported as an error rather than stopping the batch.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        (tmp_path / "process.ini").write_bytes(b"[states]\n\xc3\x28\n")
+        batch_validator = BatchValidator.with_directory(root=str(tmp_path), backend=Backend.thread)
+        results = list(batch_validator.run())
+
+        assert len(results) == 1
+        assert results[0].error.startswith("UnicodeDecodeError:")
+        assert not results[0].passed
+
+    def test_batch_validator_unexpected_error(self, corpus: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test to ensure that an unexpected error from a rule set is reported for its pair rather than ending the batch.
+
+        :param corpus: Path to the root of the corpus.
+        :param monkeypatch: Pytest monkeypatch fixture.
+        """
+
+        def validate(self: Validator) -> None:
+            raise RecursionError("maximum recursion depth exceeded")
+
+        monkeypatch.setattr(Validator, "validate", validate)
+        batch_validator = BatchValidator.with_directory(root=str(corpus), backend=Backend.thread, schedule=True)
+        results = list(batch_validator.run())
+
+        assert sorted(result.pair.name for result in results) == ["Orphan", "unix/Unix", "windows"]
+        assert {result.error for result in results} == {"RecursionError: maximum recursion depth exceeded"}
+
+    def test_batch_validator_broken_executor(self, corpus: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test to ensure that every pair is reported with an error when the workers die.
+
+        :param corpus: Path to the root of the corpus.
+        :param monkeypatch: Pytest monkeypatch fixture.
+        """
+        monkeypatch.setattr(batch_validator_module, "create_executor", lambda **_: BrokenExecutor())
+        results = list(BatchValidator.with_directory(root=str(corpus), backend=Backend.thread).run())
+
+        assert sorted(result.pair.name for result in results) == ["Orphan", "unix/Unix", "windows"]
+        assert all(result.error.startswith("BrokenProcessPool:") for result in results)
+
+    def test_interpreter_backend_unavailable(self) -> None:
+        """Test to ensure that requesting the interpreter backend on an older Python is reported."""
+        if Backend.interpreter in available_backends():
+            pytest.skip("The interpreter backend is available with this Python.")
+
+        with pytest.raises(ValueError) as exc_info:
+            create_executor(backend=Backend.interpreter)
+
+        assert exc_info.value.args[0] == "The interpreter backend requires Python 3.14 or later."
+
+    def test_parse_cache(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test to ensure that a prompts file shared by several plugins is parsed once per worker.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        :param monkeypatch: Pytest monkeypatch fixture.
+        """
+        parsed: list[str] = []
+
+        class CountingParser(worker.Parser):
+            def __init__(self, file_contents: str) -> None:
+                parsed.append(file_contents)
+                super().__init__(file_contents=file_contents)
+
+        monkeypatch.setattr(worker, "Parser", CountingParser)
+        monkeypatch.setattr(worker, "_parse_cache", worker.OrderedDict())
+        process = Path("tests/data/valid-process.ini").read_text(encoding="utf-8")
+        for index in range(3):
+            (tmp_path / f"Plugin{index}Process.ini").write_text(f"{process}\n# Copy {index}", encoding="utf-8")
+            shutil.copy("tests/data/valid-prompts.ini", tmp_path / f"Plugin{index}Prompts.ini")
+
+        batch_validator = BatchValidator.with_directory(root=str(tmp_path), backend=Backend.thread, max_workers=1)
+        results = list(batch_validator.run())
+
+        assert len(results) == 3
+        assert all(result.passed for result in results)
+        assert len(parsed) == 4
+
+    def test_parse_cache_eviction(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test to ensure that the parse cache is bounded.
+
+        :param monkeypatch: Pytest monkeypatch fixture.
+        """
+        monkeypatch.setattr(worker, "_parse_cache", worker.OrderedDict())
+        monkeypatch.setattr(worker, "PARSE_CACHE_SIZE", 2)
+        first = worker.parse_cached(content=b"[states]\nInit")
+        worker.parse_cached(content=b"[states]\nWait")
+        assert worker.parse_cached(content=b"[states]\nInit") is first
+        worker.parse_cached(content=b"[states]\nEND")
+
+        assert len(worker._parse_cache) == 2
+        assert worker.parse_cached(content=b"[states]\nInit") is first
+        assert worker.parse_cached(content=b"") == {}
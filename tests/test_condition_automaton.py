@@ -0,0 +1,86 @@
+"""Tests for the automata built from condition patterns."""
+
+import time
+
+import pytest
+
+from tpc_plugin_validator.utilities import condition_automaton
+from tpc_plugin_validator.utilities.condition_automaton import build_automaton, subsumes
+
+
+class TestConditionAutomaton(object):
+    """Tests for the automata built from condition patterns."""
+
+    @pytest.mark.parametrize(
+        "earlier,later,expected",
+        [
+            ((".*assword",), "New password", True),
+            (("assword",), "New password:", True),
+            (("Password",), "Pass", False),
+            (("Wait",), "Waiting", True),
+            (("Waiting",), "Wait", False),
+            (("^Login",), "Login:", False),
+            (("Login",), "^Login:", True),
+            (("Pass",), "Pass$", True),
+            (("a|b",), "[ab]c", True),
+            (("[0-9]+",), "x[0-9]{3}", True),
+            (("yes", "no"), "(yes|no)!", True),
+            (("yes",), "(yes|no)!", False),
+            (("Hello",), "Hello <username>", True),
+            # Placeholders and anchors within a pattern cannot be modelled exactly, so they never shadow.
+            (("Hello <username>",), "Hello bob", False),
+            (("\\bfoo",), "foo", False),
+            (("(expression)true",), "anything", False),
+            (("x",), "(unclosed", False),
+            (("x",), "(" * 1200 + "x" + ")" * 1200, False),
+            # A range naming every character of the private use area still leaves a character named by no pattern.
+            (("[\u0001-\uffff]a",), "ba", True),
+            (("[\u0001-\uffff]a",), "a", False),
+        ],
+    )
+    def test_subsumes(self, earlier: tuple[str, ...], later: str, expected: bool) -> None:
+        """
+        Test to ensure that a pattern is only shadowed when the earlier patterns match everything it matches.
+
+        :param earlier: The earlier patterns.
+        :param later: The later pattern.
+        :param expected: Whether the later pattern is shadowed.
+        """
+        assert subsumes(earlier=earlier, later=later) is expected
+
+    def test_build_automaton_cached(self) -> None:
+        """Test to ensure that the automaton for a pattern is built once."""
+        build_automaton.cache_clear()
+        first = build_automaton(pattern="Password: ?")
+
+        assert build_automaton(pattern="Password: ?") is first
+        assert build_automaton.cache_info().misses == 1
+
+    def test_large_bound(self) -> None:
+        """Test to ensure that a large bound is treated as unbounded rather than copied."""
+        automaton = build_automaton(pattern="a{1,10000}")
+
+        assert automaton is not None
+        assert not automaton.exact
+        assert len(automaton.edges) < 10
+
+    def test_character_classes(self) -> None:
+        """Test to ensure that wide ranges are searched a class of characters at a time rather than by character."""
+        start = time.perf_counter()
+
+        assert subsumes(earlier=("[ -~]*a[ -~]{10}",), later="[ -~]*a[ -~]{12}")
+        assert time.perf_counter() - start < 2
+
+    def test_search_limit(self, monkeypatch) -> None:
+        """
+        Test to ensure that a search too large to finish gives up, answering False, and remembers a bounded number of
+        steps.
+
+        :param monkeypatch: Pytest fixture to patch the limits.
+        """
+        monkeypatch.setattr(condition_automaton, "MAX_SEARCH_STATES", 100)
+        monkeypatch.setattr(condition_automaton, "MAX_CACHED_STEPS", 50)
+        subsumes.cache_clear()
+
+        assert not subsumes(earlier=("[xy]*x[xy]{8}",), later="[xy]*x[xy]{9}")
+        assert len(build_automaton(pattern="[xy]*x[xy]{9}")._steps) <= 50
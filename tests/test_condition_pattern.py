@@ -0,0 +1,86 @@
+"""Tests for the parsing and cost analysis of condition patterns."""
+
+import pytest
+
+from tpc_plugin_validator.utilities.condition_pattern import (
+    MAX_NESTING_DEPTH,
+    PatternCost,
+    Repeat,
+    Sequence,
+    analyse_pattern,
+    parse_pattern,
+)
+
+
+class TestConditionPattern(object):
+    """Tests for the parsing and cost analysis of condition patterns."""
+
+    @pytest.mark.parametrize(
+        "pattern,expected_cost",
+        [
+            ("Hello <username>", PatternCost(anchored=False)),
+            ("(a+)+b", PatternCost(nested_quantifier="(a+)+", anchored=False)),
+            ("(?:x*y)*", PatternCost(nested_quantifier="(?:x*y)*", anchored=False)),
+            ("(a|ab)*c", PatternCost(overlapping_alternation="(a|ab)*", anchored=False)),
+            ("(ab|ac)*", PatternCost(overlapping_alternation="(ab|ac)*", anchored=False)),
+            ("([[:alpha:]]|[0-9])+", PatternCost(anchored=False)),
+            ("(a|b)*", PatternCost(anchored=False)),
+            ("(x{2})+", PatternCost(anchored=False)),
+            (".*a.*b", PatternCost(wildcards=1, anchored=False)),
+            (".*assword.*", PatternCost(anchored=False)),
+            ("^.*a|.*b.*c", PatternCost(wildcards=1, anchored=False)),
+            ("^[^:]*:.*$", PatternCost(wildcards=1, anchored=True)),
+            ("SELECT * FROM", PatternCost(anchored=False)),
+            ("Password: ?$", PatternCost(anchored=False)),
+            ("(expression)true", None),
+            ("(unclosed", None),
+            ("[unclosed", None),
+            ("*start", None),
+            ("(" * 1200 + "a" + ")" * 1200, None),
+            ("a" + "*" * 1200, None),
+        ],
+    )
+    def test_analyse_pattern(self, pattern: str, expected_cost: PatternCost | None) -> None:
+        """
+        Test to ensure that the features of a pattern that make it costly to match are found.
+
+        :param pattern: The pattern to analyse.
+        :param expected_cost: The expected analysis.
+        """
+        assert analyse_pattern(pattern=pattern) == expected_cost
+
+    def test_degree(self) -> None:
+        """Test to ensure that the degree counts the start positions of an unanchored search."""
+        assert PatternCost(wildcards=3, anchored=False).degree == 4
+        assert PatternCost(wildcards=0, anchored=True).degree == 1
+        assert PatternCost(nested_quantifier="(a+)+").exponential
+        assert not PatternCost(overlapping_alternation="(ab|ac)*").exponential
+
+    def test_parse_pattern(self) -> None:
+        """Test to ensure that quantifiers, including bounded and lazy forms, are parsed."""
+        node = parse_pattern(pattern=r"a{2,}b{3}c*?\d{1,4}")
+
+        assert isinstance(node, Sequence)
+        assert [(item.minimum, item.maximum) for item in node.items if isinstance(item, Repeat)] == [
+            (2, None),
+            (3, 3),
+            (0, None),
+            (1, 4),
+        ]
+
+    def test_nesting_depth(self) -> None:
+        """Test to ensure that groups and quantifiers nested too deep are rejected rather than recursed into."""
+        assert parse_pattern(pattern="(" * MAX_NESTING_DEPTH + "a" + ")" * MAX_NESTING_DEPTH).text == "a"
+        with pytest.raises(ValueError) as exc_info:
+            parse_pattern(pattern="(" * (MAX_NESTING_DEPTH + 1) + "a" + ")" * (MAX_NESTING_DEPTH + 1))
+
+        assert exc_info.value.args[0] == f"The pattern is nested more than {MAX_NESTING_DEPTH} deep at position 100."
+
+    def test_cached(self) -> None:
+        """Test to ensure that a pattern is analysed once however many conditions share it."""
+        analyse_pattern.cache_clear()
+        for _ in range(3):
+            analyse_pattern(pattern="Shared (a|b)+ pattern")
+
+        assert analyse_pattern.cache_info().hits == 2
+        assert analyse_pattern.cache_info().misses == 1
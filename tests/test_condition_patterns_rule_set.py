@@ -0,0 +1,138 @@
+"""Tests for the condition patterns rule set."""
+
+from pathlib import Path
+
+import pytest
+
+from tpc_plugin_validator.utilities.severity import Severity
+from tpc_plugin_validator.utilities.validation_result import ValidationResult
+from tpc_plugin_validator.validator import Validator
+
+
+class TestConditionPatternsRuleSet(object):
+    """Tests for the condition patterns rule set."""
+
+    @pytest.mark.parametrize(
+        "prompts_file,config,expected_violations",
+        [
+            (
+                "tests/data/condition-patterns-invalid-prompts.ini",
+                {},
+                [
+                    # Test nested quantifiers are caught.
+                    ValidationResult(
+                        rule="PatternCostViolation",
+                        severity=Severity.WARNING,
+                        message='The condition "Nested" has nested quantifiers in "(a+)+", matching can take time '
+                        "exponential in the length of the output.",
+                        file="prompts.ini",
+                        section="conditions",
+                        line=8,
+                    ),
+                    # Test repeated alternatives matching the same text are caught.
+                    ValidationResult(
+                        rule="PatternCostViolation",
+                        severity=Severity.WARNING,
+                        message='The condition "Overlapping" repeats alternatives that can start with the same character '
+                        'in "(\\w|\\d)+", matching may backtrack over the output.',
+                        file="prompts.ini",
+                        section="conditions",
+                        line=9,
+                    ),
+                    # Test a chain of wildcards is caught, a leading and trailing wildcard are not counted.
+                    ValidationResult(
+                        rule="PatternCostViolation",
+                        severity=Severity.WARNING,
+                        message='The condition "Wildcards" has 2 ".*" wildcards that can backtrack, each match can take '
+                        "time proportional to the length of the output to the power of 3.",
+                        file="prompts.ini",
+                        section="conditions",
+                        line=10,
+                    ),
+                ],
+            ),
+            (
+                "tests/data/condition-patterns-invalid-prompts.ini",
+                {"condition_patterns": {"max_degree": 1}},
+                [
+                    ValidationResult(
+                        rule="PatternCostViolation",
+                        severity=Severity.WARNING,
+                        message='The condition "Nested" has nested quantifiers in "(a+)+", matching can take time '
+                        "exponential in the length of the output.",
+                        file="prompts.ini",
+                        section="conditions",
+                        line=8,
+                    ),
+                    ValidationResult(
+                        rule="PatternCostViolation",
+                        severity=Severity.WARNING,
+                        message='The condition "Overlapping" repeats alternatives that can start with the same character '
+                        'in "(\\w|\\d)+", matching may backtrack over the output.',
+                        file="prompts.ini",
+                        section="conditions",
+                        line=9,
+                    ),
+                    ValidationResult(
+                        rule="PatternCostViolation",
+                        severity=Severity.WARNING,
+                        message='The condition "Wildcards" has 2 ".*" wildcards that can backtrack, each match can take '
+                        "time proportional to the length of the output to the power of 3.",
+                        file="prompts.ini",
+                        section="conditions",
+                        line=10,
+                    ),
+                    # Test the highest power allowed can be lowered.
+                    ValidationResult(
+                        rule="PatternCostViolation",
+                        severity=Severity.WARNING,
+                        message='The condition "Anchored" has 2 ".*" wildcards that can backtrack, each match can take '
+                        "time proportional to the length of the output to the power of 2.",
+                        file="prompts.ini",
+                        section="conditions",
+                        line=11,
+                    ),
+                ],
+            ),
+            (
+                "tests/data/valid-prompts.ini",
+                {},
+                [],
+            ),
+        ],
+    )
+    def test_condition_patterns_rule_set(
+        self,
+        prompts_file: str,
+        config: dict,
+        expected_violations: list[ValidationResult],
+    ) -> None:
+        """
+        Tests for the condition patterns rule set.
+
+        :param prompts_file: Path to the prompts file to use for the test case.
+        :param config: Configuration for the rule sets.
+        :param expected_violations: List of expected ValidationResult
+        """
+        validate: Validator = Validator.with_file(prompts_file_path=prompts_file).configure(config=config)
+        validate.validate()
+        results: list[ValidationResult] = validate.violations
+
+        assert len(results) == len(expected_violations)
+
+        for result in results:
+            assert result in expected_violations
+
+    def test_deeply_nested_pattern(self) -> None:
+        """Test to ensure that a pattern nested too deep to parse is skipped rather than stopping validation."""
+        prompts: bytes = (
+            Path("tests/data/valid-prompts.ini")
+            .read_bytes()
+            .replace(b"Waiting=Waiting", b"Waiting=" + b"(" * 1200 + b"Waiting" + b")" * 1200)
+        )
+        validate: Validator = Validator.from_bytes(
+            process_file_content=Path("tests/data/valid-process.ini").read_bytes(), prompts_file_content=prompts
+        )
+        validate.validate()
+
+        assert not [result for result in validate.violations if result.rule == "PatternCostViolation"]
@@ -0,0 +1,160 @@
+"""Tests for finding duplicate plugin pairs."""
+
+import shutil
+from pathlib import Path
+
+from tpc_plugin_validator.batch.backends import Backend
+from tpc_plugin_validator.batch.batch_validator import BatchValidator
+from tpc_plugin_validator.batch.fingerprint import (
+    fingerprint_content,
+    fingerprint_pair_content,
+    remap_violations,
+)
+from tpc_plugin_validator.batch.limits import ResourceLimits
+from tpc_plugin_validator.validator import Validator
+
+
+class TestFingerprint(object):
+    """Tests for finding duplicate plugin pairs."""
+
+    def test_fingerprint_content(self) -> None:
+        """Test to ensure that comments, blank lines, trailing whitespace and line endings are ignored."""
+        digest, line_numbers = fingerprint_content(content="[states]\nBegin\nEND\n")
+        other_digest, other_line_numbers = fingerprint_content(
+            content="# Comment.\r\n[states]  \r\n\r\n; Alternative comment.\r\nBegin\t\r\nEND\r\n"
+        )
+
+        assert digest == other_digest
+        assert line_numbers == (1, 2, 3)
+        assert other_line_numbers == (2, 5, 6)
+        assert fingerprint_content(content="[states]\nBegin\nEnd\n")[0] != digest
+
+    def test_fingerprint_pair_missing_file(self) -> None:
+        """Test to ensure that a process only pair never matches a prompts only pair with the same content."""
+        content = Path("tests/data/valid-process.ini").read_bytes()
+        process_only = fingerprint_pair_content(process_file_content=content, prompts_file_content=b"")
+        prompts_only = fingerprint_pair_content(process_file_content=b"", prompts_file_content=content)
+
+        assert process_only is not None
+        assert prompts_only is not None
+        assert process_only.key != prompts_only.key
+        assert fingerprint_pair_content(process_file_content=b"\xc3\x28", prompts_file_content=b"") is None
+
+    def test_fingerprint_pair_exact(self) -> None:
+        """Test to ensure that an exact fingerprint only matches identical content."""
+        content = Path("tests/data/valid-process.ini").read_bytes()
+        commented = b"# Copy.\n" + content
+
+        loose = fingerprint_pair_content(process_file_content=content, prompts_file_content=b"")
+        loose_commented = fingerprint_pair_content(process_file_content=commented, prompts_file_content=b"")
+        exact = fingerprint_pair_content(process_file_content=content, prompts_file_content=b"", exact=True)
+        exact_commented = fingerprint_pair_content(process_file_content=commented, prompts_file_content=b"", exact=True)
+        exact_copy = fingerprint_pair_content(process_file_content=content, prompts_file_content=b"", exact=True)
+
+        assert loose is not None and loose_commented is not None
+        assert exact is not None and exact_commented is not None and exact_copy is not None
+        assert loose.key == loose_commented.key
+        assert exact.key != exact_commented.key
+        assert exact.key == exact_copy.key
+
+    def test_remap_violations(self, tmp_path: Path) -> None:
+        """
+        Test to ensure that violations are moved onto the lines of a duplicate whose comments have moved.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        process_path = "tests/data/transitions-invalid-process.ini"
+        prompts_path = "tests/data/transitions-invalid-prompts.ini"
+        with open(process_path, encoding="utf-8") as file:
+            (tmp_path / "process.ini").write_text("# Moved.\n\n" + file.read().replace("# Comment.\n", ""))
+
+        prompts_content = Path(prompts_path).read_bytes()
+        source = fingerprint_pair_content(
+            process_file_content=Path(process_path).read_bytes(), prompts_file_content=prompts_content
+        )
+        target = fingerprint_pair_content(
+            process_file_content=(tmp_path / "process.ini").read_bytes(), prompts_file_content=prompts_content
+        )
+        assert source is not None
+        assert target is not None
+        assert source.key == target.key
+
+        validator = Validator.with_file(process_file_path=process_path, prompts_file_path=prompts_path)
+        validator.validate()
+        expected = Validator.with_file(process_file_path=str(tmp_path / "process.ini"), prompts_file_path=prompts_path)
+        expected.validate()
+
+        assert remap_violations(violations=validator.violations, source=source, target=target) == expected.violations
+
+    def test_batch_deduplicate(self, tmp_path: Path) -> None:
+        """
+        Test to ensure that duplicates are validated once with the results shared between them.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        for name in ("first", "second", "third"):
+            (tmp_path / name).mkdir()
+            shutil.copy("tests/data/transitions-invalid-prompts.ini", tmp_path / name / "prompts.ini")
+        shutil.copy("tests/data/transitions-invalid-process.ini", tmp_path / "first" / "process.ini")
+        with open("tests/data/transitions-invalid-process.ini", encoding="utf-8") as file:
+            content = file.read()
+        (tmp_path / "second" / "process.ini").write_bytes(("# Copy.\n" + content).replace("\n", "\r\n").encode())
+        (tmp_path / "third" / "process.ini").write_text(content.replace("Begin", "Start"))
+
+        batch_validator = BatchValidator.with_directory(root=str(tmp_path), backend=Backend.thread, deduplicate=True)
+        results = {result.pair.name: result for result in batch_validator.run()}
+
+        assert sorted(results) == ["first", "second", "third"]
+        assert [[pair.name for pair in group] for group in batch_validator.duplicate_groups] == [["first", "second"]]
+        for pair in batch_validator.pairs:
+            validator = Validator.with_file(process_file_path=pair.process_file, prompts_file_path=pair.prompts_file)
+            validator.validate()
+            assert results[pair.name].violations == validator.violations
+
+    def test_batch_deduplicate_closed_cycle(self, tmp_path: Path) -> None:
+        """
+        Test to ensure that the message of a closed cycle still holds for a duplicate whose lines have moved.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        for name in ("first", "second"):
+            (tmp_path / name).mkdir()
+            shutil.copy("tests/data/valid-prompts.ini", tmp_path / name / "prompts.ini")
+        shutil.copy("tests/data/transitions-graph-invalid-process.ini", tmp_path / "first" / "process.ini")
+        with open("tests/data/transitions-graph-invalid-process.ini", encoding="utf-8") as file:
+            (tmp_path / "second" / "process.ini").write_text("# Moved.\n\n" + file.read())
+
+        batch_validator = BatchValidator.with_directory(root=str(tmp_path), backend=Backend.thread, deduplicate=True)
+        results = {result.pair.name: result for result in batch_validator.run()}
+
+        assert [[pair.name for pair in group] for group in batch_validator.duplicate_groups] == [["first", "second"]]
+        for pair in batch_validator.pairs:
+            validator = Validator.with_file(process_file_path=pair.process_file, prompts_file_path=pair.prompts_file)
+            validator.validate()
+            assert "ClosedCycleViolation" in [violation.rule for violation in validator.violations]
+            assert results[pair.name].violations == validator.violations
+
+    def test_batch_deduplicate_limits(self, tmp_path: Path) -> None:
+        """
+        Test to ensure that only identical pairs are shared when a limit counting comments is enforced.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        with open("tests/data/valid-process.ini", encoding="utf-8") as file:
+            content = file.read()
+        for name in ("first", "second", "third"):
+            (tmp_path / name).mkdir()
+            shutil.copy("tests/data/valid-prompts.ini", tmp_path / name / "prompts.ini")
+            (tmp_path / name / "process.ini").write_text(content)
+        commented = content.replace("[transitions]\n", "[transitions]\n" + "# Copy.\n" * 50)
+        (tmp_path / "third" / "process.ini").write_text(commented)
+
+        batch_validator = BatchValidator.with_directory(
+            root=str(tmp_path), backend=Backend.thread, deduplicate=True, limits=ResourceLimits(max_section_tokens=30)
+        )
+        results = {result.pair.name: result for result in batch_validator.run()}
+
+        assert [[pair.name for pair in group] for group in batch_validator.duplicate_groups] == [["first", "second"]]
+        assert results["first"].passed
+        assert results["second"].passed
+        assert [violation.rule for violation in results["third"].violations] == ["ResourceLimitViolation"]
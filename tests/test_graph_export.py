@@ -0,0 +1,147 @@
+"""Tests for exporting the state machine as a graph."""
+
+import io
+import json
+import time
+import xml.etree.ElementTree as ElementTree
+
+import pytest
+from tpc_plugin_parser.lexer.tokens.transition import Transition
+
+from tpc_plugin_validator.utilities.graph_export import GraphFormat, write_graph
+from tpc_plugin_validator.utilities.state_graph import StateGraph
+from tpc_plugin_validator.validator import Validator
+
+GRAPHML_NAMESPACE: str = "{http://graphml.graphdrawing.org/xmlns}"
+
+
+@pytest.fixture
+def validator() -> Validator:
+    """
+    Create a validator that has validated a plugin with problems in its state machine.
+
+    :return: Validator
+    """
+    validator = Validator.with_file(
+        process_file_path="tests/data/transitions-graph-invalid-process.ini",
+        prompts_file_path="tests/data/valid-prompts.ini",
+    )
+    validator.validate()
+    return validator
+
+
+def _export(validator: Validator, graph_format: GraphFormat) -> str:
+    """
+    Export the state machine of a validated plugin.
+
+    :param validator: The validator that has validated the plugin.
+    :param graph_format: The format to write.
+
+    :return: The exported graph.
+    """
+    output = io.StringIO()
+    write_graph(
+        graph=StateGraph.from_process_file(process_file=validator.process_file),
+        output=output,
+        graph_format=graph_format,
+        violations=validator.violations,
+    )
+    return output.getvalue()
+
+
+class TestGraphExport(object):
+    """Tests for exporting the state machine as a graph."""
+
+    def test_json(self, validator: Validator) -> None:
+        """
+        Test to ensure that the JSON export holds every state and transition with problems highlighted.
+
+        :param validator: The validator that has validated the plugin.
+        """
+        graph = json.loads(_export(validator=validator, graph_format=GraphFormat.json))
+
+        assert graph["initial"] == "init"
+        nodes = {node["id"]: node for node in graph["nodes"]}
+        assert len(nodes) == 11
+        assert nodes["init"]["kind"] == "initial"
+        assert nodes["end"] == {"id": "end", "label": "END", "kind": "end", "problems": []}
+        assert nodes["somefailure"]["kind"] == "fail"
+        assert nodes["orphan"]["problems"] == ["unreachable", "non-terminating"]
+        assert nodes["loop"]["problems"] == ["non-terminating"]
+        assert len(graph["edges"]) == 12
+        assert graph["edges"][5] == {
+            "source": "loop",
+            "target": "loopback",
+            "label": "Waiting",
+            "line": 27,
+            "problems": ["ClosedCycleViolation"],
+        }
+        assert graph["edges"][0]["problems"] == []
+
+    def test_graphml(self, validator: Validator) -> None:
+        """
+        Test to ensure that the GraphML export is well formed and holds every state and transition.
+
+        :param validator: The validator that has validated the plugin.
+        """
+        root = ElementTree.fromstring(_export(validator=validator, graph_format=GraphFormat.graphml))
+        graph = root.find(f"{GRAPHML_NAMESPACE}graph")
+
+        assert graph is not None
+        assert len(graph.findall(f"{GRAPHML_NAMESPACE}node")) == 11
+        edges = graph.findall(f"{GRAPHML_NAMESPACE}edge")
+        assert len(edges) == 12
+        assert edges[4].attrib == {"source": "enterloop", "target": "loop"}
+        assert [data.text for data in edges[4]] == ["Hello", "26", "NonTerminatingStateViolation"]
+
+    def test_dot(self, validator: Validator) -> None:
+        """
+        Test to ensure that the DOT export labels each transition and highlights problems.
+
+        :param validator: The validator that has validated the plugin.
+        """
+        lines = _export(validator=validator, graph_format=GraphFormat.dot).splitlines()
+
+        assert lines[0] == "digraph transitions {"
+        assert lines[-1] == "}"
+        assert '\t"init" -> "wait" [label="Hello"];' in lines
+        assert (
+            '\t"loop" -> "loopback" [label="Waiting", color=red, fontcolor=red, penwidth=2, '
+            'tooltip="ClosedCycleViolation"];'
+        ) in lines
+        assert '\t"end" [label="END", shape=doublecircle];' in lines
+
+    def test_dot_escaping(self) -> None:
+        """Test to ensure that quotes in a condition are escaped in the DOT export."""
+        output = io.StringIO()
+        write_graph(
+            graph=StateGraph(
+                transitions=[
+                    Transition(line_number=1, current_state="Init", condition='Say"Hi"', next_state="END"),
+                ]
+            ),
+            output=output,
+            graph_format=GraphFormat.dot,
+        )
+
+        assert '\t"init" -> "end" [label="Say\\"Hi\\""];' in output.getvalue().splitlines()
+
+    @pytest.mark.parametrize("graph_format", list(GraphFormat))
+    def test_large_graph(self, graph_format: GraphFormat) -> None:
+        """
+        Test to ensure that a graph of ten thousand transitions is exported quickly.
+
+        :param graph_format: The format to write.
+        """
+        transitions = [
+            Transition(line_number=line, current_state=f"State{line}", condition="Next", next_state=f"State{line + 1}")
+            for line in range(10_000)
+        ]
+        graph = StateGraph(transitions=transitions)
+        output = io.StringIO()
+
+        started: float = time.perf_counter()
+        write_graph(graph=graph, output=output, graph_format=graph_format)
+
+        assert time.perf_counter() - started < 1.0
+        assert output.getvalue().count("state9999") >= 2
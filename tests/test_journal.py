@@ -0,0 +1,118 @@
+"""Tests for journalling and resuming batch runs."""
+
+import builtins
+from pathlib import Path
+
+import pytest
+
+from tests.conftest import CorpusBuilder
+from tpc_plugin_validator.batch import batch_validator as batch_validator_module
+from tpc_plugin_validator.batch.backends import Backend
+from tpc_plugin_validator.batch.batch_result import BatchResult
+from tpc_plugin_validator.batch.batch_validator import BatchValidator
+from tpc_plugin_validator.batch.journal import Journal, file_digest
+from tpc_plugin_validator.batch.plugin_pair import PluginPair
+
+
+@pytest.fixture
+def corpus(build_corpus: CorpusBuilder) -> Path:
+    """
+    Create a corpus of plugins on disk.
+
+    :param build_corpus: Function creating plugins within a corpus on disk.
+
+    :return: Path to the root of the corpus.
+    """
+    return build_corpus(names=[f"plugin{index}" for index in range(4)])
+
+
+class TestJournal(object):
+    """Tests for journalling and resuming batch runs."""
+
+    def test_resume(self, corpus: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test to ensure that only changed pairs are validated again and the rest are replayed from the journal.
+
+        :param corpus: Path to the root of the corpus.
+        :param tmp_path: Temporary directory provided by pytest.
+        :param monkeypatch: Pytest monkeypatch fixture.
+        """
+        journal_path = str(tmp_path / "journal.jsonl")
+        with Journal(path=journal_path, sync_every=2) as journal:
+            batch_validator = BatchValidator.with_directory(root=str(corpus), backend=Backend.thread, journal=journal)
+            first = {result.pair.name: result for result in batch_validator.run()}
+
+        with open(corpus / "plugin2" / "process.ini", "a", encoding="utf-8") as file:
+            file.write("\n# Changed.\n")
+        validated: list[bytes] = []
+        opened: list[str] = []
+        validate_pair_content = batch_validator_module.validate_pair_content
+        builtin_open = builtins.open
+
+        def counting_validate_pair_content(process_file_content: bytes, prompts_file_content: bytes) -> tuple:
+            validated.append(process_file_content)
+            return validate_pair_content(
+                process_file_content=process_file_content, prompts_file_content=prompts_file_content
+            )
+
+        def counting_open(file, *args, **kwargs):
+            if str(file).startswith(str(corpus)):
+                opened.append(str(file))
+            return builtin_open(file, *args, **kwargs)
+
+        monkeypatch.setattr(batch_validator_module, "validate_pair_content", counting_validate_pair_content)
+        monkeypatch.setattr(builtins, "open", counting_open)
+        with Journal(path=journal_path, resume=True) as journal:
+            batch_validator = BatchValidator.with_directory(root=str(corpus), backend=Backend.thread, journal=journal)
+            second = {result.pair.name: result for result in batch_validator.run()}
+        monkeypatch.undo()
+
+        assert validated == [(corpus / "plugin2" / "process.ini").read_bytes()]
+        assert sorted(opened) == sorted(str(path) for path in corpus.rglob("*.ini"))
+        assert batch_validator.resumed == 3
+        assert second == first
+
+    def test_partial_entry(self, corpus: Path, tmp_path: Path) -> None:
+        """
+        Test to ensure that a partially written final entry is discarded and replaced.
+
+        :param corpus: Path to the root of the corpus.
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        journal_path = tmp_path / "journal.jsonl"
+        pair = PluginPair(
+            name="plugin0",
+            process_file=str(corpus / "plugin0" / "process.ini"),
+            prompts_file=str(corpus / "plugin0" / "prompts.ini"),
+        )
+        digest = file_digest(process_file_path=pair.process_file, prompts_file_path=pair.prompts_file)
+        with Journal(path=str(journal_path)) as journal:
+            journal.record(result=BatchResult(pair=pair), digest=digest)
+        with open(journal_path, "a", encoding="utf-8") as file:
+            file.write('{"name":"plugin1","proc')
+
+        with Journal(path=str(journal_path), resume=True) as journal:
+            assert journal.completed(name="plugin0", digest=digest) == BatchResult(pair=pair)
+            assert journal.completed(name="plugin0", digest="changed") is None
+            assert journal.completed(name="plugin1", digest=digest) is None
+            journal.record(result=BatchResult(pair=PluginPair(name="plugin1")), digest="")
+
+        assert len(journal_path.read_text(encoding="utf-8").splitlines()) == 2
+        with Journal(path=str(journal_path), resume=True) as journal:
+            assert journal.completed(name="plugin1", digest="") is None
+
+    def test_invalid(self, tmp_path: Path) -> None:
+        """
+        Test to ensure that an invalid sync interval and recording before opening are reported.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        with pytest.raises(ValueError) as exc_info:
+            Journal(path=str(tmp_path / "journal.jsonl"), sync_every=0)
+        assert exc_info.value.args[0] == "The journal sync interval must be at least 1, 0 was given."
+
+        with pytest.raises(ValueError) as exc_info:
+            Journal(path=str(tmp_path / "journal.jsonl")).record(
+                result=BatchResult(pair=PluginPair(name="a")), digest=""
+            )
+        assert exc_info.value.args[0] == "The journal must be opened before recording."
@@ -0,0 +1,210 @@
+"""Tests for the per-pair resource limits."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from tests.conftest import CorpusBuilder
+from tpc_plugin_validator.batch import worker
+from tpc_plugin_validator.batch.backends import Backend
+from tpc_plugin_validator.batch.batch_validator import BatchValidator
+from tpc_plugin_validator.batch.limits import ResourceLimits
+from tpc_plugin_validator.batch.pipeline import BatchPipeline
+from tpc_plugin_validator.validator import Validator
+
+PROCESS_FILE: str = "tests/data/valid-process.ini"
+PROMPTS_FILE: str = "tests/data/valid-prompts.ini"
+
+
+@pytest.fixture
+def corpus(build_corpus: CorpusBuilder) -> Path:
+    """
+    Create a corpus with one normal plugin and one whose process file is very large.
+
+    :param build_corpus: Function creating plugins within a corpus on disk.
+
+    :return: Path to the root of the corpus.
+    """
+    build_corpus(names=["normal"], process_file=PROCESS_FILE, prompts_file=PROMPTS_FILE)
+    return build_corpus(names=["huge"], process_file=PROCESS_FILE, prompts_file=PROMPTS_FILE, padding=5000)
+
+
+def _slow_validate(self: Validator) -> None:
+    """
+    Stand in for Validator.validate that never finishes in time.
+
+    :param self: The validator.
+    """
+    time.sleep(0.5)
+
+
+class TestResourceLimits(object):
+    """Tests for the per-pair resource limits."""
+
+    @pytest.mark.parametrize(
+        "limits,message",
+        [
+            ({"max_file_bytes": -1}, "The maximum file size must be at least 0, -1 was given."),
+            (
+                {"max_section_tokens": -1},
+                "The maximum number of tokens per section must be at least 0, -1 was given.",
+            ),
+            ({"max_seconds": -1.0}, "The maximum validation time must be at least 0, -1.0 was given."),
+        ],
+    )
+    def test_negative_limit(self, limits: dict, message: str) -> None:
+        """
+        Test to ensure that a negative limit is rejected.
+
+        :param limits: The limit to set.
+        :param message: The expected error message.
+        """
+        with pytest.raises(ValueError) as exc_info:
+            ResourceLimits(**limits)
+
+        assert exc_info.value.args[0] == message
+
+    def test_within_limits(self) -> None:
+        """Test to ensure that a pair within its limits is validated as normal."""
+        limits = ResourceLimits(max_file_bytes=10_000, max_section_tokens=100, max_seconds=30.0)
+
+        assert worker.validate_pair(PROCESS_FILE, PROMPTS_FILE, limits) == worker.validate_pair(
+            PROCESS_FILE, PROMPTS_FILE
+        )
+
+    def test_max_file_bytes(self) -> None:
+        """Test to ensure that a file larger than the limit is not read."""
+        violations, error = worker.validate_pair(PROCESS_FILE, PROMPTS_FILE, ResourceLimits(max_file_bytes=1000))
+
+        assert error == ""
+        assert violations == (
+            (
+                "ResourceLimitViolation",
+                "CRITICAL",
+                "The file is 1208 bytes which exceeds the limit of 1000 bytes.",
+                "process.ini",
+                "",
+                0,
+            ),
+        )
+
+    def test_max_section_tokens(self) -> None:
+        """Test to ensure that a section holding more tokens than the limit is not validated."""
+        content = Path(PROCESS_FILE).read_bytes()
+        violations, error = worker.validate_pair_content(content, b"", ResourceLimits(max_section_tokens=7))
+
+        assert error == ""
+        assert violations == (
+            (
+                "ResourceLimitViolation",
+                "CRITICAL",
+                "The section holds 8 tokens which exceeds the limit of 7 tokens.",
+                "process.ini",
+                "states",
+                0,
+            ),
+        )
+
+    def test_max_seconds_interrupts(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test to ensure that a pair running past its time limit on the main thread is interrupted.
+
+        :param monkeypatch: Pytest fixture to patch the validator.
+        """
+        monkeypatch.setattr(Validator, "validate", _slow_validate)
+
+        started: float = time.perf_counter()
+        violations, error = worker.validate_pair(PROCESS_FILE, PROMPTS_FILE, ResourceLimits(max_seconds=0.05))
+
+        assert time.perf_counter() - started < 0.4
+        assert error == ""
+        assert violations == (
+            (
+                "ResourceLimitViolation",
+                "CRITICAL",
+                "The plugin could not be validated within the time limit.",
+                "",
+                "",
+                0,
+            ),
+        )
+
+    def test_max_seconds_thread(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test to ensure that a pair running past its time limit on a thread is reported once it finishes.
+
+        :param monkeypatch: Pytest fixture to patch the validator.
+        """
+        monkeypatch.setattr(Validator, "validate", _slow_validate)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            violations = executor.submit(
+                worker.validate_content,
+                Path(PROCESS_FILE).read_text(encoding="utf-8"),
+                "",
+                ResourceLimits(max_seconds=0.05),
+            ).result()
+
+        assert [violation[0] for violation in violations] == ["ResourceLimitViolation"]
+
+    @pytest.mark.parametrize("backend", [Backend.process, Backend.thread])
+    def test_batch_validator(self, corpus: Path, backend: Backend) -> None:
+        """
+        Test to ensure that only the pair exceeding a limit is reported and the rest of the batch completes.
+
+        :param corpus: Path to the root of the corpus.
+        :param backend: The executor backend to validate with.
+        """
+        batch_validator = BatchValidator.with_directory(
+            root=str(corpus), backend=backend, max_workers=2, limits=ResourceLimits(max_file_bytes=10_000)
+        )
+        results = {result.pair.name: result for result in batch_validator.run()}
+
+        assert results["normal"].passed
+        assert [violation.rule for violation in results["huge"].violations] == ["ResourceLimitViolation"]
+
+    def test_batch_pipeline(self, corpus: Path) -> None:
+        """
+        Test to ensure that the pipeline reports a file larger than the limit without reading it.
+
+        :param corpus: Path to the root of the corpus.
+        """
+        batch_pipeline = BatchPipeline.with_directory(
+            root=str(corpus), backend=Backend.thread, max_workers=2, limits=ResourceLimits(max_file_bytes=10_000)
+        )
+        results = {result.pair.name: result for result in batch_pipeline.run()}
+
+        assert results["normal"].passed
+        assert [violation.rule for violation in results["huge"].violations] == ["ResourceLimitViolation"]
+        assert results["huge"].violations[0].file == "process.ini"
+
+    @pytest.mark.parametrize(
+        "backend,limits,message",
+        [
+            (Backend.process, ResourceLimits(max_seconds=30.0), ""),
+            (Backend.thread, ResourceLimits(max_file_bytes=10_000), ""),
+            (
+                Backend.thread,
+                ResourceLimits(max_seconds=30.0),
+                "The maximum validation time can only be enforced with the process backend, thread was given.",
+            ),
+        ],
+    )
+    def test_time_limit_backend(self, backend: Backend, limits: ResourceLimits, message: str) -> None:
+        """
+        Test to ensure that a time limit is rejected with a backend whose workers cannot be interrupted.
+
+        :param backend: The executor backend to validate with.
+        :param limits: The resource limits to enforce.
+        :param message: The expected error message, empty if the limits are accepted.
+        """
+        for create in (BatchValidator, BatchPipeline):
+            if not message:
+                create(pairs=[], backend=backend, limits=limits)
+                continue
+            with pytest.raises(ValueError) as exc_info:
+                create(pairs=[], backend=backend, limits=limits)
+
+            assert exc_info.value.args[0] == message
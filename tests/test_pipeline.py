@@ -0,0 +1,136 @@
+"""Tests for the staged batch pipeline."""
+
+import shutil
+import threading
+from pathlib import Path
+
+import pytest
+
+from tests.conftest import BrokenExecutor, CorpusBuilder
+from tpc_plugin_validator.batch import pipeline
+from tpc_plugin_validator.batch.backends import Backend
+from tpc_plugin_validator.batch.batch_validator import BatchValidator
+from tpc_plugin_validator.batch.pipeline import BatchPipeline, ReadResult
+from tpc_plugin_validator.batch.plugin_pair import PluginPair
+from tpc_plugin_validator.batch.worker import TimedWorkerResult
+from tpc_plugin_validator.validator import Validator
+
+
+class TestBatchPipeline(object):
+    """Tests for the staged batch pipeline."""
+
+    @pytest.mark.parametrize("backend", [Backend.process, Backend.thread])
+    def test_batch_pipeline(self, tmp_path: Path, backend: Backend) -> None:
+        """
+        Test to ensure that the pipeline produces the same results as the batch validator and counts each stage.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        :param backend: The backend to test.
+        """
+        (tmp_path / "unix").mkdir()
+        shutil.copy("tests/data/valid-process.ini", tmp_path / "unix" / "process.ini")
+        shutil.copy("tests/data/valid-prompts.ini", tmp_path / "unix" / "prompts.ini")
+        (tmp_path / "windows").mkdir()
+        shutil.copy("tests/data/transitions-invalid-process.ini", tmp_path / "windows" / "process.ini")
+        shutil.copy("tests/data/transitions-invalid-prompts.ini", tmp_path / "windows" / "prompts.ini")
+        (tmp_path / "broken").mkdir()
+        (tmp_path / "broken" / "process.ini").write_bytes(b"[states]\n\xc3\x28\n")
+
+        batch_pipeline = BatchPipeline.with_directory(root=str(tmp_path), backend=backend, max_workers=2)
+        results = {result.pair.name: result for result in batch_pipeline.run()}
+        expected = {
+            result.pair.name: result
+            for result in BatchValidator.with_directory(root=str(tmp_path), backend=Backend.thread).run()
+        }
+
+        assert sorted(results) == ["broken", "unix", "windows"]
+        assert results["unix"] == expected["unix"]
+        assert results["windows"] == expected["windows"]
+        assert results["broken"].error.startswith("UnicodeDecodeError:")
+        assert [counter.name for counter in batch_pipeline.counters] == ["read", "parse", "validate", "report"]
+        assert [counter.items for counter in batch_pipeline.counters] == [2, 2, 2, 3]
+        assert batch_pipeline.counters[0].workers == pipeline.DEFAULT_IO_THREADS
+        assert batch_pipeline.counters[1].workers == 2
+
+    def test_batch_pipeline_unexpected_error(
+        self, build_corpus: CorpusBuilder, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        Test to ensure that an unexpected error in the executor is reported for its pair rather than ending the batch.
+
+        :param build_corpus: Function creating plugins within a corpus on disk.
+        :param monkeypatch: Pytest monkeypatch fixture.
+        """
+
+        def validate(self: Validator) -> None:
+            raise RecursionError("maximum recursion depth exceeded")
+
+        monkeypatch.setattr(Validator, "validate", validate)
+        root = build_corpus(names=["first", "second"])
+        results = list(BatchPipeline.with_directory(root=str(root), backend=Backend.thread).run())
+
+        assert sorted(result.pair.name for result in results) == ["first", "second"]
+        assert {result.error for result in results} == {"RecursionError: maximum recursion depth exceeded"}
+
+    def test_batch_pipeline_broken_executor(self, build_corpus: CorpusBuilder, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test to ensure that every pair is reported with an error when the workers die.
+
+        :param build_corpus: Function creating plugins within a corpus on disk.
+        :param monkeypatch: Pytest monkeypatch fixture.
+        """
+        monkeypatch.setattr(pipeline, "create_executor", lambda **_: BrokenExecutor())
+        root = build_corpus(names=["first", "second", "third"])
+        results = list(BatchPipeline.with_directory(root=str(root), backend=Backend.thread).run())
+
+        assert sorted(result.pair.name for result in results) == ["first", "second", "third"]
+        assert all(result.error.startswith("BrokenProcessPool:") for result in results)
+
+    def test_batch_pipeline_backpressure(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test to ensure that a slow stage holds back the read stage rather than letting pairs pile up.
+
+        :param monkeypatch: Pytest monkeypatch fixture.
+        """
+        lock = threading.Lock()
+        counts: dict[str, int] = {"read": 0, "validated": 0, "held": 0}
+
+        def fake_read_pair(process_file_path: str, prompts_file_path: str) -> ReadResult:
+            with lock:
+                counts["read"] += 1
+                counts["held"] = max(counts["held"], counts["read"] - counts["validated"])
+            return process_file_path, prompts_file_path, 0.0
+
+        def fake_validate_pair_text(process_file_content: str, prompts_file_content: str) -> TimedWorkerResult:
+            threading.Event().wait(timeout=0.005)
+            with lock:
+                counts["validated"] += 1
+            return ((), ""), 0.0, 0.0
+
+        monkeypatch.setattr(pipeline, "read_pair", fake_read_pair)
+        monkeypatch.setattr(pipeline, "validate_pair_text", fake_validate_pair_text)
+        pairs = [PluginPair(name=str(index), process_file=str(index)) for index in range(30)]
+        batch_pipeline = BatchPipeline(pairs=pairs, backend=Backend.thread, max_workers=1, io_threads=2, queue_size=2)
+
+        assert len(list(batch_pipeline.run())) == 30
+        assert counts["held"] <= 4
+
+    @pytest.mark.parametrize(
+        "io_threads,queue_size,message",
+        [
+            (0, None, "The number of I/O threads must be at least 1, 0 was given."),
+            (1, 0, "The queue size must be at least 1, 0 was given."),
+        ],
+    )
+    def test_batch_pipeline_invalid(self, io_threads: int, queue_size: int | None, message: str) -> None:
+        """
+        Test to ensure that invalid stage sizes are rejected.
+
+        :param io_threads: Number of I/O threads to request.
+        :param queue_size: Queue size to request.
+        :param message: The expected error message.
+        """
+        with pytest.raises(ValueError) as exc_info:
+            BatchPipeline(pairs=[], io_threads=io_threads, queue_size=queue_size)
+
+        assert exc_info.value.args[0] == message
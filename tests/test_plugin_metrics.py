@@ -0,0 +1,148 @@
+"""Tests for the plugin complexity metrics."""
+
+import csv
+import io
+import json
+
+import pytest
+
+from tpc_plugin_validator.utilities.plugin_metrics import (
+    MetricsFormat,
+    MetricsWriter,
+    MetricThresholds,
+    PluginMetrics,
+    check_thresholds,
+    compute_metrics,
+)
+from tpc_plugin_validator.utilities.severity import Severity
+from tpc_plugin_validator.utilities.validation_result import ValidationResult
+from tpc_plugin_validator.validator import Validator
+
+
+@pytest.fixture
+def metrics() -> PluginMetrics:
+    """
+    Measure a plugin holding a separate pair of states and a closed cycle.
+
+    :return: PluginMetrics
+    """
+    validator = Validator.with_file(
+        process_file_path="tests/data/transitions-graph-invalid-process.ini",
+        prompts_file_path="tests/data/valid-prompts.ini",
+    )
+    return compute_metrics(process_file=validator.process_file, prompts_file=validator.prompts_file)
+
+
+class TestPluginMetrics(object):
+    """Tests for the plugin complexity metrics."""
+
+    def test_compute_metrics(self, metrics: PluginMetrics) -> None:
+        """
+        Test to ensure that each metric is measured.
+
+        :param metrics: The metrics of the plugin.
+        """
+        assert metrics == PluginMetrics(
+            states=11,
+            transitions=12,
+            conditions=5,
+            max_fan_out=3,
+            cyclomatic_complexity=5,
+            placeholders=1,
+            fail_states={"1000-1999": 1},
+        )
+
+    def test_compute_metrics_empty(self) -> None:
+        """Test to ensure that a plugin without any sections is measured as zero."""
+        assert compute_metrics(process_file={}, prompts_file={}) == PluginMetrics()
+
+    def test_check_thresholds(self, metrics: PluginMetrics) -> None:
+        """
+        Test to ensure that only the metrics greater than their threshold are reported.
+
+        :param metrics: The metrics of the plugin.
+        """
+        violations = check_thresholds(
+            metrics=metrics,
+            thresholds=MetricThresholds(max_states=11, max_fan_out=2, max_cyclomatic_complexity=4),
+        )
+
+        assert violations == [
+            ValidationResult(
+                rule="ComplexityViolation",
+                severity=Severity.WARNING,
+                message="The largest number of transitions leaving a single state of the plugin is 3 which exceeds the "
+                "threshold of 2.",
+                file="process.ini",
+                section="transitions",
+            ),
+            ValidationResult(
+                rule="ComplexityViolation",
+                severity=Severity.WARNING,
+                message="The cyclomatic complexity of the plugin is 5 which exceeds the threshold of 4.",
+                file="process.ini",
+                section="transitions",
+            ),
+        ]
+
+    def test_negative_threshold(self) -> None:
+        """Test to ensure that a negative threshold is rejected."""
+        with pytest.raises(ValueError) as exc_info:
+            MetricThresholds(max_cyclomatic_complexity=-1)
+
+        assert exc_info.value.args[0] == "The cyclomatic complexity threshold must be at least 0, -1 was given."
+
+    def test_write_json(self, metrics: PluginMetrics) -> None:
+        """
+        Test to ensure that the metrics of a corpus are written as a JSON array.
+
+        :param metrics: The metrics of the plugin.
+        """
+        output = io.StringIO()
+        with MetricsWriter(output=output, metrics_format=MetricsFormat.json) as writer:
+            writer.write(name="first", metrics=metrics, violations=[])
+            writer.write(name="second", metrics=PluginMetrics(), violations=[])
+
+        records = json.loads(output.getvalue())
+
+        assert [record["plugin"] for record in records] == ["first", "second"]
+        assert records[0]["cyclomatic_complexity"] == 5
+        assert records[0]["fail_states"] == {"1000-1999": 1}
+
+    def test_write_csv(self, metrics: PluginMetrics) -> None:
+        """
+        Test to ensure that the metrics of a corpus are written as CSV with the violations of each plugin.
+
+        :param metrics: The metrics of the plugin.
+        """
+        output = io.StringIO(newline="")
+        violations = check_thresholds(metrics=metrics, thresholds=MetricThresholds(max_transitions=10))
+        with MetricsWriter(output=output, metrics_format=MetricsFormat.csv) as writer:
+            writer.write(name="first", metrics=metrics, violations=violations)
+
+        rows = list(csv.reader(io.StringIO(output.getvalue(), newline="")))
+
+        assert rows == [
+            [
+                "plugin",
+                "states",
+                "transitions",
+                "conditions",
+                "max_fan_out",
+                "cyclomatic_complexity",
+                "placeholders",
+                "fail_states",
+                "violations",
+            ],
+            [
+                "first",
+                "11",
+                "12",
+                "5",
+                "3",
+                "5",
+                "1",
+                "1000-1999=1",
+                "The number of transitions of the plugin is 12 which exceeds the threshold of 10.",
+            ],
+        ]
@@ -0,0 +1,93 @@
+"""Tests for writing and reading batch result files."""
+
+from pathlib import Path
+
+import pytest
+
+from tpc_plugin_validator.batch.batch_result import BatchResult
+from tpc_plugin_validator.batch.plugin_pair import PluginPair
+from tpc_plugin_validator.batch.result_file import RESULT_FILE_MAGIC, ResultWriter, read_results
+from tpc_plugin_validator.utilities.severity import Severity
+from tpc_plugin_validator.utilities.validation_result import ValidationResult
+
+
+def _results() -> list[BatchResult]:
+    """
+    Create a set of batch results sharing most of their strings.
+
+    :return: List of BatchResult
+    """
+    violation = ValidationResult(
+        rule="InvalidTransitionViolation",
+        severity=Severity.CRITICAL,
+        message='The state "Wait" is not declared.',
+        file="process.ini",
+        section="transitions",
+        line=12,
+    )
+    return [
+        BatchResult(pair=PluginPair(name="unix", process_file="unix/process.ini", prompts_file="unix/prompts.ini")),
+        BatchResult(
+            pair=PluginPair(name="windows", process_file="windows/process.ini"),
+            violations=[violation, ValidationResult(rule="Rule", severity=Severity.WARNING, message="Message")],
+        ),
+        BatchResult(pair=PluginPair(name="broken", prompts_file="broken/prompts.ini"), error="UnicodeDecodeError: é"),
+    ] + [BatchResult(pair=PluginPair(name=f"copy{index}"), violations=[violation] * 3) for index in range(100)]
+
+
+class TestResultFile(object):
+    """Tests for writing and reading batch result files."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """
+        Test to ensure that results read back equal the results written and repeated strings are stored once.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        path = str(tmp_path / "results.bin")
+        with ResultWriter(path=path) as writer:
+            writer.write_all(results=_results())
+
+        assert list(read_results(path=path)) == _results()
+        assert (tmp_path / "results.bin").stat().st_size < 6000
+
+    def test_not_a_result_file(self, tmp_path: Path) -> None:
+        """
+        Test to ensure that a file without the header is rejected.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        (tmp_path / "results.bin").write_bytes(b"not results")
+
+        with pytest.raises(ValueError) as exc_info:
+            list(read_results(path=str(tmp_path / "results.bin")))
+
+        assert exc_info.value.args[0] == f"The file is not a batch result file: {tmp_path / 'results.bin'}"
+
+    def test_truncated(self, tmp_path: Path) -> None:
+        """
+        Test to ensure that a truncated file is reported.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        path = tmp_path / "results.bin"
+        with ResultWriter(path=str(path)) as writer:
+            writer.write_all(results=_results()[:2])
+        path.write_bytes(path.read_bytes()[:-3])
+
+        with pytest.raises(ValueError) as exc_info:
+            list(read_results(path=str(path)))
+
+        assert exc_info.value.args[0] == f"The batch result file is truncated or corrupt: {path}"
+
+    def test_write_unopened(self, tmp_path: Path) -> None:
+        """
+        Test to ensure that writing before the writer is opened is reported.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        with pytest.raises(ValueError) as exc_info:
+            ResultWriter(path=str(tmp_path / "results.bin")).write(result=_results()[0])
+
+        assert exc_info.value.args[0] == "The result writer must be opened before writing."
+        assert RESULT_FILE_MAGIC.startswith(b"TPCR")
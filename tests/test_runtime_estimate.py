@@ -0,0 +1,78 @@
+"""Tests for the runtime estimate."""
+
+import pytest
+from tpc_plugin_parser.parser import Parser
+
+from tpc_plugin_validator.utilities.runtime_estimate import RuntimeEstimate, estimate_runtime, send_length
+from tpc_plugin_validator.utilities.state_graph import StateGraph
+from tpc_plugin_validator.utilities.validation_result import ValidationResult
+from tpc_plugin_validator.validator import Validator
+
+
+class TestRuntimeEstimate(object):
+    """Tests for the runtime estimate."""
+
+    @pytest.mark.parametrize(
+        "process_file,expected_estimate",
+        [
+            (
+                "tests/data/transitions-invalid-process.ini",
+                RuntimeEstimate(longest_steps=4, shortest_steps=2, worst_seconds=46.0, typical_seconds=10.5),
+            ),
+            (
+                "tests/data/valid-process.ini",
+                RuntimeEstimate(longest_steps=4, shortest_steps=4, worst_seconds=0.0, typical_seconds=0.0),
+            ),
+            (
+                "tests/data/empty-process.ini",
+                None,
+            ),
+        ],
+    )
+    def test_estimate_runtime(self, process_file: str, expected_estimate: RuntimeEstimate | None) -> None:
+        """
+        Test to ensure that the runtime is estimated from the longest and shortest paths to END.
+
+        :param process_file: Path to the process file to use for the test case.
+        :param expected_estimate: The expected estimate.
+        """
+        with open(process_file, encoding="utf-8") as file:
+            parsed_file = Parser(file_contents=file.read()).parsed_file
+
+        assert (
+            estimate_runtime(
+                graph=StateGraph.from_process_file(process_file=parsed_file),
+                states=parsed_file.get("states", []),
+                parameters=parsed_file.get("parameters", []),
+            )
+            == expected_estimate
+        )
+
+    def test_send_length(self) -> None:
+        """Test to ensure that each placeholder is counted as a fixed number of characters."""
+        assert send_length(value="sleep 1") == 7
+        assert send_length(value="<username> <password>") == 33
+
+    @pytest.mark.parametrize("budget,expected_rules", [(30, ["RuntimeBudgetViolation"]), (60, [])])
+    def test_runtime_budget(self, budget: float, expected_rules: list[str]) -> None:
+        """
+        Test to ensure that a plugin is reported when its worst case runtime exceeds the configured budget.
+
+        :param budget: The runtime budget in seconds.
+        :param expected_rules: The expected budget violations.
+        """
+        validator = Validator.with_file(
+            process_file_path="tests/data/transitions-invalid-process.ini",
+            prompts_file_path="tests/data/transitions-invalid-prompts.ini",
+        ).configure(config={"transitions": {"runtime_budget": budget}})
+        validator.validate()
+        violations: list[ValidationResult] = [
+            violation for violation in validator.violations if violation.rule == "RuntimeBudgetViolation"
+        ]
+
+        assert [violation.rule for violation in violations] == expected_rules
+        if violations:
+            assert violations[0].message == (
+                "The worst case runtime is estimated at 46.0 seconds over 4 transitions, which exceeds the budget of "
+                "30.0 seconds. The typical runtime is estimated at 10.5 seconds over 2 transitions."
+            )
@@ -0,0 +1,118 @@
+"""Tests for scheduling the most expensive plugin pairs first."""
+
+from pathlib import Path
+
+import pytest
+
+from tests.conftest import CorpusBuilder
+from tpc_plugin_validator.batch import batch_validator as batch_validator_module
+from tpc_plugin_validator.batch.backends import Backend
+from tpc_plugin_validator.batch.batch_validator import BatchValidator
+from tpc_plugin_validator.batch.plugin_pair import discover_pairs
+from tpc_plugin_validator.batch.scheduling import chunk_target, estimate_costs, load_stats, save_stats
+from tpc_plugin_validator.batch.worker import ChunkResult, run_chunk
+
+
+@pytest.fixture
+def corpus(build_corpus: CorpusBuilder) -> Path:
+    """
+    Create a corpus with one large plugin and many small ones.
+
+    :param build_corpus: Function creating plugins within a corpus on disk.
+
+    :return: Path to the root of the corpus.
+    """
+    valid: dict[str, str] = {
+        "process_file": "tests/data/valid-process.ini",
+        "prompts_file": "tests/data/valid-prompts.ini",
+    }
+    build_corpus(names=[f"small{index:02}" for index in range(20)], **valid)
+    return build_corpus(names=["large"], padding=5000, **valid)
+
+
+class TestScheduling(object):
+    """Tests for scheduling the most expensive plugin pairs first."""
+
+    def test_estimate_costs(self, corpus: Path) -> None:
+        """
+        Test to ensure that recorded timings are used and other pairs are costed by size in the same unit.
+
+        :param corpus: Path to the root of the corpus.
+        """
+        pairs = discover_pairs(root=str(corpus))
+        by_name = {pair.name: pair for pair in pairs}
+        size = sum(path.stat().st_size for path in (corpus / "small00").iterdir())
+
+        costs = estimate_costs(pairs=pairs, stats={})
+        assert costs[by_name["small00"]] == size
+        assert costs[by_name["large"]] > costs[by_name["small00"]]
+
+        costs = estimate_costs(pairs=pairs, stats={"small00": 2.0})
+        assert costs[by_name["small00"]] == 2.0
+        assert costs[by_name["small01"]] == pytest.approx(2.0)
+        assert chunk_target(costs={by_name["small00"]: 32.0, by_name["small01"]: 32.0}, workers=2) == 2.0
+
+    def test_schedule(self, corpus: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test to ensure that the largest pair is submitted first and alone while small pairs are grouped.
+
+        :param corpus: Path to the root of the corpus.
+        :param monkeypatch: Pytest monkeypatch fixture.
+        """
+        chunks: list[list[str]] = []
+
+        def recording_run_chunk(calls: tuple) -> ChunkResult:
+            chunks.append([arguments[0] for _, arguments in calls])
+            return run_chunk(calls=calls)
+
+        monkeypatch.setattr(batch_validator_module, "run_chunk", recording_run_chunk)
+        batch_validator = BatchValidator.with_directory(
+            root=str(corpus),
+            backend=Backend.thread,
+            max_workers=1,
+            schedule=True,
+        )
+        results = list(batch_validator.run())
+
+        assert len(results) == 21
+        assert all(result.passed for result in results)
+        assert chunks[0] == [str(corpus / "large" / "process.ini")]
+        assert 1 < len(chunks) < 21
+        assert sorted(batch_validator.timings) == sorted(result.pair.name for result in results)
+        assert batch_validator.makespan > 0
+
+    def test_unscheduled(self, corpus: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test to ensure that pairs are dispatched alone when not scheduling.
+
+        :param corpus: Path to the root of the corpus.
+        :param monkeypatch: Pytest monkeypatch fixture.
+        """
+        chunks: list[int] = []
+
+        def recording_run_chunk(calls: tuple) -> ChunkResult:
+            chunks.append(len(calls))
+            return run_chunk(calls=calls)
+
+        monkeypatch.setattr(batch_validator_module, "run_chunk", recording_run_chunk)
+        batch_validator = BatchValidator.with_directory(root=str(corpus), backend=Backend.thread, max_workers=1)
+        results = [result.pair.name for result in batch_validator.run()]
+
+        assert chunks == [1] * 21
+        assert sorted(results) == [pair.name for pair in batch_validator.pairs]
+
+    def test_stats_file(self, tmp_path: Path) -> None:
+        """
+        Test to ensure that recorded timings survive a round trip and an invalid file is reported.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        path = str(tmp_path / "stats.json")
+        assert load_stats(path=path) == {}
+        save_stats(path=path, stats={"b": 0.5, "a": 1.0})
+        assert load_stats(path=path) == {"a": 1.0, "b": 0.5}
+
+        (tmp_path / "stats.json").write_text("[1, 2]", encoding="utf-8")
+        with pytest.raises(ValueError) as exc_info:
+            load_stats(path=path)
+        assert exc_info.value.args[0] == f"The stats file could not be read: {path}"
@@ -0,0 +1,221 @@
+"""Tests for the HTTP validation service."""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from aiohttp import test_utils
+
+from tpc_plugin_validator import server
+from tpc_plugin_validator.batch.worker import ViolationTuple, validate_content
+from tpc_plugin_validator.server import ServiceBusyError, ValidationService, create_app
+from tpc_plugin_validator.validator import Validator
+
+
+def _read(path: str) -> str:
+    """
+    Read a test data file.
+
+    :param path: Path to the file.
+
+    :return: The file content.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def _run_with_client(service: ValidationService, test: Callable[[test_utils.TestClient], Awaitable[Any]]) -> Any:
+    """
+    Run a test against the service listening on localhost.
+
+    :param service: The service to expose.
+    :param test: Coroutine function receiving a connected client.
+
+    :return: The result of the test.
+    """
+
+    async def run() -> Any:
+        async with test_utils.TestClient(
+            test_utils.TestServer(create_app(service=service), host="127.0.0.1")
+        ) as client:
+            return await test(client)
+
+    return asyncio.run(run())
+
+
+class TestValidationServer(object):
+    """Tests for the HTTP validation service."""
+
+    def test_validate(self) -> None:
+        """Test to ensure that a single pair is validated over HTTP."""
+        process = _read("tests/data/transitions-invalid-process.ini")
+        prompts = _read("tests/data/transitions-invalid-prompts.ini")
+        validator = Validator(process_file_content=process, prompts_file_content=prompts)
+        validator.validate()
+
+        async def test(client: test_utils.TestClient) -> Any:
+            response = await client.post("/validate", json={"process": process, "prompts": prompts})
+            assert response.status == 200
+            return await response.json()
+
+        body = _run_with_client(service=ValidationService(), test=test)
+
+        assert body["violations"][0] == {
+            "rule": validator.violations[0].rule,
+            "severity": validator.violations[0].severity.value,
+            "message": validator.violations[0].message,
+            "file": validator.violations[0].file,
+            "section": validator.violations[0].section,
+            "line": validator.violations[0].line,
+        }
+        assert len(body["violations"]) == len(validator.violations)
+
+    def test_validate_batch(self) -> None:
+        """Test to ensure that several pairs are validated over HTTP."""
+        valid = {
+            "name": "valid",
+            "process": _read("tests/data/valid-process.ini"),
+            "prompts": _read("tests/data/valid-prompts.ini"),
+        }
+        prompts_only = {"name": "prompts", "prompts": _read("tests/data/states-invalid-prompts.ini")}
+
+        async def test(client: test_utils.TestClient) -> Any:
+            response = await client.post("/validate/batch", json={"pairs": [valid, prompts_only, valid]})
+            assert response.status == 200
+            return await response.json()
+
+        body = _run_with_client(service=ValidationService(), test=test)
+
+        assert [result["name"] for result in body["results"]] == ["valid", "prompts", "valid"]
+        assert body["results"][0] == {"name": "valid", "violations": [], "error": ""}
+        assert body["results"][2] == body["results"][0]
+
+    @pytest.mark.parametrize(
+        "path,payload,expected_error",
+        [
+            ("/validate", {}, "At least one of process file or prompts file is required to complete validation."),
+            ("/validate", {"process": 1}, '"process" and "prompts" must be strings.'),
+            ("/validate", [], "The request body must be a JSON object."),
+            (
+                "/validate",
+                {"process": "#" * (server.MAX_FILE_BYTES + 1)},
+                f"Source exceeds the maximum allowed size of {server.MAX_FILE_BYTES} bytes",
+            ),
+            ("/validate/batch", {"pairs": "x"}, 'The request body must contain a "pairs" list.'),
+            ("/validate/batch", {"pairs": ["x"]}, "Each plugin pair must be a JSON object."),
+        ],
+    )
+    def test_validate_bad_request(self, path: str, payload: Any, expected_error: str) -> None:
+        """
+        Test to ensure that malformed requests are rejected.
+
+        :param path: The endpoint to call.
+        :param payload: The JSON payload to send.
+        :param expected_error: The expected error message.
+        """
+
+        async def test(client: test_utils.TestClient) -> Any:
+            response = await client.post(path, json=payload)
+            assert response.status == 400
+            return await response.json()
+
+        assert _run_with_client(service=ValidationService(), test=test) == {"error": expected_error}
+
+    def test_validate_invalid_json(self) -> None:
+        """Test to ensure that a body that is not JSON is rejected."""
+
+        async def test(client: test_utils.TestClient) -> Any:
+            response = await client.post("/validate", data=b"not json")
+            assert response.status == 400
+            return await response.json()
+
+        assert _run_with_client(service=ValidationService(), test=test) == {
+            "error": "The request body must be valid JSON."
+        }
+
+    def test_coalescing_and_cache(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test to ensure that identical in-flight requests share one validation and later ones are served from cache.
+
+        :param monkeypatch: Pytest monkeypatch fixture.
+        """
+        calls: list[str] = []
+        release = threading.Event()
+
+        def fake_validate_content(process_file_content: str, prompts_file_content: str) -> tuple[ViolationTuple, ...]:
+            calls.append(process_file_content)
+            release.wait(timeout=5)
+            return validate_content(process_file_content, prompts_file_content)
+
+        monkeypatch.setattr(server, "validate_content", fake_validate_content)
+        process = _read("tests/data/valid-process.ini")
+
+        async def run() -> None:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                service = ValidationService(executor=executor, cache_size=1)
+                first = asyncio.ensure_future(service.validate(process, ""))
+                second = asyncio.ensure_future(service.validate(process, ""))
+                await asyncio.sleep(0.05)
+                assert service.pending == 1
+                release.set()
+                assert await first == await second
+                assert service.pending == 0
+                await service.validate(process, "")
+                assert len(calls) == 1
+                await service.validate("", process)
+                await service.validate(process, "")
+                assert len(calls) == 3
+
+        asyncio.run(run())
+
+    def test_backpressure(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test to ensure that work beyond the pending limit is refused with a 503.
+
+        :param monkeypatch: Pytest monkeypatch fixture.
+        """
+        release = threading.Event()
+
+        def fake_validate_content(process_file_content: str, prompts_file_content: str) -> tuple[ViolationTuple, ...]:
+            release.wait(timeout=5)
+            return ()
+
+        monkeypatch.setattr(server, "validate_content", fake_validate_content)
+
+        async def test(client: test_utils.TestClient) -> Any:
+            blocked = asyncio.ensure_future(client.post("/validate", json={"process": "a"}))
+            await asyncio.sleep(0.05)
+            refused = await client.post("/validate", json={"process": "b"})
+            refused_batch = await client.post("/validate/batch", json={"pairs": [{"process": "c"}]})
+            joined = asyncio.ensure_future(client.post("/validate", json={"process": "a"}))
+            await asyncio.sleep(0.05)
+            release.set()
+            assert (await blocked).status == 200
+            assert (await joined).status == 200
+            assert refused_batch.status == 503
+            assert refused.headers["Retry-After"] == "1"
+            return refused.status, await refused.json()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            status, body = _run_with_client(service=ValidationService(executor=executor, max_pending=1), test=test)
+
+        assert status == 503
+        assert body == {"error": "The maximum number of pending validations has been reached."}
+
+    def test_validate_many_busy(self) -> None:
+        """Test to ensure that a batch is refused if it would exceed the pending limit."""
+
+        async def run() -> None:
+            service = ValidationService(max_pending=1)
+            await service.validate_many(pairs=[("a", "")])
+            with pytest.raises(ServiceBusyError) as exc_info:
+                await service.validate_many(pairs=[("b", ""), ("c", "")])
+            assert exc_info.value.args[0] == "The batch needs 2 validation slots but the service is busy."
+
+        asyncio.run(run())
@@ -0,0 +1,88 @@
+"""Tests for splitting a corpus into shards."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from tpc_plugin_validator.batch.backends import Backend
+from tpc_plugin_validator.batch.batch_validator import BatchValidator
+from tpc_plugin_validator.batch.pipeline import BatchPipeline
+from tpc_plugin_validator.batch.sharding import in_shard, parse_shard, shard_of
+
+
+class TestSharding(object):
+    """Tests for splitting a corpus into shards."""
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("1/1", (1, 1)),
+            ("3/4", (3, 4)),
+            (" 2 / 10 ", (2, 10)),
+        ],
+    )
+    def test_parse_shard(self, value: str, expected: tuple[int, int]) -> None:
+        """
+        Test to ensure that a shard given as K/N is parsed.
+
+        :param value: The shard to parse.
+        :param expected: The expected index and count.
+        """
+        assert parse_shard(value=value) == expected
+
+    @pytest.mark.parametrize(
+        "value,message",
+        [
+            ("1", "The shard must be given as K/N, 1 was given."),
+            ("a/b", "The shard must be given as K/N, a/b was given."),
+            ("0/4", "The shard index must be between 1 and 4, 0 was given."),
+            ("5/4", "The shard index must be between 1 and 4, 5 was given."),
+        ],
+    )
+    def test_parse_shard_invalid(self, value: str, message: str) -> None:
+        """
+        Test to ensure that an invalid shard is rejected.
+
+        :param value: The shard to parse.
+        :param message: The expected error message.
+        """
+        with pytest.raises(ValueError) as exc_info:
+            parse_shard(value=value)
+
+        assert exc_info.value.args[0] == message
+
+    def test_shard_of(self) -> None:
+        """Test to ensure that pairs are spread evenly and stay on the same shard whatever the path separator."""
+        names = [f"platforms/plugin{index}" for index in range(4000)]
+        counts = [0, 0, 0, 0]
+        for name in names:
+            counts[shard_of(name=name, count=4) - 1] += 1
+
+        assert all(900 < count < 1100 for count in counts)
+        assert shard_of(name="platforms\\plugin1", count=4) == shard_of(name="platforms/plugin1", count=4)
+        assert in_shard(name="platforms/plugin1", shard=None)
+
+    def test_batch_shards(self, tmp_path: Path) -> None:
+        """
+        Test to ensure that the shards of a corpus cover every pair exactly once.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        for index in range(12):
+            (tmp_path / f"plugin{index}").mkdir()
+            shutil.copy("tests/data/valid-process.ini", tmp_path / f"plugin{index}" / "process.ini")
+            shutil.copy("tests/data/valid-prompts.ini", tmp_path / f"plugin{index}" / "prompts.ini")
+
+        validated: list[str] = []
+        for index in range(1, 4):
+            batch_validator = BatchValidator.with_directory(
+                root=str(tmp_path),
+                backend=Backend.thread,
+                shard=(index, 3),
+            )
+            batch_pipeline = BatchPipeline.with_directory(root=str(tmp_path), backend=Backend.thread, shard=(index, 3))
+            assert batch_pipeline.pairs == batch_validator.pairs
+            validated.extend(result.pair.name for result in batch_validator.run())
+
+        assert sorted(validated) == sorted(f"plugin{index}" for index in range(12))
@@ -0,0 +1,210 @@
+"""Tests for the transcript simulator."""
+
+import io
+import time
+
+import pytest
+from tpc_plugin_parser.lexer.tokens.assignment import Assignment
+from tpc_plugin_parser.lexer.tokens.transition import Transition
+
+from tpc_plugin_validator.utilities.simulator import (
+    MATCH_MAX,
+    SimulationOutcome,
+    Simulator,
+    compile_condition,
+    read_parameters,
+    simulate,
+)
+from tpc_plugin_validator.validator import Validator
+
+
+@pytest.fixture
+def validator() -> Validator:
+    """
+    Load the valid example plugin.
+
+    :return: Validator
+    """
+    return Validator.with_file(
+        process_file_path="tests/data/valid-process.ini",
+        prompts_file_path="tests/data/valid-prompts.ini",
+    )
+
+
+class TestSimulator(object):
+    """Tests for the transcript simulator."""
+
+    @pytest.mark.parametrize(
+        "transcript,outcome,state,path,reason",
+        [
+            (
+                "Welcome\nHello bob\nWaiting\nGoodbye\n",
+                SimulationOutcome.end,
+                "END",
+                ["Hello", "Waiting", "TRUE", "Goodbye"],
+                "",
+            ),
+            (
+                "Hello bob\nSome Failure\nWaiting\n",
+                SimulationOutcome.fail,
+                "SomeFailure",
+                ["Hello", "Failure"],
+                "We failed for some reason.",
+            ),
+            (
+                "Hello bob\nWaiting\n",
+                SimulationOutcome.stalled,
+                "SetPassword",
+                ["Hello", "Waiting", "TRUE"],
+                'The output ran out while waiting for one of the conditions "Goodbye".',
+            ),
+            (
+                "Hello alice\nWaiting\nGoodbye\n",
+                SimulationOutcome.stalled,
+                "Init",
+                [],
+                'The output ran out while waiting for one of the conditions "Hello".',
+            ),
+        ],
+    )
+    def test_simulate(
+        self,
+        validator: Validator,
+        transcript: str,
+        outcome: SimulationOutcome,
+        state: str,
+        path: list[str],
+        reason: str,
+    ) -> None:
+        """
+        Test to ensure that a transcript drives the state machine to the expected state.
+
+        :param validator: The validator holding the plugin.
+        :param transcript: The recorded output of the target.
+        :param outcome: The expected outcome.
+        :param state: The expected final state.
+        :param path: The expected conditions of the transitions taken.
+        :param reason: The expected reason.
+        """
+        result = simulate(
+            transcript=io.StringIO(transcript),
+            process_file=validator.process_file,
+            prompts_file=validator.prompts_file,
+            parameters={"username": "bob"},
+        )
+
+        assert result.outcome == outcome
+        assert result.state == state
+        assert [step.transition.condition for step in result.steps] == path
+        assert result.reason == reason
+        assert result.missing_parameters == []
+
+    def test_earlier_condition_wins(self, validator: Validator) -> None:
+        """
+        Test to ensure that the first transition declared wins when several conditions match the same output.
+
+        :param validator: The validator holding the plugin.
+        """
+        result = simulate(
+            transcript=io.StringIO("Hello bob\nSome Failure Waiting\n"),
+            process_file=validator.process_file,
+            prompts_file=validator.prompts_file,
+            parameters={"username": "bob"},
+        )
+
+        assert [str(step) for step in result.steps] == [
+            "Line 21: Init -(Hello)-> Wait",
+            "Line 22: Wait -(Waiting)-> IsWaiting",
+            "Line 23: IsWaiting -(TRUE)-> SetPassword",
+        ]
+
+    def test_missing_parameter(self, validator: Validator) -> None:
+        """
+        Test to ensure that a placeholder without a value is reported and matched literally.
+
+        :param validator: The validator holding the plugin.
+        """
+        result = simulate(
+            transcript=io.StringIO("Hello <username>\n"),
+            process_file=validator.process_file,
+            prompts_file=validator.prompts_file,
+        )
+
+        assert [step.matched for step in result.steps] == ["Hello <username>"]
+        assert result.missing_parameters == ["username"]
+
+    def test_streamed_output(self, validator: Validator) -> None:
+        """
+        Test to ensure that a condition split across reads is matched once the rest is read.
+
+        :param validator: The validator holding the plugin.
+        """
+        simulator = Simulator(
+            process_file=validator.process_file,
+            prompts_file=validator.prompts_file,
+            parameters={"username": "bob"},
+        )
+
+        assert simulator.feed(output="Hel") == []
+        assert [step.transition.next_state for step in simulator.feed(output="lo bob")] == ["Wait"]
+
+    def test_loop_without_output(self) -> None:
+        """Test to ensure that a cycle of boolean conditions is reported as a stall rather than followed forever."""
+        process_file = {
+            "transitions": [
+                Transition(line_number=1, current_state="Init", condition="TRUE", next_state="Retry"),
+                Transition(line_number=2, current_state="Retry", condition="TRUE", next_state="Init"),
+                Transition(line_number=3, current_state="Retry", condition="Done", next_state="END"),
+            ],
+        }
+        prompts_file = {
+            "conditions": [
+                Assignment(line_number=1, name="TRUE", equals="=", assigned="(expression)true"),
+                Assignment(line_number=2, name="Done", equals="=", assigned="Done"),
+            ],
+        }
+
+        result = simulate(transcript=io.StringIO("Done\n"), process_file=process_file, prompts_file=prompts_file)
+
+        assert result.outcome == SimulationOutcome.stalled
+        assert result.state == "Init"
+        assert result.reason == 'The state "Init" was reached again without reading output.'
+
+    def test_long_transcript(self, validator: Validator) -> None:
+        """
+        Test to ensure that a long transcript is simulated quickly and in bounded memory.
+
+        :param validator: The validator holding the plugin.
+        """
+        simulator = Simulator(
+            process_file=validator.process_file,
+            prompts_file=validator.prompts_file,
+            parameters={"username": "bob"},
+        )
+        start = time.perf_counter()
+        for _ in range(100_000):
+            simulator.feed(output="noise that matches none of the conditions\n")
+        simulator.feed(output="Hello bob\n")
+
+        assert time.perf_counter() - start < 5
+        assert len(simulator._buffer) <= MATCH_MAX
+        assert simulator.finish().state == "Wait"
+
+    def test_compile_condition(self) -> None:
+        """Test to ensure that Tcl tokens are translated unless escaped and placeholder values are matched literally."""
+        pattern = compile_condition(pattern=r"[[:digit:]]+ \m<name>\M", parameters=(("name", "a.b"),))
+
+        assert pattern is not None
+        assert pattern.search("42 a.b") is not None
+        assert pattern.search("42 axb") is None
+        escaped = compile_condition(pattern=r"a\\m \[:digit:]", parameters=())
+        assert escaped is not None
+        assert escaped.search(r"a\m [:digit:]") is not None
+        assert compile_condition(pattern="(", parameters=()) is None
+
+    def test_read_parameters(self) -> None:
+        """Test to ensure that name=value lines are read and other lines ignored."""
+        assert read_parameters(lines=["[parameters]", "# Comment.", "", "UserName = bob", "Password=a=b"]) == {
+            "username": "bob",
+            "password": "a=b",
+        }
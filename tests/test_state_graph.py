@@ -0,0 +1,90 @@
+"""Tests for the state machine graph."""
+
+from tpc_plugin_parser.lexer.tokens.transition import Transition
+from tpc_plugin_parser.parser import Parser
+
+from tpc_plugin_validator.utilities.state_graph import StateGraph
+
+
+def _graph(path: str) -> StateGraph:
+    """
+    Create the graph of a process file.
+
+    :param path: Path to the process file.
+
+    :return: StateGraph
+    """
+    with open(path, encoding="utf-8") as file:
+        return StateGraph.from_process_file(process_file=Parser(file_contents=file.read()).parsed_file)
+
+
+class TestStateGraph(object):
+    """Tests for the state machine graph."""
+
+    def test_index(self) -> None:
+        """Test to ensure that the transitions are indexed by state regardless of case."""
+        graph = _graph(path="tests/data/transitions-invalid-process.ini")
+
+        assert graph.initial_state == "begin"
+        assert graph.name("WAIT") == "wait"
+        assert [transition.line_number for transition in graph.successors("Wait")] == [22, 23, 27, 28, 30, 31, 32]
+        assert [transition.line_number for transition in graph.predecessors("SomeFailure")] == [27, 28, 29, 31]
+        assert graph.is_terminal("End")
+        assert graph.is_terminal("somefailure")
+        assert not graph.is_terminal("Wait")
+
+    def test_reachability(self) -> None:
+        """Test to ensure that the forward and backward searches follow whole paths."""
+        graph = _graph(path="tests/data/transitions-graph-invalid-process.ini")
+
+        assert graph.reachable() == {
+            "init",
+            "wait",
+            "iswaiting",
+            "somefailure",
+            "enterloop",
+            "loop",
+            "loopback",
+            "setpassword",
+            "end",
+        }
+        assert graph.terminating() == {"init", "wait", "iswaiting", "somefailure", "setpassword", "end"}
+
+    def test_strongly_connected_components(self) -> None:
+        """Test to ensure that cycles are grouped and listed after the components they lead to."""
+        graph = _graph(path="tests/data/transitions-graph-invalid-process.ini")
+
+        assert graph.strongly_connected_components() == [
+            ["end"],
+            ["setpassword"],
+            ["iswaiting"],
+            ["somefailure"],
+            ["loop", "loopback"],
+            ["enterloop"],
+            ["wait"],
+            ["init"],
+            ["orphan", "orphanpair"],
+        ]
+
+    def test_strongly_connected_components_large(self) -> None:
+        """Test to ensure that a graph far deeper than the recursion limit can be searched."""
+        transitions = [
+            Transition(line_number=index, current_state=f"S{index}", condition="c", next_state=f"S{index + 1}")
+            for index in range(20_000)
+        ]
+        transitions.append(Transition(line_number=20_000, current_state="S20000", condition="c", next_state="S0"))
+        graph = StateGraph(transitions=transitions)
+
+        components = graph.strongly_connected_components()
+
+        assert len(components) == 1
+        assert len(components[0]) == 20_001
+
+    def test_empty(self) -> None:
+        """Test to ensure that a process file without transitions gives an empty graph."""
+        graph = StateGraph.from_process_file(process_file={})
+
+        assert graph.initial_state == ""
+        assert graph.states == []
+        assert graph.reachable() == set()
+        assert graph.terminating() == set()
@@ -0,0 +1,219 @@
+"""Tests for the transition coverage measured from CPM debug logs."""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from tpc_plugin_parser.lexer.tokens.transition import Transition
+
+from tpc_plugin_validator.utilities import transition_coverage
+from tpc_plugin_validator.utilities.state_graph import StateGraph
+from tpc_plugin_validator.utilities.transition_coverage import find_logs, measure_coverage
+from tpc_plugin_validator.validator import Validator
+
+FIRST_RUN: str = (
+    "10:00:00 | Current state is [Init]\n"
+    "10:00:01 | Checking condition [Hello]\n"
+    "10:00:01 | Found condition [Hello]\n"
+    "10:00:02 | Current state is [Wait]\n"
+    "10:00:03 | Found condition [Failure]\n"
+)
+SECOND_RUN: str = (
+    "11:00:00 | CURRENT STATE: Init\n"
+    "11:00:01 | Found condition Hello\n"
+    "11:00:02 | Found condition Waiting\n"
+    "11:00:03 | Moving to state SetPassword\n"
+)
+CONDITION_PATTERN: str = r"\bfound\s+condition\s*\[?(?P<condition>\w+)"
+STATE_PATTERN: str = r"\b(?:current|moving\s+to)\s+state\s*(?:is)?\s*:?\s*\[?(?P<state>\w+)"
+
+
+@pytest.fixture
+def graph() -> StateGraph:
+    """
+    Build the state machine of the valid example plugin.
+
+    :return: StateGraph
+    """
+    return StateGraph.from_process_file(
+        process_file=Validator.with_file(process_file_path="tests/data/valid-process.ini").process_file
+    )
+
+
+class TestTransitionCoverage(object):
+    """Tests for the transition coverage measured from CPM debug logs."""
+
+    def test_measure_coverage(self, graph: StateGraph, tmp_path) -> None:
+        """
+        Test to ensure that the transitions and states never exercised across several logs are reported.
+
+        :param graph: The state machine of the plugin.
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        (tmp_path / "first.log").write_text(FIRST_RUN)
+        (tmp_path / "second.log").write_text(SECOND_RUN)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            coverage = measure_coverage(
+                graph=graph,
+                logs=find_logs(paths=[str(tmp_path)]),
+                state_pattern=STATE_PATTERN,
+                condition_pattern=CONDITION_PATTERN,
+                executor=executor,
+            )
+
+        assert coverage.logs == 2
+        assert [transition.line_number for transition in coverage.unexercised_transitions] == [25]
+        assert coverage.unobserved_states == ["END"]
+        assert coverage.percentage == 80.0
+
+    def test_ambiguous_state(self, tmp_path) -> None:
+        """
+        Test to ensure that a state entered by one of several transitions counts only the state as reached.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        graph = StateGraph(
+            transitions=[
+                Transition(line_number=1, current_state="Init", condition="Yes", next_state="Wait"),
+                Transition(line_number=2, current_state="Init", condition="No", next_state="Wait"),
+                Transition(line_number=3, current_state="Wait", condition="Done", next_state="END"),
+            ]
+        )
+        log = tmp_path / "run.log"
+        log.write_text("Current state is [Init]\nCurrent state is [Wait]\nFound condition [Done]\n")
+
+        coverage = measure_coverage(
+            graph=graph, logs=[str(log)], state_pattern=STATE_PATTERN, condition_pattern=CONDITION_PATTERN
+        )
+
+        assert sorted(coverage.exercised) == [2]
+        assert coverage.unobserved_states == []
+
+    def test_lines_across_chunks(self, graph: StateGraph, tmp_path, monkeypatch) -> None:
+        """
+        Test to ensure that a line split across two reads is still matched.
+
+        :param graph: The state machine of the plugin.
+        :param tmp_path: Temporary directory provided by pytest.
+        :param monkeypatch: Pytest fixture to patch the chunk size.
+        """
+        monkeypatch.setattr(transition_coverage, "CHUNK_SIZE", 7)
+        log = tmp_path / "run.log"
+        log.write_text(FIRST_RUN)
+
+        coverage = measure_coverage(
+            graph=graph, logs=[str(log)], state_pattern=STATE_PATTERN, condition_pattern=CONDITION_PATTERN
+        )
+
+        assert sorted(coverage.exercised) == [0, 3]
+
+    def test_line_without_newline(self, graph: StateGraph, tmp_path, monkeypatch) -> None:
+        """
+        Test to ensure that a long line without a newline is searched in pieces rather than held whole.
+
+        :param graph: The state machine of the plugin.
+        :param tmp_path: Temporary directory provided by pytest.
+        :param monkeypatch: Pytest fixture to patch the chunk size.
+        """
+        monkeypatch.setattr(transition_coverage, "CHUNK_SIZE", 1024)
+        log = tmp_path / "run.log"
+        log.write_text("state " * 2_000_000 + "\n" + FIRST_RUN)
+
+        start = time.perf_counter()
+        coverage = measure_coverage(
+            graph=graph, logs=[str(log)], state_pattern=STATE_PATTERN, condition_pattern=CONDITION_PATTERN
+        )
+
+        assert time.perf_counter() - start < 5
+        assert sorted(coverage.exercised) == [0, 3]
+
+    def test_optional_condition_group(self, graph: StateGraph, tmp_path) -> None:
+        """
+        Test to ensure that a condition pattern matching without its condition group is ignored.
+
+        :param graph: The state machine of the plugin.
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        log = tmp_path / "run.log"
+        log.write_text("Found condition\n" + FIRST_RUN)
+
+        coverage = measure_coverage(
+            graph=graph,
+            logs=[str(log)],
+            state_pattern=STATE_PATTERN,
+            condition_pattern=r"\bfound\s+condition(?:\s*\[(?P<condition>\w+))?",
+        )
+
+        assert sorted(coverage.exercised) == [0, 3]
+
+    def test_unreadable_log(self, graph: StateGraph, tmp_path) -> None:
+        """
+        Test to ensure that a log that cannot be read is reported without stopping the others.
+
+        :param graph: The state machine of the plugin.
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        log = tmp_path / "run.log"
+        log.write_text(FIRST_RUN)
+        missing = os.path.join(tmp_path, "missing.log")
+
+        coverage = measure_coverage(
+            graph=graph, logs=[missing, str(log)], state_pattern=STATE_PATTERN, condition_pattern=CONDITION_PATTERN
+        )
+
+        assert list(coverage.unreadable) == [missing]
+        assert sorted(coverage.exercised) == [0, 3]
+
+    @pytest.mark.parametrize(
+        "state_pattern,condition_pattern,message",
+        [
+            ("state (\\w+)", "condition (?P<condition>\\w+)", 'The state pattern must have a group named "state".'),
+            (
+                "state (?P<state>\\w+)",
+                "condition (?P<condition>\\w+",
+                (
+                    "The condition pattern is not a valid regular expression: missing ), unterminated subpattern at "
+                    "position 10."
+                ),
+            ),
+            (
+                "(?P<ts>\\d+) state (?P<state>\\w+)",
+                "(?P<ts>\\d+) condition (?P<condition>\\w+)",
+                "The state and condition patterns cannot be combined: redefinition of group name 'ts' as group 3; was "
+                "group 1 at position 44.",
+            ),
+        ],
+    )
+    def test_invalid_pattern(self, graph: StateGraph, state_pattern: str, condition_pattern: str, message: str) -> None:
+        """
+        Test to ensure that a pattern that cannot find a state or condition is rejected.
+
+        :param graph: The state machine of the plugin.
+        :param state_pattern: The state pattern.
+        :param condition_pattern: The condition pattern.
+        :param message: The expected error message.
+        """
+        with pytest.raises(ValueError) as exc_info:
+            measure_coverage(graph=graph, logs=[], state_pattern=state_pattern, condition_pattern=condition_pattern)
+
+        assert exc_info.value.args[0] == message
+
+    def test_find_logs(self, tmp_path) -> None:
+        """
+        Test to ensure that only the logs matching the pattern are found in a directory and a missing path is rejected.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        (tmp_path / "nested").mkdir()
+        (tmp_path / "nested" / "b.LOG").write_text("")
+        (tmp_path / "a.log").write_text("")
+        (tmp_path / "notes.txt").write_text("")
+
+        assert find_logs(paths=[str(tmp_path)]) == [
+            os.path.join(tmp_path, "a.log"),
+            os.path.join(tmp_path, "nested", "b.LOG"),
+        ]
+        with pytest.raises(FileNotFoundError):
+            find_logs(paths=[os.path.join(tmp_path, "missing")])
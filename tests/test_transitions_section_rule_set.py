@@ -57,7 +57,7 @@ class TestTransitionsSectionRuleSet(object):
                     ValidationResult(
                         rule="UnreachableTransitionViolation",
                         severity=Severity.CRITICAL,
-                        message='The transition "IsWaiting,Waiting,END" is unreachable due to a previous transition from "IsWaiting" having a boolean condition.',
+                        message='The transition "IsWaiting,Waiting,END" is unreachable due to a previous transition from "IsWaiting" having a boolean condition. Example path: "Begin" -(Hello)-> "wait" -(Waiting)-> "IsWaiting" -(TRUE)-> "SetPassword".',
                         file="process.ini",
                         section="transitions",
                         line=26,
@@ -102,7 +102,7 @@ class TestTransitionsSectionRuleSet(object):
                     ValidationResult(
                         rule="UnreachableTransitionViolation",
                         severity=Severity.CRITICAL,
-                        message='The transition "Wait,FALSE,SomeFailure" is unreachable due to a previous transition from "Wait" having a boolean condition.',
+                        message='The transition "Wait,FALSE,SomeFailure" is unreachable due to a previous transition from "Wait" having a boolean condition. Example path: "Begin" -(Hello)-> "wait" -(AnotherExpression)-> "END".',
                         file="process.ini",
                         section="transitions",
                         line=31,
@@ -111,7 +111,7 @@ class TestTransitionsSectionRuleSet(object):
                     ValidationResult(
                         rule="UnreachableTransitionViolation",
                         severity=Severity.WARNING,
-                        message='The transition "Wait,FALSE,SomeFailure" will never be matched.',
+                        message='The transition "Wait,FALSE,SomeFailure" will never be matched. Example path: "Begin" -(Hello)-> "wait".',
                         file="process.ini",
                         section="transitions",
                         line=31,
@@ -129,7 +129,7 @@ class TestTransitionsSectionRuleSet(object):
                     ValidationResult(
                         rule="InvalidTransitionViolation",
                         severity=Severity.CRITICAL,
-                        message='The state "Wait" attempts to transition to "NoNext" but has not been declared.',
+                        message='The state "Wait" attempts to transition to "NoNext" but has not been declared. Example path: "Begin" -(Hello)-> "wait" -(Nothing)-> "NoNext".',
                         file="process.ini",
                         section="transitions",
                         line=32,
@@ -138,7 +138,7 @@ class TestTransitionsSectionRuleSet(object):
                     ValidationResult(
                         rule="UnreachableTransitionViolation",
                         severity=Severity.CRITICAL,
-                        message='The transition "Wait,Nothing,NoNext" is unreachable due to a previous transition from "Wait" having a boolean condition.',
+                        message='The transition "Wait,Nothing,NoNext" is unreachable due to a previous transition from "Wait" having a boolean condition. Example path: "Begin" -(Hello)-> "wait" -(AnotherExpression)-> "END".',
                         file="process.ini",
                         section="transitions",
                         line=32,
@@ -218,7 +218,7 @@ class TestTransitionsSectionRuleSet(object):
                     ValidationResult(
                         rule="UnreachableTransitionViolation",
                         severity=Severity.CRITICAL,
-                        message='The transition "IsWaiting,Waiting,END" is unreachable due to a previous transition from "IsWaiting" having a boolean condition.',
+                        message='The transition "IsWaiting,Waiting,END" is unreachable due to a previous transition from "IsWaiting" having a boolean condition. Example path: "Begin" -(Hello)-> "wait" -(Waiting)-> "IsWaiting" -(TRUE)-> "SetPassword".',
                         file="process.ini",
                         section="transitions",
                         line=26,
@@ -254,7 +254,7 @@ class TestTransitionsSectionRuleSet(object):
                     ValidationResult(
                         rule="UnreachableTransitionViolation",
                         severity=Severity.WARNING,
-                        message='The transition "Wait,FALSE,SomeFailure" will never be matched.',
+                        message='The transition "Wait,FALSE,SomeFailure" will never be matched. Example path: "Begin" -(Hello)-> "wait".',
                         file="process.ini",
                         section="transitions",
                         line=31,
@@ -272,7 +272,7 @@ class TestTransitionsSectionRuleSet(object):
                     ValidationResult(
                         rule="InvalidTransitionViolation",
                         severity=Severity.CRITICAL,
-                        message='The state "Wait" attempts to transition to "NoNext" but has not been declared.',
+                        message='The state "Wait" attempts to transition to "NoNext" but has not been declared. Example path: "Begin" -(Hello)-> "wait" -(Nothing)-> "NoNext".',
                         file="process.ini",
                         section="transitions",
                         line=32,
@@ -297,6 +297,83 @@ class TestTransitionsSectionRuleSet(object):
                     ),
                 ],
             ),
+            (
+                "tests/data/transitions-graph-invalid-process.ini",
+                "tests/data/valid-prompts.ini",
+                [
+                    # Test to ensure that a state whose every path leads into a closed cycle is caught.
+                    ValidationResult(
+                        rule="NonTerminatingStateViolation",
+                        severity=Severity.CRITICAL,
+                        message='The state "EnterLoop" has no path leading to "END" or a fail state. Example path: "Init" -(Hello)-> "Wait" -(Goodbye)-> "EnterLoop".',
+                        file="process.ini",
+                        section="transitions",
+                        line=26,
+                    ),
+                    # Test to ensure that a cycle with no way out towards END or a fail state is reported once.
+                    ValidationResult(
+                        rule="ClosedCycleViolation",
+                        severity=Severity.CRITICAL,
+                        message='The states "Loop", "LoopBack" form a cycle with no path leading to "END" or a fail state, through the transitions "Loop" -(Waiting)-> "LoopBack", "LoopBack" -(Waiting)-> "Loop", "Loop" -(Hello)-> "Loop". Example path: "Init" -(Hello)-> "Wait" -(Goodbye)-> "EnterLoop" -(Hello)-> "Loop".',
+                        file="process.ini",
+                        section="transitions",
+                        line=27,
+                    ),
+                    # Test to ensure that states which only lead to each other are caught as unreachable.
+                    ValidationResult(
+                        rule="UnreachableStateViolation",
+                        severity=Severity.CRITICAL,
+                        message='The state "Orphan" cannot be reached from the initial state "Init".',
+                        file="process.ini",
+                        section="transitions",
+                        line=30,
+                    ),
+                    ValidationResult(
+                        rule="UnreachableStateViolation",
+                        severity=Severity.CRITICAL,
+                        message='The state "OrphanPair" cannot be reached from the initial state "Init".',
+                        file="process.ini",
+                        section="transitions",
+                        line=31,
+                    ),
+                    ValidationResult(
+                        rule="UnusedConditionViolation",
+                        severity=Severity.WARNING,
+                        message='The condition "TRUE" is declared but is not used.',
+                        file="prompts.ini",
+                        section="conditions",
+                        line=15,
+                    ),
+                ],
+            ),
+            (
+                "tests/data/transitions-shadowed-process.ini",
+                "tests/data/transitions-shadowed-prompts.ini",
+                [
+                    # Test a condition matching everything a later condition from the same state matches is caught.
+                    ValidationResult(
+                        rule="UnreachableTransitionViolation",
+                        severity=Severity.WARNING,
+                        message='The transition "Wait,NewPassword,SetPassword" is unreachable as any output matched by '
+                        'the condition "NewPassword" is matched first by the earlier condition "AnyPassword" from '
+                        '"Wait". Example path: "Init" -(Hello)-> "Wait".',
+                        file="process.ini",
+                        section="transitions",
+                        line=23,
+                    ),
+                    # Test conditions that only shadow a later condition between them are caught.
+                    ValidationResult(
+                        rule="UnreachableTransitionViolation",
+                        severity=Severity.WARNING,
+                        message='The transition "Wait,YesOrNo,SomeFailure" is unreachable as any output matched by '
+                        'the condition "YesOrNo" is matched first by one of the earlier conditions "Yes", "No" from '
+                        '"Wait". Example path: "Init" -(Hello)-> "Wait".',
+                        file="process.ini",
+                        section="transitions",
+                        line=26,
+                    ),
+                ],
+            ),
             (
                 # Test to ensure that validation continues with a missing prompts file.
                 "tests/data/valid-process.ini",
@@ -78,3 +78,24 @@ class TestTransitionsSectionRuleSet(object):
         :param expected_message: The expected message.
         """
         assert str(validation_result) == expected_message
+
+    def test_validation_result_tuple(self) -> None:
+        """Test to ensure that a validation result survives conversion to and from a tuple."""
+        validation_result = ValidationResult(
+            rule="InvalidTokenTypeViolation",
+            severity=Severity.CRITICAL,
+            message='The token type "Transition" is not valid in the "default" section.',
+            file="process.ini",
+            section="default",
+            line=7,
+        )
+
+        assert validation_result.to_tuple() == (
+            "InvalidTokenTypeViolation",
+            "CRITICAL",
+            'The token type "Transition" is not valid in the "default" section.',
+            "process.ini",
+            "default",
+            7,
+        )
+        assert ValidationResult.from_tuple(validation_result.to_tuple()) == validation_result
@@ -1,5 +1,10 @@
 """Test the validator."""
 
+import codecs
+import io
+import zipfile
+from pathlib import Path
+
 import pytest
 
 from tpc_plugin_validator.utilities.exceptions import ProgrammingError
@@ -152,3 +157,238 @@ class TestValidator(object):
             Validator.with_file(process_file_path=process_file, prompts_file_path=prompts_file)
 
         assert exc_info.value.args[0] == expected_message
+
+    @pytest.mark.parametrize(
+        "members",
+        [
+            # Test to ensure that members are located by name.
+            {
+                "UnixProcess.ini": "tests/data/transitions-invalid-process.ini",
+                "UnixPrompts.ini": "tests/data/transitions-invalid-prompts.ini",
+            },
+            # Test to ensure that members are located by name within a directory regardless of case.
+            {
+                "Unix/unixprocess.INI": "tests/data/transitions-invalid-process.ini",
+                "Unix/unixprompts.INI": "tests/data/transitions-invalid-prompts.ini",
+                "Unix/Policy-Unix.ini": "tests/data/valid-process-alt.ini",
+            },
+            # Test to ensure that members are located by their content when their names do not identify them.
+            {
+                "Unix/first.ini": "tests/data/transitions-invalid-process.ini",
+                "Unix/second.ini": "tests/data/transitions-invalid-prompts.ini",
+                "Unix/readme.txt": "tests/data/valid-process.ini",
+            },
+        ],
+    )
+    def test_validator_with_zip(self, tmp_path: Path, members: dict[str, str]) -> None:
+        """
+        Test to ensure that a plugin archive produces the same violations as the extracted files.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        :param members: Mapping of archive member names to the test data written to them.
+        """
+        zip_path = tmp_path / "plugin.zip"
+        with zipfile.ZipFile(zip_path, "w") as archive:
+            for member_name, data_file in members.items():
+                archive.write(data_file, arcname=member_name)
+
+        expected: Validator = Validator.with_file(
+            process_file_path="tests/data/transitions-invalid-process.ini",
+            prompts_file_path="tests/data/transitions-invalid-prompts.ini",
+        )
+        expected.validate()
+
+        validator: Validator = Validator.with_zip(zip_file=str(zip_path))
+        validator.validate()
+
+        assert validator.violations == expected.violations
+        with open(zip_path, "rb") as zip_file:
+            assert Validator.with_zip(zip_file=zip_file).process_file == expected.process_file
+
+    @pytest.mark.parametrize(
+        "members,exception_type,expected_message",
+        [
+            (
+                None,
+                FileNotFoundError,
+                "The archive was not found: {zip_path}",
+            ),
+            (
+                {},
+                ValueError,
+                "The archive does not contain a process or prompts file.",
+            ),
+            (
+                {
+                    "OneProcess.ini": "tests/data/valid-process.ini",
+                    "TwoProcess.ini": "tests/data/valid-process.ini",
+                },
+                ValueError,
+                "The archive contains more than one process file: OneProcess.ini, TwoProcess.ini",
+            ),
+            (
+                {
+                    "first.ini": "tests/data/valid-prompts.ini",
+                    "second.ini": "tests/data/valid-prompts-alt.ini",
+                },
+                ValueError,
+                "The archive contains more than one prompts file: first.ini, second.ini",
+            ),
+        ],
+    )
+    def test_validator_with_zip_exception(
+        self, tmp_path: Path, members: dict[str, str] | None, exception_type, expected_message: str
+    ) -> None:
+        """
+        Test to ensure that invalid archives are reported.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        :param members: Mapping of archive member names to test data, None to not create the archive.
+        :param exception_type: The expected exception type.
+        :param expected_message: The expected message from the thrown exception.
+        """
+        zip_path = tmp_path / "plugin.zip"
+        if members is not None:
+            with zipfile.ZipFile(zip_path, "w") as archive:
+                for member_name, data_file in members.items():
+                    archive.write(data_file, arcname=member_name)
+
+        with pytest.raises(exception_type) as exc_info:
+            Validator.with_zip(zip_file=str(zip_path))
+
+        assert exc_info.value.args[0] == expected_message.format(zip_path=zip_path)
+
+    def test_validator_with_zip_bad_zip(self, tmp_path: Path) -> None:
+        """
+        Test to ensure that a file that is not a zip archive is reported.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        zip_path = tmp_path / "plugin.zip"
+        zip_path.write_bytes(b"not a zip file")
+
+        with pytest.raises(ValueError) as exc_info:
+            Validator.with_zip(zip_file=str(zip_path))
+
+        assert exc_info.value.args[0] == "The archive is not a valid zip file: File is not a zip file"
+
+    @pytest.mark.parametrize(
+        "bom,encoding",
+        [
+            (b"", "utf-8"),
+            (codecs.BOM_UTF8, "utf-8"),
+            (codecs.BOM_UTF16_LE, "utf-16-le"),
+            (codecs.BOM_UTF16_BE, "utf-16-be"),
+            (codecs.BOM_UTF32_LE, "utf-32-le"),
+        ],
+    )
+    def test_validator_from_bytes(self, tmp_path: Path, bom: bytes, encoding: str) -> None:
+        """
+        Test to ensure that raw content is decoded from its byte order mark whichever way it is supplied.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        :param bom: The byte order mark to prefix the content with.
+        :param encoding: The encoding to write the content in.
+        """
+        expected: Validator = Validator.with_file(
+            process_file_path="tests/data/transitions-invalid-process.ini",
+            prompts_file_path="tests/data/transitions-invalid-prompts.ini",
+        )
+        expected.validate()
+
+        raw: dict[str, bytes] = {}
+        for file_type in ("process", "prompts"):
+            with open(f"tests/data/transitions-invalid-{file_type}.ini", "r", encoding="utf-8") as data_file:
+                raw[file_type] = bom + data_file.read().encode(encoding)
+            (tmp_path / f"{file_type}.ini").write_bytes(raw[file_type])
+
+        validators: list[Validator] = [
+            Validator.from_bytes(process_file_content=raw["process"], prompts_file_content=raw["prompts"]),
+            Validator.from_bytes(
+                process_file_content=memoryview(raw["process"]),
+                prompts_file_content=bytearray(raw["prompts"]),
+            ),
+            Validator.from_file_objects(
+                process_file=io.BytesIO(raw["process"]), prompts_file=io.BytesIO(raw["prompts"])
+            ),
+            Validator.with_file(
+                process_file_path=str(tmp_path / "process.ini"),
+                prompts_file_path=str(tmp_path / "prompts.ini"),
+            ),
+        ]
+        for validator in validators:
+            validator.validate()
+            assert validator.violations == expected.violations
+
+    def test_validator_from_bytes_single_file(self) -> None:
+        """Test to ensure that only one file needs to be supplied as bytes."""
+        with open("tests/data/valid-prompts.ini", "rb") as prompts_file:
+            validator: Validator = Validator.from_file_objects(prompts_file=prompts_file)
+
+        validator.validate()
+
+        assert validator.process_file == {}
+        assert validator.violations == []
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            b"[states]\n\xc3\x28\n",
+            codecs.BOM_UTF16_LE + b"[\x00s",
+        ],
+    )
+    def test_validator_from_bytes_exception(self, content: bytes) -> None:
+        """
+        Test to ensure that content that cannot be decoded is reported.
+
+        :param content: The raw content.
+        """
+        with pytest.raises(UnicodeDecodeError):
+            Validator.from_bytes(process_file_content=content)
+
+    def test_validator_from_parsed(self) -> None:
+        """Test to ensure that validating parsed files matches validating their content."""
+        invalid: Validator = Validator.with_file(
+            process_file_path="tests/data/transitions-invalid-process.ini",
+            prompts_file_path="tests/data/transitions-invalid-prompts.ini",
+        )
+        valid: Validator = Validator.with_file(
+            process_file_path="tests/data/valid-process.ini",
+            prompts_file_path="tests/data/valid-prompts.ini",
+        )
+
+        from_parsed: Validator = Validator.from_parsed(
+            process_file=invalid.process_file,
+            prompts_file=invalid.prompts_file,
+        )
+        from_parsed.validate()
+        invalid.validate()
+
+        assert from_parsed.violations == invalid.violations
+        assert from_parsed.process_file is invalid.process_file
+
+        # Swapping in the valid process file keeps the invalid prompts file.
+        replaced: Validator = from_parsed.replace_process_file(process_file=valid.process_file)
+        expected: Validator = Validator.with_file(
+            process_file_path="tests/data/valid-process.ini",
+            prompts_file_path="tests/data/transitions-invalid-prompts.ini",
+        )
+        replaced.validate()
+        expected.validate()
+
+        assert replaced.violations == expected.violations
+        assert replaced.prompts_file is invalid.prompts_file
+
+        replaced = replaced.replace_prompts_file(prompts_file=valid.prompts_file)
+        replaced.validate()
+
+        assert replaced.violations == []
+
+    def test_validator_from_parsed_exception(self) -> None:
+        """Test to ensure that at least one parsed file is required."""
+        with pytest.raises(ProgrammingError) as exc_info:
+            Validator.from_parsed(process_file={}, prompts_file=None)
+
+        assert (
+            exc_info.value.args[0] == "At least one of process file or prompts file is required to complete validation."
+        )
@@ -0,0 +1,152 @@
+"""Tests for the filesystem work queue."""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from tests.conftest import CorpusBuilder
+from tpc_plugin_validator.batch.backends import Backend
+from tpc_plugin_validator.batch.batch_validator import BatchValidator
+from tpc_plugin_validator.batch.plugin_pair import discover_pairs
+from tpc_plugin_validator.batch.work_queue import WorkQueue
+from tpc_plugin_validator.validator import Validator
+
+
+@pytest.fixture
+def corpus(build_corpus: CorpusBuilder) -> Path:
+    """
+    Create a corpus of plugins on disk.
+
+    :param build_corpus: Function creating plugins within a corpus on disk.
+
+    :return: Path to the root of the corpus.
+    """
+    return build_corpus(names=[f"plugin{index}" for index in range(6)])
+
+
+class TestWorkQueue(object):
+    """Tests for the filesystem work queue."""
+
+    def test_enqueue(self, corpus: Path, tmp_path: Path) -> None:
+        """
+        Test to ensure that pairs are only queued once.
+
+        :param corpus: Path to the root of the corpus.
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        work_queue = WorkQueue(path=str(tmp_path / "queue"))
+
+        assert work_queue.enqueue(pairs=discover_pairs(root=str(corpus))) == 6
+        assert work_queue.enqueue(pairs=discover_pairs(root=str(corpus))) == 0
+        assert work_queue.counts() == {"pending": 6, "claimed": 0, "done": 0}
+
+    def test_claim(self, corpus: Path, tmp_path: Path) -> None:
+        """
+        Test to ensure that each item is claimed by exactly one worker.
+
+        :param corpus: Path to the root of the corpus.
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        first = WorkQueue(path=str(tmp_path / "queue"))
+        second = WorkQueue(path=str(tmp_path / "queue"))
+        first.enqueue(pairs=discover_pairs(root=str(corpus)))
+
+        claimed: list[str] = []
+        while claim := (first.claim() or second.claim()):
+            claimed.append(claim[1].name)
+
+        assert sorted(claimed) == [f"plugin{index}" for index in range(6)]
+        assert first.counts() == {"pending": 0, "claimed": 6, "done": 0}
+
+    def test_reclaim_stale(self, corpus: Path, tmp_path: Path) -> None:
+        """
+        Test to ensure that only claims older than the stale timeout are moved back to pending.
+
+        :param corpus: Path to the root of the corpus.
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        work_queue = WorkQueue(path=str(tmp_path / "queue"), stale_after=60)
+        work_queue.enqueue(pairs=discover_pairs(root=str(corpus)))
+        first = work_queue.claim()
+        assert first is not None
+        assert work_queue.claim() is not None
+        stale_time = time.time() - 120
+        os.utime(tmp_path / "queue" / "claimed" / first[0], (stale_time, stale_time))
+
+        assert work_queue.reclaim_stale() == 1
+        assert work_queue.counts() == {"pending": 5, "claimed": 1, "done": 0}
+
+    def test_heartbeat(self, corpus: Path, tmp_path: Path) -> None:
+        """
+        Test to ensure that a claim still held by a live worker is timestamped and so not reclaimed.
+
+        :param corpus: Path to the root of the corpus.
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        work_queue = WorkQueue(path=str(tmp_path / "queue"), stale_after=60)
+        other = WorkQueue(path=str(tmp_path / "queue"), stale_after=60)
+        work_queue.enqueue(pairs=discover_pairs(root=str(corpus)))
+        held = work_queue.claim()
+        assert held is not None
+        stale_time = time.time() - 120
+        os.utime(tmp_path / "queue" / "claimed" / held[0], (stale_time, stale_time))
+
+        assert work_queue.heartbeat() == 1
+        assert other.reclaim_stale() == 0
+        assert other.heartbeat() == 0
+
+    def test_claims_follow_free_workers(self, corpus: Path, tmp_path: Path) -> None:
+        """
+        Test to ensure that a worker only claims an item once it has a free worker to start it on.
+
+        :param corpus: Path to the root of the corpus.
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        work_queue = WorkQueue(path=str(tmp_path / "queue"))
+        work_queue.enqueue(pairs=discover_pairs(root=str(corpus)))
+        batch_validator = BatchValidator(pairs=[], backend=Backend.thread, max_workers=1)
+
+        for _ in work_queue.work(batch_validator=batch_validator, poll_interval=0):
+            assert work_queue.counts()["claimed"] == 0
+
+        assert work_queue.counts() == {"pending": 0, "claimed": 0, "done": 6}
+
+    def test_work(self, corpus: Path, tmp_path: Path) -> None:
+        """
+        Test to ensure that workers finish the queue, including items left behind by a worker that died.
+
+        :param corpus: Path to the root of the corpus.
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        work_queue = WorkQueue(path=str(tmp_path / "queue"), stale_after=60)
+        work_queue.enqueue(pairs=discover_pairs(root=str(corpus)))
+        abandoned = work_queue.claim()
+        assert abandoned is not None
+        stale_time = time.time() - 120
+        os.utime(tmp_path / "queue" / "claimed" / abandoned[0], (stale_time, stale_time))
+
+        batch_validator = BatchValidator(pairs=[], backend=Backend.thread, max_workers=2)
+        validated = [result.pair.name for result in work_queue.work(batch_validator=batch_validator, poll_interval=0)]
+
+        assert sorted(validated) == [f"plugin{index}" for index in range(6)]
+        assert work_queue.counts() == {"pending": 0, "claimed": 0, "done": 6}
+        validator = Validator.with_file(
+            process_file_path=str(corpus / "plugin0" / "process.ini"),
+            prompts_file_path=str(corpus / "plugin0" / "prompts.ini"),
+        )
+        validator.validate()
+        for result in work_queue.results():
+            assert result.violations == validator.violations
+
+    def test_invalid_stale_after(self, tmp_path: Path) -> None:
+        """
+        Test to ensure that a stale timeout that is not positive is rejected.
+
+        :param tmp_path: Temporary directory provided by pytest.
+        """
+        with pytest.raises(ValueError) as exc_info:
+            WorkQueue(path=str(tmp_path), stale_after=0)
+
+        assert exc_info.value.args[0] == "The stale timeout must be greater than 0, 0 was given."
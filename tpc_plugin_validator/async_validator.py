@@ -0,0 +1,85 @@
+"""Asynchronous entry points for validating plugins from within an event loop."""
+
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from concurrent.futures import Executor
+
+from tpc_plugin_validator.batch.batch_result import BatchResult
+from tpc_plugin_validator.batch.batch_validator import BatchValidator
+from tpc_plugin_validator.batch.plugin_pair import PluginPair
+from tpc_plugin_validator.batch.worker import validate_files, validate_pair
+from tpc_plugin_validator.utilities.validation_result import ValidationResult
+
+DEFAULT_CONCURRENCY: int = 8
+
+
+async def avalidate_file(
+    process_file_path: str = "",
+    prompts_file_path: str = "",
+    executor: Executor | None = None,
+) -> list[ValidationResult]:
+    """
+    Validate a single plugin pair without blocking the event loop.
+
+    Reading, parsing and validating all happen on the executor.
+
+    :param process_file_path: Path to the process file.
+    :param prompts_file_path: Path to the prompt file.
+    :param executor: Executor to run the validation on, the loop's default executor is used if not supplied.
+
+    :raises FileNotFoundError: If one of the files does not exist.
+
+    :return: List of ValidationResult
+    """
+    loop = asyncio.get_running_loop()
+    violations = await loop.run_in_executor(executor, validate_files, process_file_path, prompts_file_path)
+    return [ValidationResult.from_tuple(violation) for violation in violations]
+
+
+async def avalidate_many(
+    pairs: Iterable[PluginPair],
+    executor: Executor | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> AsyncIterator[BatchResult]:
+    """
+    Validate many plugin pairs, yielding each result as soon as it completes.
+
+    At most concurrency pairs are in flight at once and pairs are only taken from the iterable as capacity frees up, so
+    a slow plugin never holds back the results of others and a large iterable is never materialised. Closing the
+    iterator or cancelling the task consuming it cancels any validations that have not yet started.
+
+    :param pairs: The plugin pairs to validate.
+    :param executor: Executor to run the validations on, the loop's default executor is used if not supplied.
+    :param concurrency: Maximum number of validations in flight at once.
+
+    :raises ValueError: If concurrency is less than 1.
+
+    :return: Async iterator of BatchResult in completion order.
+    """
+    if concurrency < 1:
+        raise ValueError(f"The concurrency must be at least 1, {concurrency} was given.")
+
+    loop = asyncio.get_running_loop()
+    pending: dict[asyncio.Future, PluginPair] = {}
+    pair_iterator = iter(pairs)
+    exhausted: bool = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                pair: PluginPair | None = next(pair_iterator, None)
+                if pair is None:
+                    exhausted = True
+                    break
+                future = loop.run_in_executor(executor, validate_pair, pair.process_file, pair.prompts_file)
+                pending[future] = pair
+
+            if not pending:
+                return
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield BatchValidator.to_batch_result(pair=pending.pop(future), worker_result=future.result())
+    finally:
+        for future in pending:
+            future.cancel()
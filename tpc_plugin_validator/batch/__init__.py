@@ -0,0 +1 @@
+"""Standard blank __init__ file for the tpc_plugin_validator package."""
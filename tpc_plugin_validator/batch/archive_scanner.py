@@ -0,0 +1,400 @@
+"""Stream plugin pairs out of bulk platform export archives without extracting them to disk."""
+
+import io
+import os
+import posixpath
+import tarfile
+import zipfile
+from collections.abc import Iterator
+from typing import BinaryIO
+
+from tpc_plugin_validator.batch.plugin_pair import PluginPair
+from tpc_plugin_validator.utilities.plugin_archive import (
+    PROCESS_FILE_SUFFIX,
+    PROMPTS_FILE_SUFFIX,
+    is_process_content,
+    is_prompts_content,
+)
+
+ARCHIVE_MEMBER_SEPARATOR: str = "!"
+MAX_FILE_BYTES: int = 1024 * 1024
+MAX_NESTED_ZIP_BYTES: int = 256 * 1024 * 1024
+MAX_NESTING_DEPTH: int = 8
+MAX_UNCOMPRESSED_BYTES: int = 4 * 1024 * 1024 * 1024
+TAR_SUFFIXES: tuple[str, ...] = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+ZIP_SUFFIXES: tuple[str, ...] = (".zip",)
+
+ArchivePair = tuple[PluginPair, bytes, bytes, str]
+
+
+def is_archive(path: str) -> bool:
+    """
+    Check if a path names an archive that can be scanned.
+
+    :param path: The path to check.
+
+    :return: True if the path has a supported archive suffix otherwise False.
+    """
+    return path.lower().endswith(TAR_SUFFIXES + ZIP_SUFFIXES)
+
+
+def scan_archive(
+    archive_path: str,
+    max_depth: int = MAX_NESTING_DEPTH,
+    max_bytes: int = MAX_UNCOMPRESSED_BYTES,
+    max_file_bytes: int = MAX_FILE_BYTES,
+    max_zip_bytes: int = MAX_NESTED_ZIP_BYTES,
+) -> Iterator[ArchivePair]:
+    """
+    Yield every plugin pair within an archive, descending into nested archives.
+
+    Tar archives are read as a stream. Zip archives, including those nested within other archives, are read member by
+    member. Only the files of plugins still waiting for their partner are held in memory, and each container's
+    unpaired files are released once that container has been read. The depth archives may be nested to and the total
+    uncompressed size of their members are capped, so a zip bomb or an archive that contains itself cannot exhaust
+    memory or run forever. A plugin file or nested zip larger than its own cap is not read, it is yielded as a pair of
+    its own with an error.
+
+    :param archive_path: Path to a zip or tar archive.
+    :param max_depth: The deepest an archive may be nested within the outer archive.
+    :param max_bytes: The most bytes the members of the archive and every nested archive may hold uncompressed.
+    :param max_file_bytes: The most bytes a single plugin file may hold uncompressed.
+    :param max_zip_bytes: The most bytes a single nested zip, which is held in memory while it is read, may hold.
+
+    :raises FileNotFoundError: If the archive does not exist.
+    :raises ValueError: If the archive is not a supported type, is corrupt or exceeds a limit.
+
+    :return: Iterator of the pair, attributed to its member paths, with the raw process and prompts content and an
+        error, empty unless a member was too large to read.
+    """
+    if not os.path.isfile(archive_path):
+        raise FileNotFoundError(f"The archive was not found: {archive_path}")
+    if not is_archive(archive_path):
+        raise ValueError(f"The archive type is not supported: {archive_path}")
+
+    if max_depth < 0:
+        raise ValueError(f"The maximum nesting depth must be at least 0, {max_depth} was given.")
+    if max_bytes < 0:
+        raise ValueError(f"The maximum uncompressed size must be at least 0, {max_bytes} was given.")
+    if max_file_bytes < 0:
+        raise ValueError(f"The maximum file size must be at least 0, {max_file_bytes} was given.")
+    if max_zip_bytes < 0:
+        raise ValueError(f"The maximum nested zip size must be at least 0, {max_zip_bytes} was given.")
+
+    with open(archive_path, "rb") as archive_file:
+        yield from _scan(
+            name=os.path.basename(archive_path),
+            archive_file=archive_file,
+            depth=0,
+            budget=_ScanBudget(
+                max_depth=max_depth, max_bytes=max_bytes, max_file_bytes=max_file_bytes, max_zip_bytes=max_zip_bytes
+            ),
+        )
+
+
+def _scan(name: str, archive_file: BinaryIO, depth: int, budget: "_ScanBudget") -> Iterator[ArchivePair]:
+    """
+    Yield every plugin pair within an open archive.
+
+    :param name: The attribution path of the archive.
+    :param archive_file: Binary file object positioned at the start of the archive.
+    :param depth: The number of archives this archive is nested within.
+    :param budget: The limits shared by every archive of the scan.
+
+    :raises ValueError: If the archive is corrupt or exceeds a limit.
+
+    :return: Iterator of ArchivePair
+    """
+    if depth > budget.max_depth:
+        raise ValueError(f"The archive {name} exceeds the maximum nesting depth of {budget.max_depth}.")
+    try:
+        if name.lower().endswith(ZIP_SUFFIXES):
+            yield from _scan_zip(name=name, archive_file=archive_file, depth=depth, budget=budget)
+        else:
+            yield from _scan_tar(name=name, archive_file=archive_file, depth=depth, budget=budget)
+    except (tarfile.TarError, zipfile.BadZipFile) as exc:
+        raise ValueError(f"The archive {name} could not be read: {exc}") from exc
+
+
+def _scan_tar(name: str, archive_file: BinaryIO, depth: int, budget: "_ScanBudget") -> Iterator[ArchivePair]:
+    """
+    Yield every plugin pair within a tar archive, reading it strictly as a stream.
+
+    :param name: The attribution path of the archive.
+    :param archive_file: Binary file object positioned at the start of the archive.
+    :param depth: The number of archives this archive is nested within.
+    :param budget: The limits shared by every archive of the scan.
+
+    :return: Iterator of ArchivePair
+    """
+    collector = _PairCollector(container=name)
+    with tarfile.open(fileobj=archive_file, mode="r|*") as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            budget.consume(name=name, size=member.size)
+            member_file = archive.extractfile(member)
+            if member_file is None:
+                continue
+            yield from _scan_member(
+                collector=collector,
+                member_name=member.name,
+                member_file=member_file,
+                size=member.size,
+                depth=depth,
+                budget=budget,
+            )
+    yield from collector.flush()
+
+
+def _scan_zip(name: str, archive_file: BinaryIO, depth: int, budget: "_ScanBudget") -> Iterator[ArchivePair]:
+    """
+    Yield every plugin pair within a zip archive.
+
+    :param name: The attribution path of the archive.
+    :param archive_file: Seekable binary file object holding the archive.
+    :param depth: The number of archives this archive is nested within.
+    :param budget: The limits shared by every archive of the scan.
+
+    :return: Iterator of ArchivePair
+    """
+    collector = _PairCollector(container=name)
+    with zipfile.ZipFile(archive_file) as archive:
+        for member in archive.infolist():
+            if member.is_dir():
+                continue
+            # Reads from a zip member stop at its recorded size, so the recorded size can be trusted.
+            budget.consume(name=name, size=member.file_size)
+            with archive.open(member) as member_file:
+                yield from _scan_member(
+                    collector=collector,
+                    member_name=member.filename,
+                    member_file=member_file,
+                    size=member.file_size,
+                    depth=depth,
+                    budget=budget,
+                )
+    yield from collector.flush()
+
+
+def _scan_member(
+    collector: "_PairCollector",
+    member_name: str,
+    member_file: BinaryIO,
+    size: int,
+    depth: int,
+    budget: "_ScanBudget",
+) -> Iterator[ArchivePair]:
+    """
+    Handle a single archive member, recursing into it if it is an archive itself.
+
+    :param collector: The collector for the archive holding the member.
+    :param member_name: The name of the member within its archive.
+    :param member_file: Binary file object for the member.
+    :param size: The uncompressed size of the member recorded by its archive.
+    :param depth: The number of archives the archive holding the member is nested within.
+    :param budget: The limits shared by every archive of the scan.
+
+    :return: Iterator of ArchivePair
+    """
+    member_name_lower: str = member_name.lower()
+    nested_name: str = f"{collector.container}{ARCHIVE_MEMBER_SEPARATOR}{member_name}"
+    if member_name_lower.endswith(ZIP_SUFFIXES):
+        # Zip archives need random access so a nested zip is held in memory while it is read.
+        content: bytes | None = _read_member(member_file=member_file, size=size, limit=budget.max_zip_bytes)
+        if content is None:
+            yield _oversized(name=nested_name, limit=budget.max_zip_bytes)
+            return
+        yield from _scan(name=nested_name, archive_file=io.BytesIO(content), depth=depth + 1, budget=budget)
+    elif member_name_lower.endswith(TAR_SUFFIXES):
+        yield from _scan(name=nested_name, archive_file=member_file, depth=depth + 1, budget=budget)
+    elif member_name_lower.endswith(".ini"):
+        content = _read_member(member_file=member_file, size=size, limit=budget.max_file_bytes)
+        if content is None:
+            yield _oversized(name=nested_name, limit=budget.max_file_bytes)
+        elif pair := collector.add(member_name=member_name, content=content):
+            yield pair
+
+
+def _read_member(member_file: BinaryIO, size: int, limit: int) -> bytes | None:
+    """
+    Read a member whole unless it is larger than a limit.
+
+    The size recorded by the archive is checked first and no more than one byte past the limit is read, so an oversized
+    member is never held in memory.
+
+    :param member_file: Binary file object for the member.
+    :param size: The uncompressed size of the member recorded by its archive.
+    :param limit: The most bytes the member may hold.
+
+    :return: The raw content, or None if the member is larger than the limit.
+    """
+    if size > limit:
+        return None
+    content: bytes = member_file.read(limit + 1)
+    return None if len(content) > limit else content
+
+
+def _oversized(name: str, limit: int) -> ArchivePair:
+    """
+    Create the pair reporting a member too large to read.
+
+    :param name: The attribution path of the member.
+    :param limit: The most bytes the member may hold.
+
+    :return: ArchivePair without content, holding the error.
+    """
+    return PluginPair(name=name), b"", b"", f"The archive member {name} exceeds the maximum size of {limit} bytes."
+
+
+class _ScanBudget(object):
+    """Track the uncompressed bytes read by a scan against its limits."""
+
+    __slots__ = (
+        "_read",
+        "max_bytes",
+        "max_depth",
+        "max_file_bytes",
+        "max_zip_bytes",
+    )
+
+    def __init__(self, max_depth: int, max_bytes: int, max_file_bytes: int, max_zip_bytes: int) -> None:
+        """
+        Standard init for the _ScanBudget class.
+
+        :param max_depth: The deepest an archive may be nested within the outer archive.
+        :param max_bytes: The most bytes the members of every archive may hold uncompressed.
+        :param max_file_bytes: The most bytes a single plugin file may hold uncompressed.
+        :param max_zip_bytes: The most bytes a single nested zip may hold uncompressed.
+        """
+        self._read: int = 0
+        self.max_bytes: int = max_bytes
+        self.max_depth: int = max_depth
+        self.max_file_bytes: int = max_file_bytes
+        self.max_zip_bytes: int = max_zip_bytes
+
+    def consume(self, name: str, size: int) -> None:
+        """
+        Count a member about to be read.
+
+        :param name: The attribution path of the archive holding the member.
+        :param size: The uncompressed size of the member.
+
+        :raises ValueError: If the scan would read more than the maximum uncompressed size.
+        """
+        self._read += size
+        if self._read > self.max_bytes:
+            raise ValueError(f"The archive {name} exceeds the maximum uncompressed size of {self.max_bytes} bytes.")
+
+
+class _PairCollector(object):
+    """Pair up the process and prompts files found within a single archive."""
+
+    __slots__ = (
+        "_container",
+        "_pending",
+    )
+
+    def __init__(self, container: str) -> None:
+        """
+        Standard init for the _PairCollector class.
+
+        :param container: The attribution path of the archive.
+        """
+        self._container: str = container
+        self._pending: dict[tuple[str, str], dict[str, tuple[str, bytes]]] = {}
+
+    @property
+    def container(self) -> str:
+        """
+        Property to fetch the attribution path of the archive.
+
+        :return: The attribution path.
+        """
+        return self._container
+
+    def add(self, member_name: str, content: bytes) -> ArchivePair | None:
+        """
+        Add a member, returning a pair as soon as both of its files have been seen.
+
+        :param member_name: The name of the member within its archive.
+        :param content: The raw content of the member.
+
+        :return: The completed pair or None.
+        """
+        directory, file_name = posixpath.split(member_name)
+        file_name_lower: str = file_name.lower()
+        if file_name_lower.endswith(PROCESS_FILE_SUFFIX):
+            file_type, prefix = "process", file_name_lower.removesuffix(PROCESS_FILE_SUFFIX)
+        elif file_name_lower.endswith(PROMPTS_FILE_SUFFIX):
+            file_type, prefix = "prompts", file_name_lower.removesuffix(PROMPTS_FILE_SUFFIX)
+        elif is_process_content(content=content):
+            file_type, prefix = "process", ""
+        elif is_prompts_content(content=content):
+            file_type, prefix = "prompts", ""
+        else:
+            return None
+
+        files = self._pending.setdefault((directory, prefix), {})
+        if file_type in files:
+            # A second file of the same type for the same plugin, validate the first on its own.
+            self._pending[(directory, prefix)] = {file_type: (member_name, content)}
+            return self._create_pair(directory=directory, files=files)
+
+        files[file_type] = (member_name, content)
+        if len(files) < 2:
+            return None
+
+        del self._pending[(directory, prefix)]
+        return self._create_pair(directory=directory, files=files)
+
+    def flush(self) -> Iterator[ArchivePair]:
+        """
+        Release the files still waiting for a partner.
+
+        Where a directory holds exactly one unmatched file of each type they are paired regardless of name, otherwise
+        each file is validated alone.
+
+        :return: Iterator of ArchivePair
+        """
+        by_directory: dict[str, list[dict[str, tuple[str, bytes]]]] = {}
+        for (directory, _), files in self._pending.items():
+            by_directory.setdefault(directory, []).append(files)
+        self._pending = {}
+
+        for directory, groups in by_directory.items():
+            if len(groups) == 2 and {file_type for files in groups for file_type in files} == {"process", "prompts"}:
+                yield self._create_pair(directory=directory, files=groups[0] | groups[1])
+                continue
+            for files in groups:
+                yield self._create_pair(directory=directory, files=files)
+
+    def _create_pair(self, directory: str, files: dict[str, tuple[str, bytes]]) -> ArchivePair:
+        """
+        Create a pair attributed to its members' paths.
+
+        :param directory: The directory within the archive holding the files.
+        :param files: The files keyed by type, each a tuple of member name and content.
+
+        :return: ArchivePair
+        """
+        process_name, process_content = files.get("process", ("", b""))
+        prompts_name, prompts_content = files.get("prompts", ("", b""))
+        file_name: str = posixpath.basename(process_name or prompts_name)
+        prefix: str = ""
+        for suffix in (PROCESS_FILE_SUFFIX, PROMPTS_FILE_SUFFIX):
+            if file_name.lower().endswith(suffix):
+                prefix = file_name[: -len(suffix)].rstrip("-_. ")
+                break
+        location: str = "/".join(part for part in (directory, prefix) if part)
+
+        return (
+            PluginPair(
+                name=f"{self._container}{ARCHIVE_MEMBER_SEPARATOR}{location}" if location else self._container,
+                process_file=f"{self._container}{ARCHIVE_MEMBER_SEPARATOR}{process_name}" if process_name else "",
+                prompts_file=f"{self._container}{ARCHIVE_MEMBER_SEPARATOR}{prompts_name}" if prompts_name else "",
+            ),
+            process_content,
+            prompts_content,
+            "",
+        )
@@ -0,0 +1,76 @@
+"""Executor backends available for batch validation."""
+
+import concurrent.futures
+import signal
+from enum import Enum
+
+from tpc_plugin_validator.batch.limits import ResourceLimits
+from tpc_plugin_validator.batch.worker import preload
+
+
+class Backend(Enum):
+    """Enum to hold the supported executor backends."""
+
+    interpreter = "interpreter"
+    process = "process"
+    thread = "thread"
+
+
+def available_backends() -> list[Backend]:
+    """
+    Fetch the backends that can be used with the running Python.
+
+    :return: List of available backends.
+    """
+    backends: list[Backend] = [Backend.process, Backend.thread]
+    if hasattr(concurrent.futures, "InterpreterPoolExecutor"):
+        backends.insert(0, Backend.interpreter)
+    return backends
+
+
+def check_time_limit(backend: Backend, limits: ResourceLimits | None) -> None:
+    """
+    Check that a time limit can interrupt a pair on the backend.
+
+    Only a worker running on the main thread of its own process can be interrupted by a timer. Threads and
+    sub-interpreters can only check the time between steps, so a pair that hangs within a step would hang the pool.
+
+    :param backend: The backend the pairs will be validated with.
+    :param limits: The resource limits each pair must stay within.
+
+    :raises ValueError: If a time limit is set and cannot be enforced.
+    """
+    if limits is None or not limits.max_seconds:
+        return
+    if backend != Backend.process:
+        raise ValueError(
+            f"The maximum validation time can only be enforced with the process backend, {backend.value} was given."
+        )
+    if not hasattr(signal, "setitimer"):
+        raise ValueError("The maximum validation time cannot be enforced on a platform without setitimer.")
+
+
+def create_executor(backend: Backend, max_workers: int | None = None) -> concurrent.futures.Executor:
+    """
+    Create an executor for the requested backend.
+
+    Process and interpreter workers import the validator once at start up via the initializer so the first task does
+    not pay for it.
+
+    :param backend: The backend to create.
+    :param max_workers: Maximum number of workers, the executor default is used if not supplied.
+
+    :raises ValueError: If the backend is not available with the running Python.
+
+    :return: The executor.
+    """
+    if backend == Backend.thread:
+        return concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+    if backend == Backend.process:
+        return concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=preload)
+
+    interpreter_pool = getattr(concurrent.futures, "InterpreterPoolExecutor", None)
+    if interpreter_pool is None:
+        raise ValueError("The interpreter backend requires Python 3.14 or later.")
+    return interpreter_pool(max_workers=max_workers, initializer=preload)
@@ -0,0 +1,24 @@
+"""Class to hold the result of validating a single plugin pair within a batch."""
+
+from dataclasses import dataclass, field
+
+from tpc_plugin_validator.batch.plugin_pair import PluginPair
+from tpc_plugin_validator.utilities.validation_result import ValidationResult
+
+
+@dataclass
+class BatchResult(object):
+    """Class to hold the result of validating a single plugin pair within a batch."""
+
+    pair: PluginPair
+    violations: list[ValidationResult] = field(default_factory=list)
+    error: str = ""
+
+    @property
+    def passed(self) -> bool:
+        """
+        Property to check if the pair validated without violations or errors.
+
+        :return: True if the pair passed otherwise False.
+        """
+        return not self.violations and not self.error
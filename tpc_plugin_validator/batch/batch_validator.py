@@ -0,0 +1,572 @@
+"""Class to manage validation of many plugin pairs."""
+
+import os
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, Executor, Future, wait
+from functools import partial
+from typing import Any
+
+from tpc_plugin_validator.batch.archive_scanner import scan_archive
+from tpc_plugin_validator.batch.backends import Backend, check_time_limit, create_executor
+from tpc_plugin_validator.batch.batch_result import BatchResult
+from tpc_plugin_validator.batch.fingerprint import PairFingerprint, fingerprint_pair_content, remap_violations
+from tpc_plugin_validator.batch.journal import Journal, content_digest
+from tpc_plugin_validator.batch.limits import ResourceLimits
+from tpc_plugin_validator.batch.plugin_pair import PluginPair, discover_pairs
+from tpc_plugin_validator.batch.scheduling import MAX_CHUNK_SIZE, chunk_target, estimate_costs
+from tpc_plugin_validator.batch.sharding import Shard, in_shard
+from tpc_plugin_validator.batch.worker import (
+    ChunkResult,
+    WorkerResult,
+    report_error,
+    run_chunk,
+    validate_pair,
+    validate_pair_content,
+)
+from tpc_plugin_validator.utilities.validation_result import ValidationResult
+
+Task = tuple[PluginPair, Callable[..., WorkerResult], tuple]
+
+
+class BatchValidator(object):
+    """Class to manage validation of many plugin pairs."""
+
+    __slots__ = (
+        "_archive_path",
+        "_backend",
+        "_chunk_target",
+        "_config",
+        "_costs",
+        "_deduplicate",
+        "_duplicate_groups",
+        "_journal",
+        "_limits",
+        "_makespan",
+        "_max_in_flight",
+        "_max_workers",
+        "_pairs",
+        "_resumed",
+        "_schedule",
+        "_shard",
+        "_stats",
+        "_timings",
+    )
+
+    def __init__(
+        self,
+        pairs: list[PluginPair],
+        backend: Backend = Backend.process,
+        max_workers: int | None = None,
+        archive_path: str = "",
+        deduplicate: bool = False,
+        shard: Shard | None = None,
+        journal: Journal | None = None,
+        schedule: bool = False,
+        stats: dict[str, float] | None = None,
+        limits: ResourceLimits | None = None,
+        config: dict[str, dict[str, Any]] | None = None,
+    ) -> None:
+        """
+        Standard init for the BatchValidator class.
+
+        :param pairs: The plugin pairs to validate.
+        :param backend: The executor backend to validate with.
+        :param max_workers: Maximum number of workers, the executor default is used if not supplied.
+        :param archive_path: Path to an archive to stream pairs from instead of reading them from disk.
+        :param deduplicate: Validate pairs that only differ by comments or whitespace once and share the results.
+        :param shard: The shard to validate as a tuple of index and count, every pair is validated if not supplied.
+        :param journal: An open journal to record completed pairs in and to replay unchanged pairs from.
+        :param schedule: Submit the most expensive pairs first, grouping cheap pairs into shared tasks.
+        :param stats: Recorded validation times in seconds keyed by pair name, used to estimate costs when scheduling.
+        :param limits: The resource limits each pair must stay within, nothing is enforced if not supplied.
+        :param config: Configuration of the rule sets keyed by rule set, the defaults are used if not supplied.
+
+        :raises ValueError: If a time limit is set and cannot be enforced with the backend.
+        """
+        check_time_limit(backend=backend, limits=limits)
+
+        self._archive_path: str = archive_path
+        self._backend: Backend = backend
+        self._chunk_target: float = 0.0
+        self._config: dict[str, dict[str, Any]] = config or {}
+        self._costs: dict[PluginPair, float] = {}
+        self._deduplicate: bool = deduplicate
+        self._duplicate_groups: dict[bytes, list[PluginPair]] = {}
+        self._journal: Journal | None = journal
+        self._limits: ResourceLimits | None = limits
+        self._makespan: float = 0.0
+        self._max_workers: int | None = max_workers
+        self._max_in_flight: int = (max_workers or os.cpu_count() or 1) * 4
+        self._pairs: list[PluginPair] = [pair for pair in pairs if in_shard(name=pair.name, shard=shard)]
+        self._resumed: int = 0
+        self._schedule: bool = schedule
+        self._shard: Shard | None = shard
+        self._stats: dict[str, float] = stats or {}
+        self._timings: dict[str, float] = {}
+
+    def run(self) -> Iterator[BatchResult]:
+        """
+        Validate every pair, yielding results as they complete.
+
+        Pairs are submitted to the executor as capacity frees up, so only a bounded number are held in memory at once.
+
+        :return: Iterator of BatchResult in completion order.
+        """
+        self._duplicate_groups = {}
+        self._resumed = 0
+        self._timings = {}
+        started: float = time.perf_counter()
+        if self._schedule and not self._archive_path:
+            self._costs = estimate_costs(pairs=self._pairs, stats=self._stats)
+            self._chunk_target = chunk_target(costs=self._costs, workers=self._max_workers or os.cpu_count() or 1)
+
+        tasks: Iterable[Task] = self._tasks()
+        digests: dict[PluginPair, str] = {}
+        replayed: list[BatchResult] = []
+        if self._journal is not None:
+            tasks = self._journal_tasks(tasks=tasks, digests=digests, replayed=replayed)
+
+        with create_executor(backend=self._backend, max_workers=self._max_workers) as executor:
+            if self._deduplicate:
+                results: Iterator[BatchResult] = self._execute_unique(executor=executor, tasks=tasks)
+            else:
+                results = self._execute(executor=executor, tasks=tasks)
+
+            for result in results:
+                if self._journal is not None:
+                    self._journal.record(result=result, digest=digests.pop(result.pair, ""))
+                yield result
+                while replayed:
+                    yield replayed.pop()
+            yield from replayed
+        self._makespan = time.perf_counter() - started
+
+    def validate_stream(self, pairs: Iterable[PluginPair]) -> Iterator[BatchResult]:
+        """
+        Validate pairs taken lazily from an iterable, such as pairs claimed from a work queue, yielding results as they
+        complete.
+
+        A pair is only taken from the iterable once a worker is free to start it, so nothing is held waiting in the
+        executor's queue.
+
+        :param pairs: The pairs to validate.
+
+        :return: Iterator of BatchResult in completion order.
+        """
+        with create_executor(backend=self._backend, max_workers=self._max_workers) as executor:
+            yield from self._execute(
+                executor=executor,
+                tasks=(self._pair_task(pair=pair) for pair in pairs),
+                max_in_flight=self._max_workers or os.cpu_count() or 1,
+            )
+
+    def _execute(
+        self,
+        executor: Executor,
+        tasks: Iterable[Task],
+        max_in_flight: int | None = None,
+    ) -> Iterator[BatchResult]:
+        """
+        Submit tasks to the executor keeping no more than the in-flight limit outstanding.
+
+        When scheduling, consecutive tasks whose combined cost is below the chunk target are submitted together, so
+        cheap pairs share a round trip to the worker while expensive pairs are dispatched alone. A chunk whose worker
+        fails, such as one that died, reports an error for each of its pairs and the rest of the batch carries on.
+
+        :param executor: The executor to submit to.
+        :param tasks: The tasks to run, consumed lazily.
+        :param max_in_flight: Most chunks outstanding at once, four per worker if not supplied.
+
+        :return: Iterator of BatchResult in completion order.
+        """
+        limit: int = max_in_flight or self._max_in_flight
+        pending: dict[Future[ChunkResult], tuple[PluginPair, ...]] = {}
+        task_iterator: Iterator[Task] = iter(tasks)
+        held: Task | None = None
+        exhausted: bool = False
+
+        while True:
+            while not exhausted and len(pending) < limit:
+                chunk: list[Task] = []
+                cost: float = 0.0
+                while len(chunk) < MAX_CHUNK_SIZE:
+                    task: Task | None = held if held is not None else next(task_iterator, None)
+                    held = None
+                    if task is None:
+                        exhausted = True
+                        break
+                    # A pair without an estimate is treated as expensive so that it is dispatched alone.
+                    task_cost: float = self._costs.get(task[0], self._chunk_target)
+                    if chunk and cost + task_cost > self._chunk_target:
+                        held = task
+                        break
+                    chunk.append(task)
+                    cost += task_cost
+                    if cost >= self._chunk_target:
+                        break
+                if not chunk:
+                    break
+                calls = tuple((function, arguments) for _, function, arguments in chunk)
+                chunk_pairs: tuple[PluginPair, ...] = tuple(pair for pair, _, _ in chunk)
+                try:
+                    pending[executor.submit(run_chunk, calls)] = chunk_pairs
+                except BrokenExecutor as exc:
+                    yield from (BatchResult(pair=pair, error=f"{type(exc).__name__}: {exc}") for pair in chunk_pairs)
+
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pairs: tuple[PluginPair, ...] = pending.pop(future)
+                try:
+                    chunk_result: ChunkResult = future.result()
+                except Exception as exc:
+                    yield from (BatchResult(pair=pair, error=f"{type(exc).__name__}: {exc}") for pair in pairs)
+                    continue
+                for pair, (worker_result, seconds) in zip(pairs, chunk_result):
+                    self._timings[pair.name] = seconds
+                    yield self.to_batch_result(pair=pair, worker_result=worker_result)
+
+    def _execute_unique(self, executor: Executor, tasks: Iterable[Task]) -> Iterator[BatchResult]:
+        """
+        Submit only the first pair of each fingerprint, fanning its result out to the duplicates.
+
+        Each pair is fingerprinted as it is taken from the task stream, from the content the task already holds. A
+        duplicate seen while its representative is still running waits for that result, one seen afterwards is
+        answered straight away. A pair whose content could not be read is validated alone.
+
+        :param executor: The executor to submit to.
+        :param tasks: The tasks to run, consumed lazily.
+
+        :return: Iterator of BatchResult in completion order.
+        """
+        representatives: dict[PluginPair, PairFingerprint] = {}
+        waiting: dict[bytes, list[tuple[PluginPair, PairFingerprint]]] = {}
+        completed: dict[bytes, tuple[BatchResult, PairFingerprint]] = {}
+        ready: list[BatchResult] = []
+
+        # The section limit counts comments, which fingerprints ignore, so only identical pairs are shared under it.
+        exact: bool = self._limits is not None and bool(self._limits.max_section_tokens)
+
+        def unique_tasks() -> Iterator[Task]:
+            for pair, function, arguments in tasks:
+                pair_fingerprint: PairFingerprint | None = (
+                    fingerprint_pair_content(*arguments, exact=exact) if _holds_content(arguments=arguments) else None
+                )
+                if pair_fingerprint is None:
+                    yield pair, function, arguments
+                    continue
+
+                self._duplicate_groups.setdefault(pair_fingerprint.key, []).append(pair)
+                if pair_fingerprint.key in completed:
+                    result, source = completed[pair_fingerprint.key]
+                    ready.append(self._fan_out(result=result, source=source, pair=pair, target=pair_fingerprint))
+                elif pair_fingerprint.key in waiting:
+                    waiting[pair_fingerprint.key].append((pair, pair_fingerprint))
+                else:
+                    waiting[pair_fingerprint.key] = []
+                    representatives[pair] = pair_fingerprint
+                    yield pair, function, arguments
+
+        for result in self._execute(executor=executor, tasks=unique_tasks()):
+            yield result
+            source: PairFingerprint | None = representatives.pop(result.pair, None)
+            if source is not None:
+                completed[source.key] = (result, source)
+                for pair, target in waiting.pop(source.key):
+                    yield self._fan_out(result=result, source=source, pair=pair, target=target)
+            while ready:
+                yield ready.pop()
+        yield from ready
+
+    def _journal_tasks(
+        self,
+        tasks: Iterable[Task],
+        digests: dict[PluginPair, str],
+        replayed: list[BatchResult],
+    ) -> Iterator[Task]:
+        """
+        Skip the pairs the journal holds a result for whose content has not changed.
+
+        The content is hashed from what the task already holds. A pair whose content could not be read is never
+        skipped.
+
+        :param tasks: The tasks to filter.
+        :param digests: Populated with the content hash of each pair that is passed on, to be recorded in the journal.
+        :param replayed: Populated with the journalled results of the pairs that are skipped.
+
+        :return: Iterator of the tasks that still need to run.
+        """
+        for pair, function, arguments in tasks:
+            pair_digest: str = content_digest(*arguments) if _holds_content(arguments=arguments) else ""
+            if self._journal is not None and (result := self._journal.completed(name=pair.name, digest=pair_digest)):
+                self._resumed += 1
+                replayed.append(result)
+                continue
+            digests[pair] = pair_digest
+            yield pair, function, arguments
+
+    def _pair_task(self, pair: PluginPair) -> Task:
+        """
+        Create the task validating a pair on disk.
+
+        :param pair: The pair to validate.
+
+        :return: Task
+        """
+        return pair, self._worker_function(function=validate_pair), (pair.process_file, pair.prompts_file)
+
+    def _read_task(self, pair: PluginPair) -> Task:
+        """
+        Create the task validating a pair from its content, read once here so that the journal, deduplication and the
+        worker all share a single read of each file.
+
+        A pair that cannot be read, or with a file larger than the size limit, is left for the worker to read so that
+        it reports the problem as it would for any other pair.
+
+        :param pair: The pair to validate.
+
+        :return: Task
+        """
+        max_file_bytes: int = self._limits.max_file_bytes if self._limits is not None else 0
+        contents: list[bytes] = []
+        for path in (pair.process_file, pair.prompts_file):
+            if not path:
+                contents.append(b"")
+                continue
+            try:
+                if max_file_bytes and os.path.getsize(path) > max_file_bytes:
+                    return self._pair_task(pair=pair)
+                with open(path, "rb") as file:
+                    contents.append(file.read())
+            except OSError:
+                return self._pair_task(pair=pair)
+        return pair, self._worker_function(function=validate_pair_content), tuple(contents)
+
+    def _tasks(self) -> Iterator[Task]:
+        """
+        Create the tasks to run, streaming pairs from the archive if one was given.
+
+        :return: Iterator of tasks.
+        """
+        if self._archive_path:
+            function: Callable[..., WorkerResult] = self._worker_function(function=validate_pair_content)
+            for pair, process_file_content, prompts_file_content, error in scan_archive(
+                archive_path=self._archive_path
+            ):
+                if not in_shard(name=pair.name, shard=self._shard):
+                    continue
+                if error:
+                    yield pair, report_error, (error,)
+                    continue
+                yield pair, function, (process_file_content, prompts_file_content)
+            return
+
+        pairs: list[PluginPair] = self._pairs
+        if self._costs:
+            pairs = sorted(pairs, key=lambda pair: self._costs.get(pair, 0.0), reverse=True)
+        read: bool = self._deduplicate or self._journal is not None
+        for pair in pairs:
+            yield self._read_task(pair=pair) if read else self._pair_task(pair=pair)
+
+    def _worker_function(self, function: Callable[..., WorkerResult]) -> Callable[..., WorkerResult]:
+        """
+        Bind the resource limits and rule set configuration to a worker function.
+
+        They are bound rather than added to the arguments so that the arguments remain the pair's files, as expected
+        when fingerprinting and journalling tasks.
+
+        :param function: The worker function.
+
+        :return: The worker function, with the limits and configuration bound if any were supplied.
+        """
+        keywords: dict[str, Any] = {}
+        if self._limits is not None:
+            keywords["limits"] = self._limits
+        if self._config:
+            keywords["config"] = self._config
+        return partial(function, **keywords) if keywords else function
+
+    @property
+    def duplicate_groups(self) -> list[list[PluginPair]]:
+        """
+        Property to fetch the groups of pairs found to be duplicates during the last run.
+
+        :return: List of groups, each a list of PluginPair in the order they were found.
+        """
+        return [group for group in self._duplicate_groups.values() if len(group) > 1]
+
+    @property
+    def makespan(self) -> float:
+        """
+        Property to fetch the wall clock seconds taken by the last run.
+
+        :return: The makespan in seconds.
+        """
+        return self._makespan
+
+    @property
+    def pairs(self) -> list[PluginPair]:
+        """
+        Property to fetch the pairs to be validated, pairs streamed from an archive are not known in advance.
+
+        :return: List of PluginPair
+        """
+        return self._pairs
+
+    @property
+    def resumed(self) -> int:
+        """
+        Property to fetch the number of pairs replayed from the journal during the last run.
+
+        :return: The number of pairs.
+        """
+        return self._resumed
+
+    @property
+    def timings(self) -> dict[str, float]:
+        """
+        Property to fetch the seconds each pair validated during the last run took within its worker.
+
+        :return: Dictionary of seconds keyed by pair name.
+        """
+        return self._timings
+
+    @classmethod
+    def _fan_out(
+        cls,
+        result: BatchResult,
+        source: PairFingerprint,
+        pair: PluginPair,
+        target: PairFingerprint,
+    ) -> BatchResult:
+        """
+        Create the result for a duplicate pair from the result of its representative.
+
+        :param result: The result of the representative pair.
+        :param source: Fingerprint of the representative pair.
+        :param pair: The duplicate pair.
+        :param target: Fingerprint of the duplicate pair.
+
+        :return: BatchResult
+        """
+        return BatchResult(
+            pair=pair,
+            violations=remap_violations(violations=result.violations, source=source, target=target),
+            error=result.error,
+        )
+
+    @classmethod
+    def to_batch_result(cls, pair: PluginPair, worker_result: WorkerResult) -> BatchResult:
+        """
+        Convert the compact result returned by a worker into a BatchResult.
+
+        :param pair: The pair the worker validated.
+        :param worker_result: The result returned by the worker.
+
+        :return: BatchResult
+        """
+        violations, error = worker_result
+        return BatchResult(
+            pair=pair,
+            violations=[ValidationResult.from_tuple(violation) for violation in violations],
+            error=error,
+        )
+
+    @classmethod
+    def with_archive(
+        cls,
+        archive_path: str,
+        backend: Backend = Backend.process,
+        max_workers: int | None = None,
+        deduplicate: bool = False,
+        shard: Shard | None = None,
+        journal: Journal | None = None,
+        limits: ResourceLimits | None = None,
+        config: dict[str, dict[str, Any]] | None = None,
+    ) -> "BatchValidator":
+        """
+        Create a batch validator that streams every plugin pair out of an archive, including nested archives.
+
+        :param archive_path: Path to a zip or tar archive.
+        :param backend: The executor backend to validate with.
+        :param max_workers: Maximum number of workers, the executor default is used if not supplied.
+        :param deduplicate: Validate pairs that only differ by comments or whitespace once and share the results.
+        :param shard: The shard to validate as a tuple of index and count, every pair is validated if not supplied.
+        :param journal: An open journal to record completed pairs in and to replay unchanged pairs from.
+        :param limits: The resource limits each pair must stay within, nothing is enforced if not supplied.
+        :param config: Configuration of the rule sets keyed by rule set, the defaults are used if not supplied.
+
+        :raises FileNotFoundError: If the archive does not exist.
+
+        :return: Self
+        """
+        if not os.path.isfile(archive_path):
+            raise FileNotFoundError(f"The archive was not found: {archive_path}")
+        return BatchValidator(
+            pairs=[],
+            backend=backend,
+            max_workers=max_workers,
+            archive_path=archive_path,
+            deduplicate=deduplicate,
+            shard=shard,
+            journal=journal,
+            limits=limits,
+            config=config,
+        )
+
+    @classmethod
+    def with_directory(
+        cls,
+        root: str,
+        backend: Backend = Backend.process,
+        max_workers: int | None = None,
+        deduplicate: bool = False,
+        shard: Shard | None = None,
+        journal: Journal | None = None,
+        schedule: bool = False,
+        stats: dict[str, float] | None = None,
+        limits: ResourceLimits | None = None,
+        config: dict[str, dict[str, Any]] | None = None,
+    ) -> "BatchValidator":
+        """
+        Create a batch validator for every plugin pair found beneath a directory.
+
+        :param root: Directory to search for plugin pairs.
+        :param backend: The executor backend to validate with.
+        :param max_workers: Maximum number of workers, the executor default is used if not supplied.
+        :param deduplicate: Validate pairs that only differ by comments or whitespace once and share the results.
+        :param shard: The shard to validate as a tuple of index and count, every pair is validated if not supplied.
+        :param journal: An open journal to record completed pairs in and to replay unchanged pairs from.
+        :param schedule: Submit the most expensive pairs first, grouping cheap pairs into shared tasks.
+        :param stats: Recorded validation times in seconds keyed by pair name, used to estimate costs when scheduling.
+        :param limits: The resource limits each pair must stay within, nothing is enforced if not supplied.
+        :param config: Configuration of the rule sets keyed by rule set, the defaults are used if not supplied.
+
+        :return: Self
+        """
+        return BatchValidator(
+            pairs=discover_pairs(root=root),
+            backend=backend,
+            max_workers=max_workers,
+            deduplicate=deduplicate,
+            shard=shard,
+            journal=journal,
+            schedule=schedule,
+            stats=stats,
+            limits=limits,
+            config=config,
+        )
+
+
+def _holds_content(arguments: tuple) -> bool:
+    """
+    Check whether the arguments of a task are the raw content of a pair rather than the paths to its files.
+
+    :param arguments: The arguments of the task.
+
+    :return: True if the task holds the content.
+    """
+    return all(isinstance(argument, bytes) for argument in arguments)
@@ -0,0 +1,155 @@
+"""Normalised fingerprints used to find plugin pairs that will validate identically."""
+
+import bisect
+import dataclasses
+import hashlib
+from dataclasses import dataclass
+
+from tpc_plugin_validator.utilities.decoding import decode_content
+from tpc_plugin_validator.utilities.types import FileNames
+from tpc_plugin_validator.utilities.validation_result import ValidationResult
+
+_COMMENT_PREFIXES: tuple[str, ...] = ("#", ";")
+
+
+@dataclass(frozen=True)
+class PairFingerprint(object):
+    """Class to hold the normalised fingerprint of a plugin pair."""
+
+    key: bytes
+    process_lines: tuple[int, ...] = ()
+    prompts_lines: tuple[int, ...] = ()
+
+
+def fingerprint_content(content: str) -> tuple[bytes, tuple[int, ...]]:
+    """
+    Fingerprint file content ignoring comments, blank lines, trailing whitespace and line endings.
+
+    :param content: The decoded file content.
+
+    :return: Tuple of the digest and the original line number of each significant line.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    line_numbers: list[int] = []
+    for line_number, line in enumerate(content.splitlines(), start=1):
+        line = line.rstrip()
+        if not line or line.lstrip().startswith(_COMMENT_PREFIXES):
+            continue
+        digest.update(line.encode("utf-8", "surrogatepass"))
+        digest.update(b"\n")
+        line_numbers.append(line_number)
+    return digest.digest(), tuple(line_numbers)
+
+
+def fingerprint_pair_content(
+    process_file_content: bytes, prompts_file_content: bytes, exact: bool = False
+) -> PairFingerprint | None:
+    """
+    Fingerprint a plugin pair from its raw content.
+
+    Comments are ignored, yet the resource limit on the tokens in a section counts them, so two pairs differing only
+    in comments may fall either side of the limit. Pairs must be fingerprinted exactly when that limit is enforced.
+
+    :param process_file_content: Raw content for the process file, empty if not supplied.
+    :param prompts_file_content: Raw content for the prompts file, empty if not supplied.
+    :param exact: Whether only pairs with identical raw content should share a fingerprint.
+
+    :return: PairFingerprint or None if either file could not be decoded, so that the pair is validated on its own.
+    """
+    try:
+        process_digest, process_lines = (
+            fingerprint_content(content=decode_content(data=process_file_content))
+            if process_file_content
+            else (b"", ())
+        )
+        prompts_digest, prompts_lines = (
+            fingerprint_content(content=decode_content(data=prompts_file_content))
+            if prompts_file_content
+            else (b"", ())
+        )
+    except UnicodeDecodeError:
+        return None
+
+    pair_fingerprint: PairFingerprint = _create_fingerprint(
+        process_digest=process_digest,
+        process_lines=process_lines,
+        prompts_digest=prompts_digest,
+        prompts_lines=prompts_lines,
+    )
+    if not exact:
+        return pair_fingerprint
+    return dataclasses.replace(
+        pair_fingerprint,
+        key=pair_fingerprint.key
+        + hashlib.blake2b(process_file_content, digest_size=16).digest()
+        + hashlib.blake2b(prompts_file_content, digest_size=16).digest(),
+    )
+
+
+def remap_violations(
+    violations: list[ValidationResult],
+    source: PairFingerprint,
+    target: PairFingerprint,
+) -> list[ValidationResult]:
+    """
+    Move the line numbers of violations found in one pair onto a pair with the same fingerprint.
+
+    Pairs with the same fingerprint share their significant lines in the same order, so a line number is remapped by
+    its position among the significant lines.
+
+    :param violations: Violations found validating the source pair.
+    :param source: Fingerprint of the pair that was validated.
+    :param target: Fingerprint of the duplicate pair.
+
+    :return: List of ValidationResult with line numbers for the target pair.
+    """
+    remapped: list[ValidationResult] = []
+    for violation in violations:
+        if violation.file == FileNames.process.value:
+            line = _remap_line(line=violation.line, source=source.process_lines, target=target.process_lines)
+        elif violation.file == FileNames.prompts.value:
+            line = _remap_line(line=violation.line, source=source.prompts_lines, target=target.prompts_lines)
+        else:
+            line = violation.line
+        remapped.append(dataclasses.replace(violation, line=line) if line != violation.line else violation)
+    return remapped
+
+
+def _create_fingerprint(
+    process_digest: bytes,
+    process_lines: tuple[int, ...],
+    prompts_digest: bytes,
+    prompts_lines: tuple[int, ...],
+) -> PairFingerprint:
+    """
+    Combine the fingerprints of both files of a pair.
+
+    :param process_digest: Digest of the process file, empty if not supplied.
+    :param process_lines: Significant line numbers of the process file.
+    :param prompts_digest: Digest of the prompts file, empty if not supplied.
+    :param prompts_lines: Significant line numbers of the prompts file.
+
+    :return: PairFingerprint
+    """
+    return PairFingerprint(
+        # A missing file is padded so that a process only pair never matches a prompts only pair.
+        key=(process_digest or bytes(16)) + (prompts_digest or bytes(16)),
+        process_lines=process_lines,
+        prompts_lines=prompts_lines,
+    )
+
+
+def _remap_line(line: int, source: tuple[int, ...], target: tuple[int, ...]) -> int:
+    """
+    Remap a line number by its position among the significant lines.
+
+    :param line: The line number in the source file.
+    :param source: Significant line numbers of the source file.
+    :param target: Significant line numbers of the target file.
+
+    :return: The line number in the target file, unchanged if the line is not a significant line.
+    """
+    index: int = bisect.bisect_left(source, line)
+    if line <= 0 or index >= len(source) or source[index] != line or index >= len(target):
+        return line
+    return target[index]
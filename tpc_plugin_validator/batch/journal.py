@@ -0,0 +1,197 @@
+"""Journal of completed plugin pairs so an interrupted batch run can be resumed."""
+
+import hashlib
+import json
+import os
+from types import TracebackType
+from typing import TextIO
+
+from tpc_plugin_validator.batch.batch_result import BatchResult
+from tpc_plugin_validator.batch.plugin_pair import PluginPair
+from tpc_plugin_validator.utilities.validation_result import ValidationResult
+
+DEFAULT_SYNC_EVERY: int = 64
+
+
+def content_digest(process_file_content: bytes, prompts_file_content: bytes) -> str:
+    """
+    Hash the raw content of a plugin pair.
+
+    :param process_file_content: Raw content for the process file, empty if not supplied.
+    :param prompts_file_content: Raw content for the prompts file, empty if not supplied.
+
+    :return: Hex digest of the pair.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for content in (process_file_content, prompts_file_content):
+        digest.update(len(content).to_bytes(8, "big"))
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def file_digest(process_file_path: str, prompts_file_path: str) -> str:
+    """
+    Hash the raw content of a plugin pair on disk.
+
+    :param process_file_path: Path to the process file, empty if not supplied.
+    :param prompts_file_path: Path to the prompts file, empty if not supplied.
+
+    :return: Hex digest of the pair, empty if either file could not be read so that the pair is never skipped.
+    """
+    contents: list[bytes] = []
+    for path in (process_file_path, prompts_file_path):
+        if not path:
+            contents.append(b"")
+            continue
+        try:
+            with open(path, "rb") as file:
+                contents.append(file.read())
+        except OSError:
+            return ""
+    return content_digest(process_file_content=contents[0], prompts_file_content=contents[1])
+
+
+class Journal(object):
+    """
+    Journal of completed plugin pairs so an interrupted batch run can be resumed.
+
+    Each completed pair is appended as a line of JSON holding the hash of its content and its result. Lines are flushed
+    to disk in batches, so a run that is killed loses at most the last batch, and a partially written final line is
+    discarded when the journal is read back.
+    """
+
+    __slots__ = (
+        "_completed",
+        "_file",
+        "_path",
+        "_resume",
+        "_sync_every",
+        "_unsynced",
+    )
+
+    def __init__(self, path: str, resume: bool = False, sync_every: int = DEFAULT_SYNC_EVERY) -> None:
+        """
+        Standard init for the Journal class.
+
+        :param path: Path to the journal file.
+        :param resume: Keep the pairs already in the journal rather than starting a new one.
+        :param sync_every: Number of pairs recorded between each flush to disk.
+
+        :raises ValueError: If sync_every is less than 1.
+        """
+        if sync_every < 1:
+            raise ValueError(f"The journal sync interval must be at least 1, {sync_every} was given.")
+        self._completed: dict[str, tuple[str, BatchResult]] = {}
+        self._file: TextIO | None = None
+        self._path: str = path
+        self._resume: bool = resume
+        self._sync_every: int = sync_every
+        self._unsynced: int = 0
+
+    def __enter__(self) -> "Journal":
+        """
+        Open the journal, reading back the pairs already completed when resuming.
+
+        :return: Self
+        """
+        if self._resume and os.path.isfile(self._path):
+            # Drop any partially written final entry so that new entries start on a line of their own.
+            os.truncate(self._path, self._load())
+            self._file = open(self._path, "a", encoding="utf-8")
+        else:
+            self._file = open(self._path, "w", encoding="utf-8")
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """
+        Flush and close the journal.
+
+        :param exc_type: The type of the exception raised within the context, if any.
+        :param exc_value: The exception raised within the context, if any.
+        :param traceback: The traceback of the exception raised within the context, if any.
+        """
+        if self._file is None:
+            return
+        self._sync()
+        self._file.close()
+        self._file = None
+
+    def completed(self, name: str, digest: str) -> BatchResult | None:
+        """
+        Fetch the journalled result of a pair if its content has not changed since it was recorded.
+
+        :param name: The name of the pair.
+        :param digest: The hash of the pair's current content.
+
+        :return: The journalled BatchResult or None if the pair must be validated.
+        """
+        entry: tuple[str, BatchResult] | None = self._completed.get(name)
+        if entry is None or not digest or entry[0] != digest:
+            return None
+        return entry[1]
+
+    def record(self, result: BatchResult, digest: str) -> None:
+        """
+        Append a completed pair to the journal.
+
+        :param result: The result of the pair.
+        :param digest: The hash of the pair's content when it was validated.
+
+        :raises ValueError: If the journal has not been opened.
+        """
+        if self._file is None:
+            raise ValueError("The journal must be opened before recording.")
+
+        entry: dict = {
+            "name": result.pair.name,
+            "process_file": result.pair.process_file,
+            "prompts_file": result.pair.prompts_file,
+            "digest": digest,
+            "error": result.error,
+            "violations": [violation.to_tuple() for violation in result.violations],
+        }
+        self._file.write(f"{json.dumps(entry, separators=(',', ':'))}\n")
+        self._unsynced += 1
+        if self._unsynced >= self._sync_every:
+            self._sync()
+
+    def _load(self) -> int:
+        """
+        Read back the pairs already in the journal, later entries for a pair replacing earlier ones.
+
+        :return: The length in bytes of the journal up to the end of the last complete entry.
+        """
+        valid_length: int = 0
+        with open(self._path, "rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry: dict = json.loads(line)
+                except ValueError:
+                    break
+                result = BatchResult(
+                    pair=PluginPair(
+                        name=entry["name"],
+                        process_file=entry["process_file"],
+                        prompts_file=entry["prompts_file"],
+                    ),
+                    violations=[ValidationResult.from_tuple(tuple(violation)) for violation in entry["violations"]],
+                    error=entry["error"],
+                )
+                self._completed[result.pair.name] = (entry["digest"], result)
+                valid_length += len(line)
+        return valid_length
+
+    def _sync(self) -> None:
+        """Flush the recorded pairs through to disk."""
+        if self._file is None or not self._unsynced:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
@@ -0,0 +1,171 @@
+"""Per-pair resource limits enforced inside batch validation workers."""
+
+import signal
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from types import FrameType
+
+from tpc_plugin_parser.lexer.utilities.types import ALL_TOKEN_TYPES
+
+from tpc_plugin_validator.utilities.severity import Severity
+from tpc_plugin_validator.utilities.types import FileNames, Violations
+from tpc_plugin_validator.utilities.validation_result import ValidationResult
+
+
+@dataclass(frozen=True)
+class ResourceLimits(object):
+    """
+    Class to hold the limits a single plugin pair must stay within, a limit of zero is not enforced.
+
+    The limits are passed to the worker alongside each pair, so they must only hold builtin types.
+    """
+
+    max_file_bytes: int = 0
+    max_section_tokens: int = 0
+    max_seconds: float = 0.0
+
+    def __post_init__(self) -> None:
+        """
+        Check that no limit is negative.
+
+        :raises ValueError: If a limit is negative.
+        """
+        if self.max_file_bytes < 0:
+            raise ValueError(f"The maximum file size must be at least 0, {self.max_file_bytes} was given.")
+        if self.max_section_tokens < 0:
+            raise ValueError(
+                f"The maximum number of tokens per section must be at least 0, {self.max_section_tokens} was given."
+            )
+        if self.max_seconds < 0:
+            raise ValueError(f"The maximum validation time must be at least 0, {self.max_seconds} was given.")
+
+
+class ResourceLimitExceeded(Exception):
+    """Raised within a worker when a plugin pair exceeds one of its resource limits."""
+
+    def __init__(self, message: str, file: FileNames | None = None, section: str = "") -> None:
+        """
+        Standard init for the ResourceLimitExceeded class.
+
+        :param message: The text describing the limit that was exceeded.
+        :param file: The file that exceeded the limit, None if the pair as a whole exceeded it.
+        :param section: The section that exceeded the limit, if any.
+        """
+        super().__init__(message)
+        self.violation: ValidationResult = ValidationResult(
+            rule=Violations.resource_limit_violation.value,
+            severity=Severity.CRITICAL,
+            message=message,
+            file=file.value if file else "",
+            section=section,
+        )
+
+
+def check_file_size(size: int, file: FileNames, limits: ResourceLimits | None) -> None:
+    """
+    Check the size of a file before it is read or parsed.
+
+    :param size: The size of the file in bytes.
+    :param file: The file being checked.
+    :param limits: The limits to enforce, nothing is enforced if None.
+
+    :raises ResourceLimitExceeded: If the file is larger than the limit.
+    """
+    if limits is None or not limits.max_file_bytes or size <= limits.max_file_bytes:
+        return
+    raise ResourceLimitExceeded(
+        message=f"The file is {size} bytes which exceeds the limit of {limits.max_file_bytes} bytes.",
+        file=file,
+    )
+
+
+def check_sections(
+    parsed_file: dict[str, list[ALL_TOKEN_TYPES]], file: FileNames, limits: ResourceLimits | None
+) -> None:
+    """
+    Check the number of tokens in each section of a parsed file before it is validated.
+
+    :param parsed_file: The parsed file.
+    :param file: The file being checked.
+    :param limits: The limits to enforce, nothing is enforced if None.
+
+    :raises ResourceLimitExceeded: If a section holds more tokens than the limit.
+    """
+    if limits is None or not limits.max_section_tokens:
+        return
+    for section_name, tokens in parsed_file.items():
+        if len(tokens) > limits.max_section_tokens:
+            raise ResourceLimitExceeded(
+                message=(
+                    f"The section holds {len(tokens)} tokens which exceeds the limit of "
+                    f"{limits.max_section_tokens} tokens."
+                ),
+                file=file,
+                section=section_name,
+            )
+
+
+def check_deadline(deadline: float) -> None:
+    """
+    Check whether the time allowed for a pair has run out.
+
+    :param deadline: The perf_counter value at which the time runs out, zero if there is no limit.
+
+    :raises ResourceLimitExceeded: If the deadline has passed.
+    """
+    if deadline and time.perf_counter() > deadline:
+        raise _timed_out()
+
+
+@contextmanager
+def time_limit(limits: ResourceLimits | None) -> Iterator[float]:
+    """
+    Limit the wall clock time spent within the context.
+
+    Where the worker runs on the main thread of its own process, as with the process backend on platforms providing
+    setitimer, an interval timer interrupts the pair as soon as the time runs out. Threads and sub-interpreters cannot
+    be interrupted, so there the deadline yielded is checked between each step instead.
+
+    :param limits: The limits to enforce, nothing is enforced if None.
+
+    :raises ResourceLimitExceeded: If the timer interrupts the context.
+
+    :return: The perf_counter value at which the time runs out, zero if there is no limit.
+    """
+    if limits is None or not limits.max_seconds:
+        yield 0.0
+        return
+
+    deadline: float = time.perf_counter() + limits.max_seconds
+    if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield deadline
+        return
+
+    def interrupt(signal_number: int, frame: FrameType | None) -> None:
+        raise _timed_out()
+
+    try:
+        previous_handler = signal.signal(signal.SIGALRM, interrupt)
+    except ValueError:
+        # Signals can only be handled by the main interpreter.
+        yield deadline
+        return
+
+    signal.setitimer(signal.ITIMER_REAL, limits.max_seconds)
+    try:
+        yield deadline
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def _timed_out() -> ResourceLimitExceeded:
+    """
+    Create the exception raised when a pair runs out of time.
+
+    :return: ResourceLimitExceeded
+    """
+    return ResourceLimitExceeded(message="The plugin could not be validated within the time limit.")
@@ -0,0 +1,290 @@
+"""Class to validate a corpus of plugin pairs through a staged pipeline."""
+
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, Executor, Future, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Any
+
+from tpc_plugin_validator.batch.backends import Backend, check_time_limit, create_executor
+from tpc_plugin_validator.batch.batch_result import BatchResult
+from tpc_plugin_validator.batch.batch_validator import BatchValidator
+from tpc_plugin_validator.batch.limits import ResourceLimitExceeded, ResourceLimits, check_file_size
+from tpc_plugin_validator.batch.plugin_pair import PluginPair, discover_pairs
+from tpc_plugin_validator.batch.sharding import Shard, in_shard
+from tpc_plugin_validator.batch.stage_counter import StageCounter
+from tpc_plugin_validator.batch.worker import TimedWorkerResult, preload, validate_pair_text
+from tpc_plugin_validator.utilities.decoding import read_file
+from tpc_plugin_validator.utilities.types import FileNames
+
+DEFAULT_IO_THREADS: int = 4
+
+ReadResult = tuple[str, str, float]
+
+
+def read_pair(process_file_path: str, prompts_file_path: str, limits: ResourceLimits | None = None) -> ReadResult:
+    """
+    Read and decode both files of a plugin pair, run on the I/O threads of the pipeline.
+
+    :param process_file_path: Path to the process file, empty if not supplied.
+    :param prompts_file_path: Path to the prompts file, empty if not supplied.
+    :param limits: The resource limits the pair must stay within, nothing is enforced if None.
+
+    :raises FileNotFoundError: If either file does not exist.
+    :raises ResourceLimitExceeded: If either file is larger than the limit.
+    :raises UnicodeDecodeError: If either file is not valid for its detected encoding.
+
+    :return: Tuple of the process content, the prompts content and the seconds spent reading.
+    """
+    started: float = time.perf_counter()
+    process_file_content: str = _read_text(path=process_file_path, file=FileNames.process, limits=limits)
+    prompts_file_content: str = _read_text(path=prompts_file_path, file=FileNames.prompts, limits=limits)
+    return process_file_content, prompts_file_content, time.perf_counter() - started
+
+
+def _read_text(path: str, file: FileNames, limits: ResourceLimits | None = None) -> str:
+    """
+    Read and decode a plugin file, checking its size before it is read.
+
+    :param path: Path to the file, empty if not supplied.
+    :param file: The file being read, used in the error message.
+    :param limits: The resource limits to enforce, nothing is enforced if None.
+
+    :raises FileNotFoundError: If the file does not exist.
+    :raises ResourceLimitExceeded: If the file is larger than the limit.
+
+    :return: The decoded content, empty if no path was given.
+    """
+    if not path:
+        return ""
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"The {file.name} file was not found: {path}")
+    check_file_size(size=os.path.getsize(path), file=file, limits=limits)
+    return read_file(path=path)
+
+
+class BatchPipeline(object):
+    """Class to validate a corpus of plugin pairs through a staged pipeline."""
+
+    __slots__ = (
+        "_backend",
+        "_config",
+        "_counters",
+        "_io_threads",
+        "_limits",
+        "_max_workers",
+        "_pairs",
+        "_queue_size",
+    )
+
+    def __init__(
+        self,
+        pairs: list[PluginPair],
+        backend: Backend = Backend.process,
+        max_workers: int | None = None,
+        io_threads: int = DEFAULT_IO_THREADS,
+        queue_size: int | None = None,
+        shard: Shard | None = None,
+        limits: ResourceLimits | None = None,
+        config: dict[str, dict[str, Any]] | None = None,
+    ) -> None:
+        """
+        Standard init for the BatchPipeline class.
+
+        :param pairs: The plugin pairs to validate.
+        :param backend: The executor backend to parse and validate with.
+        :param max_workers: Maximum number of workers, the executor default is used if not supplied.
+        :param io_threads: Number of threads reading and decoding files.
+        :param queue_size: Maximum number of pairs held between two stages, four per worker if not supplied.
+        :param shard: The shard to validate as a tuple of index and count, every pair is validated if not supplied.
+        :param limits: The resource limits each pair must stay within, nothing is enforced if not supplied.
+        :param config: Configuration of the rule sets keyed by rule set, the defaults are used if not supplied.
+
+        :raises ValueError: If the number of I/O threads or the queue size is less than 1, or a time limit is set and
+            cannot be enforced with the backend.
+        """
+        check_time_limit(backend=backend, limits=limits)
+        if io_threads < 1:
+            raise ValueError(f"The number of I/O threads must be at least 1, {io_threads} was given.")
+        if queue_size is not None and queue_size < 1:
+            raise ValueError(f"The queue size must be at least 1, {queue_size} was given.")
+
+        self._backend: Backend = backend
+        self._config: dict[str, dict[str, Any]] = config or {}
+        self._counters: list[StageCounter] = []
+        self._io_threads: int = io_threads
+        self._limits: ResourceLimits | None = limits
+        self._max_workers: int | None = max_workers
+        self._pairs: list[PluginPair] = [pair for pair in pairs if in_shard(name=pair.name, shard=shard)]
+        self._queue_size: int = queue_size or (max_workers or os.cpu_count() or 1) * 4
+
+    def run(self) -> Iterator[BatchResult]:
+        """
+        Validate every pair, yielding results as they complete.
+
+        Files are read and decoded by a pool of threads while earlier pairs are parsed and validated by the executor,
+        so the disks and the CPUs are kept busy at the same time. The time the caller spends handling each result is
+        counted as the report stage.
+
+        :return: Iterator of BatchResult in completion order.
+        """
+        workers: int = self._max_workers or os.cpu_count() or 1
+        self._counters = [
+            StageCounter(name="read", workers=self._io_threads),
+            StageCounter(name="parse", workers=workers),
+            StageCounter(name="validate", workers=workers),
+            StageCounter(name="report"),
+        ]
+        report: StageCounter = self._counters[3]
+
+        for result in self._stream():
+            started: float = time.perf_counter()
+            yield result
+            report.add(seconds=time.perf_counter() - started)
+
+    def _stream(self) -> Iterator[BatchResult]:
+        """
+        Move pairs through the read stage and the executor, keeping each bounded by the queue size.
+
+        A pair is only read once there is room for it in the queue ahead of the executor, and only submitted once the
+        executor has room for it, so a slow stage holds back the stages in front of it rather than letting work pile up
+        in memory.
+
+        :return: Iterator of BatchResult in completion order.
+        """
+        with create_executor(backend=self._backend, max_workers=self._max_workers) as executor:
+            # Start the workers before the read threads so that process workers are not forked from a threaded parent.
+            try:
+                executor.submit(preload).result()
+            except BrokenExecutor:
+                # Each pair is reported with the error when it is submitted.
+                pass
+            with ThreadPoolExecutor(max_workers=self._io_threads, thread_name_prefix="tpc-read") as readers:
+                yield from self._pump(executor=executor, readers=readers)
+
+    def _pump(self, executor: Executor, readers: ThreadPoolExecutor) -> Iterator[BatchResult]:
+        """
+        Run the stages until every pair has been reported.
+
+        A pair whose validation fails in the executor, such as in a worker that died, is reported with an error and the
+        rest of the batch carries on.
+
+        :param executor: The executor parsing and validating pairs.
+        :param readers: The thread pool reading and decoding files.
+
+        :return: Iterator of BatchResult in completion order.
+        """
+        read, parse, validate = self._counters[:3]
+        pair_iterator: Iterator[PluginPair] = iter(self._pairs)
+        exhausted: bool = False
+        reading: dict[Future[ReadResult], PluginPair] = {}
+        decoded: deque[tuple[PluginPair, str, str]] = deque()
+        validating: dict[Future[TimedWorkerResult], PluginPair] = {}
+        read_function: Callable[..., ReadResult] = read_pair
+        validate_function: Callable[..., TimedWorkerResult] = validate_pair_text
+        if self._limits is not None:
+            read_function = partial(read_pair, limits=self._limits)
+            validate_function = partial(validate_pair_text, limits=self._limits)
+        if self._config:
+            validate_function = partial(validate_function, config=self._config)
+
+        while True:
+            while not exhausted and len(reading) + len(decoded) < self._queue_size:
+                pair: PluginPair | None = next(pair_iterator, None)
+                if pair is None:
+                    exhausted = True
+                    break
+                reading[readers.submit(read_function, pair.process_file, pair.prompts_file)] = pair
+
+            while decoded and len(validating) < self._queue_size:
+                pair, process_file_content, prompts_file_content = decoded.popleft()
+                try:
+                    validating[executor.submit(validate_function, process_file_content, prompts_file_content)] = pair
+                except BrokenExecutor as exc:
+                    yield BatchResult(pair=pair, error=f"{type(exc).__name__}: {exc}")
+
+            if not reading and not validating:
+                return
+
+            done, _ = wait([*reading, *validating], return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in reading:
+                    pair = reading.pop(future)
+                    try:
+                        process_file_content, prompts_file_content, seconds = future.result()
+                    except ResourceLimitExceeded as exc:
+                        yield BatchResult(pair=pair, violations=[exc.violation])
+                        continue
+                    except (OSError, UnicodeDecodeError) as exc:
+                        yield BatchResult(pair=pair, error=f"{type(exc).__name__}: {exc}")
+                        continue
+                    read.add(seconds=seconds)
+                    decoded.append((pair, process_file_content, prompts_file_content))
+                    continue
+
+                pair = validating.pop(future)
+                try:
+                    worker_result, parse_seconds, validate_seconds = future.result()
+                except Exception as exc:
+                    yield BatchResult(pair=pair, error=f"{type(exc).__name__}: {exc}")
+                    continue
+                parse.add(seconds=parse_seconds)
+                validate.add(seconds=validate_seconds)
+                yield BatchValidator.to_batch_result(pair=pair, worker_result=worker_result)
+
+    @property
+    def counters(self) -> list[StageCounter]:
+        """
+        Property to fetch the throughput counters of each stage from the last run.
+
+        :return: List of StageCounter in pipeline order.
+        """
+        return self._counters
+
+    @property
+    def pairs(self) -> list[PluginPair]:
+        """
+        Property to fetch the pairs to be validated.
+
+        :return: List of PluginPair
+        """
+        return self._pairs
+
+    @classmethod
+    def with_directory(
+        cls,
+        root: str,
+        backend: Backend = Backend.process,
+        max_workers: int | None = None,
+        io_threads: int = DEFAULT_IO_THREADS,
+        queue_size: int | None = None,
+        shard: Shard | None = None,
+        limits: ResourceLimits | None = None,
+        config: dict[str, dict[str, Any]] | None = None,
+    ) -> "BatchPipeline":
+        """
+        Create a batch pipeline for every plugin pair found beneath a directory.
+
+        :param root: Directory to search for plugin pairs.
+        :param backend: The executor backend to parse and validate with.
+        :param max_workers: Maximum number of workers, the executor default is used if not supplied.
+        :param io_threads: Number of threads reading and decoding files.
+        :param queue_size: Maximum number of pairs held between two stages, four per worker if not supplied.
+        :param shard: The shard to validate as a tuple of index and count, every pair is validated if not supplied.
+        :param limits: The resource limits each pair must stay within, nothing is enforced if not supplied.
+        :param config: Configuration of the rule sets keyed by rule set, the defaults are used if not supplied.
+
+        :return: Self
+        """
+        return BatchPipeline(
+            pairs=discover_pairs(root=root),
+            backend=backend,
+            max_workers=max_workers,
+            io_threads=io_threads,
+            queue_size=queue_size,
+            shard=shard,
+            limits=limits,
+            config=config,
+        )
@@ -0,0 +1,110 @@
+"""Structures and helpers for locating plugin process and prompts file pairs."""
+
+import os
+from dataclasses import dataclass
+
+from tpc_plugin_validator.utilities.plugin_archive import PROCESS_FILE_SUFFIX, PROMPTS_FILE_SUFFIX
+
+
+@dataclass(frozen=True)
+class PluginPair(object):
+    """Class to hold the location of a process and prompts file that make up a single plugin."""
+
+    name: str
+    process_file: str = ""
+    prompts_file: str = ""
+
+
+def discover_pairs(root: str) -> list[PluginPair]:
+    """
+    Walk a directory tree and pair up the process and prompts files found.
+
+    Files are paired by the prefix in front of "process.ini" and "prompts.ini", for example "UnixProcess.ini" and
+    "UnixPrompts.ini". Where a directory holds exactly one unmatched file of each type they are paired regardless of
+    prefix. Any file that still has no partner is returned on its own so that it is validated alone.
+
+    :param root: Directory to search.
+
+    :raises FileNotFoundError: If the directory does not exist.
+
+    :return: List of PluginPair sorted by name.
+    """
+    if not os.path.isdir(root):
+        raise FileNotFoundError(f"The directory was not found: {root}")
+
+    pairs: list[PluginPair] = []
+    for directory, sub_directories, file_names in os.walk(root):
+        sub_directories.sort()
+        process_files: dict[str, str] = {}
+        prompts_files: dict[str, str] = {}
+        for file_name in sorted(file_names):
+            file_name_lower = file_name.lower()
+            if file_name_lower.endswith(PROCESS_FILE_SUFFIX):
+                process_files[file_name_lower.removesuffix(PROCESS_FILE_SUFFIX)] = file_name
+            elif file_name_lower.endswith(PROMPTS_FILE_SUFFIX):
+                prompts_files[file_name_lower.removesuffix(PROMPTS_FILE_SUFFIX)] = file_name
+
+        relative_directory = os.path.relpath(directory, root)
+        relative_directory = "" if relative_directory == "." else relative_directory
+
+        for prefix in sorted(process_files.keys() & prompts_files.keys()):
+            pairs.append(
+                _create_pair(
+                    directory=directory,
+                    relative_directory=relative_directory,
+                    process_file_name=process_files.pop(prefix),
+                    prompts_file_name=prompts_files.pop(prefix),
+                )
+            )
+
+        if len(process_files) == 1 and len(prompts_files) == 1:
+            pairs.append(
+                _create_pair(
+                    directory=directory,
+                    relative_directory=relative_directory,
+                    process_file_name=process_files.popitem()[1],
+                    prompts_file_name=prompts_files.popitem()[1],
+                )
+            )
+
+        pairs.extend(
+            _create_pair(directory=directory, relative_directory=relative_directory, process_file_name=file_name)
+            for file_name in process_files.values()
+        )
+        pairs.extend(
+            _create_pair(directory=directory, relative_directory=relative_directory, prompts_file_name=file_name)
+            for file_name in prompts_files.values()
+        )
+
+    return sorted(pairs, key=lambda pair: pair.name)
+
+
+def _create_pair(
+    directory: str,
+    relative_directory: str,
+    process_file_name: str = "",
+    prompts_file_name: str = "",
+) -> PluginPair:
+    """
+    Create a PluginPair named after the location of its files relative to the search root.
+
+    :param directory: Directory holding the files.
+    :param relative_directory: The directory relative to the search root.
+    :param process_file_name: File name of the process file if found.
+    :param prompts_file_name: File name of the prompts file if found.
+
+    :return: PluginPair
+    """
+    file_name: str = process_file_name or prompts_file_name
+    suffix_length: int = len(PROCESS_FILE_SUFFIX if process_file_name else PROMPTS_FILE_SUFFIX)
+    prefix: str = file_name[:-suffix_length].rstrip("-_. ")
+    if not prefix:
+        # Files named just "process.ini" and "prompts.ini" take the name of their directory.
+        name: str = relative_directory or os.path.basename(os.path.normpath(directory))
+    else:
+        name = os.path.join(relative_directory, prefix) if relative_directory else prefix
+    return PluginPair(
+        name=name,
+        process_file=os.path.join(directory, process_file_name) if process_file_name else "",
+        prompts_file=os.path.join(directory, prompts_file_name) if prompts_file_name else "",
+    )
@@ -0,0 +1,232 @@
+"""Compact binary files holding batch results so the results of several shards can be merged."""
+
+from collections.abc import Iterable, Iterator
+from types import TracebackType
+from typing import BinaryIO
+
+from tpc_plugin_validator.batch.batch_result import BatchResult
+from tpc_plugin_validator.batch.plugin_pair import PluginPair
+from tpc_plugin_validator.utilities.validation_result import ValidationResult
+
+RESULT_FILE_MAGIC: bytes = b"TPCR\x01"
+
+
+class ResultWriter(object):
+    """
+    Stream batch results to a file.
+
+    Rule names, messages, severities and file names repeat heavily across a corpus, so each distinct string is written
+    once and then referred to by its index. Integers are written as variable length so that the common small values
+    take a single byte.
+    """
+
+    __slots__ = (
+        "_file",
+        "_path",
+        "_strings",
+    )
+
+    def __init__(self, path: str) -> None:
+        """
+        Standard init for the ResultWriter class.
+
+        :param path: Path to the file to write, replaced if it exists.
+        """
+        self._file: BinaryIO | None = None
+        self._path: str = path
+        self._strings: dict[str, int] = {}
+
+    def __enter__(self) -> "ResultWriter":
+        """
+        Open the file and write the header.
+
+        :return: Self
+        """
+        self._file = open(self._path, "wb")
+        self._file.write(RESULT_FILE_MAGIC)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """
+        Close the file.
+
+        :param exc_type: The type of the exception raised within the context, if any.
+        :param exc_value: The exception raised within the context, if any.
+        :param traceback: The traceback of the exception raised within the context, if any.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def write(self, result: BatchResult) -> None:
+        """
+        Write a single batch result.
+
+        :param result: The result to write.
+
+        :raises ValueError: If the writer has not been opened.
+        """
+        if self._file is None:
+            raise ValueError("The result writer must be opened before writing.")
+
+        buffer = bytearray()
+        for value in (result.pair.name, result.pair.process_file, result.pair.prompts_file, result.error):
+            self._pack_string(buffer=buffer, value=value)
+        _pack_varint(buffer=buffer, value=len(result.violations))
+        for violation in result.violations:
+            rule, severity, message, file, section, line = violation.to_tuple()
+            for value in (rule, severity, message, file, section):
+                self._pack_string(buffer=buffer, value=value)
+            # Lines are never negative in practice but are zigzag encoded so that any int survives the round trip.
+            _pack_varint(buffer=buffer, value=line << 1 if line >= 0 else (-line << 1) - 1)
+        self._file.write(buffer)
+
+    def write_all(self, results: Iterable[BatchResult]) -> None:
+        """
+        Write every batch result.
+
+        :param results: The results to write.
+        """
+        for result in results:
+            self.write(result=result)
+
+    def _pack_string(self, buffer: bytearray, value: str) -> None:
+        """
+        Append a string, or a reference to it if it has already been written.
+
+        :param buffer: The buffer to append to.
+        :param value: The string to append.
+        """
+        index: int | None = self._strings.get(value)
+        if index is not None:
+            _pack_varint(buffer=buffer, value=index << 1)
+            return
+
+        encoded: bytes = value.encode("utf-8", "surrogatepass")
+        self._strings[value] = len(self._strings)
+        _pack_varint(buffer=buffer, value=len(encoded) << 1 | 1)
+        buffer += encoded
+
+
+def _pack_varint(buffer: bytearray, value: int) -> None:
+    """
+    Append a non-negative integer seven bits at a time, the high bit of each byte marking that more follow.
+
+    :param buffer: The buffer to append to.
+    :param value: The integer to append.
+    """
+    while value > 0x7F:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_results(path: str) -> Iterator[BatchResult]:
+    """
+    Read the batch results held in a file.
+
+    :param path: Path to the file.
+
+    :raises FileNotFoundError: If the file does not exist.
+    :raises ValueError: If the file is not a batch result file or is truncated.
+
+    :return: Iterator of BatchResult in the order they were written.
+    """
+    with open(path, "rb") as file:
+        data: bytes = file.read()
+    if not data.startswith(RESULT_FILE_MAGIC):
+        raise ValueError(f"The file is not a batch result file: {path}")
+
+    try:
+        yield from _ResultReader(data=data, offset=len(RESULT_FILE_MAGIC)).read()
+    except (IndexError, UnicodeDecodeError) as exc:
+        raise ValueError(f"The batch result file is truncated or corrupt: {path}") from exc
+
+
+class _ResultReader(object):
+    """Decode the records of a batch result file."""
+
+    __slots__ = (
+        "_data",
+        "_offset",
+        "_strings",
+    )
+
+    def __init__(self, data: bytes, offset: int) -> None:
+        """
+        Standard init for the _ResultReader class.
+
+        :param data: The content of the file.
+        :param offset: The offset of the first record.
+        """
+        self._data: bytes = data
+        self._offset: int = offset
+        self._strings: list[str] = []
+
+    def read(self) -> Iterator[BatchResult]:
+        """
+        Decode every record.
+
+        :return: Iterator of BatchResult
+        """
+        while self._offset < len(self._data):
+            name, process_file, prompts_file, error = (self._unpack_string() for _ in range(4))
+            violations: list[ValidationResult] = []
+            for _ in range(self._unpack_varint()):
+                rule, severity, message, file, section = (self._unpack_string() for _ in range(5))
+                line: int = self._unpack_varint()
+                line = line >> 1 if not line & 1 else -((line + 1) >> 1)
+                violations.append(ValidationResult.from_tuple((rule, severity, message, file, section, line)))
+            yield BatchResult(
+                pair=PluginPair(name=name, process_file=process_file, prompts_file=prompts_file),
+                violations=violations,
+                error=error,
+            )
+
+    def _unpack_varint(self) -> int:
+        """
+        Decode a single variable length integer.
+
+        :raises IndexError: If the integer runs past the end of the file.
+
+        :return: The integer.
+        """
+        byte: int = self._data[self._offset]
+        self._offset += 1
+        if byte < 0x80:
+            return byte
+
+        value: int = byte & 0x7F
+        shift: int = 7
+        while True:
+            byte = self._data[self._offset]
+            self._offset += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def _unpack_string(self) -> str:
+        """
+        Decode a string, or resolve a reference to a string already read.
+
+        :raises IndexError: If the string runs past the end of the file or refers to an unknown string.
+
+        :return: The string.
+        """
+        value: int = self._unpack_varint()
+        if not value & 1:
+            return self._strings[value >> 1]
+
+        end: int = self._offset + (value >> 1)
+        if end > len(self._data):
+            raise IndexError(end)
+        string: str = self._data[self._offset : end].decode("utf-8", "surrogatepass")
+        self._offset = end
+        self._strings.append(string)
+        return string
@@ -0,0 +1,101 @@
+"""Cost estimates used to schedule the most expensive plugin pairs first."""
+
+import json
+import os
+
+from tpc_plugin_validator.batch.plugin_pair import PluginPair
+
+CHUNKS_PER_WORKER: int = 16
+MAX_CHUNK_SIZE: int = 64
+
+
+def estimate_costs(pairs: list[PluginPair], stats: dict[str, float]) -> dict[PluginPair, float]:
+    """
+    Estimate the cost of validating each pair.
+
+    Pairs with a recorded timing use it. The remaining pairs are costed by their size on disk, converted to seconds
+    using the time per byte of the recorded pairs when there are any, so every estimate shares a unit.
+
+    :param pairs: The pairs to estimate.
+    :param stats: Recorded validation times in seconds keyed by pair name.
+
+    :return: Dictionary of the estimated cost keyed by pair.
+    """
+    sizes: dict[PluginPair, int] = {
+        pair: _size(path=pair.process_file) + _size(path=pair.prompts_file) for pair in pairs
+    }
+    recorded_seconds: float = 0.0
+    recorded_bytes: int = 0
+    for pair, size in sizes.items():
+        if pair.name in stats:
+            recorded_seconds += stats[pair.name]
+            recorded_bytes += size
+    seconds_per_byte: float = recorded_seconds / recorded_bytes if recorded_seconds and recorded_bytes else 1.0
+
+    return {pair: stats.get(pair.name, size * seconds_per_byte) for pair, size in sizes.items()}
+
+
+def chunk_target(costs: dict[PluginPair, float], workers: int) -> float:
+    """
+    Fetch the cost below which pairs are grouped into a single task.
+
+    The target aims for a fixed number of tasks per worker. Pairs costing more than the target are dispatched alone,
+    while cheaper pairs are grouped until the target is reached so they share the cost of crossing into the worker.
+
+    :param costs: The estimated cost of each pair.
+    :param workers: The number of workers.
+
+    :return: The target cost of a task.
+    """
+    return sum(costs.values()) / (max(workers, 1) * CHUNKS_PER_WORKER)
+
+
+def load_stats(path: str) -> dict[str, float]:
+    """
+    Load recorded validation times.
+
+    :param path: Path to the stats file.
+
+    :raises ValueError: If the stats file is not valid.
+
+    :return: Dictionary of the validation time in seconds keyed by pair name, empty if the file does not exist.
+    """
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as file:
+            stats = json.load(file)
+    except (OSError, ValueError) as exc:
+        raise ValueError(f"The stats file could not be read: {exc}") from exc
+    if not isinstance(stats, dict):
+        raise ValueError(f"The stats file could not be read: {path}")
+    return {str(name): float(seconds) for name, seconds in stats.items()}
+
+
+def save_stats(path: str, stats: dict[str, float]) -> None:
+    """
+    Save recorded validation times, replacing the file in a single step.
+
+    :param path: Path to the stats file.
+    :param stats: Validation times in seconds keyed by pair name.
+    """
+    temporary_path: str = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(dict(sorted(stats.items())), file, indent=0)
+    os.replace(temporary_path, path)
+
+
+def _size(path: str) -> int:
+    """
+    Fetch the size of a file.
+
+    :param path: Path to the file, empty if not supplied.
+
+    :return: The size in bytes, zero if the file is not supplied or cannot be read.
+    """
+    if not path:
+        return 0
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
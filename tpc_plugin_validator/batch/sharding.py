@@ -0,0 +1,58 @@
+"""Deterministic assignment of plugin pairs to shards so a corpus can be split across machines."""
+
+import hashlib
+import re
+
+Shard = tuple[int, int]
+
+_SHARD_PATTERN: re.Pattern[str] = re.compile(r"^\s*(\d+)\s*/\s*(\d+)\s*$")
+
+
+def parse_shard(value: str) -> Shard:
+    """
+    Parse a shard given as K/N, where K is the one based index of the shard and N the number of shards.
+
+    :param value: The shard to parse.
+
+    :raises ValueError: If the shard is not in the form K/N or K is not between 1 and N.
+
+    :return: Tuple of the shard index and the number of shards.
+    """
+    match = _SHARD_PATTERN.match(value)
+    if not match:
+        raise ValueError(f"The shard must be given as K/N, {value} was given.")
+    index, count = int(match.group(1)), int(match.group(2))
+    if not 1 <= index <= count:
+        raise ValueError(f"The shard index must be between 1 and {count}, {index} was given.")
+    return index, count
+
+
+def shard_of(name: str, count: int) -> int:
+    """
+    Fetch the shard a plugin pair belongs to.
+
+    The shard is taken from a hash of the pair's path relative to the corpus root, so a pair stays on the same shard
+    from run to run and from machine to machine, and pairs are spread evenly across the shards.
+
+    :param name: The name of the pair, its path relative to the corpus root.
+    :param count: The number of shards.
+
+    :return: The one based index of the shard.
+    """
+    digest: bytes = hashlib.blake2b(name.replace("\\", "/").encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count + 1
+
+
+def in_shard(name: str, shard: Shard | None) -> bool:
+    """
+    Check if a plugin pair belongs to a shard.
+
+    :param name: The name of the pair, its path relative to the corpus root.
+    :param shard: The shard to check, None if the corpus is not sharded.
+
+    :return: True if the pair belongs to the shard otherwise False.
+    """
+    if shard is None:
+        return True
+    index, count = shard
+    return shard_of(name=name, count=count) == index
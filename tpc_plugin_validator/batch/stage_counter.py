@@ -0,0 +1,35 @@
+"""Class to hold the throughput of a single stage of the batch pipeline."""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class StageCounter(object):
+    """Class to hold the throughput of a single stage of the batch pipeline."""
+
+    name: str
+    workers: int = 1
+    items: int = 0
+    seconds: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        """
+        Record an item passing through the stage.
+
+        :param seconds: The time spent on the item.
+        """
+        self.items += 1
+        self.seconds += seconds
+
+    @property
+    def throughput(self) -> float:
+        """
+        Property to fetch the items per second the stage can sustain with all of its workers busy.
+
+        The stage with the lowest throughput is the bottleneck of the pipeline.
+
+        :return: Items per second, zero if no time has been recorded.
+        """
+        if self.seconds <= 0:
+            return 0.0
+        return self.items * self.workers / self.seconds
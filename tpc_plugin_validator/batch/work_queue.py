@@ -0,0 +1,321 @@
+"""A work queue held in a shared directory so several hosts can validate one corpus without a broker."""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections.abc import Iterable, Iterator
+
+from tpc_plugin_validator.batch.batch_result import BatchResult
+from tpc_plugin_validator.batch.batch_validator import BatchValidator
+from tpc_plugin_validator.batch.plugin_pair import PluginPair
+from tpc_plugin_validator.batch.result_file import ResultWriter, read_results
+
+DEFAULT_POLL_INTERVAL: float = 1.0
+DEFAULT_STALE_AFTER: float = 600.0
+
+ITEM_SUFFIX: str = ".pair"
+RESULTS_SUFFIX: str = ".results"
+
+_CLAIMED: str = "claimed"
+_CLOCK: str = ".clock"
+_DONE: str = "done"
+_PENDING: str = "pending"
+
+
+class WorkQueue(object):
+    """
+    A work queue held in a shared directory so several hosts can validate one corpus without a broker.
+
+    Each plugin pair is an item file that moves from pending to claimed to done. Moves are made with a rename, which is
+    atomic within a filesystem including NFS, so when several workers race for an item exactly one of them wins. A
+    claim is timestamped when it is made and again periodically while the worker holds it, and a claim whose timestamp
+    is older than the stale timeout is assumed to belong to a worker that has died and is moved back to pending. Every
+    timestamp, including the current time a claim is compared against, is taken from the filesystem holding the queue
+    so workers on hosts whose clocks differ agree on which claims are stale.
+    """
+
+    __slots__ = (
+        "_candidates",
+        "_held",
+        "_held_lock",
+        "_path",
+        "_stale_after",
+    )
+
+    def __init__(self, path: str, stale_after: float = DEFAULT_STALE_AFTER) -> None:
+        """
+        Standard init for the WorkQueue class.
+
+        :param path: The queue directory, shared between every worker.
+        :param stale_after: Seconds after which a claim is assumed to belong to a worker that has died.
+
+        :raises ValueError: If the stale timeout is not positive.
+        """
+        if stale_after <= 0:
+            raise ValueError(f"The stale timeout must be greater than 0, {stale_after} was given.")
+        self._candidates: list[str] = []
+        self._held: set[str] = set()
+        self._held_lock: threading.Lock = threading.Lock()
+        self._path: str = path
+        self._stale_after: float = stale_after
+
+    def enqueue(self, pairs: Iterable[PluginPair]) -> int:
+        """
+        Add pairs to the queue, skipping any that are already queued, claimed or done.
+
+        :param pairs: The pairs to add.
+
+        :return: The number of pairs added.
+        """
+        for state in (_PENDING, _CLAIMED, _DONE):
+            os.makedirs(os.path.join(self._path, state), exist_ok=True)
+
+        added: int = 0
+        for pair in pairs:
+            item_name: str = f"{self.item_id(pair=pair)}{ITEM_SUFFIX}"
+            if any(os.path.exists(os.path.join(self._path, state, item_name)) for state in (_PENDING, _CLAIMED, _DONE)):
+                continue
+            content: bytes = json.dumps(
+                {"name": pair.name, "process_file": pair.process_file, "prompts_file": pair.prompts_file}
+            ).encode("utf-8")
+            self._write_atomic(path=os.path.join(self._path, _PENDING, item_name), content=content)
+            added += 1
+        return added
+
+    def claim(self) -> tuple[str, PluginPair] | None:
+        """
+        Claim the next pending item.
+
+        The pending directory is listed once and then worked through, in a random order so that workers starting
+        together do not all race for the same items, and listed again once the list runs out.
+
+        :return: Tuple of the item name and its pair, or None if nothing is pending.
+        """
+        while True:
+            if not self._candidates:
+                self._candidates = self._items(state=_PENDING)
+                if not self._candidates:
+                    return None
+                random.shuffle(self._candidates)
+
+            item_name: str = self._candidates.pop()
+            pending_path: str = os.path.join(self._path, _PENDING, item_name)
+            claimed_path: str = os.path.join(self._path, _CLAIMED, item_name)
+            try:
+                # Timestamp before the rename so the claim is never briefly seen as stale.
+                os.utime(pending_path)
+                os.rename(pending_path, claimed_path)
+            except FileNotFoundError:
+                # Another worker claimed the item first.
+                continue
+            with self._held_lock:
+                self._held.add(item_name)
+            with open(claimed_path, "rb") as item_file:
+                item: dict[str, str] = json.loads(item_file.read())
+            return item_name, PluginPair(
+                name=item["name"],
+                process_file=item["process_file"],
+                prompts_file=item["prompts_file"],
+            )
+
+    def complete(self, item_name: str, result: BatchResult) -> None:
+        """
+        Write the result of an item next to it and mark it done.
+
+        :param item_name: The name of the claimed item.
+        :param result: The result of validating the item.
+        """
+        item_id: str = item_name.removesuffix(ITEM_SUFFIX)
+        results_path: str = os.path.join(self._path, _DONE, f"{item_id}{RESULTS_SUFFIX}")
+        temporary_path: str = os.path.join(self._path, _DONE, f".{item_id}.{os.getpid()}.tmp")
+        with ResultWriter(path=temporary_path) as writer:
+            writer.write(result=result)
+        os.replace(temporary_path, results_path)
+        with self._held_lock:
+            self._held.discard(item_name)
+        try:
+            os.rename(os.path.join(self._path, _CLAIMED, item_name), os.path.join(self._path, _DONE, item_name))
+        except FileNotFoundError:
+            # The claim went stale and was reclaimed, whoever validates it again will write the same result.
+            pass
+
+    def reclaim_stale(self) -> int:
+        """
+        Move claims older than the stale timeout back to pending.
+
+        :return: The number of claims moved.
+        """
+        claimed: list[str] = self._items(state=_CLAIMED)
+        if not claimed:
+            return 0
+        reclaimed: int = 0
+        cutoff: float = self._now() - self._stale_after
+        for item_name in claimed:
+            claimed_path: str = os.path.join(self._path, _CLAIMED, item_name)
+            try:
+                if os.stat(claimed_path).st_mtime > cutoff:
+                    continue
+                os.rename(claimed_path, os.path.join(self._path, _PENDING, item_name))
+            except FileNotFoundError:
+                continue
+            reclaimed += 1
+        return reclaimed
+
+    def heartbeat(self) -> int:
+        """
+        Timestamp every claim this worker holds so that none of them is taken for stale while it is being validated.
+
+        :return: The number of claims timestamped.
+        """
+        with self._held_lock:
+            held: list[str] = sorted(self._held)
+        refreshed: int = 0
+        for item_name in held:
+            try:
+                os.utime(os.path.join(self._path, _CLAIMED, item_name))
+            except FileNotFoundError:
+                # The claim was completed or reclaimed since it was listed.
+                continue
+            refreshed += 1
+        return refreshed
+
+    def work(
+        self,
+        batch_validator: BatchValidator,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> Iterator[BatchResult]:
+        """
+        Claim and validate items until the queue is finished, yielding each result once it has been written.
+
+        When nothing is pending but other workers still hold claims, the worker waits in case those claims go stale.
+        While working, the claims held are timestamped in the background four times per stale timeout.
+
+        :param batch_validator: The batch validator to validate claimed pairs with.
+        :param poll_interval: Seconds to wait between checks for stale claims.
+
+        :return: Iterator of BatchResult in completion order.
+        """
+        stopped: threading.Event = threading.Event()
+        heartbeat: threading.Thread = threading.Thread(target=self._beat, args=(stopped,), daemon=True)
+        heartbeat.start()
+        try:
+            while True:
+                yield from self._drain(batch_validator=batch_validator)
+                if self.reclaim_stale():
+                    continue
+                if not self.counts()[_CLAIMED]:
+                    return
+                time.sleep(poll_interval)
+        finally:
+            stopped.set()
+            heartbeat.join()
+
+    def counts(self) -> dict[str, int]:
+        """
+        Count the items in each state.
+
+        :return: Dictionary of the number of items keyed by pending, claimed and done.
+        """
+        return {state: len(self._items(state=state)) for state in (_PENDING, _CLAIMED, _DONE)}
+
+    def results(self) -> Iterator[BatchResult]:
+        """
+        Read the results of every item that is done.
+
+        :raises ValueError: If a results file is corrupt.
+
+        :return: Iterator of BatchResult
+        """
+        done_path: str = os.path.join(self._path, _DONE)
+        for item_name in self._items(state=_DONE):
+            yield from read_results(
+                path=os.path.join(done_path, f"{item_name.removesuffix(ITEM_SUFFIX)}{RESULTS_SUFFIX}")
+            )
+
+    def _beat(self, stopped: threading.Event) -> None:
+        """
+        Timestamp the claims held until stopped.
+
+        :param stopped: Event set when the worker finishes.
+        """
+        while not stopped.wait(timeout=self._stale_after / 4):
+            self.heartbeat()
+
+    def _drain(self, batch_validator: BatchValidator) -> Iterator[BatchResult]:
+        """
+        Claim and validate items until nothing is pending.
+
+        Items are claimed only as a worker is free to start them, so items this worker cannot start yet are left for
+        other workers to take.
+
+        :param batch_validator: The batch validator to validate claimed pairs with.
+
+        :return: Iterator of BatchResult in completion order.
+        """
+        claimed: dict[PluginPair, str] = {}
+
+        def claimed_pairs() -> Iterator[PluginPair]:
+            while claim := self.claim():
+                item_name, pair = claim
+                claimed[pair] = item_name
+                yield pair
+
+        for result in batch_validator.validate_stream(pairs=claimed_pairs()):
+            self.complete(item_name=claimed.pop(result.pair), result=result)
+            yield result
+
+    def _items(self, state: str) -> list[str]:
+        """
+        List the items in a state.
+
+        :param state: The state directory to list.
+
+        :return: Sorted list of item names.
+        """
+        try:
+            return sorted(
+                entry.name for entry in os.scandir(os.path.join(self._path, state)) if entry.name.endswith(ITEM_SUFFIX)
+            )
+        except FileNotFoundError:
+            return []
+
+    def _now(self) -> float:
+        """
+        Fetch the current time according to the filesystem holding the queue.
+
+        :return: The time as seconds since the epoch.
+        """
+        clock_path: str = os.path.join(self._path, f"{_CLOCK}.{os.getpid()}.{threading.get_ident()}")
+        with open(clock_path, "wb"):
+            pass
+        try:
+            return os.stat(clock_path).st_mtime
+        finally:
+            os.remove(clock_path)
+
+    @classmethod
+    def item_id(cls, pair: PluginPair) -> str:
+        """
+        Fetch the stable identifier of a pair's item.
+
+        :param pair: The pair.
+
+        :return: Hex digest of the pair's name.
+        """
+        return hashlib.blake2b(pair.name.encode("utf-8"), digest_size=16).hexdigest()
+
+    @classmethod
+    def _write_atomic(cls, path: str, content: bytes) -> None:
+        """
+        Write a file so that other workers never see it partially written.
+
+        :param path: Path to the file.
+        :param content: The content to write.
+        """
+        temporary_path: str = f"{os.path.dirname(path)}{os.sep}.{os.path.basename(path)}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(content)
+        os.replace(temporary_path, path)
@@ -0,0 +1,362 @@
+"""Functions executed inside batch validation workers."""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from tpc_plugin_parser.lexer.utilities.types import ALL_TOKEN_TYPES
+from tpc_plugin_parser.parser import Parser
+
+from tpc_plugin_validator.batch.limits import (
+    ResourceLimitExceeded,
+    ResourceLimits,
+    check_deadline,
+    check_file_size,
+    check_sections,
+    time_limit,
+)
+from tpc_plugin_validator.utilities.decoding import Buffer, decode_content
+from tpc_plugin_validator.utilities.exceptions import ProgrammingError
+from tpc_plugin_validator.utilities.types import FileNames
+from tpc_plugin_validator.validator import Validator
+
+PARSE_CACHE_SIZE: int = 256
+
+ViolationTuple = tuple[str, str, str, str, str, int]
+WorkerResult = tuple[tuple[ViolationTuple, ...], str]
+TimedWorkerResult = tuple[WorkerResult, float, float]
+ChunkResult = tuple[tuple[WorkerResult, float], ...]
+
+_parse_cache: OrderedDict[bytes, dict[str, list[ALL_TOKEN_TYPES]]] = OrderedDict()
+_parse_cache_lock: threading.Lock = threading.Lock()
+
+
+def preload() -> None:
+    """
+    Import the validator and parser packages ahead of the first task.
+
+    Used as the executor initializer so that every worker, whether a process or a sub-interpreter, pays the import cost
+    once at start up rather than on the first plugin it receives.
+    """
+    import tpc_plugin_parser.parser  # noqa: F401
+
+    import tpc_plugin_validator.validator  # noqa: F401
+
+
+def parse_cached(content: str | Buffer) -> dict[str, list[ALL_TOKEN_TYPES]]:
+    """
+    Parse file content, reusing the parsed file if this worker has already seen identical content.
+
+    Plugins commonly share an identical prompts file, keying on a hash of the content means each distinct file is
+    decoded and parsed once per worker. Rule sets treat parsed files as read-only so sharing them is safe.
+
+    :param content: The raw file content, or content that has already been decoded.
+
+    :raises UnicodeDecodeError: If the content is not valid for the detected encoding.
+
+    :return: The parsed file, empty if there is no content.
+    """
+    if not content:
+        return {}
+
+    raw: Buffer = content.encode("utf-8", "surrogatepass") if isinstance(content, str) else content
+    digest: bytes = hashlib.blake2b(raw, digest_size=16).digest()
+    with _parse_cache_lock:
+        parsed = _parse_cache.get(digest)
+        if parsed is not None:
+            _parse_cache.move_to_end(digest)
+            return parsed
+
+    text: str = content if isinstance(content, str) else decode_content(data=content)
+    parsed = Parser(file_contents=text).parsed_file
+    with _parse_cache_lock:
+        _parse_cache[digest] = parsed
+        while len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return parsed
+
+
+def report_error(error: str) -> WorkerResult:
+    """
+    Report a pair that could not be read, such as an archive member too large to read, as a worker result.
+
+    :param error: The description of the error.
+
+    :return: The worker result holding the error without violations.
+    """
+    return (), error
+
+
+def run_chunk(calls: tuple[tuple[Callable[..., WorkerResult], tuple], ...]) -> ChunkResult:
+    """
+    Run several validations as a single task, timing each one.
+
+    Grouping small plugins into one task means they share a single round trip to the worker. An unexpected error
+    validating one pair, such as a RecursionError from a rule set, is returned as that pair's error so that the other
+    pairs in the task are still validated.
+
+    :param calls: Tuple of the function to call and its arguments for each validation.
+
+    :return: Tuple of the worker result and the seconds taken for each validation, in order.
+    """
+    results: list[tuple[WorkerResult, float]] = []
+    for function, arguments in calls:
+        started: float = time.perf_counter()
+        try:
+            result: WorkerResult = function(*arguments)
+        except Exception as exc:  # noqa: BLE001
+            result = (), f"{type(exc).__name__}: {exc}"
+        results.append((result, time.perf_counter() - started))
+    return tuple(results)
+
+
+def validate_content(
+    process_file_content: str,
+    prompts_file_content: str,
+    limits: ResourceLimits | None = None,
+    config: dict[str, dict[str, Any]] | None = None,
+) -> tuple[ViolationTuple, ...]:
+    """
+    Validate a single plugin pair from its content.
+
+    :param process_file_content: Content for the process file.
+    :param prompts_file_content: Content for the prompt file.
+    :param limits: The resource limits the pair must stay within, nothing is enforced if None.
+    :param config: Configuration of the rule sets keyed by rule set, the defaults are used if None.
+
+    :return: Tuple of violation tuples, a single ResourceLimitViolation if a limit was exceeded.
+    """
+    if limits is None:
+        validator = Validator(process_file_content=process_file_content, prompts_file_content=prompts_file_content)
+        validator.configure(config=config or {}).validate()
+        return tuple(violation.to_tuple() for violation in validator.violations)
+
+    try:
+        return _validate_limited(
+            process_file_content=process_file_content,
+            prompts_file_content=prompts_file_content,
+            limits=limits,
+            config=config,
+        )
+    except ResourceLimitExceeded as exc:
+        return (exc.violation.to_tuple(),)
+
+
+def validate_files(process_file_path: str, prompts_file_path: str) -> tuple[ViolationTuple, ...]:
+    """
+    Validate a single plugin pair from disk, raising any error encountered reading the files.
+
+    :param process_file_path: Path to the process file, empty if not supplied.
+    :param prompts_file_path: Path to the prompts file, empty if not supplied.
+
+    :return: Tuple of violation tuples.
+    """
+    validator = Validator.with_file(process_file_path=process_file_path, prompts_file_path=prompts_file_path)
+    validator.validate()
+    return tuple(violation.to_tuple() for violation in validator.violations)
+
+
+def validate_pair_content(
+    process_file_content: bytes,
+    prompts_file_content: bytes,
+    limits: ResourceLimits | None = None,
+    config: dict[str, dict[str, Any]] | None = None,
+) -> WorkerResult:
+    """
+    Validate a single plugin pair from its raw content, such as a pair read from an archive.
+
+    Decoding happens in the worker so that it is spread across the pool along with parsing and validation.
+
+    :param process_file_content: Raw content for the process file, empty if not supplied.
+    :param prompts_file_content: Raw content for the prompts file, empty if not supplied.
+    :param limits: The resource limits the pair must stay within, nothing is enforced if None.
+    :param config: Configuration of the rule sets keyed by rule set, the defaults are used if None.
+
+    :return: Tuple of violation tuples and an error message, the error message is empty on success.
+    """
+    try:
+        if limits is not None:
+            return _validate_limited(
+                process_file_content=process_file_content,
+                prompts_file_content=prompts_file_content,
+                limits=limits,
+                config=config,
+            ), ""
+        validator = Validator.from_parsed(
+            process_file=parse_cached(content=process_file_content),
+            prompts_file=parse_cached(content=prompts_file_content),
+        )
+    except ResourceLimitExceeded as exc:
+        return (exc.violation.to_tuple(),), ""
+    except (ProgrammingError, UnicodeDecodeError, ValueError) as exc:
+        return (), f"{type(exc).__name__}: {exc}"
+
+    validator.configure(config=config or {}).validate()
+    return tuple(violation.to_tuple() for violation in validator.violations), ""
+
+
+def validate_pair_text(
+    process_file_content: str,
+    prompts_file_content: str,
+    limits: ResourceLimits | None = None,
+    config: dict[str, dict[str, Any]] | None = None,
+) -> TimedWorkerResult:
+    """
+    Validate a single plugin pair whose files have already been read and decoded, timing each step.
+
+    Used by the batch pipeline, the time spent parsing and validating is returned so that the pipeline can report the
+    throughput of each stage.
+
+    :param process_file_content: Content for the process file, empty if not supplied.
+    :param prompts_file_content: Content for the prompts file, empty if not supplied.
+    :param limits: The resource limits the pair must stay within, nothing is enforced if None.
+    :param config: Configuration of the rule sets keyed by rule set, the defaults are used if None.
+
+    :return: Tuple of the worker result, the seconds spent parsing and the seconds spent validating.
+    """
+    started: float = time.perf_counter()
+    parsed: float = started
+    try:
+        with time_limit(limits=limits) as deadline:
+            process_file = _parse_limited(
+                content=process_file_content, file=FileNames.process, limits=limits, deadline=deadline
+            )
+            prompts_file = _parse_limited(
+                content=prompts_file_content, file=FileNames.prompts, limits=limits, deadline=deadline
+            )
+            validator = Validator.from_parsed(process_file=process_file, prompts_file=prompts_file)
+            validator.configure(config=config or {})
+            parsed = time.perf_counter()
+            validator.validate()
+            check_deadline(deadline=deadline)
+    except ResourceLimitExceeded as exc:
+        finished: float = time.perf_counter()
+        return ((exc.violation.to_tuple(),), ""), parsed - started, finished - parsed
+    except (ProgrammingError, ValueError) as exc:
+        return ((), f"{type(exc).__name__}: {exc}"), time.perf_counter() - started, 0.0
+
+    violations: tuple[ViolationTuple, ...] = tuple(violation.to_tuple() for violation in validator.violations)
+    return (violations, ""), parsed - started, time.perf_counter() - parsed
+
+
+def validate_pair(
+    process_file_path: str,
+    prompts_file_path: str,
+    limits: ResourceLimits | None = None,
+    config: dict[str, dict[str, Any]] | None = None,
+) -> WorkerResult:
+    """
+    Validate a single plugin pair from disk.
+
+    Only file paths are passed in and only builtin types are returned so that the cost of crossing a process or
+    interpreter boundary is kept to a minimum.
+
+    :param process_file_path: Path to the process file, empty if not supplied.
+    :param prompts_file_path: Path to the prompts file, empty if not supplied.
+    :param limits: The resource limits the pair must stay within, nothing is enforced if None.
+    :param config: Configuration of the rule sets keyed by rule set, the defaults are used if None.
+
+    :return: Tuple of violation tuples and an error message, the error message is empty on success.
+    """
+    try:
+        process_file_content: bytes = _read_bytes(path=process_file_path, file=FileNames.process, limits=limits)
+        prompts_file_content: bytes = _read_bytes(path=prompts_file_path, file=FileNames.prompts, limits=limits)
+    except ResourceLimitExceeded as exc:
+        return (exc.violation.to_tuple(),), ""
+    except OSError as exc:
+        return (), f"{type(exc).__name__}: {exc}"
+
+    return validate_pair_content(
+        process_file_content=process_file_content,
+        prompts_file_content=prompts_file_content,
+        limits=limits,
+        config=config,
+    )
+
+
+def _parse_limited(
+    content: str | Buffer,
+    file: FileNames,
+    limits: ResourceLimits | None,
+    deadline: float,
+) -> dict[str, list[ALL_TOKEN_TYPES]]:
+    """
+    Parse file content, checking it against the resource limits before and after parsing.
+
+    :param content: The raw file content, or content that has already been decoded.
+    :param file: The file being parsed.
+    :param limits: The resource limits to enforce, nothing is enforced if None.
+    :param deadline: The perf_counter value at which the time runs out, zero if there is no limit.
+
+    :raises ResourceLimitExceeded: If the content exceeds a limit.
+    :raises UnicodeDecodeError: If the content is not valid for the detected encoding.
+
+    :return: The parsed file, empty if there is no content.
+    """
+    if limits is not None and limits.max_file_bytes:
+        size: int = len(content.encode("utf-8", "surrogatepass")) if isinstance(content, str) else len(content)
+        check_file_size(size=size, file=file, limits=limits)
+    parsed_file: dict[str, list[ALL_TOKEN_TYPES]] = parse_cached(content=content)
+    check_sections(parsed_file=parsed_file, file=file, limits=limits)
+    check_deadline(deadline=deadline)
+    return parsed_file
+
+
+def _validate_limited(
+    process_file_content: str | Buffer,
+    prompts_file_content: str | Buffer,
+    limits: ResourceLimits,
+    config: dict[str, dict[str, Any]] | None = None,
+) -> tuple[ViolationTuple, ...]:
+    """
+    Parse and validate a plugin pair within its resource limits.
+
+    :param process_file_content: Content for the process file, empty if not supplied.
+    :param prompts_file_content: Content for the prompts file, empty if not supplied.
+    :param limits: The resource limits to enforce.
+    :param config: Configuration of the rule sets keyed by rule set, the defaults are used if None.
+
+    :raises ProgrammingError: If neither file has any content.
+    :raises ResourceLimitExceeded: If the pair exceeds a limit.
+    :raises UnicodeDecodeError: If the content is not valid for the detected encoding.
+
+    :return: Tuple of violation tuples.
+    """
+    with time_limit(limits=limits) as deadline:
+        validator = Validator.from_parsed(
+            process_file=_parse_limited(
+                content=process_file_content, file=FileNames.process, limits=limits, deadline=deadline
+            ),
+            prompts_file=_parse_limited(
+                content=prompts_file_content, file=FileNames.prompts, limits=limits, deadline=deadline
+            ),
+        )
+        validator.configure(config=config or {}).validate()
+        check_deadline(deadline=deadline)
+    return tuple(violation.to_tuple() for violation in validator.violations)
+
+
+def _read_bytes(path: str, file: FileNames, limits: ResourceLimits | None = None) -> bytes:
+    """
+    Read the raw content of a plugin file, checking its size before it is read.
+
+    :param path: Path to the file, empty if not supplied.
+    :param file: The file being read, used in the error message.
+    :param limits: The resource limits to enforce, nothing is enforced if None.
+
+    :raises FileNotFoundError: If the file does not exist.
+    :raises ResourceLimitExceeded: If the file is larger than the limit.
+
+    :return: The raw content, empty if no path was given.
+    """
+    if not path:
+        return b""
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"The {file.name} file was not found: {path}")
+    check_file_size(size=os.path.getsize(path), file=file, limits=limits)
+    with open(path, "rb") as file_handle:
+        return file_handle.read()
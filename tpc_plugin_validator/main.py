@@ -1,37 +1,110 @@
 """Entry point for the TPC Plugin Validator module."""
 
 import argparse
+import contextlib
+import os
 import sys
+from collections.abc import Callable, Iterable
+from typing import Any
 
+from tpc_plugin_parser.parser import Parser
+
+from tpc_plugin_validator.batch.archive_scanner import is_archive
+from tpc_plugin_validator.batch.backends import Backend, check_time_limit, create_executor
+from tpc_plugin_validator.batch.batch_result import BatchResult
+from tpc_plugin_validator.batch.batch_validator import BatchValidator
+from tpc_plugin_validator.batch.journal import Journal
+from tpc_plugin_validator.batch.limits import ResourceLimits
+from tpc_plugin_validator.batch.pipeline import DEFAULT_IO_THREADS, BatchPipeline
+from tpc_plugin_validator.batch.plugin_pair import PluginPair, discover_pairs
+from tpc_plugin_validator.batch.result_file import ResultWriter, read_results
+from tpc_plugin_validator.batch.scheduling import load_stats, save_stats
+from tpc_plugin_validator.batch.sharding import Shard, parse_shard
+from tpc_plugin_validator.batch.work_queue import DEFAULT_STALE_AFTER, WorkQueue
+from tpc_plugin_validator.utilities.decoding import read_file
+from tpc_plugin_validator.utilities.graph_export import GraphFormat, write_graph
+from tpc_plugin_validator.utilities.plugin_metrics import (
+    MetricsFormat,
+    MetricsWriter,
+    MetricThresholds,
+    check_thresholds,
+    compute_metrics,
+)
+from tpc_plugin_validator.utilities.simulator import SimulationOutcome, SimulationResult, Simulator, read_parameters
+from tpc_plugin_validator.utilities.state_graph import StateGraph
+from tpc_plugin_validator.utilities.transition_coverage import (
+    DEFAULT_KEYWORDS,
+    DEFAULT_LOG_GLOB,
+    TransitionCoverage,
+    find_logs,
+    measure_coverage,
+)
 from tpc_plugin_validator.utilities.validation_result import ValidationResult
 from tpc_plugin_validator.validator import Validator
 
 
 def main() -> None:
     """The main entry point for the TPC Plugin Validator module."""
+    arguments: list[str] = sys.argv[1:]
+    if arguments and arguments[0] in _COMMANDS:
+        _COMMANDS[arguments[0]](arguments[1:])
+        return
+
+    _validate(arguments=arguments)
+
+
+def _validate(arguments: list[str]) -> None:
+    """
+    Validate a single process and prompts file.
+
+    :param arguments: Command line arguments.
+    """
     arg_parse = argparse.ArgumentParser(
         prog="CyberArk TPC Plugin Validator",
         description="Validate the provided TPC process and prompts file.",
+        epilog=f"Additional commands: {', '.join(_COMMANDS)}.",
+    )
+    arg_parse.add_argument(
+        "process_file", type=str, help="Path to the process file, or plugin zip, to validate, - to read from stdin"
     )
-    arg_parse.add_argument("process_file", type=str, help="Path to the process file to validate")
-    arg_parse.add_argument("prompts_file", type=str, help="Path to the prompts file to validate")
-    args = arg_parse.parse_args()
+    arg_parse.add_argument(
+        "prompts_file",
+        type=str,
+        nargs="?",
+        default="",
+        help="Path to the prompts file to validate, - to read from stdin",
+    )
+    _add_config_arguments(arg_parse=arg_parse)
+    args = arg_parse.parse_args(arguments)
+
+    if not args.prompts_file and not args.process_file.lower().endswith(".zip"):
+        arg_parse.error("the prompts_file argument is required unless a plugin zip is given")
+    if args.prompts_file and args.process_file.lower().endswith(".zip"):
+        arg_parse.error("the prompts_file argument cannot be given with a plugin zip")
+    if args.process_file == "-" and args.prompts_file == "-":
+        arg_parse.error("only one of process_file and prompts_file can be read from stdin")
 
     try:
-        validator = Validator.with_file(process_file_path=args.process_file, prompts_file_path=args.prompts_file)
+        if args.process_file.lower().endswith(".zip"):
+            validator = Validator.with_zip(zip_file=args.process_file)
+        elif "-" in (args.process_file, args.prompts_file):
+            validator = _with_stdin(process_file_path=args.process_file, prompts_file_path=args.prompts_file)
+        else:
+            validator = Validator.with_file(process_file_path=args.process_file, prompts_file_path=args.prompts_file)
     except FileNotFoundError:
         print("One or both of the specified files do not exist.")
         sys.exit(1)
-    except PermissionError:
-        print("Permission denied reading one of the specified files.")
+    except OSError as exc:
+        print(f"One of the specified files could not be read: {exc}")
         sys.exit(1)
     except UnicodeDecodeError:
-        print("One of the specified files is not valid UTF-8.")
+        print("One of the specified files is not valid UTF-8, UTF-16 or UTF-32.")
         sys.exit(1)
     except ValueError as exc:
         print(f"Invalid input: {exc}")
         sys.exit(1)
 
+    validator.configure(config=_config(args=args))
     validator.validate()
     violations: list[ValidationResult] = validator.violations
 
@@ -40,10 +113,858 @@ def main() -> None:
         sys.exit(0)
 
     print(f"{len(violations)} violations found:")
+    _print_violations(violations=violations)
+
+    sys.exit(1)
+
+
+def _load_validator(process_file_path: str, prompts_file_path: str = "") -> Validator:
+    """
+    Create a validator from a plugin zip or a process and prompts file, exiting with a failure if they cannot be read.
+
+    :param process_file_path: Path to the process file or plugin zip.
+    :param prompts_file_path: Path to the prompts file, not given with a plugin zip.
+
+    :return: Validator
+    """
+    try:
+        if process_file_path.lower().endswith(".zip"):
+            return Validator.with_zip(zip_file=process_file_path)
+        return Validator.with_file(process_file_path=process_file_path, prompts_file_path=prompts_file_path)
+    except OSError as exc:
+        print(exc)
+        sys.exit(1)
+    except (UnicodeDecodeError, ValueError) as exc:
+        print(f"Invalid input: {exc}")
+        sys.exit(1)
+
+
+def _with_stdin(process_file_path: str, prompts_file_path: str) -> Validator:
+    """
+    Create a validator reading the file given as "-" from stdin.
+
+    :param process_file_path: Path to the process file or "-".
+    :param prompts_file_path: Path to the prompts file or "-".
+
+    :return: Validator
+    """
+    if process_file_path == "-":
+        with open(prompts_file_path, "rb") as prompts_file:
+            return Validator.from_file_objects(process_file=sys.stdin.buffer, prompts_file=prompts_file)
+
+    with open(process_file_path, "rb") as process_file:
+        return Validator.from_file_objects(process_file=process_file, prompts_file=sys.stdin.buffer)
+
+
+def _batch(arguments: list[str]) -> None:
+    """
+    Validate every plugin pair found beneath a directory.
+
+    :param arguments: Command line arguments.
+    """
+    arg_parse = argparse.ArgumentParser(
+        prog="CyberArk TPC Plugin Validator batch",
+        description="Validate every TPC process and prompts file pair found beneath a directory or within an archive.",
+    )
+    arg_parse.add_argument(
+        "path",
+        type=str,
+        help="Path to the directory, or zip/tar archive, containing the plugins to validate",
+    )
+    arg_parse.add_argument(
+        "--backend",
+        type=str,
+        choices=[backend.value for backend in Backend],
+        default=Backend.process.value,
+        help="Executor used to run validations in parallel",
+    )
+    arg_parse.add_argument("--workers", type=int, default=None, help="Maximum number of parallel workers")
+    arg_parse.add_argument(
+        "--deduplicate",
+        action="store_true",
+        help="Validate plugins that only differ by comments or whitespace once and report the duplicate groups",
+    )
+    arg_parse.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Read files on separate threads while parsing and validating, reporting the throughput of each stage",
+    )
+    arg_parse.add_argument(
+        "--io-threads", type=int, default=DEFAULT_IO_THREADS, help="Number of threads reading files in the pipeline"
+    )
+    arg_parse.add_argument(
+        "--queue-size", type=int, default=None, help="Maximum number of plugins held between pipeline stages"
+    )
+    arg_parse.add_argument(
+        "--shard", type=str, default="", help="Only validate shard K of N, given as K/N, to split a corpus across hosts"
+    )
+    arg_parse.add_argument(
+        "--output", type=str, default="", help="Also write the results to a file that can be combined using merge"
+    )
+    arg_parse.add_argument(
+        "--journal", type=str, default="", help="Record each completed plugin in a journal so the run can be resumed"
+    )
+    arg_parse.add_argument(
+        "--resume",
+        action="store_true",
+        help="Replay the results of plugins in the journal that have not changed rather than validating them again",
+    )
+    arg_parse.add_argument(
+        "--schedule",
+        action="store_true",
+        help="Validate the largest plugins first, grouping small plugins together, and report how well it worked",
+    )
+    arg_parse.add_argument(
+        "--stats",
+        type=str,
+        default="",
+        help="File of previous validation times used to estimate costs when scheduling, updated after the run",
+    )
+    _add_limit_arguments(arg_parse=arg_parse)
+    _add_config_arguments(arg_parse=arg_parse)
+    args = arg_parse.parse_args(arguments)
+
+    archive: bool = is_archive(args.path) and not os.path.isdir(args.path)
+    if args.pipeline and (archive or args.deduplicate or args.journal):
+        arg_parse.error("--pipeline can only be used with a directory and without --deduplicate or --journal")
+    if args.resume and not args.journal:
+        arg_parse.error("--resume requires --journal")
+    try:
+        shard: Shard | None = parse_shard(args.shard) if args.shard else None
+        limits: ResourceLimits | None = _limits(args=args)
+    except ValueError as exc:
+        arg_parse.error(str(exc))
+    if args.pipeline:
+        _batch_pipeline(args=args, shard=shard, limits=limits)
+        return
+
+    try:
+        stats: dict[str, float] = load_stats(path=args.stats) if args.stats else {}
+        with Journal(path=args.journal, resume=args.resume) if args.journal else contextlib.nullcontext() as journal:
+            if archive:
+                batch_validator = BatchValidator.with_archive(
+                    archive_path=args.path,
+                    backend=Backend(args.backend),
+                    max_workers=args.workers,
+                    deduplicate=args.deduplicate,
+                    shard=shard,
+                    journal=journal,
+                    limits=limits,
+                    config=_config(args=args),
+                )
+            else:
+                batch_validator = BatchValidator.with_directory(
+                    root=args.path,
+                    backend=Backend(args.backend),
+                    max_workers=args.workers,
+                    deduplicate=args.deduplicate,
+                    shard=shard,
+                    journal=journal,
+                    schedule=args.schedule or bool(args.stats),
+                    stats=stats,
+                    limits=limits,
+                    config=_config(args=args),
+                )
+            results: list[BatchResult] = sorted(batch_validator.run(), key=lambda result: result.pair.name)
+    except FileNotFoundError as exc:
+        print(exc)
+        sys.exit(1)
+    except ValueError as exc:
+        print(f"Invalid input: {exc}")
+        sys.exit(1)
+
+    failed, total = _report_batch_results(path=args.output, results=results)
+    _print_duplicate_groups(groups=batch_validator.duplicate_groups)
+    if batch_validator.resumed:
+        print(f"{batch_validator.resumed} unchanged plugins were replayed from the journal.")
+    if args.schedule or args.stats:
+        _print_schedule(batch_validator=batch_validator, workers=args.workers or os.cpu_count() or 1)
+    if args.stats:
+        try:
+            save_stats(path=args.stats, stats=stats | batch_validator.timings)
+        except OSError as exc:
+            print(f"The stats could not be written to {args.stats}: {exc}")
+    _exit_with_summary(failed=failed, total=total)
+
+
+def _batch_pipeline(args: argparse.Namespace, shard: Shard | None, limits: ResourceLimits | None) -> None:
+    """
+    Validate every plugin pair found beneath a directory using the staged pipeline.
+
+    :param args: Parsed batch command line arguments.
+    :param shard: The shard to validate, every pair is validated if None.
+    :param limits: The resource limits each pair must stay within, nothing is enforced if None.
+    """
+    try:
+        batch_pipeline = BatchPipeline.with_directory(
+            root=args.path,
+            backend=Backend(args.backend),
+            max_workers=args.workers,
+            io_threads=args.io_threads,
+            queue_size=args.queue_size,
+            shard=shard,
+            limits=limits,
+            config=_config(args=args),
+        )
+    except FileNotFoundError as exc:
+        print(exc)
+        sys.exit(1)
+    except ValueError as exc:
+        print(f"Invalid input: {exc}")
+        sys.exit(1)
+
+    # Results are reported as they complete so that the report stage counts the time spent printing and writing them.
+    failed, total = _report_batch_results(path=args.output, results=batch_pipeline.run())
+    for counter in batch_pipeline.counters:
+        print(
+            f"Stage {counter.name}: {counter.items} plugins in {counter.seconds:.3f}s over {counter.workers} workers, "
+            f"{counter.throughput:.1f} plugins/s"
+        )
+    _exit_with_summary(failed=failed, total=total)
+
+
+def _coverage(arguments: list[str]) -> None:
+    """
+    Report the transitions and states of a plugin never exercised by a set of CPM debug logs.
+
+    :param arguments: Command line arguments.
+    """
+    arg_parse = argparse.ArgumentParser(
+        prog="CyberArk TPC Plugin Validator coverage",
+        description="Report the transitions and states of a TPC plugin never exercised by a set of CPM debug logs.",
+    )
+    arg_parse.add_argument("process_file", type=str, help="Path to the process file, or plugin zip, to measure")
+    arg_parse.add_argument("logs", type=str, nargs="+", help="Paths to the log files or directories holding them")
+    arg_parse.add_argument(
+        "--glob", type=str, default=DEFAULT_LOG_GLOB, help="Pattern the names of the logs in a directory must match"
+    )
+    arg_parse.add_argument(
+        "--state-pattern",
+        type=str,
+        required=True,
+        help="Regular expression finding a state entered in a log line, with a group named state",
+    )
+    arg_parse.add_argument(
+        "--condition-pattern",
+        type=str,
+        required=True,
+        help="Regular expression finding a condition matched in a log line, with a group named condition",
+    )
+    arg_parse.add_argument(
+        "--keyword",
+        type=str,
+        action="append",
+        default=None,
+        help="Word held by every log line the patterns should be tried on, may be repeated, state and condition if not "
+        "given",
+    )
+    arg_parse.add_argument(
+        "--backend",
+        type=str,
+        choices=[backend.value for backend in Backend],
+        default=Backend.process.value,
+        help="Executor used to scan the logs in parallel",
+    )
+    arg_parse.add_argument("--workers", type=int, default=None, help="Maximum number of parallel workers")
+    args = arg_parse.parse_args(arguments)
+
+    validator: Validator = _load_validator(process_file_path=args.process_file)
+    try:
+        logs: list[str] = find_logs(paths=args.logs, glob=args.glob)
+        with create_executor(backend=Backend(args.backend), max_workers=args.workers) as executor:
+            coverage: TransitionCoverage = measure_coverage(
+                graph=StateGraph.from_process_file(process_file=validator.process_file),
+                logs=logs,
+                state_pattern=args.state_pattern,
+                condition_pattern=args.condition_pattern,
+                executor=executor,
+                keywords=tuple(args.keyword) if args.keyword else DEFAULT_KEYWORDS,
+            )
+    except FileNotFoundError as exc:
+        print(exc)
+        sys.exit(1)
+    except (UnicodeDecodeError, ValueError) as exc:
+        print(f"Invalid input: {exc}")
+        sys.exit(1)
+
+    _print_coverage(coverage=coverage)
+    sys.exit(1 if coverage.unreadable else 0)
+
+
+def _export_graph(arguments: list[str]) -> None:
+    """
+    Write the state machine of a process file as a graph.
+
+    :param arguments: Command line arguments.
+    """
+    arg_parse = argparse.ArgumentParser(
+        prog="CyberArk TPC Plugin Validator export-graph",
+        description="Write the state machine of a TPC process file as a graph with any violations highlighted.",
+    )
+    arg_parse.add_argument("process_file", type=str, help="Path to the process file, or plugin zip, to export")
+    arg_parse.add_argument(
+        "prompts_file",
+        type=str,
+        nargs="?",
+        default="",
+        help="Path to the prompts file, used to find the violations to highlight",
+    )
+    arg_parse.add_argument(
+        "--format",
+        type=str,
+        choices=[graph_format.value for graph_format in GraphFormat],
+        default=GraphFormat.dot.value,
+        help="Format of the graph",
+    )
+    arg_parse.add_argument("--output", type=str, default="", help="Path to write the graph to, stdout if not given")
+    args = arg_parse.parse_args(arguments)
+
+    if args.prompts_file and args.process_file.lower().endswith(".zip"):
+        arg_parse.error("the prompts_file argument cannot be given with a plugin zip")
+
+    validator: Validator = _load_validator(process_file_path=args.process_file, prompts_file_path=args.prompts_file)
+    validator.validate()
+    graph: StateGraph = StateGraph.from_process_file(process_file=validator.process_file)
+    try:
+        with open(args.output, "w", encoding="utf-8") if args.output else contextlib.nullcontext(sys.stdout) as output:
+            write_graph(
+                graph=graph,
+                output=output,
+                graph_format=GraphFormat(args.format),
+                violations=validator.violations,
+            )
+    except OSError as exc:
+        print(f"The graph could not be written to {args.output}: {exc}")
+        sys.exit(1)
+
+
+def _merge(arguments: list[str]) -> None:
+    """
+    Combine the result files written by several batch runs into a single report.
+
+    :param arguments: Command line arguments.
+    """
+    arg_parse = argparse.ArgumentParser(
+        prog="CyberArk TPC Plugin Validator merge",
+        description="Combine the result files written by batch --output, such as one per shard, into a single report.",
+    )
+    arg_parse.add_argument("result_files", type=str, nargs="+", help="Paths to the result files to combine")
+    args = arg_parse.parse_args(arguments)
+
+    results: list[BatchResult] = []
+    try:
+        for path in args.result_files:
+            results.extend(read_results(path=path))
+    except FileNotFoundError:
+        print(f"The result file was not found: {path}")
+        sys.exit(1)
+    except ValueError as exc:
+        print(f"Invalid input: {exc}")
+        sys.exit(1)
+
+    results.sort(key=lambda result: result.pair.name)
+    failed: int = _print_batch_results(results=results)
+    _exit_with_summary(failed=failed, total=len(results))
+
+
+def _metrics(arguments: list[str]) -> None:
+    """
+    Measure the size and complexity of every plugin pair found beneath a directory.
+
+    :param arguments: Command line arguments.
+    """
+    arg_parse = argparse.ArgumentParser(
+        prog="CyberArk TPC Plugin Validator metrics",
+        description="Measure the size and complexity of every TPC process and prompts file pair beneath a directory.",
+    )
+    arg_parse.add_argument("path", type=str, help="Path to the directory containing the plugins to measure")
+    arg_parse.add_argument(
+        "--format",
+        type=str,
+        choices=[metrics_format.value for metrics_format in MetricsFormat],
+        default=MetricsFormat.json.value,
+        help="Format of the metrics",
+    )
+    arg_parse.add_argument("--output", type=str, default="", help="Path to write the metrics to, stdout if not given")
+    arg_parse.add_argument("--max-states", type=int, default=0, help="Most states allowed, 0 for no limit")
+    arg_parse.add_argument("--max-transitions", type=int, default=0, help="Most transitions allowed, 0 for no limit")
+    arg_parse.add_argument("--max-conditions", type=int, default=0, help="Most conditions allowed, 0 for no limit")
+    arg_parse.add_argument(
+        "--max-fan-out", type=int, default=0, help="Most transitions leaving a single state, 0 for no limit"
+    )
+    arg_parse.add_argument(
+        "--max-complexity", type=int, default=0, help="Highest cyclomatic complexity allowed, 0 for no limit"
+    )
+    arg_parse.add_argument("--max-placeholders", type=int, default=0, help="Most placeholders allowed, 0 for no limit")
+    args = arg_parse.parse_args(arguments)
+
+    try:
+        thresholds = MetricThresholds(
+            max_states=args.max_states,
+            max_transitions=args.max_transitions,
+            max_conditions=args.max_conditions,
+            max_fan_out=args.max_fan_out,
+            max_cyclomatic_complexity=args.max_complexity,
+            max_placeholders=args.max_placeholders,
+        )
+    except ValueError as exc:
+        arg_parse.error(str(exc))
+
+    failed: int = 0
+    try:
+        pairs: list[PluginPair] = discover_pairs(root=args.path)
+        with (
+            (
+                open(args.output, "w", encoding="utf-8", newline="")
+                if args.output
+                else contextlib.nullcontext(sys.stdout)
+            ) as output,
+            MetricsWriter(output=output, metrics_format=MetricsFormat(args.format)) as writer,
+        ):
+            for pair in pairs:
+                try:
+                    metrics = compute_metrics(
+                        process_file=Parser(file_contents=read_file(path=pair.process_file)).parsed_file
+                        if pair.process_file
+                        else {},
+                        prompts_file=Parser(file_contents=read_file(path=pair.prompts_file)).parsed_file
+                        if pair.prompts_file
+                        else {},
+                    )
+                except (OSError, UnicodeDecodeError, ValueError) as exc:
+                    print(f"{pair.name}: {exc}", file=sys.stderr)
+                    failed += 1
+                    continue
+                violations: list[ValidationResult] = check_thresholds(metrics=metrics, thresholds=thresholds)
+                failed += bool(violations)
+                writer.write(name=pair.name, metrics=metrics, violations=violations)
+    except FileNotFoundError as exc:
+        print(exc)
+        sys.exit(1)
+    except OSError as exc:
+        print(f"The metrics could not be written to {args.output}: {exc}")
+        sys.exit(1)
+
+    sys.exit(1 if failed else 0)
+
+
+def _queue(arguments: list[str]) -> None:
+    """
+    Validate a corpus with several workers sharing a queue directory.
+
+    :param arguments: Command line arguments.
+    """
+    arg_parse = argparse.ArgumentParser(
+        prog="CyberArk TPC Plugin Validator queue",
+        description="Share the validation of a corpus between workers, on one host or many, using a queue directory.",
+    )
+    actions = arg_parse.add_subparsers(dest="action", required=True)
+    init_parser = actions.add_parser("init", help="Add every plugin pair found beneath a directory to the queue")
+    init_parser.add_argument("queue", type=str, help="Path to the queue directory")
+    init_parser.add_argument("path", type=str, help="Path to the directory containing the plugins to validate")
+    work_parser = actions.add_parser("work", help="Claim and validate plugins until the queue is finished")
+    work_parser.add_argument("queue", type=str, help="Path to the queue directory")
+    work_parser.add_argument(
+        "--backend",
+        type=str,
+        choices=[backend.value for backend in Backend],
+        default=Backend.process.value,
+        help="Executor used to run validations in parallel",
+    )
+    work_parser.add_argument("--workers", type=int, default=None, help="Maximum number of parallel workers")
+    work_parser.add_argument(
+        "--stale-after",
+        type=float,
+        default=DEFAULT_STALE_AFTER,
+        help="Seconds after which a claim is assumed to belong to a worker that has died",
+    )
+    _add_limit_arguments(arg_parse=work_parser)
+    _add_config_arguments(arg_parse=work_parser)
+    report_parser = actions.add_parser("report", help="Report the results of every plugin validated so far")
+    report_parser.add_argument("queue", type=str, help="Path to the queue directory")
+    args = arg_parse.parse_args(arguments)
+
+    try:
+        work_queue = WorkQueue(path=args.queue, stale_after=getattr(args, "stale_after", DEFAULT_STALE_AFTER))
+        if args.action == "init":
+            added: int = work_queue.enqueue(pairs=discover_pairs(root=os.path.abspath(args.path)))
+            print(f"{added} plugins added to the queue.")
+            sys.exit(0)
+
+        if args.action == "work":
+            batch_validator = BatchValidator(
+                pairs=[],
+                backend=Backend(args.backend),
+                max_workers=args.workers,
+                limits=_limits(args=args),
+                config=_config(args=args),
+            )
+            validated: int = sum(1 for _ in work_queue.work(batch_validator=batch_validator))
+            print(f"{validated} plugins validated.")
+            sys.exit(0)
+
+        counts: dict[str, int] = work_queue.counts()
+        results: list[BatchResult] = sorted(work_queue.results(), key=lambda result: result.pair.name)
+    except FileNotFoundError as exc:
+        print(exc)
+        sys.exit(1)
+    except ValueError as exc:
+        print(f"Invalid input: {exc}")
+        sys.exit(1)
+
+    failed: int = _print_batch_results(results=results)
+    remaining: int = counts["pending"] + counts["claimed"]
+    if remaining:
+        print(f"{remaining} plugins have not been validated yet.")
+        failed += remaining
+    _exit_with_summary(failed=failed, total=len(results) + remaining)
+
+
+def _add_limit_arguments(arg_parse: argparse.ArgumentParser) -> None:
+    """
+    Add the options setting the resource limits of each plugin pair.
+
+    :param arg_parse: The parser to add the options to.
+    """
+    arg_parse.add_argument(
+        "--max-file-bytes", type=int, default=0, help="Largest process or prompts file allowed, 0 for no limit"
+    )
+    arg_parse.add_argument(
+        "--max-section-tokens", type=int, default=0, help="Most lines allowed in a single section, 0 for no limit"
+    )
+    arg_parse.add_argument(
+        "--max-seconds", type=float, default=0.0, help="Longest time allowed to validate a plugin, 0 for no limit"
+    )
+
+
+def _limits(args: argparse.Namespace) -> ResourceLimits | None:
+    """
+    Create the resource limits from the command line arguments.
+
+    :param args: Parsed command line arguments including the limit options.
+
+    :raises ValueError: If a limit is negative.
+
+    :return: ResourceLimits, or None if no limit was set.
+    """
+    limits = ResourceLimits(
+        max_file_bytes=args.max_file_bytes,
+        max_section_tokens=args.max_section_tokens,
+        max_seconds=args.max_seconds,
+    )
+    return limits if limits != ResourceLimits() else None
+
+
+def _add_config_arguments(arg_parse: argparse.ArgumentParser) -> None:
+    """
+    Add the options configuring the rule sets.
+
+    :param arg_parse: The parser to add the options to.
+    """
+    arg_parse.add_argument(
+        "--runtime-budget",
+        type=float,
+        default=None,
+        help="Report a plugin if its estimated worst case runtime, in seconds, is greater than this",
+    )
+
+
+def _config(args: argparse.Namespace) -> dict[str, dict[str, Any]]:
+    """
+    Create the rule set configuration from the command line arguments.
+
+    :param args: Parsed command line arguments including the configuration options.
+
+    :return: Configuration keyed by rule set, empty if no option was set.
+    """
+    if args.runtime_budget is None:
+        return {}
+    return {"transitions": {"runtime_budget": args.runtime_budget}}
+
+
+def _exit_with_summary(failed: int, total: int) -> None:
+    """
+    Print the summary of a batch and exit with its status.
+
+    :param failed: The number of plugins that did not pass.
+    :param total: The number of plugins in the batch.
+    """
+    if not failed:
+        print(f"No violations found. All {total} plugins are valid.")
+        sys.exit(0)
+
+    print(f"{failed} of {total} plugins have violations.")
+    sys.exit(1)
+
+
+def _report_batch_results(path: str, results: Iterable[BatchResult]) -> tuple[int, int]:
+    """
+    Print the violations for each plugin in a batch as its result arrives, also writing it to a file for merging.
+
+    :param path: Path to the file to write, nothing is written if empty.
+    :param results: The batch results to report.
+
+    :return: The number of plugins that did not pass and the number of plugins in the batch.
+    """
+    failed: int = 0
+    total: int = 0
+    try:
+        with ResultWriter(path=path) if path else contextlib.nullcontext() as writer:
+            for result in results:
+                total += 1
+                if writer is not None:
+                    writer.write(result=result)
+                if not result.passed:
+                    failed += 1
+                    _print_batch_result(result=result)
+    except OSError as exc:
+        print(f"The results could not be written to {path}: {exc}")
+        sys.exit(1)
+    return failed, total
+
+
+def _serve(arguments: list[str]) -> None:
+    """
+    Run the HTTP validation service.
+
+    :param arguments: Command line arguments.
+    """
+    arg_parse = argparse.ArgumentParser(
+        prog="CyberArk TPC Plugin Validator serve",
+        description="Run an HTTP service that validates TPC process and prompts files.",
+    )
+    arg_parse.add_argument("--host", type=str, default="127.0.0.1", help="Interface to listen on")
+    arg_parse.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    arg_parse.add_argument(
+        "--backend",
+        type=str,
+        choices=[backend.value for backend in Backend],
+        default=Backend.process.value,
+        help="Executor used to run validations in parallel",
+    )
+    arg_parse.add_argument("--workers", type=int, default=None, help="Maximum number of parallel workers")
+    arg_parse.add_argument(
+        "--max-pending", type=int, default=64, help="Validations queued or running before requests are refused"
+    )
+    arg_parse.add_argument("--cache-size", type=int, default=1024, help="Number of recent results to keep")
+    _add_limit_arguments(arg_parse=arg_parse)
+    _add_config_arguments(arg_parse=arg_parse)
+    args = arg_parse.parse_args(arguments)
+
+    try:
+        from tpc_plugin_validator import server
+    except ImportError:
+        print("The validation service requires aiohttp, install cyberark-tpc-plugin-validator[server].")
+        sys.exit(1)
+
+    try:
+        limits: ResourceLimits | None = _limits(args=args)
+        check_time_limit(backend=Backend(args.backend), limits=limits)
+        executor = create_executor(backend=Backend(args.backend), max_workers=args.workers)
+    except ValueError as exc:
+        print(f"Invalid input: {exc}")
+        sys.exit(1)
+
+    with executor:
+        server.run(
+            host=args.host,
+            port=args.port,
+            executor=executor,
+            max_pending=args.max_pending,
+            cache_size=args.cache_size,
+            limits=limits,
+            config=_config(args=args),
+        )
+
+
+def _simulate(arguments: list[str]) -> None:
+    """
+    Simulate a plugin against a recorded transcript of the output of a target.
+
+    :param arguments: Command line arguments.
+    """
+    arg_parse = argparse.ArgumentParser(
+        prog="CyberArk TPC Plugin Validator simulate",
+        description="Drive the state machine of a TPC plugin with a recorded terminal transcript.",
+    )
+    arg_parse.add_argument("transcript", type=str, help="Path to the recorded output of the target, - to read stdin")
+    arg_parse.add_argument("process_file", type=str, help="Path to the process file, or plugin zip, to simulate")
+    arg_parse.add_argument(
+        "prompts_file",
+        type=str,
+        nargs="?",
+        default="",
+        help="Path to the prompts file to simulate",
+    )
+    arg_parse.add_argument(
+        "--parameters",
+        type=str,
+        default="",
+        help="Path to a file of name=value lines giving the values of the placeholders in the conditions",
+    )
+    args = arg_parse.parse_args(arguments)
+
+    if not args.prompts_file and not args.process_file.lower().endswith(".zip"):
+        arg_parse.error("the prompts_file argument is required unless a plugin zip is given")
+    if args.prompts_file and args.process_file.lower().endswith(".zip"):
+        arg_parse.error("the prompts_file argument cannot be given with a plugin zip")
+
+    validator: Validator = _load_validator(process_file_path=args.process_file, prompts_file_path=args.prompts_file)
+    try:
+        parameters: dict[str, str] = (
+            read_parameters(lines=read_file(args.parameters).splitlines()) if args.parameters else {}
+        )
+    except FileNotFoundError as exc:
+        print(exc)
+        sys.exit(1)
+    except (UnicodeDecodeError, ValueError) as exc:
+        print(f"Invalid input: {exc}")
+        sys.exit(1)
+
+    simulator = Simulator(
+        process_file=validator.process_file,
+        prompts_file=validator.prompts_file,
+        parameters=parameters,
+    )
+    try:
+        with (
+            open(args.transcript, encoding="utf-8", errors="replace", newline="")
+            if args.transcript != "-"
+            else contextlib.nullcontext(sys.stdin)
+        ) as transcript:
+            for line in transcript:
+                for step in simulator.feed(output=line):
+                    print(step)
+    except OSError as exc:
+        print(f"The transcript could not be read from {args.transcript}: {exc}")
+        sys.exit(1)
+
+    result: SimulationResult = simulator.finish()
+    _print_simulation_result(result=result)
+    if result.outcome != SimulationOutcome.end:
+        sys.exit(1)
+
+
+def _print_batch_results(results: list[BatchResult]) -> int:
+    """
+    Print the violations for each plugin in a batch.
+
+    :param results: The batch results to print.
+
+    :return: The number of plugins that did not pass.
+    """
+    failed: int = 0
+    for result in results:
+        if result.passed:
+            continue
+        failed += 1
+        _print_batch_result(result=result)
+    return failed
+
+
+def _print_batch_result(result: BatchResult) -> None:
+    """
+    Print the violations for a plugin that did not pass.
+
+    :param result: The batch result to print.
+    """
+    if result.error:
+        print(f"{result.pair.name}: {result.error}")
+        return
+    print(f"{result.pair.name}: {len(result.violations)} violations found:")
+    _print_violations(violations=result.violations)
+
+
+def _print_schedule(batch_validator: BatchValidator, workers: int) -> None:
+    """
+    Print the makespan of a batch compared with the time its tasks took.
+
+    :param batch_validator: The batch validator that has been run.
+    :param workers: The number of workers used.
+    """
+    task_seconds: float = sum(batch_validator.timings.values())
+    makespan: float = batch_validator.makespan
+    utilisation: float = task_seconds / (makespan * workers) if makespan else 0.0
+    print(
+        f"Makespan {makespan:.3f}s, sum of task times {task_seconds:.3f}s over {workers} workers, "
+        f"{utilisation:.0%} utilisation."
+    )
+
+
+def _print_duplicate_groups(groups: list[list[PluginPair]]) -> None:
+    """
+    Print the groups of plugins that were validated once as duplicates of each other.
+
+    :param groups: The duplicate groups to print.
+    """
+    if not groups:
+        return
+    print(f"{len(groups)} groups of duplicate plugins found:")
+    for group in sorted(sorted(pair.name for pair in group) for group in groups):
+        print(f"\t{', '.join(group)}")
+
+
+def _print_coverage(coverage: TransitionCoverage) -> None:
+    """
+    Print the transitions and states never exercised.
+
+    :param coverage: The coverage to print.
+    """
+    for path, error in coverage.unreadable.items():
+        print(f"The log could not be read from {path}: {error}")
+    read: int = coverage.logs - len(coverage.unreadable)
+    print(
+        f"{len(coverage.exercised)} of {len(coverage.transitions)} transitions ({coverage.percentage:.1f}%) were "
+        f"exercised by {read} {'log' if read == 1 else 'logs'}."
+    )
+    for transition in coverage.unexercised_transitions:
+        print(
+            f"Transition never exercised - Line {transition.line_number}: {transition.current_state} "
+            f"-({transition.condition})-> {transition.next_state}"
+        )
+    for state in coverage.unobserved_states:
+        print(f"State never reached - {state}")
+
+
+def _print_simulation_result(result: SimulationResult) -> None:
+    """
+    Print the outcome of a simulation.
+
+    :param result: The outcome to print.
+    """
+    if result.outcome == SimulationOutcome.end:
+        print(f'Reached the end state "{result.state}" after {len(result.steps)} transitions.')
+    elif result.outcome == SimulationOutcome.fail:
+        print(
+            f'Reached the fail state "{result.state}" after {len(result.steps)} transitions with code '
+            f"{result.fail_code}: {result.reason}"
+        )
+    else:
+        print(f'Stalled in the state "{result.state}" after {len(result.steps)} transitions. {result.reason}')
+    if result.missing_parameters:
+        print(f"No value was given for the placeholders: {', '.join(result.missing_parameters)}.")
+
+
+def _print_violations(violations: list[ValidationResult]) -> None:
+    """
+    Print the given violations.
+
+    :param violations: The violations to print.
+    """
     for violation in violations:
         print(f"{violation.severity} - {violation.rule} - {violation.message}")
 
-    sys.exit(1)
+
+_COMMANDS: dict[str, Callable[[list[str]], None]] = {
+    "batch": _batch,
+    "coverage": _coverage,
+    "export-graph": _export_graph,
+    "merge": _merge,
+    "metrics": _metrics,
+    "queue": _queue,
+    "serve": _serve,
+    "simulate": _simulate,
+}
 
 
 if __name__ == "__main__":
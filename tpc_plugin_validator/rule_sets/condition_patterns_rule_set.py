@@ -0,0 +1,80 @@
+"""Handle validation of the cost of matching the patterns assigned to conditions in the prompts file."""
+
+from tpc_plugin_parser.lexer.tokens.assignment import Assignment
+
+from tpc_plugin_validator.rule_sets.rule_set import RuleSet
+from tpc_plugin_validator.utilities.condition_pattern import PatternCost, analyse_pattern
+from tpc_plugin_validator.utilities.severity import Severity
+from tpc_plugin_validator.utilities.types import FileNames, SectionNames, Violations
+
+
+class ConditionPatternsRuleSet(RuleSet):
+    """
+    Handle validation of the cost of matching the patterns assigned to conditions in the prompts file.
+
+    Each condition is matched against the output of the target every time more output is read, so a pattern that
+    backtracks heavily can slow a password change until it times out.
+    """
+
+    _CONFIG_KEY: str = "condition_patterns"
+    _DEFAULT_MAX_DEGREE: int = 2
+    _FILE_TYPE: FileNames = FileNames.prompts
+    _SECTION_NAME: SectionNames = SectionNames.conditions
+
+    def validate(self) -> None:
+        """Validate the patterns assigned to the conditions."""
+        max_degree: int = self._config.get("max_degree", self._DEFAULT_MAX_DEGREE)
+        for token in self._get_section(file=self._FILE_TYPE, section_name=self._SECTION_NAME):
+            if not isinstance(token, Assignment) or not token.assigned:
+                continue
+            cost: PatternCost | None = analyse_pattern(pattern=token.assigned)
+            if cost is None:
+                # Boolean expressions are not patterns and invalid patterns are left to CPM to report.
+                continue
+            self._validate_cost(token=token, cost=cost, max_degree=max_degree)
+
+    def _validate_cost(self, token: Assignment, cost: PatternCost, max_degree: int) -> None:
+        """
+        Report the features of a pattern that make it costly to match.
+
+        :param token: The condition.
+        :param cost: The analysis of its pattern.
+        :param max_degree: The highest power of the length of the output the time taken to match may grow with.
+        """
+        if cost.nested_quantifier:
+            self._add_violation(
+                name=Violations.pattern_cost_violation,
+                severity=Severity.WARNING,
+                message=(
+                    f'The condition "{token.name}" has nested quantifiers in '
+                    f'"{self._sanitize_value(cost.nested_quantifier)}", matching can take time exponential in the '
+                    "length of the output."
+                ),
+                file=self._FILE_TYPE,
+                section=self._SECTION_NAME,
+                line=token.line_number,
+            )
+        if cost.overlapping_alternation and cost.overlapping_alternation != cost.nested_quantifier:
+            self._add_violation(
+                name=Violations.pattern_cost_violation,
+                severity=Severity.WARNING,
+                message=(
+                    f'The condition "{token.name}" repeats alternatives that can start with the same character in '
+                    f'"{self._sanitize_value(cost.overlapping_alternation)}", matching may backtrack over the output.'
+                ),
+                file=self._FILE_TYPE,
+                section=self._SECTION_NAME,
+                line=token.line_number,
+            )
+        if cost.degree > max_degree:
+            self._add_violation(
+                name=Violations.pattern_cost_violation,
+                severity=Severity.WARNING,
+                message=(
+                    f'The condition "{token.name}" has {cost.wildcards} ".*" wildcards that can backtrack, each match '
+                    f"can take time proportional to the length of the output to the power of {cost.degree}."
+                ),
+                file=self._FILE_TYPE,
+                section=self._SECTION_NAME,
+                line=token.line_number,
+            )
@@ -2,6 +2,7 @@
 
 import unicodedata
 from abc import ABC
+from typing import Any
 
 from tpc_plugin_parser.lexer.tokens.assignment import Assignment
 from tpc_plugin_parser.lexer.tokens.parse_error import ParseError
@@ -32,13 +33,16 @@ class RuleSet(ABC):
         self,
         process_file: dict[str, list[ALL_TOKEN_TYPES]],
         prompts_file: dict[str, list[ALL_TOKEN_TYPES]],
+        config: dict[str, dict[str, Any]] | None = None,
     ) -> None:
         """
         Initialize the rule set with prompts and process configurations.
 
         :param process_file: Parsed process file.
         :param prompts_file: Parsed prompts file.
+        :param config: Configuration keyed by rule set, this rule set uses the entry under its _CONFIG_KEY.
         """
+        self._config: dict[str, Any] = (config or {}).get(self._CONFIG_KEY, {})
         self._file_sections: dict[str, dict[str, str]] = {}
         self._process_file: dict[str, list[ALL_TOKEN_TYPES]] = process_file
         self._prompts_file: dict[str, list[ALL_TOKEN_TYPES]] = prompts_file
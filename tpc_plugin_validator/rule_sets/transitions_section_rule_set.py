@@ -12,7 +12,11 @@ from tpc_plugin_parser.lexer.tokens.transition import Transition
 from tpc_plugin_parser.lexer.utilities.token_name import TokenName
 from tpc_plugin_parser.lexer.utilities.types import ALL_TOKEN_TYPES
 from tpc_plugin_validator.rule_sets.section_rule_set import SectionRuleSet
+from tpc_plugin_validator.utilities.condition_automaton import subsumes
+from tpc_plugin_validator.utilities.condition_pattern import EXPRESSION_PREFIX
+from tpc_plugin_validator.utilities.runtime_estimate import RuntimeEstimate, estimate_runtime
 from tpc_plugin_validator.utilities.severity import Severity
+from tpc_plugin_validator.utilities.state_graph import StateGraph
 from tpc_plugin_validator.utilities.types import FileNames, SectionNames, Violations
 
 
@@ -23,6 +27,7 @@ class TransitionsSectionRuleSet(SectionRuleSet):
 
     __slots__ = (
         "_default_initial_state",
+        "_graph",
         "_initial_state",
         "_initial_state_warned",
     )
@@ -35,17 +40,19 @@ class TransitionsSectionRuleSet(SectionRuleSet):
         TokenName.COMMENT.value,
     ]
 
-    def __init__(self, process_file, prompts_file) -> None:
+    def __init__(self, process_file, prompts_file, config=None) -> None:
         """
         Initialise the transitions section rule set with prompts and process configurations.
 
         :param process_file: Parsed process file.
         :param prompts_file: Parsed prompts file.
+        :param config: Configuration keyed by rule set, the "runtime_budget" in seconds is read from "transitions".
         """
         self._default_initial_state: str = "Init"
+        self._graph: StateGraph | None = None
         self._initial_state: str = ""
         self._initial_state_warned: bool = False
-        super().__init__(prompts_file=prompts_file, process_file=process_file)
+        super().__init__(prompts_file=prompts_file, process_file=process_file, config=config)
 
     def validate(self) -> None:
         """Validate the transitions section of the process file."""
@@ -60,12 +67,42 @@ class TransitionsSectionRuleSet(SectionRuleSet):
                 self._initial_state = transition.current_state.lower()
                 break
 
+        self._graph = StateGraph.from_sections(
+            transitions=section,
+            states=self._get_section(file=self._FILE_TYPE, section_name=SectionNames.states),
+        )
         self._validate_tokens(file=self._FILE_TYPE)
         self._validate_conditions()
         self._validate_duplicates()
         self._validate_states()
         self._validate_state_paths()
         self._validate_transition_reachable()
+        self._validate_shadowed_conditions()
+        self._validate_graph()
+        self._validate_runtime()
+
+    def _example_path(self, state: str, then: Transition | None = None) -> str:
+        """
+        Describe a path with the fewest transitions from the initial state to a state, to add to a violation message.
+
+        The path names each state and the condition leading out of it rather than line numbers, so that the message
+        still holds for a copy of the file whose lines have moved.
+
+        :param state: The state the path leads to.
+        :param then: A transition from the state to add to the end of the path, if any.
+
+        :return: The description starting with a space, empty if the state cannot be reached.
+        """
+        if self._graph is None:
+            return ""
+        path: list[Transition] | None = self._graph.shortest_path(state=state)
+        if path is None:
+            return ""
+        if then is not None:
+            path = [*path, then]
+
+        steps: str = "".join(f' -({transition.condition})-> "{transition.next_state}"' for transition in path)
+        return f' Example path: "{self._graph.name(self._graph.initial_state)}"{steps}.'
 
     def _get_fail_state(self, name: str) -> FailState | None:
         """
@@ -83,6 +120,57 @@ class TransitionsSectionRuleSet(SectionRuleSet):
             None,
         )
 
+    def _validate_closed_cycles(self, reachable: set[str], terminating: set[str]) -> set[str]:
+        """
+        Check for cycles of reachable states from which END and the fail states can never be reached.
+
+        CPM keeps looping through such a cycle until the plugin times out. Each cycle is found as a strongly connected
+        component of the graph and reported once, listing its states and the transitions that form it. Transitions are
+        named by their states and condition rather than line numbers, so that the message still holds for a copy of the
+        file whose lines have moved.
+
+        :param reachable: The states that can be reached from the initial state.
+        :param terminating: The states from which END or a fail state can be reached.
+
+        :return: Set of the lower case names of every state within a reported cycle.
+        """
+        closed: set[str] = set()
+        if self._graph is None:
+            return closed
+
+        for component in self._graph.strongly_connected_components():
+            if component[0] not in reachable or component[0] in terminating:
+                continue
+            members: set[str] = set(component)
+            transitions: list[Transition] = sorted(
+                (
+                    transition
+                    for state in component
+                    for transition in self._graph.successors(state)
+                    if transition.next_state.lower() in members
+                ),
+                key=lambda transition: transition.line_number,
+            )
+            if not transitions:
+                # A single state that does not transition to itself is not a cycle.
+                continue
+            closed |= members
+            states: str = ", ".join(f'"{self._graph.name(state)}"' for state in component)
+            steps: str = ", ".join(
+                f'"{transition.current_state}" -({transition.condition})-> "{transition.next_state}"'
+                for transition in transitions
+            )
+            entry: str = min(component, key=lambda state: len(self._graph.shortest_path(state=state) or []))
+            self._add_violation(
+                name=Violations.closed_cycle_violation,
+                severity=Severity.CRITICAL,
+                message=f'The states {states} form a cycle with no path leading to "END" or a fail state, through the transitions {steps}.{self._example_path(state=entry)}',
+                file=self._FILE_TYPE,
+                section=self._SECTION_NAME,
+                line=transitions[0].line_number,
+            )
+        return closed
+
     def _validate_conditions(self) -> None:
         """Validate the conditions used in transitions."""
         if not self.has_prompts_file:
@@ -144,6 +232,68 @@ class TransitionsSectionRuleSet(SectionRuleSet):
                     line=first_states[state].line_number,
                 )
 
+    def _validate_graph(self) -> None:
+        """
+        Check that every state can be reached from the initial state and can go on to reach END or a fail state.
+
+        Unlike the checks on each transition, this follows whole paths, so a group of states that only lead to each
+        other is caught. States without any transition leading to them or away from them are already reported by
+        _validate_state_paths, and states within a closed cycle by _validate_closed_cycles, so both are skipped here.
+        """
+        if self._graph is None:
+            return
+
+        reachable: set[str] = self._graph.reachable()
+        terminating: set[str] = self._graph.terminating()
+        closed: set[str] = self._validate_closed_cycles(reachable=reachable, terminating=terminating)
+        for state in self._graph.states:
+            if self._graph.is_terminal(state) or state in closed:
+                continue
+            incoming: list[Transition] = self._graph.predecessors(state)
+            outgoing: list[Transition] = self._graph.successors(state)
+            if state not in reachable:
+                if not incoming:
+                    continue
+                self._add_violation(
+                    name=Violations.unreachable_state_violation,
+                    severity=Severity.CRITICAL,
+                    message=f'The state "{self._graph.name(state)}" cannot be reached from the initial state "{self._graph.name(self._graph.initial_state)}".',
+                    file=self._FILE_TYPE,
+                    section=self._SECTION_NAME,
+                    line=(outgoing or incoming)[0].line_number,
+                )
+            elif state not in terminating and outgoing:
+                self._add_violation(
+                    name=Violations.non_terminating_state_violation,
+                    severity=Severity.CRITICAL,
+                    message=f'The state "{self._graph.name(state)}" has no path leading to "END" or a fail state.{self._example_path(state=state)}',
+                    file=self._FILE_TYPE,
+                    section=self._SECTION_NAME,
+                    line=outgoing[0].line_number,
+                )
+
+    def _validate_runtime(self) -> None:
+        """Check that the estimated worst case runtime from the initial state to END is within the configured budget."""
+        budget: float | None = self._config.get("runtime_budget")
+        if self._graph is None or budget is None:
+            return
+
+        estimate: RuntimeEstimate | None = estimate_runtime(
+            graph=self._graph,
+            states=self._get_section(file=self._FILE_TYPE, section_name=SectionNames.states),
+            parameters=self._get_section(file=self._FILE_TYPE, section_name=SectionNames.parameters),
+        )
+        if estimate is None or estimate.worst_seconds <= budget:
+            return
+
+        self._add_violation(
+            name=Violations.runtime_budget_violation,
+            severity=Severity.WARNING,
+            message=f"The worst case runtime is estimated at {estimate.worst_seconds:.1f} seconds over {estimate.longest_steps} transitions, which exceeds the budget of {budget:.1f} seconds. The typical runtime is estimated at {estimate.typical_seconds:.1f} seconds over {estimate.shortest_steps} transitions.",
+            file=self._FILE_TYPE,
+            section=self._SECTION_NAME,
+        )
+
     def _validate_next_transition(self, transition: ALL_TOKEN_TYPES, transitions) -> None:
         """
         Check the to_state has a valid transition to start from.
@@ -167,7 +317,7 @@ class TransitionsSectionRuleSet(SectionRuleSet):
             self._add_violation(
                 name=Violations.invalid_transition_violation,
                 severity=Severity.CRITICAL,
-                message=f'The state "{transition.current_state}" attempts to transition to "{transition.next_state}" but has not been declared.',
+                message=f'The state "{transition.current_state}" attempts to transition to "{transition.next_state}" but has not been declared.{self._example_path(state=transition.current_state, then=transition)}',
                 file=self._FILE_TYPE,
                 section=self._SECTION_NAME,
                 line=transition.line_number,
@@ -236,7 +386,7 @@ class TransitionsSectionRuleSet(SectionRuleSet):
                     r"\(\s*expression\s*\)\s*(true|false)", condition.assigned, re.IGNORECASE
                 ):
                     bool_conditions.append(condition.name.lower())
-        transition_had_bool: list[str] = []
+        transition_had_bool: dict[str, Transition] = {}
         for transition in self._get_section(file=self._FILE_TYPE, section_name=self._SECTION_NAME):
             if not isinstance(transition, Transition):
                 continue
@@ -246,7 +396,7 @@ class TransitionsSectionRuleSet(SectionRuleSet):
                 self._add_violation(
                     name=Violations.unreachable_transition_violation,
                     severity=Severity.CRITICAL,
-                    message=f'The transition "{transition.current_state},{transition.condition},{transition.next_state}" is unreachable due to a previous transition from "{transition.current_state}" having a boolean condition.',
+                    message=f'The transition "{transition.current_state},{transition.condition},{transition.next_state}" is unreachable due to a previous transition from "{transition.current_state}" having a boolean condition.{self._example_path(state=transition.current_state, then=transition_had_bool[tran_cur_state_lower])}',
                     file=self._FILE_TYPE,
                     section=self._SECTION_NAME,
                     line=transition.line_number,
@@ -257,14 +407,108 @@ class TransitionsSectionRuleSet(SectionRuleSet):
                     self._add_violation(
                         name=Violations.unreachable_transition_violation,
                         severity=Severity.WARNING,
-                        message=f'The transition "{transition.current_state},{transition.condition},{transition.next_state}" will never be matched.',
+                        message=f'The transition "{transition.current_state},{transition.condition},{transition.next_state}" will never be matched.{self._example_path(state=transition.current_state)}',
                         file=self._FILE_TYPE,
                         section=self._SECTION_NAME,
                         line=transition.line_number,
                     )
                 else:
                     # Add any found transitions that use a boolean condition to the list (must be after checking previous to stop false positives).
-                    transition_had_bool.append(tran_cur_state_lower)
+                    transition_had_bool.setdefault(tran_cur_state_lower, transition)
+
+    def _validate_shadowed_conditions(self) -> None:
+        """
+        Validate that no transition is shadowed by earlier transitions from the same state.
+
+        A transition is shadowed when any output its condition matches is also matched by the condition of an earlier
+        transition from the same state, as the earlier transition is always taken first. States are only checked up to
+        their first boolean condition, as the transitions after it are reported as unreachable already.
+        """
+        if not self.has_prompts_file:
+            return
+
+        patterns: dict[str, str] = {}
+        for condition in self._get_section(file=FileNames.prompts, section_name=SectionNames.conditions):
+            if isinstance(condition, Assignment) and condition.assigned:
+                patterns.setdefault(condition.name.lower(), condition.assigned)
+
+        earlier: dict[str, list[Transition]] = {}
+        stopped: set[str] = set()
+        for transition in self._get_section(file=self._FILE_TYPE, section_name=self._SECTION_NAME):
+            if not isinstance(transition, Transition):
+                continue
+            current_state: str = transition.current_state.lower()
+            pattern: str | None = patterns.get(transition.condition.lower())
+            if current_state in stopped or pattern is None:
+                continue
+            if pattern.lower().startswith(EXPRESSION_PREFIX):
+                stopped.add(current_state)
+                continue
+
+            previous: list[Transition] = [
+                previous
+                for previous in earlier.get(current_state, [])
+                if previous.condition.lower() != transition.condition.lower()
+            ]
+            earlier.setdefault(current_state, []).append(transition)
+            if not previous:
+                continue
+
+            shadowing: list[str] = self._shadowing_conditions(
+                earlier=[previous_transition.condition for previous_transition in previous],
+                pattern=pattern,
+                patterns=patterns,
+            )
+            if not shadowing:
+                continue
+            names: str = ", ".join(f'"{condition}"' for condition in shadowing)
+            earlier_conditions: str = (
+                f"the earlier condition {names}" if len(shadowing) == 1 else f"one of the earlier conditions {names}"
+            )
+            self._add_violation(
+                name=Violations.unreachable_transition_violation,
+                severity=Severity.WARNING,
+                message=(
+                    f'The transition "{transition.current_state},{transition.condition},{transition.next_state}" is '
+                    f'unreachable as any output matched by the condition "{transition.condition}" is matched first by '
+                    f'{earlier_conditions} from "{transition.current_state}".'
+                    f"{self._example_path(state=transition.current_state)}"
+                ),
+                file=self._FILE_TYPE,
+                section=self._SECTION_NAME,
+                line=transition.line_number,
+            )
+
+    @staticmethod
+    def _shadowing_conditions(earlier: list[str], pattern: str, patterns: dict[str, str]) -> list[str]:
+        """
+        Find earlier conditions that between them match any output a pattern matches, none of which can be dropped.
+
+        A single earlier condition is looked for first, otherwise each condition is dropped in turn while the rest
+        still match everything the pattern matches. The conditions left are minimal rather than the
+        fewest, a smaller set made of other conditions may exist.
+
+        :param earlier: The names of the earlier conditions, in the order they are used.
+        :param pattern: The pattern of the later condition.
+        :param patterns: The patterns of the conditions keyed by lower case name.
+
+        :return: List of the names of the shadowing conditions, empty if the pattern is not shadowed.
+        """
+        first_used: dict[str, str] = {}
+        for condition in earlier:
+            first_used.setdefault(condition.lower(), condition)
+        candidates: list[str] = list(first_used.values())
+        for condition in candidates:
+            if subsumes(earlier=(patterns[condition.lower()],), later=pattern):
+                return [condition]
+
+        if not subsumes(earlier=tuple(patterns[condition.lower()] for condition in candidates), later=pattern):
+            return []
+        for condition in list(candidates):
+            remaining: list[str] = [candidate for candidate in candidates if candidate != condition]
+            if subsumes(earlier=tuple(patterns[candidate.lower()] for candidate in remaining), later=pattern):
+                candidates = remaining
+        return candidates
 
     def _validate_states(self) -> None:
         """Validate that states exist for all transitions and are in the correct case."""
@@ -0,0 +1,341 @@
+"""HTTP service exposing plugin validation to build agents, requires the optional aiohttp dependency."""
+
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Any
+
+from aiohttp import web
+
+from tpc_plugin_validator.batch.backends import Backend, check_time_limit
+from tpc_plugin_validator.batch.limits import ResourceLimits
+from tpc_plugin_validator.batch.worker import ViolationTuple, validate_content
+from tpc_plugin_validator.utilities.exceptions import ProgrammingError
+
+DEFAULT_CACHE_SIZE: int = 1024
+DEFAULT_MAX_PENDING: int = 64
+MAX_FILE_BYTES: int = 1024 * 1024
+# Room for a pair of files at the size the parser accepts, allowing for the escaping of JSON strings.
+MAX_REQUEST_BYTES: int = 4 * MAX_FILE_BYTES
+
+_VIOLATION_FIELDS: tuple[str, ...] = ("rule", "severity", "message", "file", "section", "line")
+
+
+class ServiceBusyError(Exception):
+    """Raised when the service cannot accept more work until pending validations complete."""
+
+
+class ValidationService(object):
+    """Run validations on a bounded executor, coalescing identical requests and caching recent results."""
+
+    __slots__ = (
+        "_cache",
+        "_cache_size",
+        "_config",
+        "_executor",
+        "_in_flight",
+        "_limits",
+        "_max_pending",
+    )
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        limits: ResourceLimits | None = None,
+        config: dict[str, dict[str, Any]] | None = None,
+    ) -> None:
+        """
+        Standard init for the ValidationService class.
+
+        :param executor: Executor to run validations on, the loop's default executor is used if not supplied.
+        :param max_pending: Maximum number of distinct validations queued or running before new work is refused.
+        :param cache_size: Number of recent results to keep.
+        :param limits: The resource limits each pair must stay within, nothing is enforced if not supplied.
+        :param config: Configuration of the rule sets keyed by rule set, the defaults are used if not supplied.
+
+        :raises ValueError: If a time limit is set and the executor is not a process pool.
+        """
+        check_time_limit(
+            backend=Backend.process if isinstance(executor, ProcessPoolExecutor) else Backend.thread, limits=limits
+        )
+
+        self._cache: OrderedDict[str, tuple[ViolationTuple, ...]] = OrderedDict()
+        self._cache_size: int = cache_size
+        self._config: dict[str, dict[str, Any]] = config or {}
+        self._executor: Executor | None = executor
+        self._in_flight: dict[str, asyncio.Future[tuple[ViolationTuple, ...]]] = {}
+        self._limits: ResourceLimits | None = limits
+        self._max_pending: int = max_pending
+
+    @property
+    def pending(self) -> int:
+        """
+        Property to fetch the number of distinct validations queued or running.
+
+        :return: Number of pending validations.
+        """
+        return len(self._in_flight)
+
+    async def validate(self, process_file_content: str, prompts_file_content: str) -> tuple[ViolationTuple, ...]:
+        """
+        Validate a plugin pair, sharing the work with any identical request already in flight.
+
+        :param process_file_content: Content for the process file.
+        :param prompts_file_content: Content for the prompt file.
+
+        :raises ServiceBusyError: If the maximum number of pending validations has been reached.
+        :raises ProgrammingError: If neither file has any content.
+        :raises ValueError: If a file is larger than the parser accepts.
+
+        :return: Tuple of violation tuples.
+        """
+        return await self._submit(
+            key=self.content_key(process_file_content, prompts_file_content),
+            process_file_content=process_file_content,
+            prompts_file_content=prompts_file_content,
+        )
+
+    async def validate_many(self, pairs: list[tuple[str, str]]) -> list[tuple[ViolationTuple, ...] | Exception]:
+        """
+        Validate several plugin pairs, admitting them together or not at all.
+
+        :param pairs: List of process and prompts content.
+
+        :raises ServiceBusyError: If the batch would exceed the maximum number of pending validations.
+
+        :return: The result for each pair in order, or the exception raised validating it.
+        """
+        keys: list[str] = [self.content_key(process, prompts) for process, prompts in pairs]
+        new_keys: set[str] = {key for key in keys if key not in self._cache and key not in self._in_flight}
+        if self.pending + len(new_keys) > self._max_pending:
+            raise ServiceBusyError(f"The batch needs {len(new_keys)} validation slots but the service is busy.")
+
+        return await asyncio.gather(
+            *(
+                self._submit(key=key, process_file_content=process, prompts_file_content=prompts)
+                for key, (process, prompts) in zip(keys, pairs, strict=True)
+            ),
+            return_exceptions=True,
+        )
+
+    async def _submit(
+        self, key: str, process_file_content: str, prompts_file_content: str
+    ) -> tuple[ViolationTuple, ...]:
+        """
+        Fetch a result from the cache, join an identical in-flight validation or start a new one.
+
+        :param key: Content key for the pair.
+        :param process_file_content: Content for the process file.
+        :param prompts_file_content: Content for the prompt file.
+
+        :raises ServiceBusyError: If the maximum number of pending validations has been reached.
+
+        :return: Tuple of violation tuples.
+        """
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        future = self._in_flight.get(key)
+        if future is None:
+            if self.pending >= self._max_pending:
+                raise ServiceBusyError("The maximum number of pending validations has been reached.")
+            loop = asyncio.get_running_loop()
+            function: Callable[..., tuple[ViolationTuple, ...]] = validate_content
+            if self._limits is not None or self._config:
+                function = partial(validate_content, limits=self._limits, config=self._config)
+            future = loop.run_in_executor(self._executor, function, process_file_content, prompts_file_content)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done: self._complete(key=key, future=done))
+
+        # Shield so that one client disconnecting does not cancel the work shared with others.
+        return await asyncio.shield(future)
+
+    def _complete(self, key: str, future: asyncio.Future[tuple[ViolationTuple, ...]]) -> None:
+        """
+        Move a finished validation from the in-flight table to the cache.
+
+        :param key: Content key for the pair.
+        :param future: The finished validation.
+        """
+        self._in_flight.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        self._cache[key] = future.result()
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def content_key(process_file_content: str, prompts_file_content: str) -> str:
+        """
+        Create the key identifying a plugin pair by its content.
+
+        :param process_file_content: Content for the process file.
+        :param prompts_file_content: Content for the prompt file.
+
+        :return: Hex digest combining the hash of both files.
+        """
+        process_digest = hashlib.sha256(process_file_content.encode("utf-8", "surrogatepass")).hexdigest()
+        prompts_digest = hashlib.sha256(prompts_file_content.encode("utf-8", "surrogatepass")).hexdigest()
+        return f"{process_digest}:{prompts_digest}"
+
+
+def create_app(service: ValidationService) -> web.Application:
+    """
+    Create the aiohttp application exposing the validation service.
+
+    :param service: The service that performs validations.
+
+    :return: The application.
+    """
+
+    async def validate(request: web.Request) -> web.Response:
+        """Handle POST /validate for a single plugin pair."""
+        body = await _read_json(request=request)
+        process, prompts = _read_pair(body)
+        try:
+            violations = await service.validate(process_file_content=process, prompts_file_content=prompts)
+        except ServiceBusyError as exc:
+            raise _busy(exc) from exc
+        except (ProgrammingError, ValueError) as exc:
+            raise _bad_request(str(exc)) from exc
+        return web.json_response({"violations": _violations_to_json(violations)})
+
+    async def validate_batch(request: web.Request) -> web.Response:
+        """Handle POST /validate/batch for several plugin pairs."""
+        body = await _read_json(request=request)
+        items = body.get("pairs")
+        if not isinstance(items, list):
+            raise _bad_request('The request body must contain a "pairs" list.')
+        pairs: list[tuple[str, str]] = [_read_pair(item) for item in items]
+        try:
+            results = await service.validate_many(pairs=pairs)
+        except ServiceBusyError as exc:
+            raise _busy(exc) from exc
+
+        response: list[dict[str, Any]] = []
+        for item, result in zip(items, results, strict=True):
+            entry: dict[str, Any] = {"name": item.get("name", "")}
+            if isinstance(result, Exception):
+                entry |= {"violations": [], "error": str(result)}
+            else:
+                entry |= {"violations": _violations_to_json(result), "error": ""}
+            response.append(entry)
+        return web.json_response({"results": response})
+
+    app = web.Application(client_max_size=MAX_REQUEST_BYTES)
+    app.router.add_post("/validate", validate)
+    app.router.add_post("/validate/batch", validate_batch)
+    return app
+
+
+def run(
+    host: str,
+    port: int,
+    executor: Executor | None = None,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+    limits: ResourceLimits | None = None,
+    config: dict[str, dict[str, Any]] | None = None,
+) -> None:
+    """
+    Run the validation service until interrupted.
+
+    :param host: Interface to listen on.
+    :param port: Port to listen on.
+    :param executor: Executor to run validations on, the loop's default executor is used if not supplied.
+    :param max_pending: Maximum number of distinct validations queued or running before new work is refused.
+    :param cache_size: Number of recent results to keep.
+    :param limits: The resource limits each pair must stay within, nothing is enforced if not supplied.
+    :param config: Configuration of the rule sets keyed by rule set, the defaults are used if not supplied.
+
+    :raises ValueError: If a time limit is set and the executor is not a process pool.
+    """
+    service = ValidationService(
+        executor=executor, max_pending=max_pending, cache_size=cache_size, limits=limits, config=config
+    )
+    web.run_app(create_app(service=service), host=host, port=port)
+
+
+async def _read_json(request: web.Request) -> dict[str, Any]:
+    """
+    Read the JSON object from the body of a request.
+
+    :param request: The request.
+
+    :raises HTTPBadRequest: If the body is not a JSON object.
+
+    :return: The decoded body.
+    """
+    try:
+        body = await request.json()
+    except ValueError as exc:
+        raise _bad_request("The request body must be valid JSON.") from exc
+    if not isinstance(body, dict):
+        raise _bad_request("The request body must be a JSON object.")
+    return body
+
+
+def _read_pair(item: Any) -> tuple[str, str]:
+    """
+    Read the process and prompts content from a JSON object.
+
+    :param item: The decoded JSON object.
+
+    :raises HTTPBadRequest: If the content is missing or not a string.
+
+    :return: Tuple of process and prompts content.
+    """
+    if not isinstance(item, dict):
+        raise _bad_request("Each plugin pair must be a JSON object.")
+    process = item.get("process", "")
+    prompts = item.get("prompts", "")
+    if not isinstance(process, str) or not isinstance(prompts, str):
+        raise _bad_request('"process" and "prompts" must be strings.')
+    if not process and not prompts:
+        raise _bad_request("At least one of process file or prompts file is required to complete validation.")
+    return process, prompts
+
+
+def _violations_to_json(violations: tuple[ViolationTuple, ...]) -> list[dict[str, Any]]:
+    """
+    Convert violation tuples to JSON objects.
+
+    :param violations: Tuple of violation tuples.
+
+    :return: List of dicts keyed by field name.
+    """
+    return [dict(zip(_VIOLATION_FIELDS, violation, strict=True)) for violation in violations]
+
+
+def _bad_request(message: str) -> web.HTTPBadRequest:
+    """
+    Create a 400 response carrying an error message.
+
+    :param message: The error message.
+
+    :return: The response exception.
+    """
+    return web.HTTPBadRequest(text=json.dumps({"error": message}), content_type="application/json")
+
+
+def _busy(exc: ServiceBusyError) -> web.HTTPServiceUnavailable:
+    """
+    Create a 503 response asking the client to retry later.
+
+    :param exc: The error raised by the service.
+
+    :return: The response exception.
+    """
+    return web.HTTPServiceUnavailable(
+        text=json.dumps({"error": str(exc)}),
+        content_type="application/json",
+        headers={"Retry-After": "1"},
+    )
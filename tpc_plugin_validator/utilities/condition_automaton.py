@@ -0,0 +1,416 @@
+"""Automata built from condition patterns, used to find conditions that can never match before an earlier one."""
+
+import sys
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from tpc_plugin_validator.utilities.condition_pattern import (
+    ANY,
+    EXPRESSION_PREFIX,
+    Alternation,
+    Anchor,
+    Characters,
+    CharSet,
+    Node,
+    Placeholder,
+    Repeat,
+    Sequence,
+    parse_pattern,
+)
+
+MAX_CACHED_STEPS: int = 100_000
+MAX_REPEAT_COPIES: int = 32
+MAX_SEARCH_STATES: int = 20_000
+
+
+@dataclass(frozen=True)
+class Automaton(object):
+    """
+    Class to hold a nondeterministic automaton accepting the output a condition pattern matches.
+
+    Expect searches the output for the pattern, so unless the pattern is anchored with ^ a match may start after any
+    prefix and, unless it is anchored with $, may be followed by anything. Anchors elsewhere are treated as matching
+    anywhere and placeholders as matching any text, so the automaton accepts at least the output the pattern matches.
+    It accepts exactly that output only when exact is True.
+
+    Each step taken by a search is remembered, so the automaton is turned into a deterministic one as it is used and
+    a step already taken is a single lookup. No more than MAX_CACHED_STEPS are remembered at once.
+    """
+
+    edges: tuple[tuple[tuple[CharSet, int], ...], ...]
+    epsilon: tuple[tuple[int, ...], ...]
+    start: int
+    accept: int
+    anchored_start: bool
+    anchored_end: bool
+    exact: bool
+    _steps: dict = field(default_factory=dict, compare=False, repr=False)
+
+    def charsets(self) -> list[CharSet]:
+        """
+        Fetch every set of characters an edge of the automaton is labelled with.
+
+        :return: List of CharSet.
+        """
+        return [charset for state_edges in self.edges for charset, _ in state_edges]
+
+    def initial(self) -> tuple[frozenset[int], bool]:
+        """
+        Fetch the state of a search before any output has been read.
+
+        :return: The automaton states reached and whether the pattern has already matched.
+        """
+        states: frozenset[int] = self._closure(states={self.start})
+        return states, self.accept in states and not self.anchored_end
+
+    def step(self, state: tuple[frozenset[int], bool], char: str) -> tuple[frozenset[int], bool]:
+        """
+        Advance a search by a character of output.
+
+        :param state: The state of the search.
+        :param char: The character read.
+
+        :return: The new state of the search.
+        """
+        key: tuple[frozenset[int], bool, str] = (*state, char)
+        if (following := self._steps.get(key)) is not None:
+            return following
+
+        states, matched = state
+        reached: set[int] = {
+            target for source in states for charset, target in self.edges[source] if charset.matches(char)
+        }
+        if not self.anchored_start:
+            reached.add(self.start)
+        next_states: frozenset[int] = self._closure(states=reached)
+        following = (next_states, matched or (self.accept in next_states and not self.anchored_end))
+        if len(self._steps) >= MAX_CACHED_STEPS:
+            self._steps.clear()
+        self._steps[key] = following
+        return following
+
+    def matched(self, state: tuple[frozenset[int], bool]) -> bool:
+        """
+        Check whether the pattern matches the output read so far.
+
+        :param state: The state of the search.
+
+        :return: True if the pattern matches otherwise False.
+        """
+        return state[1] or self.accept in state[0]
+
+    def _closure(self, states: set[int]) -> frozenset[int]:
+        """
+        Add every state reachable without reading a character.
+
+        :param states: The states to start from.
+
+        :return: The states with those reachable from them.
+        """
+        found: set[int] = set(states)
+        stack: list[int] = list(states)
+        while stack:
+            for target in self.epsilon[stack.pop()]:
+                if target not in found:
+                    found.add(target)
+                    stack.append(target)
+        return frozenset(found)
+
+
+class _AutomatonBuilder(object):
+    """Build an automaton from a parsed pattern using Thompson's construction."""
+
+    __slots__ = (
+        "_edges",
+        "_epsilon",
+        "exact",
+    )
+
+    def __init__(self) -> None:
+        """Standard init for the _AutomatonBuilder class."""
+        self._edges: list[list[tuple[CharSet, int]]] = []
+        self._epsilon: list[list[int]] = []
+        self.exact: bool = True
+
+    def state(self) -> int:
+        """
+        Add a new state.
+
+        :return: The number of the state.
+        """
+        self._edges.append([])
+        self._epsilon.append([])
+        return len(self._edges) - 1
+
+    def build(self, node: Node, start: int) -> int:
+        """
+        Add the states matching a node.
+
+        :param node: The node to match.
+        :param start: The state the match starts from.
+
+        :return: The state the match ends at.
+        """
+        if isinstance(node, Characters):
+            end: int = self.state()
+            self._edges[start].append((node.charset, end))
+            return end
+        if isinstance(node, Anchor):
+            self.exact = False
+            return start
+        if isinstance(node, Placeholder):
+            self.exact = False
+            return self._star(item=Characters(charset=ANY, text="."), start=start)
+        if isinstance(node, Sequence):
+            for item in node.items:
+                start = self.build(node=item, start=start)
+            return start
+        if isinstance(node, Alternation):
+            end = self.state()
+            for option in node.options:
+                option_start: int = self.state()
+                self._epsilon[start].append(option_start)
+                self._epsilon[self.build(node=option, start=option_start)].append(end)
+            return end
+        return self._repeat(node=node, start=start)
+
+    def _repeat(self, node: Repeat, start: int) -> int:
+        """
+        Add the states matching a repeated node, copying the node once for each repetition.
+
+        Where a bound would need more than MAX_REPEAT_COPIES copies the repeat is treated as unbounded.
+
+        :param node: The repeat to match.
+        :param start: The state the match starts from.
+
+        :return: The state the match ends at.
+        """
+        maximum: int | None = node.maximum
+        if maximum is not None and maximum > MAX_REPEAT_COPIES:
+            maximum = None
+            self.exact = False
+        minimum: int = min(node.minimum, MAX_REPEAT_COPIES)
+        if minimum != node.minimum:
+            self.exact = False
+
+        for _ in range(minimum):
+            start = self.build(node=node.item, start=start)
+        if maximum is None:
+            return self._star(item=node.item, start=start)
+
+        end: int = self.state()
+        self._epsilon[start].append(end)
+        for _ in range(maximum - minimum):
+            start = self.build(node=node.item, start=start)
+            self._epsilon[start].append(end)
+        return end
+
+    def _star(self, item: Node, start: int) -> int:
+        """
+        Add the states matching a node repeated any number of times.
+
+        :param item: The node to repeat.
+        :param start: The state the match starts from.
+
+        :return: The state the match ends at.
+        """
+        loop: int = self.state()
+        self._epsilon[start].append(loop)
+        self._epsilon[self.build(node=item, start=loop)].append(loop)
+        return loop
+
+    def finish(self, start: int, accept: int, anchored_start: bool, anchored_end: bool) -> Automaton:
+        """
+        Create the automaton from the states added.
+
+        :param start: The start state.
+        :param accept: The accepting state.
+        :param anchored_start: Whether the pattern must match from the start of the output.
+        :param anchored_end: Whether the pattern must match up to the end of the output.
+
+        :return: Automaton
+        """
+        return Automaton(
+            edges=tuple(tuple(state_edges) for state_edges in self._edges),
+            epsilon=tuple(tuple(state_epsilon) for state_epsilon in self._epsilon),
+            start=start,
+            accept=accept,
+            anchored_start=anchored_start,
+            anchored_end=anchored_end,
+            exact=self.exact,
+        )
+
+
+@lru_cache(maxsize=4096)
+def build_automaton(pattern: str) -> Automaton | None:
+    """
+    Build the automaton for the pattern assigned to a condition, caching the result by pattern text.
+
+    :param pattern: The pattern.
+
+    :return: Automaton, or None if the pattern is a boolean expression or is not valid.
+    """
+    if pattern.lower().startswith(EXPRESSION_PREFIX):
+        return None
+    try:
+        root: Node = parse_pattern(pattern=pattern)
+    except (RecursionError, ValueError):
+        return None
+
+    items: list[Node] = list(root.items) if isinstance(root, Sequence) else [root]
+    anchored_start: bool = bool(items) and isinstance(items[0], Anchor) and items[0].text in ("^", "\\A")
+    if anchored_start:
+        items.pop(0)
+    anchored_end: bool = bool(items) and isinstance(items[-1], Anchor) and items[-1].text in ("$", "\\Z")
+    if anchored_end:
+        items.pop()
+
+    builder = _AutomatonBuilder()
+    start: int = builder.state()
+    accept: int = builder.build(node=Sequence(items=tuple(items), text=pattern), start=start)
+    return builder.finish(start=start, accept=accept, anchored_start=anchored_start, anchored_end=anchored_end)
+
+
+@lru_cache(maxsize=4096)
+def subsumes(earlier: tuple[str, ...], later: str) -> bool:
+    """
+    Check whether any output matched by a pattern is also matched by one of a number of earlier patterns.
+
+    The automata are searched together one character at a time, for output the later pattern matches but none of the
+    earlier patterns do. Only one character from each class of characters that every edge matches alike needs to be
+    tried, as the others are matched in the same way. The search gives up, answering False as the answer is unknown,
+    after MAX_SEARCH_STATES.
+
+    :param earlier: The earlier patterns.
+    :param later: The later pattern.
+
+    :return: True if the later pattern can never match without an earlier one matching, otherwise False.
+    """
+    later_automaton: Automaton | None = build_automaton(pattern=later)
+    earlier_automata: list[Automaton] = []
+    for pattern in earlier:
+        automaton: Automaton | None = build_automaton(pattern=pattern)
+        # An automaton that accepts more than its pattern matches could claim output the pattern would not match.
+        if automaton is not None and automaton.exact:
+            earlier_automata.append(automaton)
+    if later_automaton is None or not earlier_automata:
+        return False
+
+    # The shortest output the later pattern matches is usually enough to show it is not shadowed.
+    sample: str = _shortest_match(pattern=later)
+    if not any(_search(automaton=automaton, output=sample) for automaton in earlier_automata):
+        return False
+
+    alphabet: list[str] = _alphabet(automata=(later_automaton, *earlier_automata))
+    start = (later_automaton.initial(), tuple(automaton.initial() for automaton in earlier_automata))
+    seen: set = {start}
+    queue: deque = deque([start])
+    while queue:
+        later_state, earlier_states = queue.popleft()
+        if any(matched for _, matched in earlier_states) or not (later_state[0] or later_state[1]):
+            # An earlier pattern has matched and will still match whatever follows, or the later pattern cannot match.
+            continue
+        if later_automaton.matched(state=later_state) and not any(
+            automaton.matched(state=state) for automaton, state in zip(earlier_automata, earlier_states)
+        ):
+            return False
+        for char in alphabet:
+            following = (
+                later_automaton.step(state=later_state, char=char),
+                tuple(
+                    automaton.step(state=state, char=char) for automaton, state in zip(earlier_automata, earlier_states)
+                ),
+            )
+            if following not in seen:
+                if len(seen) >= MAX_SEARCH_STATES:
+                    return False
+                seen.add(following)
+                queue.append(following)
+    return True
+
+
+def _alphabet(automata: Iterable[Automaton]) -> list[str]:
+    """
+    Find one character from each class of characters that every edge of the automata matches alike.
+
+    The characters named by the edges are split by each set of characters in turn, the characters named by none form
+    a class of their own. However wide the ranges named, a search need only try as many characters as there are classes.
+
+    :param automata: The automata to be searched together.
+
+    :return: List of characters, one from each class.
+    """
+    named_sets: set[frozenset[str]] = {charset.chars for automaton in automata for charset in automaton.charsets()}
+    named: frozenset[str] = frozenset().union(*named_sets)
+    classes: list[frozenset[str]] = [named] if named else []
+    for chars in named_sets:
+        classes = [part for block in classes for part in (block & chars, block - chars) if part]
+    alphabet: list[str] = sorted(min(block) for block in classes)
+    if (unnamed := _unnamed(named=named)) is not None:
+        alphabet.append(unnamed)
+    return alphabet
+
+
+@lru_cache(maxsize=4096)
+def _shortest_match(pattern: str) -> str:
+    """
+    Find the shortest output a pattern matches, caching the result by pattern text.
+
+    :param pattern: The pattern, which must have an automaton.
+
+    :return: The output, empty if the pattern matches empty output or cannot match any output.
+    """
+    automaton: Automaton | None = build_automaton(pattern=pattern)
+    if automaton is None:
+        return ""
+    alphabet: list[str] = _alphabet(automata=(automaton,))
+
+    start: tuple[frozenset[int], bool] = automaton.initial()
+    parents: dict[tuple[frozenset[int], bool], tuple[tuple[frozenset[int], bool], str] | None] = {start: None}
+    queue: deque[tuple[frozenset[int], bool]] = deque([start])
+    while queue:
+        state = queue.popleft()
+        if automaton.matched(state=state):
+            output: list[str] = []
+            while (parent := parents[state]) is not None:
+                state, char = parent
+                output.append(char)
+            return "".join(reversed(output))
+        for char in alphabet:
+            following = automaton.step(state=state, char=char)
+            if following not in parents and len(parents) < MAX_SEARCH_STATES:
+                parents[following] = (state, char)
+                queue.append(following)
+    return ""
+
+
+def _search(automaton: Automaton, output: str) -> bool:
+    """
+    Check whether a pattern matches some output.
+
+    :param automaton: The automaton of the pattern.
+    :param output: The output.
+
+    :return: True if the pattern matches otherwise False.
+    """
+    state: tuple[frozenset[int], bool] = automaton.initial()
+    for char in output:
+        state = automaton.step(state=state, char=char)
+    return automaton.matched(state=state)
+
+
+def _unnamed(named: frozenset[str]) -> str | None:
+    """
+    Find a character that no pattern names, standing in for every character that is matched only by wildcards.
+
+    :param named: The characters named by the patterns.
+
+    :return: A character, from the private use area if one there is not named, or None if every character is named.
+    """
+    for codes in (range(0xE000, 0xF900), range(sys.maxunicode + 1)):
+        for code in codes:
+            if chr(code) not in named:
+                return chr(code)
+    return None
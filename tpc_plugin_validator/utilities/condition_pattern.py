@@ -0,0 +1,561 @@
+"""Parse the regular expressions assigned to conditions and estimate how costly they are to match."""
+
+import string
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations
+
+EXPRESSION_PREFIX: str = "(expression)"
+MAX_NESTING_DEPTH: int = 100
+
+_CLASS_ESCAPES: dict[str, frozenset[str]] = {
+    "d": frozenset(string.digits),
+    "s": frozenset(string.whitespace),
+    "w": frozenset(string.ascii_letters + string.digits + "_"),
+}
+_POSIX_CLASSES: dict[str, frozenset[str]] = {
+    "alnum": frozenset(string.ascii_letters + string.digits),
+    "alpha": frozenset(string.ascii_letters),
+    "blank": frozenset(" \t"),
+    "digit": frozenset(string.digits),
+    "lower": frozenset(string.ascii_lowercase),
+    "punct": frozenset(string.punctuation),
+    "space": frozenset(string.whitespace),
+    "upper": frozenset(string.ascii_uppercase),
+    "xdigit": frozenset(string.hexdigits),
+}
+_CHARACTER_ESCAPES: dict[str, str] = {"n": "\n", "r": "\r", "t": "\t"}
+_ANCHOR_ESCAPES: str = "AbBmMyYZ"
+
+
+@dataclass(frozen=True)
+class CharSet(object):
+    """Class to hold the characters a single position of a pattern can match, all but those listed when negated."""
+
+    chars: frozenset[str]
+    negated: bool = False
+
+    def matches(self, char: str) -> bool:
+        """
+        Check whether the set matches a character.
+
+        :param char: The character.
+
+        :return: True if the character is matched otherwise False.
+        """
+        return (char in self.chars) != self.negated
+
+    def overlaps(self, other: "CharSet") -> bool:
+        """
+        Check whether any character is matched by both sets.
+
+        :param other: The other set.
+
+        :return: True if a character is matched by both otherwise False.
+        """
+        if self.negated and other.negated:
+            return True
+        if self.negated:
+            return bool(other.chars - self.chars)
+        if other.negated:
+            return bool(self.chars - other.chars)
+        return bool(self.chars & other.chars)
+
+    def union(self, other: "CharSet") -> "CharSet":
+        """
+        Combine two sets into the set matching any character matched by either.
+
+        :param other: The other set.
+
+        :return: CharSet
+        """
+        if self.negated and other.negated:
+            return CharSet(chars=self.chars & other.chars, negated=True)
+        if self.negated:
+            return CharSet(chars=self.chars - other.chars, negated=True)
+        if other.negated:
+            return CharSet(chars=other.chars - self.chars, negated=True)
+        return CharSet(chars=self.chars | other.chars)
+
+
+ANY: CharSet = CharSet(chars=frozenset(), negated=True)
+NOTHING: CharSet = CharSet(chars=frozenset())
+
+
+@dataclass(frozen=True)
+class Characters(object):
+    """Class to hold a pattern matching a single character from a set."""
+
+    charset: CharSet
+    text: str
+
+
+@dataclass(frozen=True)
+class Anchor(object):
+    """Class to hold a pattern matching a position rather than a character, such as ^, $ or a word boundary."""
+
+    text: str
+
+
+@dataclass(frozen=True)
+class Placeholder(object):
+    """Class to hold a placeholder such as <username>, replaced by a value of any length when the plugin runs."""
+
+    text: str
+
+
+@dataclass(frozen=True)
+class Sequence(object):
+    """Class to hold patterns matched one after the other."""
+
+    items: tuple["Node", ...]
+    text: str
+
+
+@dataclass(frozen=True)
+class Alternation(object):
+    """Class to hold patterns of which any one is matched."""
+
+    options: tuple["Node", ...]
+    text: str
+
+
+@dataclass(frozen=True)
+class Repeat(object):
+    """Class to hold a pattern matched between a minimum and maximum number of times, no maximum if None."""
+
+    item: "Node"
+    minimum: int
+    maximum: int | None
+    text: str
+
+
+Node = Characters | Anchor | Placeholder | Sequence | Alternation | Repeat
+
+
+@dataclass(frozen=True)
+class PatternCost(object):
+    """
+    Class to hold the features of a pattern that make it costly to match.
+
+    The degree is the power of the length of the output that the time taken to try a match grows with, one for each
+    position a search can start from plus one for each unbounded wildcard that can backtrack. A trailing wildcard
+    matches the rest of the output at once and a leading wildcard of an unanchored search only stands in for the start
+    positions, so neither is counted. Alternatives starting with the same character make a repeat backtrack, which is
+    only exponential when the alternatives can divide the same text in more than one way, so they are reported apart
+    from nested quantifiers.
+    """
+
+    nested_quantifier: str = ""
+    overlapping_alternation: str = ""
+    wildcards: int = 0
+    anchored: bool = True
+
+    @property
+    def degree(self) -> int:
+        """
+        Property to fetch the power of the length of the output the time taken to match grows with.
+
+        :return: The degree, at least one.
+        """
+        return max(self.wildcards + (0 if self.anchored else 1), 1)
+
+    @property
+    def exponential(self) -> bool:
+        """
+        Property to fetch whether the time taken to match can grow exponentially with the length of the output.
+
+        :return: True if it can otherwise False.
+        """
+        return bool(self.nested_quantifier)
+
+
+class _PatternParser(object):
+    """
+    Recursive descent parser for the subset of Tcl regular expression syntax used by conditions.
+
+    Groups and quantifiers may only be nested MAX_NESTING_DEPTH deep, so that neither parsing nor walking the nodes
+    parsed can exceed the recursion limit.
+    """
+
+    __slots__ = (
+        "_depth",
+        "_pattern",
+        "_position",
+    )
+
+    def __init__(self, pattern: str) -> None:
+        """
+        Standard init for the _PatternParser class.
+
+        :param pattern: The pattern to parse.
+        """
+        self._depth: int = 0
+        self._pattern: str = pattern
+        self._position: int = 0
+
+    def parse(self) -> Node:
+        """
+        Parse the whole pattern.
+
+        :raises ValueError: If the pattern is not valid.
+
+        :return: The root node of the pattern.
+        """
+        node: Node = self._alternation()
+        if self._position < len(self._pattern):
+            raise ValueError(f'Unexpected "{self._pattern[self._position]}" at position {self._position}.')
+        return node
+
+    def _alternation(self) -> Node:
+        """
+        Parse sequences separated by |.
+
+        :return: The node matched.
+        """
+        start: int = self._position
+        options: list[Node] = [self._sequence()]
+        while self._peek() == "|":
+            self._position += 1
+            options.append(self._sequence())
+        if len(options) == 1:
+            return options[0]
+        return Alternation(options=tuple(options), text=self._pattern[start : self._position])
+
+    def _sequence(self) -> Node:
+        """
+        Parse quantified atoms up to the end of the pattern, a | or a closing parenthesis.
+
+        :return: The node matched.
+        """
+        start: int = self._position
+        items: list[Node] = []
+        while self._peek() not in ("", "|", ")"):
+            items.append(self._quantified())
+        if len(items) == 1:
+            return items[0]
+        return Sequence(items=tuple(items), text=self._pattern[start : self._position])
+
+    def _quantified(self) -> Node:
+        """
+        Parse an atom followed by any number of quantifiers.
+
+        :raises ValueError: If the quantifiers are nested too deep.
+
+        :return: The node matched.
+        """
+        start: int = self._position
+        node: Node = self._atom()
+        depth: int = self._depth
+        while (bounds := self._quantifier()) is not None:
+            if self._peek() in ("?", "+"):
+                # Lazy and possessive forms change the order matches are tried in, not what can be matched.
+                self._position += 1
+            depth += 1
+            self._check_depth(depth=depth, start=start)
+            node = Repeat(item=node, minimum=bounds[0], maximum=bounds[1], text=self._pattern[start : self._position])
+        return node
+
+    def _quantifier(self) -> tuple[int, int | None] | None:
+        """
+        Parse a quantifier if one is next.
+
+        :return: The minimum and maximum repetitions, or None if no quantifier is next.
+        """
+        char: str = self._peek()
+        if char in ("*", "+", "?"):
+            self._position += 1
+            return {"*": (0, None), "+": (1, None), "?": (0, 1)}[char]
+        if char != "{":
+            return None
+
+        end: int = self._pattern.find("}", self._position)
+        bounds: list[str] = self._pattern[self._position + 1 : end].split(",") if end != -1 else []
+        if (
+            not 1 <= len(bounds) <= 2
+            or not bounds[0].isdigit()
+            or not all(bound.isdigit() for bound in bounds[1:] if bound)
+        ):
+            # Not a valid bound, so the brace is matched literally.
+            return None
+        self._position = end + 1
+        if len(bounds) == 1:
+            return int(bounds[0]), int(bounds[0])
+        return int(bounds[0]), int(bounds[1]) if bounds[1] else None
+
+    def _atom(self) -> Node:
+        """
+        Parse a single atom.
+
+        :raises ValueError: If a group or bracket expression is not closed or groups are nested too deep.
+
+        :return: The node matched.
+        """
+        start: int = self._position
+        char: str = self._pattern[self._position]
+        self._position += 1
+        if char == "(":
+            self._check_depth(depth=self._depth + 1, start=start)
+            lookahead: bool = self._pattern.startswith(("?=", "?!"), self._position)
+            if lookahead or self._pattern.startswith("?:", self._position):
+                self._position += 2
+            self._depth += 1
+            node: Node = self._alternation()
+            self._depth -= 1
+            self._expect(char=")", start=start)
+            if lookahead:
+                # Lookahead matches no characters, so for cost it is treated as an anchor.
+                return Anchor(text=self._pattern[start : self._position])
+            return node
+        if char == "[":
+            return Characters(charset=self._bracket(start=start), text=self._pattern[start : self._position])
+        if char == ".":
+            return Characters(charset=ANY, text=char)
+        if char in ("^", "$"):
+            return Anchor(text=char)
+        if char == "\\":
+            return self._escape(start=start)
+        if char == "<" and (end := self._pattern.find(">", self._position)) > self._position:
+            self._position = end + 1
+            return Placeholder(text=self._pattern[start : self._position])
+        if char in ("*", "+", "?"):
+            raise ValueError(f'Nothing to repeat before "{char}" at position {start}.')
+        return Characters(charset=CharSet(chars=frozenset(char)), text=char)
+
+    def _escape(self, start: int) -> Node:
+        """
+        Parse an escape sequence after the backslash.
+
+        :param start: The position of the backslash.
+
+        :return: The node matched.
+        """
+        char: str = self._pattern[self._position] if self._position < len(self._pattern) else "\\"
+        self._position += 1
+        text: str = self._pattern[start : self._position]
+        if char.lower() in _CLASS_ESCAPES:
+            return Characters(charset=CharSet(chars=_CLASS_ESCAPES[char.lower()], negated=char.isupper()), text=text)
+        if char in _ANCHOR_ESCAPES:
+            return Anchor(text=text)
+        return Characters(charset=CharSet(chars=frozenset(_CHARACTER_ESCAPES.get(char, char))), text=text)
+
+    def _bracket(self, start: int) -> CharSet:
+        """
+        Parse a bracket expression after the opening bracket.
+
+        :param start: The position of the opening bracket.
+
+        :raises ValueError: If the bracket expression is not closed.
+
+        :return: The set of characters matched.
+        """
+        negated: bool = self._peek() == "^"
+        if negated:
+            self._position += 1
+        chars: set[str] = set()
+        first: bool = True
+        while (char := self._peek()) != "]" or first:
+            if not char:
+                raise ValueError(f"Unclosed bracket expression starting at position {start}.")
+            first = False
+            if (
+                self._pattern.startswith("[:", self._position)
+                and (end := self._pattern.find(":]", self._position)) != -1
+            ):
+                chars |= _POSIX_CLASSES.get(self._pattern[self._position + 2 : end], frozenset())
+                self._position = end + 2
+                continue
+            self._position += 1
+            if char == "\\" and self._peek():
+                escaped: str = self._peek()
+                self._position += 1
+                if escaped.lower() in _CLASS_ESCAPES and escaped.islower():
+                    chars |= _CLASS_ESCAPES[escaped]
+                    continue
+                char = _CHARACTER_ESCAPES.get(escaped, escaped)
+            if self._peek() == "-" and self._pattern[self._position + 1 : self._position + 2] not in ("]", ""):
+                end_char: str = self._pattern[self._position + 1]
+                self._position += 2
+                chars |= {chr(code) for code in range(ord(char), ord(end_char) + 1)}
+                continue
+            chars.add(char)
+        self._position += 1
+        return CharSet(chars=frozenset(chars), negated=negated)
+
+    def _check_depth(self, depth: int, start: int) -> None:
+        """
+        Check that a group or quantifier is not nested too deep.
+
+        :param depth: The depth of the group or quantifier.
+        :param start: The position of the group or quantified atom, for the error message.
+
+        :raises ValueError: If the depth is greater than MAX_NESTING_DEPTH.
+        """
+        if depth > MAX_NESTING_DEPTH:
+            raise ValueError(f"The pattern is nested more than {MAX_NESTING_DEPTH} deep at position {start}.")
+
+    def _expect(self, char: str, start: int) -> None:
+        """
+        Consume a character that must be next.
+
+        :param char: The character expected.
+        :param start: The position of the construct being closed, for the error message.
+
+        :raises ValueError: If the character is not next.
+        """
+        if self._peek() != char:
+            raise ValueError(f'Missing "{char}" for the group starting at position {start}.')
+        self._position += 1
+
+    def _peek(self) -> str:
+        """
+        Fetch the next character without consuming it.
+
+        :return: The next character, empty at the end of the pattern.
+        """
+        return self._pattern[self._position : self._position + 1]
+
+
+@lru_cache(maxsize=4096)
+def parse_pattern(pattern: str) -> Node:
+    """
+    Parse the regular expression assigned to a condition, caching the result by pattern text.
+
+    :param pattern: The pattern.
+
+    :raises ValueError: If the pattern is not valid.
+
+    :return: The root node of the pattern.
+    """
+    return _PatternParser(pattern=pattern).parse()
+
+
+@lru_cache(maxsize=4096)
+def analyse_pattern(pattern: str) -> PatternCost | None:
+    """
+    Find the features of the regular expression assigned to a condition that make it costly to match.
+
+    Conditions are matched against the output of the target each time more is read, so the cost of every attempt is
+    paid repeatedly. The analysis is cached by pattern text so a condition shared across a corpus is analysed once.
+
+    :param pattern: The pattern.
+
+    :return: PatternCost, or None if the pattern is a boolean expression or is not valid.
+    """
+    if pattern.lower().startswith(EXPRESSION_PREFIX):
+        return None
+    try:
+        root: Node = parse_pattern(pattern=pattern)
+    except ValueError:
+        return None
+
+    nested_quantifier: str = ""
+    overlapping_alternation: str = ""
+    for repeat in _walk(node=root, kind=Repeat):
+        if repeat.maximum is not None and repeat.maximum <= 1:
+            continue
+        if not nested_quantifier and any(
+            inner.maximum != inner.minimum for inner in _walk(node=repeat.item, kind=Repeat)
+        ):
+            nested_quantifier = repeat.text
+        if not overlapping_alternation and any(
+            first_a.overlaps(first_b) or (nullable_a and nullable_b)
+            for alternation in _walk(node=repeat.item, kind=Alternation)
+            for (first_a, nullable_a), (first_b, nullable_b) in combinations(map(_first, alternation.options), 2)
+        ):
+            overlapping_alternation = repeat.text
+
+    wildcards: int = 0
+    anchored: bool = True
+    for option in root.options if isinstance(root, Alternation) else (root,):
+        items: tuple[Node, ...] = option.items if isinstance(option, Sequence) else (option,)
+        option_anchored: bool = bool(items) and isinstance(items[0], Anchor) and items[0].text in ("^", "\\A")
+        matched: list[Node] = [item for item in items if not isinstance(item, Anchor)]
+        backtracking: list[Node] = matched[:-1]
+        if not option_anchored and backtracking:
+            backtracking = backtracking[1:]
+        option_wildcards: int = sum(1 for item in backtracking if _is_wildcard(node=item))
+        if option_wildcards + (not option_anchored) > wildcards + (not anchored):
+            wildcards, anchored = option_wildcards, option_anchored
+
+    return PatternCost(
+        nested_quantifier=nested_quantifier,
+        overlapping_alternation=overlapping_alternation,
+        wildcards=wildcards,
+        anchored=anchored,
+    )
+
+
+def _is_wildcard(node: Node) -> bool:
+    """
+    Check whether a node is an unbounded wildcard such as .* or [^:]*.
+
+    :param node: The node.
+
+    :return: True if it is otherwise False.
+    """
+    return (
+        isinstance(node, Repeat)
+        and node.maximum is None
+        and isinstance(node.item, Characters)
+        and node.item.charset.negated
+    )
+
+
+def _walk(node: Node, kind: type) -> list:
+    """
+    Find every node of a type within a node, including the node itself.
+
+    :param node: The node to search.
+    :param kind: The type of node to find.
+
+    :return: List of nodes in the order they appear in the pattern.
+    """
+    found: list = []
+    stack: list[Node] = [node]
+    while stack:
+        current: Node = stack.pop()
+        if isinstance(current, kind):
+            found.append(current)
+        if isinstance(current, Sequence):
+            stack.extend(reversed(current.items))
+        elif isinstance(current, Alternation):
+            stack.extend(reversed(current.options))
+        elif isinstance(current, Repeat):
+            stack.append(current.item)
+    return found
+
+
+def _first(node: Node) -> tuple[CharSet, bool]:
+    """
+    Find the characters a node can start a match with.
+
+    :param node: The node.
+
+    :return: The set of first characters and whether the node can match without consuming a character.
+    """
+    if isinstance(node, Characters):
+        return node.charset, False
+    if isinstance(node, Placeholder):
+        return ANY, False
+    if isinstance(node, Anchor):
+        return NOTHING, True
+    if isinstance(node, Repeat):
+        first, nullable = _first(node=node.item)
+        return first, nullable or node.minimum == 0
+    if isinstance(node, Alternation):
+        first = NOTHING
+        nullable = False
+        for option in node.options:
+            option_first, option_nullable = _first(node=option)
+            first = first.union(option_first)
+            nullable = nullable or option_nullable
+        return first, nullable
+
+    first = NOTHING
+    for item in node.items:
+        item_first, item_nullable = _first(node=item)
+        first = first.union(item_first)
+        if not item_nullable:
+            return first, False
+    return first, True
@@ -0,0 +1,65 @@
+"""Helpers for decoding plugin files from raw bytes."""
+
+import codecs
+import mmap
+
+Buffer = bytes | bytearray | memoryview | mmap.mmap
+
+_BOMS: tuple[tuple[bytes, str], ...] = (
+    # UTF-32 must be checked before UTF-16 as the little endian BOMs share a prefix.
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+
+def detect_encoding(data: Buffer) -> tuple[str, int]:
+    """
+    Detect the encoding of raw file content from its byte order mark.
+
+    Plugins authored on Windows are commonly saved as UTF-16 or as UTF-8 with a BOM, content without a BOM is treated
+    as UTF-8.
+
+    :param data: The raw file content.
+
+    :return: Tuple of the encoding and the length of the BOM to skip.
+    """
+    head: bytes = bytes(data[:4])
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+    return "utf-8", 0
+
+
+def decode_content(data: Buffer) -> str:
+    """
+    Decode raw file content in a single pass without copying the underlying buffer.
+
+    :param data: The raw file content.
+
+    :raises UnicodeDecodeError: If the content is not valid for the detected encoding.
+
+    :return: The decoded content with any BOM removed.
+    """
+    encoding, bom_length = detect_encoding(data=data)
+    with memoryview(data) as view:
+        return codecs.decode(view[bom_length:], encoding)
+
+
+def read_file(path: str) -> str:
+    """
+    Read and decode a plugin file.
+
+    Plugin files are small, the parser rejects any over 1 MiB, so the file is read whole rather than memory-mapped.
+
+    :param path: Path to the file.
+
+    :raises FileNotFoundError: If the file does not exist.
+    :raises UnicodeDecodeError: If the content is not valid for the detected encoding.
+
+    :return: The decoded content.
+    """
+    with open(path, "rb") as file:
+        return decode_content(data=file.read())
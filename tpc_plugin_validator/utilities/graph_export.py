@@ -0,0 +1,227 @@
+"""Write the state machine of a process file as DOT, GraphML or JSON for review in graph tools."""
+
+import json
+from collections.abc import Iterable
+from enum import Enum
+from typing import TextIO
+from xml.sax.saxutils import escape, quoteattr
+
+from tpc_plugin_parser.lexer.tokens.transition import Transition
+
+from tpc_plugin_validator.utilities.state_graph import END_STATE, StateGraph
+from tpc_plugin_validator.utilities.types import FileNames, SectionNames
+from tpc_plugin_validator.utilities.validation_result import ValidationResult
+
+
+class GraphFormat(Enum):
+    """Enum to hold the supported graph export formats."""
+
+    dot = "dot"
+    graphml = "graphml"
+    json = "json"
+
+
+class _GraphDetails(object):
+    """Class to hold what is known about each state and transition while the graph is written."""
+
+    __slots__ = (
+        "_edge_violations",
+        "_reachable",
+        "_terminating",
+        "graph",
+    )
+
+    def __init__(self, graph: StateGraph, violations: Iterable[ValidationResult]) -> None:
+        """
+        Standard init for the _GraphDetails class.
+
+        :param graph: The graph to write.
+        :param violations: The violations found in the plugin.
+        """
+        self.graph: StateGraph = graph
+        self._reachable: set[str] = graph.reachable()
+        self._terminating: set[str] = graph.terminating()
+        self._edge_violations: dict[int, list[str]] = {}
+        for violation in violations:
+            if (
+                violation.file == FileNames.process.value
+                and violation.section == SectionNames.transitions.value
+                and violation.line
+            ):
+                rules: list[str] = self._edge_violations.setdefault(violation.line, [])
+                if violation.rule not in rules:
+                    rules.append(violation.rule)
+
+    def kind(self, state: str) -> str:
+        """
+        Describe the role a state plays in the state machine.
+
+        :param state: The lower case state name.
+
+        :return: One of "initial", "end", "fail" or "state".
+        """
+        if state == self.graph.initial_state:
+            return "initial"
+        if state == END_STATE:
+            return "end"
+        if self.graph.is_terminal(state):
+            return "fail"
+        return "state"
+
+    def node_problems(self, state: str) -> list[str]:
+        """
+        Fetch the problems with a state found by searching the graph.
+
+        :param state: The lower case state name.
+
+        :return: List holding "unreachable" and/or "non-terminating", empty if there are none.
+        """
+        problems: list[str] = []
+        if state not in self._reachable:
+            problems.append("unreachable")
+        if state not in self._terminating:
+            problems.append("non-terminating")
+        return problems
+
+    def edge_violations(self, transition: Transition) -> list[str]:
+        """
+        Fetch the rules violated on the line of a transition.
+
+        :param transition: The transition.
+
+        :return: List of violation rule names in the order they were first reported.
+        """
+        return self._edge_violations.get(transition.line_number, [])
+
+
+def write_graph(
+    graph: StateGraph,
+    output: TextIO,
+    graph_format: GraphFormat,
+    violations: Iterable[ValidationResult] = (),
+) -> None:
+    """
+    Write the state machine, labelling each transition with its condition and highlighting any problem.
+
+    Each state and transition is written to the output as soon as it is formatted, so no more than a single line is
+    held in memory beyond the graph itself. A transition is highlighted when a violation was reported on its line and a
+    state is highlighted when it cannot be reached from the initial state or has no path to END or a fail state.
+
+    :param graph: The graph to write.
+    :param output: The text stream to write to.
+    :param graph_format: The format to write.
+    :param violations: The violations found in the plugin, as returned by Validator.violations.
+    """
+    details = _GraphDetails(graph=graph, violations=violations)
+    {
+        GraphFormat.dot: _write_dot,
+        GraphFormat.graphml: _write_graphml,
+        GraphFormat.json: _write_json,
+    }[graph_format](details=details, output=output)
+
+
+def _write_dot(details: _GraphDetails, output: TextIO) -> None:
+    """
+    Write the graph in the DOT language used by Graphviz.
+
+    :param details: The graph and what is known about it.
+    :param output: The text stream to write to.
+    """
+    output.write("digraph transitions {\n")
+    output.write("\trankdir=LR;\n")
+    for state in details.graph.states:
+        attributes: list[str] = [f"label={_dot_string(details.graph.name(state))}"]
+        kind: str = details.kind(state)
+        if kind == "initial":
+            attributes.append("style=bold")
+        elif kind == "end":
+            attributes.append("shape=doublecircle")
+        elif kind == "fail":
+            attributes.append("shape=octagon")
+        if problems := details.node_problems(state):
+            attributes.extend(("color=red", "fontcolor=red", f"tooltip={_dot_string(', '.join(problems))}"))
+        output.write(f"\t{_dot_string(state)} [{', '.join(attributes)}];\n")
+    for transition in details.graph.transitions:
+        attributes = [f"label={_dot_string(transition.condition)}"]
+        if rules := details.edge_violations(transition):
+            attributes.extend(("color=red", "fontcolor=red", "penwidth=2", f"tooltip={_dot_string(', '.join(rules))}"))
+        output.write(
+            f"\t{_dot_string(transition.current_state.lower())} -> {_dot_string(transition.next_state.lower())} "
+            f"[{', '.join(attributes)}];\n"
+        )
+    output.write("}\n")
+
+
+def _write_graphml(details: _GraphDetails, output: TextIO) -> None:
+    """
+    Write the graph as GraphML.
+
+    :param details: The graph and what is known about it.
+    :param output: The text stream to write to.
+    """
+    output.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    output.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+    output.write('\t<key id="label" for="all" attr.name="label" attr.type="string"/>\n')
+    output.write('\t<key id="kind" for="node" attr.name="kind" attr.type="string"/>\n')
+    output.write('\t<key id="line" for="edge" attr.name="line" attr.type="int"/>\n')
+    output.write('\t<key id="problems" for="all" attr.name="problems" attr.type="string"/>\n')
+    output.write('\t<graph id="transitions" edgedefault="directed">\n')
+    for state in details.graph.states:
+        output.write(f"\t\t<node id={quoteattr(state)}>")
+        output.write(f'<data key="label">{escape(details.graph.name(state))}</data>')
+        output.write(f'<data key="kind">{details.kind(state)}</data>')
+        if problems := details.node_problems(state):
+            output.write(f'<data key="problems">{", ".join(problems)}</data>')
+        output.write("</node>\n")
+    for transition in details.graph.transitions:
+        output.write(
+            f"\t\t<edge source={quoteattr(transition.current_state.lower())} "
+            f"target={quoteattr(transition.next_state.lower())}>"
+        )
+        output.write(f'<data key="label">{escape(transition.condition)}</data>')
+        output.write(f'<data key="line">{transition.line_number}</data>')
+        if rules := details.edge_violations(transition):
+            output.write(f'<data key="problems">{", ".join(rules)}</data>')
+        output.write("</edge>\n")
+    output.write("\t</graph>\n")
+    output.write("</graphml>\n")
+
+
+def _write_json(details: _GraphDetails, output: TextIO) -> None:
+    """
+    Write the graph as a JSON object holding a list of nodes and a list of edges.
+
+    :param details: The graph and what is known about it.
+    :param output: The text stream to write to.
+    """
+    output.write(f'{{"initial": {json.dumps(details.graph.initial_state)}, "nodes": [')
+    for position, state in enumerate(details.graph.states):
+        node: dict[str, object] = {
+            "id": state,
+            "label": details.graph.name(state),
+            "kind": details.kind(state),
+            "problems": details.node_problems(state),
+        }
+        output.write(f"{',' if position else ''}\n{json.dumps(node)}")
+    output.write('\n], "edges": [')
+    for position, transition in enumerate(details.graph.transitions):
+        edge: dict[str, object] = {
+            "source": transition.current_state.lower(),
+            "target": transition.next_state.lower(),
+            "label": transition.condition,
+            "line": transition.line_number,
+            "problems": details.edge_violations(transition),
+        }
+        output.write(f"{',' if position else ''}\n{json.dumps(edge)}")
+    output.write("\n]}\n")
+
+
+def _dot_string(value: str) -> str:
+    """
+    Quote a value as a DOT string.
+
+    :param value: The value to quote.
+
+    :return: The quoted value.
+    """
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
@@ -0,0 +1,97 @@
+"""Helpers for locating the process and prompts files within a plugin zip archive."""
+
+import re
+import zipfile
+
+from tpc_plugin_validator.utilities.decoding import decode_content
+
+PROCESS_FILE_SUFFIX: str = "process.ini"
+PROMPTS_FILE_SUFFIX: str = "prompts.ini"
+
+_PROCESS_SECTION_PATTERN: re.Pattern[bytes] = re.compile(
+    rb"^\s*\[\s*(states|transitions)\s*\]", re.IGNORECASE | re.MULTILINE
+)
+_PROMPTS_SECTION_PATTERN: re.Pattern[bytes] = re.compile(rb"^\s*\[\s*conditions\s*\]", re.IGNORECASE | re.MULTILINE)
+
+
+def find_plugin_members(zip_file: zipfile.ZipFile) -> tuple[zipfile.ZipInfo | None, zipfile.ZipInfo | None]:
+    """
+    Locate the process and prompts members of a plugin archive.
+
+    Members are first matched by name, for example "UnixProcess.ini" and "UnixPrompts.ini". If either file cannot be
+    identified by name the remaining ".ini" members are sniffed for the sections each file must declare.
+
+    :param zip_file: The open archive.
+
+    :raises ValueError: If the archive holds more than one candidate for either file.
+
+    :return: Tuple of the process and prompts members, either may be None if not found.
+    """
+    ini_members: list[zipfile.ZipInfo] = [
+        member for member in zip_file.infolist() if not member.is_dir() and member.filename.lower().endswith(".ini")
+    ]
+    process_members: list[zipfile.ZipInfo] = [
+        member for member in ini_members if member.filename.lower().endswith(PROCESS_FILE_SUFFIX)
+    ]
+    prompts_members: list[zipfile.ZipInfo] = [
+        member for member in ini_members if member.filename.lower().endswith(PROMPTS_FILE_SUFFIX)
+    ]
+
+    sniff_process: bool = not process_members
+    sniff_prompts: bool = not prompts_members
+    if sniff_process or sniff_prompts:
+        for member in ini_members:
+            if member in process_members or member in prompts_members:
+                continue
+            with zip_file.open(member) as member_file:
+                content: bytes = member_file.read()
+            if sniff_process and is_process_content(content=content):
+                process_members.append(member)
+            elif sniff_prompts and is_prompts_content(content=content):
+                prompts_members.append(member)
+
+    for file_type, members in (("process", process_members), ("prompts", prompts_members)):
+        if len(members) > 1:
+            names = ", ".join(member.filename for member in members)
+            raise ValueError(f"The archive contains more than one {file_type} file: {names}")
+
+    return (
+        process_members[0] if process_members else None,
+        prompts_members[0] if prompts_members else None,
+    )
+
+
+def is_process_content(content: bytes) -> bool:
+    """
+    Check if raw file content looks like a process file.
+
+    :param content: The raw file content.
+
+    :return: True if a states or transitions section is declared otherwise False.
+    """
+    return _PROCESS_SECTION_PATTERN.search(content) is not None
+
+
+def is_prompts_content(content: bytes) -> bool:
+    """
+    Check if raw file content looks like a prompts file.
+
+    :param content: The raw file content.
+
+    :return: True if a conditions section is declared otherwise False.
+    """
+    return _PROMPTS_SECTION_PATTERN.search(content) is not None
+
+
+def read_member(zip_file: zipfile.ZipFile, member: zipfile.ZipInfo | None) -> str:
+    """
+    Decode a member of an archive in memory.
+
+    :param zip_file: The open archive.
+    :param member: The member to read, if None an empty string is returned.
+
+    :return: The decoded content.
+    """
+    if member is None:
+        return ""
+    return decode_content(data=zip_file.read(member))
@@ -0,0 +1,306 @@
+"""Measure the size and complexity of a plugin from its parsed process and prompts files."""
+
+import csv
+import json
+from dataclasses import dataclass, field, fields
+from enum import Enum
+from types import TracebackType
+from typing import TextIO
+
+from tpc_plugin_parser.lexer.tokens.assignment import Assignment
+from tpc_plugin_parser.lexer.tokens.fail_state import FailState
+from tpc_plugin_parser.lexer.tokens.transition import Transition
+from tpc_plugin_parser.lexer.utilities.types import ALL_TOKEN_TYPES
+
+from tpc_plugin_validator.utilities.runtime_estimate import PLACEHOLDER_PATTERN
+from tpc_plugin_validator.utilities.severity import Severity
+from tpc_plugin_validator.utilities.types import FileNames, SectionNames, Violations
+from tpc_plugin_validator.utilities.validation_result import ValidationResult
+
+FAIL_CODE_RANGE: int = 1000
+
+
+class MetricsFormat(Enum):
+    """Enum to hold the supported metrics output formats."""
+
+    csv = "csv"
+    json = "json"
+
+
+@dataclass(frozen=True)
+class PluginMetrics(object):
+    """Class to hold the size and complexity of a single plugin."""
+
+    states: int = 0
+    transitions: int = 0
+    conditions: int = 0
+    max_fan_out: int = 0
+    cyclomatic_complexity: int = 0
+    placeholders: int = 0
+    fail_states: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class MetricThresholds(object):
+    """Class to hold the largest value allowed for each metric, a threshold of zero is not enforced."""
+
+    max_states: int = 0
+    max_transitions: int = 0
+    max_conditions: int = 0
+    max_fan_out: int = 0
+    max_cyclomatic_complexity: int = 0
+    max_placeholders: int = 0
+
+    def __post_init__(self) -> None:
+        """
+        Check that no threshold is negative.
+
+        :raises ValueError: If a threshold is negative.
+        """
+        for threshold in fields(self):
+            value: int = getattr(self, threshold.name)
+            if value < 0:
+                raise ValueError(
+                    f"The {threshold.name.removeprefix('max_').replace('_', ' ')} threshold must be at least 0, "
+                    f"{value} was given."
+                )
+
+
+def compute_metrics(
+    process_file: dict[str, list[ALL_TOKEN_TYPES]],
+    prompts_file: dict[str, list[ALL_TOKEN_TYPES]],
+) -> PluginMetrics:
+    """
+    Measure a plugin in a single pass over the tokens of its parsed files.
+
+    States are those used in the transitions section. The cyclomatic complexity of the state graph is the number of
+    transitions less the number of states plus twice the number of connected parts of the graph, found as the
+    transitions are read by merging the parts each transition joins. Fail states are counted per FAIL_CODE_RANGE codes.
+
+    :param process_file: The parsed process file.
+    :param prompts_file: The parsed prompts file.
+
+    :return: PluginMetrics
+    """
+    process_sections: dict[str, list[ALL_TOKEN_TYPES]] = {name.lower(): tokens for name, tokens in process_file.items()}
+    prompts_sections: dict[str, list[ALL_TOKEN_TYPES]] = {name.lower(): tokens for name, tokens in prompts_file.items()}
+
+    fan_out: dict[str, int] = {}
+    parents: dict[str, str] = {}
+    transitions: int = 0
+    for token in process_sections.get(SectionNames.transitions.value.lower(), []):
+        if not isinstance(token, Transition):
+            continue
+        transitions += 1
+        current_state: str = token.current_state.lower()
+        next_state: str = token.next_state.lower()
+        fan_out[current_state] = fan_out.get(current_state, 0) + 1
+        fan_out.setdefault(next_state, 0)
+        current_root: str = _find(parents=parents, state=current_state)
+        next_root: str = _find(parents=parents, state=next_state)
+        if current_root != next_root:
+            parents[next_root] = current_root
+
+    placeholders: int = 0
+    fail_states: dict[int, int] = {}
+    for token in process_sections.get(SectionNames.states.value.lower(), []):
+        if isinstance(token, Assignment) and token.assigned:
+            placeholders += len(PLACEHOLDER_PATTERN.findall(token.assigned))
+        elif isinstance(token, FailState):
+            low: int = token.code // FAIL_CODE_RANGE * FAIL_CODE_RANGE
+            fail_states[low] = fail_states.get(low, 0) + 1
+
+    parts: int = sum(1 for state in fan_out if _find(parents=parents, state=state) == state)
+    return PluginMetrics(
+        states=len(fan_out),
+        transitions=transitions,
+        conditions=sum(
+            1
+            for token in prompts_sections.get(SectionNames.conditions.value.lower(), [])
+            if isinstance(token, Assignment)
+        ),
+        max_fan_out=max(fan_out.values(), default=0),
+        cyclomatic_complexity=transitions - len(fan_out) + 2 * parts,
+        placeholders=placeholders,
+        fail_states={f"{low}-{low + FAIL_CODE_RANGE - 1}": count for low, count in sorted(fail_states.items())},
+    )
+
+
+def check_thresholds(metrics: PluginMetrics, thresholds: MetricThresholds) -> list[ValidationResult]:
+    """
+    Report each metric of a plugin that is greater than its threshold.
+
+    :param metrics: The metrics of the plugin.
+    :param thresholds: The thresholds to enforce.
+
+    :return: List of ValidationResult, empty if every metric is within its threshold.
+    """
+    checks: list[tuple[int, int, str, FileNames, SectionNames]] = [
+        (metrics.states, thresholds.max_states, "number of states", FileNames.process, SectionNames.transitions),
+        (
+            metrics.transitions,
+            thresholds.max_transitions,
+            "number of transitions",
+            FileNames.process,
+            SectionNames.transitions,
+        ),
+        (
+            metrics.conditions,
+            thresholds.max_conditions,
+            "number of conditions",
+            FileNames.prompts,
+            SectionNames.conditions,
+        ),
+        (
+            metrics.max_fan_out,
+            thresholds.max_fan_out,
+            "largest number of transitions leaving a single state",
+            FileNames.process,
+            SectionNames.transitions,
+        ),
+        (
+            metrics.cyclomatic_complexity,
+            thresholds.max_cyclomatic_complexity,
+            "cyclomatic complexity",
+            FileNames.process,
+            SectionNames.transitions,
+        ),
+        (
+            metrics.placeholders,
+            thresholds.max_placeholders,
+            "number of placeholders",
+            FileNames.process,
+            SectionNames.states,
+        ),
+    ]
+    return [
+        ValidationResult(
+            rule=Violations.complexity_violation.value,
+            severity=Severity.WARNING,
+            message=f"The {name} of the plugin is {value} which exceeds the threshold of {threshold}.",
+            file=file.value,
+            section=section.value,
+        )
+        for value, threshold, name, file, section in checks
+        if threshold and value > threshold
+    ]
+
+
+class MetricsWriter(object):
+    """
+    Stream the metrics of each plugin in a corpus as JSON or CSV.
+
+    JSON is written as an array of objects, one per plugin. CSV is written with a row per plugin, with the fail states
+    written as range=count pairs separated by semicolons and the violations as their messages separated by semicolons.
+    """
+
+    __slots__ = (
+        "_csv",
+        "_output",
+        "_written",
+    )
+
+    _CSV_HEADER: tuple[str, ...] = (
+        "plugin",
+        "states",
+        "transitions",
+        "conditions",
+        "max_fan_out",
+        "cyclomatic_complexity",
+        "placeholders",
+        "fail_states",
+        "violations",
+    )
+
+    def __init__(self, output: TextIO, metrics_format: MetricsFormat) -> None:
+        """
+        Standard init for the MetricsWriter class.
+
+        :param output: The text stream to write to, opened with newline="" when writing CSV to a file.
+        :param metrics_format: The format to write.
+        """
+        self._csv = csv.writer(output) if metrics_format is MetricsFormat.csv else None
+        self._output: TextIO = output
+        self._written: int = 0
+
+    def __enter__(self) -> "MetricsWriter":
+        """
+        Write the start of the output.
+
+        :return: Self
+        """
+        if self._csv is not None:
+            self._csv.writerow(self._CSV_HEADER)
+        else:
+            self._output.write("[")
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """
+        Write the end of the output.
+
+        :param exc_type: The type of the exception raised within the context, if any.
+        :param exc_value: The exception raised within the context, if any.
+        :param traceback: The traceback of the exception raised within the context, if any.
+        """
+        if self._csv is None:
+            self._output.write("\n]\n")
+
+    def write(self, name: str, metrics: PluginMetrics, violations: list[ValidationResult]) -> None:
+        """
+        Write the metrics of a single plugin.
+
+        :param name: The name of the plugin.
+        :param metrics: The metrics of the plugin.
+        :param violations: The thresholds the plugin exceeds.
+        """
+        if self._csv is not None:
+            self._csv.writerow(
+                (
+                    name,
+                    metrics.states,
+                    metrics.transitions,
+                    metrics.conditions,
+                    metrics.max_fan_out,
+                    metrics.cyclomatic_complexity,
+                    metrics.placeholders,
+                    ";".join(f"{code_range}={count}" for code_range, count in metrics.fail_states.items()),
+                    ";".join(violation.message for violation in violations),
+                )
+            )
+        else:
+            record: dict[str, object] = {
+                "plugin": name,
+                "states": metrics.states,
+                "transitions": metrics.transitions,
+                "conditions": metrics.conditions,
+                "max_fan_out": metrics.max_fan_out,
+                "cyclomatic_complexity": metrics.cyclomatic_complexity,
+                "placeholders": metrics.placeholders,
+                "fail_states": metrics.fail_states,
+                "violations": [violation.message for violation in violations],
+            }
+            self._output.write(f"{',' if self._written else ''}\n{json.dumps(record)}")
+        self._written += 1
+
+
+def _find(parents: dict[str, str], state: str) -> str:
+    """
+    Find the state representing the connected part of the graph a state belongs to, shortening the path as it goes.
+
+    :param parents: The state each merged state was joined to, updated in place.
+    :param state: The lower case state name.
+
+    :return: The lower case name of the representing state.
+    """
+    root: str = state
+    while (parent := parents.get(root, root)) != root:
+        root = parent
+    while state != root:
+        parents[state], state = root, parents[state]
+    return root
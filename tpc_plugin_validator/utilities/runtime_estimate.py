@@ -0,0 +1,118 @@
+"""Estimate how long CPM takes to run a plugin from its state machine and the text each state sends."""
+
+import re
+from dataclasses import dataclass
+
+from tpc_plugin_parser.lexer.tokens.assignment import Assignment
+from tpc_plugin_parser.lexer.utilities.types import ALL_TOKEN_TYPES
+
+from tpc_plugin_validator.utilities.state_graph import END_STATE, StateGraph
+
+PLACEHOLDER_LENGTH: int = 16
+
+PLACEHOLDER_PATTERN: re.Pattern[str] = re.compile(r"<[^<>]+>")
+
+
+@dataclass(frozen=True)
+class RuntimeEstimate(object):
+    """Class to hold the estimated steps and seconds taken to run a plugin from the initial state to END."""
+
+    longest_steps: int
+    shortest_steps: int
+    worst_seconds: float
+    typical_seconds: float
+
+
+def estimate_runtime(
+    graph: StateGraph,
+    states: list[ALL_TOKEN_TYPES],
+    parameters: list[ALL_TOKEN_TYPES],
+) -> RuntimeEstimate | None:
+    """
+    Estimate how long CPM takes to run a plugin from the initial state to END.
+
+    Each character a state sends is delayed by between SendHumanMin and SendHumanMax seconds, with each placeholder
+    counted as PLACEHOLDER_LENGTH characters. The worst case follows the longest path without repeating a state, found
+    over the graph with every cycle collapsed into a single step per state, with each character taking SendHumanMax. The
+    typical case follows the path with the fewest transitions, with each character taking the mean of the two.
+
+    :param graph: The graph of the state machine.
+    :param states: The tokens of the states section, holding the text each state sends.
+    :param parameters: The tokens of the parameters section, holding SendHumanMin and SendHumanMax.
+
+    :return: RuntimeEstimate, or None if END cannot be reached from the initial state.
+    """
+    typical_path = graph.shortest_path(state=END_STATE)
+    if typical_path is None:
+        return None
+
+    human_min: float = _parameter(parameters=parameters, name="SendHumanMin")
+    human_max: float = max(_parameter(parameters=parameters, name="SendHumanMax"), human_min)
+    characters: dict[str, int] = {
+        state.name.lower(): send_length(value=state.assigned)
+        for state in states
+        if isinstance(state, Assignment) and state.assigned
+    }
+
+    # Components are listed before any component that leads to them, so the longest path from each component to END
+    # is known before it is needed. The states and the characters sent along it are maximised independently.
+    component_of: dict[str, int] = {}
+    longest: list[tuple[int, int] | None] = []
+    for position, component in enumerate(graph.strongly_connected_components()):
+        members: set[str] = set(component)
+        for state in component:
+            component_of[state] = position
+        best: tuple[int, int] | None = (0, 0) if END_STATE in members else None
+        for state in component:
+            for transition in graph.successors(state):
+                next_state: str = transition.next_state.lower()
+                if next_state in members or (following := longest[component_of[next_state]]) is None:
+                    continue
+                best = following if best is None else (max(best[0], following[0]), max(best[1], following[1]))
+        if best is not None:
+            best = (best[0] + len(component), best[1] + sum(characters.get(state, 0) for state in component))
+        longest.append(best)
+
+    worst: tuple[int, int] | None = longest[component_of[graph.initial_state]]
+    if worst is None:
+        return None
+    worst_states, worst_characters = worst
+    typical_characters: int = characters.get(graph.initial_state, 0) + sum(
+        characters.get(transition.next_state.lower(), 0) for transition in typical_path
+    )
+    return RuntimeEstimate(
+        longest_steps=worst_states - 1,
+        shortest_steps=len(typical_path),
+        worst_seconds=worst_characters * human_max,
+        typical_seconds=typical_characters * (human_min + human_max) / 2,
+    )
+
+
+def send_length(value: str) -> int:
+    """
+    Count the characters a state sends, counting each placeholder as PLACEHOLDER_LENGTH characters.
+
+    :param value: The text the state sends.
+
+    :return: The number of characters.
+    """
+    placeholders: list[str] = PLACEHOLDER_PATTERN.findall(value)
+    return len(value) - sum(len(placeholder) for placeholder in placeholders) + len(placeholders) * PLACEHOLDER_LENGTH
+
+
+def _parameter(parameters: list[ALL_TOKEN_TYPES], name: str) -> float:
+    """
+    Fetch a numerical parameter, ignoring any value that is not a non-negative number as it is reported elsewhere.
+
+    :param parameters: The tokens of the parameters section.
+    :param name: The name of the parameter.
+
+    :return: The value, zero if it is not set or not valid.
+    """
+    for token in parameters:
+        if isinstance(token, Assignment) and token.name.lower() == name.lower() and token.assigned:
+            try:
+                return max(float(token.assigned), 0.0)
+            except ValueError:
+                return 0.0
+    return 0.0
@@ -0,0 +1,352 @@
+"""Drive the state machine of a plugin with a recorded terminal transcript rather than a live target."""
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import lru_cache
+from typing import TextIO
+
+from tpc_plugin_parser.lexer.tokens.assignment import Assignment
+from tpc_plugin_parser.lexer.tokens.fail_state import FailState
+from tpc_plugin_parser.lexer.tokens.transition import Transition
+from tpc_plugin_parser.lexer.utilities.types import ALL_TOKEN_TYPES
+
+from tpc_plugin_validator.utilities.condition_pattern import EXPRESSION_PREFIX
+from tpc_plugin_validator.utilities.state_graph import END_STATE, StateGraph
+from tpc_plugin_validator.utilities.types import SectionNames
+
+MATCH_MAX: int = 2000
+
+_PLACEHOLDER_PATTERN: re.Pattern[str] = re.compile(r"<([^<>]+)>")
+_TCL_TRANSLATIONS: dict[str, str] = {
+    "[:alnum:]": r"a-zA-Z0-9",
+    "[:alpha:]": r"a-zA-Z",
+    "[:blank:]": r" \t",
+    "[:digit:]": r"0-9",
+    "[:lower:]": r"a-z",
+    "[:punct:]": r"!-/:-@\[-`{-~",
+    "[:space:]": r"\s",
+    "[:upper:]": r"A-Z",
+    "[:xdigit:]": r"0-9a-fA-F",
+    r"\m": r"\b",
+    r"\M": r"\b",
+    r"\y": r"\b",
+    r"\Y": r"\B",
+}
+# Every escape is matched as a whole, so an escaped backslash followed by m is never taken for the Tcl \m.
+_TCL_PATTERN: re.Pattern[str] = re.compile(r"\[:\w+:\]|\\.", re.DOTALL)
+
+
+class SimulationOutcome(Enum):
+    """Enum to hold the ways a simulation can finish."""
+
+    end = "end"
+    fail = "fail"
+    stalled = "stalled"
+
+
+@dataclass(frozen=True)
+class SimulationStep(object):
+    """Class to hold a single transition taken by a simulation."""
+
+    transition: Transition
+    matched: str
+
+    def __str__(self) -> str:
+        """
+        Describe the step.
+
+        :return: The step as a string.
+        """
+        return (
+            f"Line {self.transition.line_number}: {self.transition.current_state} -({self.transition.condition})-> "
+            f"{self.transition.next_state}"
+        )
+
+
+@dataclass
+class SimulationResult(object):
+    """Class to hold the outcome of a simulation."""
+
+    outcome: SimulationOutcome
+    state: str
+    steps: list[SimulationStep] = field(default_factory=list)
+    reason: str = ""
+    fail_code: int = 0
+    missing_parameters: list[str] = field(default_factory=list)
+
+
+class Simulator(object):
+    """
+    Drive the state machine of a plugin with the output of a target, as CPM would.
+
+    Output is fed in as it is read. The conditions of the transitions leaving the current state are tried against the
+    output not yet consumed in the order the transitions are declared, as Expect does, and the first to match is taken,
+    consuming the output up to the end of its match. Boolean conditions are taken without reading output, "true" always
+    matching and any other expression never matching. Only the last MATCH_MAX characters of unconsumed output are kept,
+    as with the Expect match_max default, so a long transcript is simulated in memory proportional to MATCH_MAX.
+    """
+
+    __slots__ = (
+        "_buffer",
+        "_conditions",
+        "_fail_states",
+        "_graph",
+        "_missing",
+        "_names",
+        "_parameters",
+        "_result",
+        "_state",
+        "_steps",
+    )
+
+    def __init__(
+        self,
+        process_file: dict[str, list[ALL_TOKEN_TYPES]],
+        prompts_file: dict[str, list[ALL_TOKEN_TYPES]],
+        parameters: dict[str, str] | None = None,
+    ) -> None:
+        """
+        Standard init for the Simulator class.
+
+        :param process_file: The parsed process file.
+        :param prompts_file: The parsed prompts file.
+        :param parameters: The values substituted for placeholders in the conditions, keyed by lower case name.
+        """
+        self._buffer: str = ""
+        self._conditions: dict[str, str] = {}
+        self._fail_states: dict[str, FailState] = {}
+        self._graph: StateGraph = StateGraph.from_process_file(process_file=process_file)
+        self._missing: dict[str, None] = {}
+        self._names: frozenset[str] = frozenset(parameters or {})
+        self._parameters: tuple[tuple[str, str], ...] = tuple(sorted((parameters or {}).items()))
+        self._result: SimulationResult | None = None
+        self._state: str = self._graph.initial_state
+        self._steps: list[SimulationStep] = []
+
+        for name, tokens in prompts_file.items():
+            if name.lower() == SectionNames.conditions.value.lower():
+                for token in tokens:
+                    if isinstance(token, Assignment):
+                        self._conditions.setdefault(token.name.lower(), token.assigned or "")
+        for name, tokens in process_file.items():
+            if name.lower() == SectionNames.states.value.lower():
+                self._fail_states = {token.name.lower(): token for token in tokens if isinstance(token, FailState)}
+
+        if not self._state:
+            self._finish(outcome=SimulationOutcome.stalled, reason="The process file has no transitions.")
+        else:
+            self._advance()
+
+    def feed(self, output: str) -> list[SimulationStep]:
+        """
+        Read more output from the target and take any transitions it allows.
+
+        :param output: The output read.
+
+        :return: List of SimulationStep taken as a result, in order.
+        """
+        if self._result is not None:
+            return []
+        taken: int = len(self._steps)
+        self._buffer = (self._buffer + output)[-MATCH_MAX:]
+        self._advance()
+        return self._steps[taken:]
+
+    def finish(self) -> SimulationResult:
+        """
+        Finish the simulation once all output has been read.
+
+        :return: SimulationResult
+        """
+        if self._result is None:
+            conditions: str = ", ".join(
+                f'"{transition.condition}"' for transition in self._graph.successors(self._state)
+            )
+            self._finish(
+                outcome=SimulationOutcome.stalled,
+                reason=f"The output ran out while waiting for one of the conditions {conditions}.",
+            )
+        assert self._result is not None
+        return self._result
+
+    def _advance(self) -> None:
+        """Take transitions until none of the conditions from the current state match the output not yet consumed."""
+        visited: set[tuple[str, int]] = set()
+        while self._result is None:
+            if self._graph.is_terminal(self._state):
+                self._finish_terminal()
+                return
+            transitions: list[Transition] = self._graph.successors(self._state)
+            if not transitions:
+                self._finish(
+                    outcome=SimulationOutcome.stalled,
+                    reason=f'The state "{self._graph.name(self._state)}" has no transitions leaving it.',
+                )
+                return
+            if (self._state, len(self._buffer)) in visited:
+                self._finish(
+                    outcome=SimulationOutcome.stalled,
+                    reason=f'The state "{self._graph.name(self._state)}" was reached again without reading output.',
+                )
+                return
+            visited.add((self._state, len(self._buffer)))
+
+            match: tuple[Transition, str] | None = self._match(transitions=transitions)
+            if match is None:
+                return
+            transition, matched = match
+            self._steps.append(SimulationStep(transition=transition, matched=matched))
+            self._state = transition.next_state.lower()
+
+    def _match(self, transitions: list[Transition]) -> tuple[Transition, str] | None:
+        """
+        Find the first transition whose condition matches, consuming the output matched.
+
+        :param transitions: The transitions leaving the current state in the order they are declared.
+
+        :return: The transition and the output it matched, or None if none match.
+        """
+        for transition in transitions:
+            pattern: str | None = self._conditions.get(transition.condition.lower())
+            if pattern is None:
+                continue
+            if pattern.lower().startswith(EXPRESSION_PREFIX):
+                if pattern[len(EXPRESSION_PREFIX) :].strip().lower() == "true":
+                    return transition, ""
+                continue
+            compiled: re.Pattern[str] | None = self._compile(pattern=pattern)
+            if compiled is not None and (found := compiled.search(self._buffer)) is not None:
+                self._buffer = self._buffer[found.end() :]
+                return transition, found.group(0)
+        return None
+
+    def _compile(self, pattern: str) -> re.Pattern[str] | None:
+        """
+        Compile a condition pattern with its placeholders replaced, noting any placeholder without a value.
+
+        :param pattern: The condition pattern.
+
+        :return: The compiled pattern, or None if it is not valid.
+        """
+        for name in _placeholders(pattern=pattern):
+            if name.lower() not in self._names:
+                self._missing.setdefault(name, None)
+        return compile_condition(pattern=pattern, parameters=self._parameters)
+
+    def _finish_terminal(self) -> None:
+        """Finish the simulation on reaching END or a fail state."""
+        fail_state: FailState | None = self._fail_states.get(self._state)
+        if self._state == END_STATE or fail_state is None:
+            self._finish(outcome=SimulationOutcome.end)
+            return
+        self._finish(outcome=SimulationOutcome.fail, reason=fail_state.message, fail_code=fail_state.code)
+
+    def _finish(self, outcome: SimulationOutcome, reason: str = "", fail_code: int = 0) -> None:
+        """
+        Record the outcome of the simulation.
+
+        :param outcome: How the simulation finished.
+        :param reason: The description of the outcome.
+        :param fail_code: The code of the fail state reached, if any.
+        """
+        self._result = SimulationResult(
+            outcome=outcome,
+            state=self._graph.name(self._state),
+            steps=self._steps,
+            reason=reason,
+            fail_code=fail_code,
+            missing_parameters=list(self._missing),
+        )
+
+
+@lru_cache(maxsize=4096)
+def compile_condition(pattern: str, parameters: tuple[tuple[str, str], ...]) -> re.Pattern[str] | None:
+    """
+    Translate a condition pattern to a Python regular expression and compile it, caching the result.
+
+    Placeholders with a value are replaced by the value matched literally, those without are matched literally as
+    written. The POSIX classes and word boundaries of Tcl regular expressions are translated to their Python
+    equivalents.
+
+    :param pattern: The condition pattern.
+    :param parameters: The values of the placeholders as sorted pairs of lower case name and value.
+
+    :return: The compiled pattern, or None if it is not valid.
+    """
+    values: dict[str, str] = dict(parameters)
+    parts: list[str] = []
+    position: int = 0
+    for placeholder in _PLACEHOLDER_PATTERN.finditer(pattern):
+        parts.append(_translate(pattern=pattern[position : placeholder.start()]))
+        parts.append(re.escape(values.get(placeholder.group(1).lower(), placeholder.group(0))))
+        position = placeholder.end()
+    parts.append(_translate(pattern=pattern[position:]))
+    try:
+        return re.compile("".join(parts))
+    except re.error:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _placeholders(pattern: str) -> tuple[str, ...]:
+    """
+    Find the names of the placeholders in a condition pattern, caching the result by pattern text.
+
+    :param pattern: The condition pattern.
+
+    :return: Tuple of placeholder names as written.
+    """
+    return tuple(_PLACEHOLDER_PATTERN.findall(pattern))
+
+
+def read_parameters(lines: Iterable[str]) -> dict[str, str]:
+    """
+    Read the values of placeholders from name=value lines, ignoring blank lines, comments and section headers.
+
+    :param lines: The lines of the parameter file.
+
+    :return: Dictionary of values keyed by lower case name.
+    """
+    parameters: dict[str, str] = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(("#", ";", "[")) or "=" not in line:
+            continue
+        name, value = line.split("=", 1)
+        parameters[name.strip().lower()] = value.strip()
+    return parameters
+
+
+def _translate(pattern: str) -> str:
+    """
+    Translate the parts of a Tcl regular expression Python does not share.
+
+    :param pattern: The part of the condition pattern between placeholders.
+
+    :return: The Python regular expression.
+    """
+    return _TCL_PATTERN.sub(lambda found: _TCL_TRANSLATIONS.get(found.group(0), found.group(0)), pattern)
+
+
+def simulate(
+    transcript: TextIO,
+    process_file: dict[str, list[ALL_TOKEN_TYPES]],
+    prompts_file: dict[str, list[ALL_TOKEN_TYPES]],
+    parameters: dict[str, str] | None = None,
+) -> SimulationResult:
+    """
+    Simulate a plugin against a whole transcript, reading it a line at a time.
+
+    :param transcript: The text stream holding the recorded output of the target.
+    :param process_file: The parsed process file.
+    :param prompts_file: The parsed prompts file.
+    :param parameters: The values substituted for placeholders in the conditions, keyed by lower case name.
+
+    :return: SimulationResult
+    """
+    simulator = Simulator(process_file=process_file, prompts_file=prompts_file, parameters=parameters)
+    for line in transcript:
+        simulator.feed(output=line)
+    return simulator.finish()
@@ -0,0 +1,283 @@
+"""Directed graph of the state machine declared by the transitions section of a process file."""
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+from tpc_plugin_parser.lexer.tokens.fail_state import FailState
+from tpc_plugin_parser.lexer.tokens.transition import Transition
+from tpc_plugin_parser.lexer.utilities.types import ALL_TOKEN_TYPES
+
+from tpc_plugin_validator.utilities.types import SectionNames
+
+END_STATE: str = "end"
+
+
+class StateGraph(object):
+    """
+    Directed graph of the state machine declared by the transitions section of a process file.
+
+    Each state is a node keyed by its lower case name and each transition is an edge. The edges leaving and entering
+    every state are indexed once when the graph is built, so each search over the graph takes time linear in the
+    number of states and transitions.
+    """
+
+    __slots__ = (
+        "_fail_states",
+        "_initial_state",
+        "_names",
+        "_parents",
+        "_predecessors",
+        "_successors",
+        "_transitions",
+    )
+
+    def __init__(self, transitions: Iterable[ALL_TOKEN_TYPES], fail_states: Iterable[str] = ()) -> None:
+        """
+        Standard init for the StateGraph class.
+
+        :param transitions: The tokens of the transitions section, tokens other than transitions are ignored.
+        :param fail_states: The names of the fail states declared in the states section.
+        """
+        self._fail_states: set[str] = {name.lower() for name in fail_states}
+        self._names: dict[str, str] = {}
+        self._parents: dict[str, Transition | None] | None = None
+        self._predecessors: dict[str, list[Transition]] = {}
+        self._successors: dict[str, list[Transition]] = {}
+        self._transitions: list[Transition] = []
+
+        for transition in transitions:
+            if not isinstance(transition, Transition):
+                continue
+            current_state: str = transition.current_state.lower()
+            next_state: str = transition.next_state.lower()
+            self._names.setdefault(current_state, transition.current_state)
+            self._names.setdefault(next_state, transition.next_state)
+            self._successors.setdefault(current_state, []).append(transition)
+            self._successors.setdefault(next_state, [])
+            self._predecessors.setdefault(next_state, []).append(transition)
+            self._predecessors.setdefault(current_state, [])
+            self._transitions.append(transition)
+
+        self._initial_state: str = self._transitions[0].current_state.lower() if self._transitions else ""
+
+    def reachable(self) -> set[str]:
+        """
+        Find the states that can be reached from the initial state, using a breadth first search.
+
+        :return: Set of lower case state names, including the initial state.
+        """
+        return set(self._parent_map())
+
+    def shortest_path(self, state: str) -> list[Transition] | None:
+        """
+        Fetch a path with the fewest transitions from the initial state to a state.
+
+        The breadth first search from the initial state records the transition each state was first reached by, that
+        map is built once per graph and each path is then read back from it.
+
+        :param state: The state name in any case.
+
+        :return: List of Transition from the initial state, empty for the initial state, or None if it is unreachable.
+        """
+        parents: dict[str, Transition | None] = self._parent_map()
+        state = state.lower()
+        if state not in parents:
+            return None
+
+        path: list[Transition] = []
+        while (transition := parents[state]) is not None:
+            path.append(transition)
+            state = transition.current_state.lower()
+        path.reverse()
+        return path
+
+    def strongly_connected_components(self) -> list[list[str]]:
+        """
+        Find the strongly connected components, the groups of states that can each reach every other state in the
+        group.
+
+        Uses Tarjan's algorithm with an explicit stack rather than recursion, so that a graph of any size can be searched
+        without reaching the recursion limit.
+
+        :return: List of components, each a list of lower case state names in the order they were first used, with a
+            component listed before any component that leads to it.
+        """
+        order: dict[str, int] = {state: position for position, state in enumerate(self._names)}
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+        components: list[list[str]] = []
+
+        for root in self._names:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work: list[tuple[str, Iterator[Transition]]] = [(root, iter(self._successors[root]))]
+            while work:
+                state, edges = work[-1]
+                for transition in edges:
+                    next_state: str = transition.next_state.lower()
+                    if next_state not in index:
+                        index[next_state] = low[next_state] = len(index)
+                        stack.append(next_state)
+                        on_stack.add(next_state)
+                        work.append((next_state, iter(self._successors[next_state])))
+                        break
+                    if next_state in on_stack:
+                        low[state] = min(low[state], index[next_state])
+                else:
+                    work.pop()
+                    if work:
+                        parent: str = work[-1][0]
+                        low[parent] = min(low[parent], low[state])
+                    if low[state] != index[state]:
+                        continue
+                    component: list[str] = []
+                    while True:
+                        member: str = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == state:
+                            break
+                    components.append(sorted(component, key=order.__getitem__))
+        return components
+
+    def terminating(self) -> set[str]:
+        """
+        Find the states from which END or a fail state can be reached, using a breadth first search backwards.
+
+        :return: Set of lower case state names, including END and the fail states.
+        """
+        seen: set[str] = {state for state in self._names if self.is_terminal(state)}
+        queue: deque[str] = deque(seen)
+        while queue:
+            for transition in self._predecessors[queue.popleft()]:
+                current_state: str = transition.current_state.lower()
+                if current_state not in seen:
+                    seen.add(current_state)
+                    queue.append(current_state)
+        return seen
+
+    def is_terminal(self, state: str) -> bool:
+        """
+        Check whether the state machine stops at a state.
+
+        :param state: The state name.
+
+        :return: True if the state is END or a fail state otherwise False.
+        """
+        state = state.lower()
+        return state == END_STATE or state in self._fail_states
+
+    def name(self, state: str) -> str:
+        """
+        Fetch the name of a state as it was first written in the transitions section.
+
+        :param state: The state name in any case.
+
+        :return: The state name as written.
+        """
+        return self._names.get(state.lower(), state)
+
+    def predecessors(self, state: str) -> list[Transition]:
+        """
+        Fetch the transitions entering a state.
+
+        :param state: The state name in any case.
+
+        :return: List of Transition in the order they were declared.
+        """
+        return self._predecessors.get(state.lower(), [])
+
+    def successors(self, state: str) -> list[Transition]:
+        """
+        Fetch the transitions leaving a state.
+
+        :param state: The state name in any case.
+
+        :return: List of Transition in the order they were declared.
+        """
+        return self._successors.get(state.lower(), [])
+
+    def _parent_map(self) -> dict[str, Transition | None]:
+        """
+        Fetch the transition each reachable state is first reached by in a breadth first search from the initial state.
+
+        :return: Dictionary of Transition keyed by lower case state name, None for the initial state.
+        """
+        if self._parents is not None:
+            return self._parents
+
+        self._parents = {self._initial_state: None} if self._initial_state else {}
+        queue: deque[str] = deque(self._parents)
+        while queue:
+            for transition in self._successors[queue.popleft()]:
+                next_state: str = transition.next_state.lower()
+                if next_state not in self._parents:
+                    self._parents[next_state] = transition
+                    queue.append(next_state)
+        return self._parents
+
+    @property
+    def initial_state(self) -> str:
+        """
+        Property to fetch the initial state, the current state of the first transition.
+
+        :return: The lower case state name, empty if there are no transitions.
+        """
+        return self._initial_state
+
+    @property
+    def states(self) -> list[str]:
+        """
+        Property to fetch every state used in a transition.
+
+        :return: List of lower case state names in the order they were first used.
+        """
+        return list(self._names)
+
+    @property
+    def transitions(self) -> list[Transition]:
+        """
+        Property to fetch every transition.
+
+        :return: List of Transition in the order they were declared.
+        """
+        return self._transitions
+
+    @classmethod
+    def from_sections(
+        cls,
+        transitions: Iterable[ALL_TOKEN_TYPES],
+        states: Iterable[ALL_TOKEN_TYPES],
+    ) -> "StateGraph":
+        """
+        Create the graph from the transitions and states sections of a parsed process file.
+
+        :param transitions: The tokens of the transitions section.
+        :param states: The tokens of the states section, used to find the fail states.
+
+        :return: Self
+        """
+        return cls(
+            transitions=transitions,
+            fail_states=[state.name for state in states if isinstance(state, FailState)],
+        )
+
+    @classmethod
+    def from_process_file(cls, process_file: dict[str, list[ALL_TOKEN_TYPES]]) -> "StateGraph":
+        """
+        Create the graph from a parsed process file, matching the section names regardless of case.
+
+        :param process_file: The parsed process file.
+
+        :return: Self
+        """
+        sections: dict[str, list[ALL_TOKEN_TYPES]] = {name.lower(): tokens for name, tokens in process_file.items()}
+        return cls.from_sections(
+            transitions=sections.get(SectionNames.transitions.value.lower(), []),
+            states=sections.get(SectionNames.states.value.lower(), []),
+        )
@@ -0,0 +1,297 @@
+"""Measure which transitions of a plugin are exercised by the CPM debug logs of its runs."""
+
+import fnmatch
+import os
+import re
+from collections.abc import Iterable
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from tpc_plugin_parser.lexer.tokens.transition import Transition
+
+from tpc_plugin_validator.utilities.state_graph import StateGraph
+
+CHUNK_SIZE: int = 1 << 20
+DEFAULT_KEYWORDS: tuple[str, ...] = ("state", "condition")
+DEFAULT_LOG_GLOB: str = "*.log"
+LINE_MAX: int = 1 << 16
+
+TransitionTuple = tuple[str, str, str]
+LogResult = tuple[tuple[int, ...], tuple[str, ...]]
+
+
+@dataclass(frozen=True)
+class TransitionCoverage(object):
+    """Class to hold the transitions and states of a plugin exercised by a set of logs."""
+
+    transitions: list[Transition]
+    states: list[str]
+    exercised: frozenset[int] = frozenset()
+    observed: frozenset[str] = frozenset()
+    logs: int = 0
+    unreadable: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def percentage(self) -> float:
+        """
+        Fetch the proportion of the transitions exercised.
+
+        :return: The percentage, 100 for a plugin without transitions.
+        """
+        if not self.transitions:
+            return 100.0
+        return 100.0 * len(self.exercised) / len(self.transitions)
+
+    @property
+    def unexercised_transitions(self) -> list[Transition]:
+        """
+        Fetch the transitions no log exercised.
+
+        :return: List of Transition in the order they were declared.
+        """
+        return [transition for index, transition in enumerate(self.transitions) if index not in self.exercised]
+
+    @property
+    def unobserved_states(self) -> list[str]:
+        """
+        Fetch the states no log reached.
+
+        :return: List of state names as written, in the order they were first used.
+        """
+        return [state for state in self.states if state.lower() not in self.observed]
+
+
+def find_logs(paths: Iterable[str], glob: str = DEFAULT_LOG_GLOB) -> list[str]:
+    """
+    Find the log files given directly or beneath the given directories.
+
+    :param paths: The log files and directories holding them.
+    :param glob: The pattern the names of the log files in a directory must match.
+
+    :raises FileNotFoundError: If a path does not exist.
+
+    :return: List of file paths, those within each directory sorted by path.
+    """
+    logs: list[str] = []
+    for path in paths:
+        if os.path.isfile(path):
+            logs.append(path)
+            continue
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"The log file or directory was not found: {path}")
+        found: list[str] = []
+        for directory, _, file_names in os.walk(path):
+            found.extend(
+                os.path.join(directory, file_name)
+                for file_name in file_names
+                if fnmatch.fnmatch(file_name.lower(), glob.lower())
+            )
+        logs.extend(sorted(found))
+    return logs
+
+
+def measure_coverage(
+    graph: StateGraph,
+    logs: Iterable[str],
+    state_pattern: str,
+    condition_pattern: str,
+    executor: Executor | None = None,
+    keywords: tuple[str, ...] = DEFAULT_KEYWORDS,
+) -> TransitionCoverage:
+    """
+    Scan logs for the transitions of a plugin they exercise, each log in its own task if an executor is supplied.
+
+    No wording of the debug logs is assumed, the patterns finding the states entered and the conditions matched must be
+    given to suit the logs being scanned.
+
+    :param graph: The state machine of the plugin.
+    :param logs: The paths of the log files.
+    :param state_pattern: The regular expression finding a state entered, with a group named state.
+    :param condition_pattern: The regular expression finding a condition matched, with a group named condition.
+    :param executor: The executor to scan the logs with, the logs are scanned in turn if not supplied.
+    :param keywords: The words, in any case, one of which every line the patterns should be tried on holds.
+
+    :raises ValueError: If a pattern is not valid or lacks its named group, the patterns share a group name, or no
+        keyword is given.
+
+    :return: TransitionCoverage
+    """
+    _check_pattern(pattern=state_pattern, group="state")
+    _check_pattern(pattern=condition_pattern, group="condition")
+    try:
+        _combined_pattern(state_pattern=state_pattern, condition_pattern=condition_pattern)
+    except re.error as exc:
+        raise ValueError(f"The state and condition patterns cannot be combined: {exc}.") from exc
+    if not any(keywords):
+        raise ValueError("At least one keyword must be given.")
+    transitions: tuple[TransitionTuple, ...] = tuple(
+        (transition.current_state.lower(), transition.condition.lower(), transition.next_state.lower())
+        for transition in graph.transitions
+    )
+
+    exercised: set[int] = set()
+    observed: set[str] = set()
+    unreadable: dict[str, str] = {}
+    paths: list[str] = list(logs)
+    results: dict[str, Future[LogResult]] = {}
+    if executor is not None:
+        results = {
+            path: executor.submit(scan_log, path, transitions, state_pattern, condition_pattern, keywords)
+            for path in paths
+        }
+    for path in paths:
+        try:
+            if path in results:
+                indexes, states = results[path].result()
+            else:
+                indexes, states = scan_log(path, transitions, state_pattern, condition_pattern, keywords)
+        except OSError as exc:
+            unreadable[path] = str(exc)
+            continue
+        exercised.update(indexes)
+        observed.update(states)
+
+    return TransitionCoverage(
+        transitions=graph.transitions,
+        states=[graph.name(state) for state in graph.states],
+        exercised=frozenset(exercised),
+        observed=frozenset(observed),
+        logs=len(paths),
+        unreadable=unreadable,
+    )
+
+
+def scan_log(
+    path: str,
+    transitions: tuple[TransitionTuple, ...],
+    state_pattern: str,
+    condition_pattern: str,
+    keywords: tuple[str, ...] = DEFAULT_KEYWORDS,
+) -> LogResult:
+    """
+    Scan a single log for the transitions it exercises, reading it a chunk at a time.
+
+    The patterns are only tried on the lines holding a keyword, which are found with a plain search of the lower case
+    chunk. The few lines of a large log that mention a state or condition can so be found at close to disk speed. A
+    line longer than LINE_MAX is searched in pieces rather than held whole.
+
+    The states entered and conditions matched are followed in the order they are logged, starting from the initial
+    state of the plugin. A condition matched takes the first transition declared from the current state with that
+    condition, as CPM does. A state entered directly from the current state takes the transition between them if there
+    is only one, otherwise only the state is counted as reached. A state that cannot be entered from the current state
+    starts a new run of the plugin.
+
+    :param path: The path of the log file.
+    :param transitions: The transitions of the plugin as lower case current state, condition and next state.
+    :param state_pattern: The regular expression finding a state entered, with a group named state.
+    :param condition_pattern: The regular expression finding a condition matched, with a group named condition.
+    :param keywords: The words, in any case, one of which every line the patterns should be tried on holds.
+
+    :raises OSError: If the log cannot be read.
+
+    :return: The indexes of the transitions exercised and the lower case names of the states reached.
+    """
+    by_condition: dict[tuple[str, str], int] = {}
+    by_states: dict[tuple[str, str], list[int]] = {}
+    states: set[str] = set()
+    for index, (current_state, condition, next_state) in enumerate(transitions):
+        by_condition.setdefault((current_state, condition), index)
+        by_states.setdefault((current_state, next_state), []).append(index)
+        states.update((current_state, next_state))
+
+    pattern: re.Pattern[bytes] = _combined_pattern(state_pattern=state_pattern, condition_pattern=condition_pattern)
+    lowered_keywords: list[bytes] = [keyword.lower().encode() for keyword in keywords if keyword]
+    exercised: set[int] = set()
+    observed: set[str] = set()
+    current: str = transitions[0][0] if transitions else ""
+    with open(path, "rb") as log:
+        remainder: bytes = b""
+        while True:
+            chunk: bytes = log.read(CHUNK_SIZE)
+            data: bytes = remainder + chunk
+            # Only whole lines are searched so that a state or condition is never split across two chunks.
+            end: int = len(data) if not chunk else data.rfind(b"\n") + 1
+            if len(data) - end > LINE_MAX:
+                end = len(data)
+            remainder = data[end:]
+            for found in (
+                found
+                for line_start, line_end in _keyword_lines(data=data[:end].lower(), keywords=lowered_keywords)
+                for found in pattern.finditer(data, line_start, line_end)
+            ):
+                if (state := found.group("state")) is not None:
+                    entered: str = state.decode("utf-8", errors="replace").lower()
+                    if entered not in states:
+                        continue
+                    observed.add(entered)
+                    if entered == current:
+                        continue
+                    candidates: list[int] = by_states.get((current, entered), [])
+                    if len(candidates) == 1:
+                        exercised.add(candidates[0])
+                    current = entered
+                    continue
+                if (matched := found.group("condition")) is None:
+                    continue
+                condition: str = matched.decode("utf-8", errors="replace").lower()
+                index: int | None = by_condition.get((current, condition))
+                if index is not None:
+                    exercised.add(index)
+                    observed.add(current)
+                    current = transitions[index][2]
+                    observed.add(current)
+            if not chunk:
+                break
+
+    return tuple(sorted(exercised)), tuple(sorted(observed))
+
+
+def _check_pattern(pattern: str, group: str) -> None:
+    """
+    Check that a log pattern is valid and has the named group it must capture.
+
+    :param pattern: The regular expression.
+    :param group: The name of the group.
+
+    :raises ValueError: If the pattern is not valid or lacks the group.
+    """
+    try:
+        compiled: re.Pattern[str] = re.compile(pattern)
+    except re.error as exc:
+        raise ValueError(f"The {group} pattern is not a valid regular expression: {exc}.") from exc
+    if group not in compiled.groupindex:
+        raise ValueError(f'The {group} pattern must have a group named "{group}".')
+
+
+def _keyword_lines(data: bytes, keywords: list[bytes]) -> list[tuple[int, int]]:
+    """
+    Find the lines holding any of the keywords.
+
+    :param data: The lower case lines to search.
+    :param keywords: The lower case keywords.
+
+    :return: List of the start and end of each line found, in the order they appear.
+    """
+    lines: set[tuple[int, int]] = set()
+    for keyword in keywords:
+        position: int = data.find(keyword)
+        while position != -1:
+            line_end: int = data.find(b"\n", position)
+            line_end = len(data) if line_end == -1 else line_end
+            lines.add((data.rfind(b"\n", 0, position) + 1, line_end))
+            position = data.find(keyword, line_end)
+    return sorted(lines)
+
+
+@lru_cache(maxsize=16)
+def _combined_pattern(state_pattern: str, condition_pattern: str) -> re.Pattern[bytes]:
+    """
+    Compile the state and condition patterns into a single case insensitive pattern searching bytes.
+
+    :param state_pattern: The regular expression finding a state entered.
+    :param condition_pattern: The regular expression finding a condition matched.
+
+    :return: The compiled pattern.
+    """
+    return re.compile(f"(?:{state_pattern})|(?:{condition_pattern})".encode(), re.IGNORECASE)
@@ -36,6 +36,8 @@ class Violations(Enum):
     # Special case for information only.
     information_only = "InformationOnly"
 
+    closed_cycle_violation = "ClosedCycleViolation"
+    complexity_violation = "ComplexityViolation"
     duplicate_assignment_violation = "DuplicateAssignmentViolation"
     duplicate_transition_violation = "DuplicateTransitionViolation"
     invalid_condition_violation = "InvalidConditionViolation"
@@ -48,11 +50,16 @@ class Violations(Enum):
     name_case_mismatch_violation = "NameCaseMismatchViolation"
     name_case_violation = "NameCaseViolation"
     name_violation = "NameViolation"
+    non_terminating_state_violation = "NonTerminatingStateViolation"
     parse_error_violation = "ParseErrorViolation"
+    pattern_cost_violation = "PatternCostViolation"
+    resource_limit_violation = "ResourceLimitViolation"
+    runtime_budget_violation = "RuntimeBudgetViolation"
     section_name_case_violation = "SectionNameCaseViolation"
     unused_condition_violation = "UnusedConditionViolation"
     unused_parameter_violation = "UnusedParameterViolation"
     unused_state_violation = "UnusedStateViolation"
+    unreachable_state_violation = "UnreachableStateViolation"
     unreachable_transition_violation = "UnreachableTransitionViolation"
     value_case_violation = "ValueCaseViolation"
     value_violation = "ValueViolation"
@@ -27,3 +27,25 @@ class ValidationResult(object):
             file_details += f"({self.line})"
         output_message: str = f"{self.severity.value} -{file_details} ({self.rule}) {self.message}"
         return output_message
+
+    def to_tuple(self) -> tuple[str, str, str, str, str, int]:
+        """
+        Convert the validation result to a compact tuple of builtin types.
+
+        Used when results cross a process or interpreter boundary.
+
+        :return: Tuple of rule, severity, message, file, section and line.
+        """
+        return self.rule, self.severity.value, self.message, self.file, self.section, self.line
+
+    @classmethod
+    def from_tuple(cls, values: tuple[str, str, str, str, str, int]) -> "ValidationResult":
+        """
+        Create a validation result from a tuple created by to_tuple.
+
+        :param values: Tuple of rule, severity, message, file, section and line.
+
+        :return: ValidationResult
+        """
+        rule, severity, message, file, section, line = values
+        return cls(rule=rule, severity=Severity(severity), message=message, file=file, section=section, line=line)
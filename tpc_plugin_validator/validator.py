@@ -1,11 +1,13 @@
 """Class to manage validations."""
 
 import os
-from typing import Callable
+import zipfile
+from typing import Any, BinaryIO, Callable
 
 from tpc_plugin_parser.lexer.utilities.types import ALL_TOKEN_TYPES
 from tpc_plugin_parser.parser import Parser
 
+from tpc_plugin_validator.rule_sets.condition_patterns_rule_set import ConditionPatternsRuleSet
 from tpc_plugin_validator.rule_sets.conditions_section_rule_set import (
     ConditionsSectionRuleSet,
 )
@@ -24,7 +26,9 @@ from tpc_plugin_validator.rule_sets.states_section_rule_set import StatesSection
 from tpc_plugin_validator.rule_sets.transitions_section_rule_set import (
     TransitionsSectionRuleSet,
 )
+from tpc_plugin_validator.utilities.decoding import Buffer, decode_content, read_file
 from tpc_plugin_validator.utilities.exceptions import ProgrammingError
+from tpc_plugin_validator.utilities.plugin_archive import find_plugin_members, read_member
 from tpc_plugin_validator.utilities.validation_result import ValidationResult
 
 
@@ -49,21 +53,28 @@ class Validator(object):
         if not process_file_content and not prompts_file_content:
             raise ProgrammingError("At least one of process file or prompts file is required to complete validation.")
 
-        self._process: dict[str, list[ALL_TOKEN_TYPES]] = {}
-        self._prompts: dict[str, list[ALL_TOKEN_TYPES]] = {}
-
-        if process_file_content:
-            self._process = Parser(
-                file_contents=process_file_content,
-            ).parsed_file
+        self._setup(
+            process_file=Parser(file_contents=process_file_content).parsed_file if process_file_content else {},
+            prompts_file=Parser(file_contents=prompts_file_content).parsed_file if prompts_file_content else {},
+        )
 
-        if prompts_file_content:
-            self._prompts = Parser(
-                file_contents=prompts_file_content,
-            ).parsed_file
+    def _setup(
+        self,
+        process_file: dict[str, list[ALL_TOKEN_TYPES]],
+        prompts_file: dict[str, list[ALL_TOKEN_TYPES]],
+    ) -> None:
+        """
+        Set up the validator from parsed files.
 
+        :param process_file: Parsed process file.
+        :param prompts_file: Parsed prompts file.
+        """
+        self._config: dict[str, dict[str, Any]] = {}
+        self._process: dict[str, list[ALL_TOKEN_TYPES]] = process_file
+        self._prompts: dict[str, list[ALL_TOKEN_TYPES]] = prompts_file
         self._violations: list[ValidationResult] = []
         self._rule_sets: set[Callable] = {
+            ConditionPatternsRuleSet,
             ConditionsSectionRuleSet,
             CPMParametersValidationSectionRuleSet,
             DebugInformationSectionRuleSet,
@@ -80,10 +91,47 @@ class Validator(object):
             validator = rule_set(
                 process_file=self._process,
                 prompts_file=self._prompts,
+                config=self._config,
             )
             validator.validate()
             self._violations = self.sort_violations(self._violations + validator.violations)
 
+    def configure(self, config: dict[str, dict[str, Any]]) -> "Validator":
+        """
+        Set the configuration of the rule sets, replacing any set before.
+
+        Each rule set reads the entry under its own key, for example {"transitions": {"runtime_budget": 60}} sets the
+        worst case runtime, in seconds, allowed by the transitions section rule set.
+
+        :param config: Configuration keyed by rule set.
+
+        :return: Self
+        """
+        self._config = config
+        return self
+
+    def replace_process_file(self, process_file: dict[str, list[ALL_TOKEN_TYPES]]) -> "Validator":
+        """
+        Create a new validator using a different parsed process file and this validator's prompts file and
+        configuration.
+
+        :param process_file: Parsed process file.
+
+        :return: A new Validator with no violations.
+        """
+        return self.from_parsed(process_file=process_file, prompts_file=self._prompts).configure(config=self._config)
+
+    def replace_prompts_file(self, prompts_file: dict[str, list[ALL_TOKEN_TYPES]]) -> "Validator":
+        """
+        Create a new validator using this validator's process file and configuration and a different parsed prompts
+        file.
+
+        :param prompts_file: Parsed prompts file.
+
+        :return: A new Validator with no violations.
+        """
+        return self.from_parsed(process_file=self._process, prompts_file=prompts_file).configure(config=self._config)
+
     @property
     def process_file(self) -> dict[str, list[ALL_TOKEN_TYPES]]:
         """
@@ -130,6 +178,32 @@ class Validator(object):
             ),
         )
 
+    @classmethod
+    def from_parsed(
+        cls,
+        process_file: dict[str, list[ALL_TOKEN_TYPES]] | None = None,
+        prompts_file: dict[str, list[ALL_TOKEN_TYPES]] | None = None,
+    ) -> "Validator":
+        """
+        Set already parsed files to be validated, skipping the parser.
+
+        Parsed files are treated as read-only by the rule sets so the same dict can be shared between validators, and
+        as the tokens are plain dataclasses a parsed file can be pickled and reused in another process.
+
+        :param process_file: Parsed process file, as returned by the process_file property.
+        :param prompts_file: Parsed prompts file, as returned by the prompts_file property.
+
+        :raises ProgrammingError: If neither file is supplied.
+
+        :return: Self
+        """
+        if not process_file and not prompts_file:
+            raise ProgrammingError("At least one of process file or prompts file is required to complete validation.")
+
+        validator = cls.__new__(cls)
+        validator._setup(process_file=process_file or {}, prompts_file=prompts_file or {})
+        return validator
+
     @classmethod
     def with_file(cls, process_file_path: str = "", prompts_file_path: str = "") -> "Validator":
         """
@@ -146,15 +220,76 @@ class Validator(object):
         if prompts_file_path and not os.path.isfile(prompts_file_path):
             raise FileNotFoundError(f"The prompts file was not found: {prompts_file_path}")
 
-        process_file_content: str = ""
-        prompts_file_content: str = ""
+        process_file_content: str = read_file(path=process_file_path) if process_file_path else ""
+        prompts_file_content: str = read_file(path=prompts_file_path) if prompts_file_path else ""
+
+        return Validator(process_file_content=process_file_content, prompts_file_content=prompts_file_content)
+
+    @classmethod
+    def from_bytes(cls, process_file_content: Buffer = b"", prompts_file_content: Buffer = b"") -> "Validator":
+        """
+        Set the raw content to be validated, such as content held from a database or an archive.
+
+        The encoding is detected from any byte order mark and each buffer is decoded once without being copied.
+
+        :param process_file_content: Raw content for the process file.
+        :param prompts_file_content: Raw content for the prompt file.
+
+        :raises UnicodeDecodeError: If the content is not valid for the detected encoding.
+
+        :return: Self
+        """
+        return Validator(
+            process_file_content=decode_content(data=process_file_content) if process_file_content else "",
+            prompts_file_content=decode_content(data=prompts_file_content) if prompts_file_content else "",
+        )
+
+    @classmethod
+    def from_file_objects(
+        cls,
+        process_file: BinaryIO | None = None,
+        prompts_file: BinaryIO | None = None,
+    ) -> "Validator":
+        """
+        Set the binary file objects to be validated, such as sys.stdin.buffer or an open archive member.
+
+        :param process_file: Binary file object holding the process file.
+        :param prompts_file: Binary file object holding the prompt file.
+
+        :raises UnicodeDecodeError: If the content is not valid for the detected encoding.
+
+        :return: Self
+        """
+        return cls.from_bytes(
+            process_file_content=process_file.read() if process_file else b"",
+            prompts_file_content=prompts_file.read() if prompts_file else b"",
+        )
 
-        if process_file_path:
-            with open(process_file_path, "r", encoding="utf-8") as process_file:
-                process_file_content = process_file.read()
+    @classmethod
+    def with_zip(cls, zip_file: str | BinaryIO) -> "Validator":
+        """
+        Set the plugin archive to be validated.
+
+        The process and prompts files are decoded directly from the archive without being extracted to disk.
+
+        :param zip_file: Path to, or binary file object holding, the plugin zip archive.
+
+        :raises FileNotFoundError: If the archive does not exist.
+        :raises ValueError: If the archive is invalid or does not contain a process or prompts file.
+
+        :return: Self
+        """
+        if isinstance(zip_file, str) and not os.path.isfile(zip_file):
+            raise FileNotFoundError(f"The archive was not found: {zip_file}")
 
-        if prompts_file_path:
-            with open(prompts_file_path, "r", encoding="utf-8") as prompts_file:
-                prompts_file_content = prompts_file.read()
+        try:
+            with zipfile.ZipFile(zip_file) as archive:
+                process_member, prompts_member = find_plugin_members(zip_file=archive)
+                if process_member is None and prompts_member is None:
+                    raise ValueError("The archive does not contain a process or prompts file.")
+                process_file_content: str = read_member(zip_file=archive, member=process_member)
+                prompts_file_content: str = read_member(zip_file=archive, member=prompts_member)
+        except zipfile.BadZipFile as exc:
+            raise ValueError(f"The archive is not a valid zip file: {exc}") from exc
 
         return Validator(process_file_content=process_file_content, prompts_file_content=prompts_file_content)